@@ -1,16 +1,53 @@
 from __future__ import annotations
 
 import os
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from functools import lru_cache
 from pathlib import Path
 
 
+# Per-request info events that are only worth keeping as a sample.
+DEFAULT_LOG_SAMPLE_RATES = "mock_rewrite=0.01,plan_cache_hit=0.1,single_flight_joined=0.1"
+
+
 @dataclass
 class Settings:
     database_url: str
     artifacts_root: Path
     openai_api_key: str | None
+    openai_base_url: str | None = None
+    openai_model: str = "gpt-4o-mini"
+    tailor_workers: int = 2
+    token_cost_per_1k: float = 0.0
+    speculative_tailoring: bool = False
+    primary_resume_ids: tuple[int, ...] = ()
+    speculative_daily_budget: int = 50
+    render_workers: int = 0
+    artifact_max_age_days: int = 0
+    artifact_keep_per_job: int = 0
+    artifact_max_total_bytes: int = 0
+    artifact_archive_after_days: int = 0
+    artifact_sweep_interval: float = 3600.0
+    scheduler_sync_interval: float = 60.0
+    scheduler_workers: int = 2
+    scheduler_max_runs: int = 2
+    scheduler_misfire_grace: int = 300
+    scheduler_jitter: int = 30
+    log_level: str = "INFO"
+    log_async: bool = True
+    log_queue_size: int = 10000
+    log_sample_rates: dict[str, float] = field(default_factory=dict)
+
+    @property
+    def retention_enabled(self) -> bool:
+        return any(
+            (
+                self.artifact_max_age_days,
+                self.artifact_keep_per_job,
+                self.artifact_max_total_bytes,
+                self.artifact_archive_after_days,
+            )
+        )
 
 
 @lru_cache(maxsize=1)
@@ -22,8 +59,62 @@ def get_settings() -> Settings:
     artifacts_root = Path(artifacts_env).resolve()
     artifacts_root.mkdir(parents=True, exist_ok=True)
     openai_api_key = os.environ.get("OPENAI_API_KEY")
+    # An OpenAI-compatible endpoint, e.g. the fake server in benchmarks/fake_openai.py.
+    openai_base_url = os.environ.get("OPENAI_BASE_URL") or None
+    openai_model = os.environ.get("OPENAI_MODEL", "gpt-4o-mini")
+    tailor_workers = int(os.environ.get("TAILOR_WORKERS", "2"))
+    token_cost_per_1k = float(os.environ.get("TOKEN_COST_PER_1K", "0"))
+    speculative_tailoring = os.environ.get("SPECULATIVE_TAILORING", "").lower() in ("1", "true", "yes")
+    primary_resume_ids = tuple(
+        int(value) for value in os.environ.get("PRIMARY_RESUME_IDS", "").split(",") if value.strip()
+    )
+    speculative_daily_budget = int(os.environ.get("SPECULATIVE_DAILY_BUDGET", "50"))
+    render_workers = int(os.environ.get("RENDER_WORKERS", str(os.cpu_count() or 1)))
+    artifact_max_age_days = int(os.environ.get("ARTIFACT_MAX_AGE_DAYS", "0"))
+    artifact_keep_per_job = int(os.environ.get("ARTIFACT_KEEP_PER_JOB", "0"))
+    artifact_max_total_bytes = int(os.environ.get("ARTIFACT_MAX_TOTAL_BYTES", "0"))
+    artifact_archive_after_days = int(os.environ.get("ARTIFACT_ARCHIVE_AFTER_DAYS", "0"))
+    artifact_sweep_interval = float(os.environ.get("ARTIFACT_SWEEP_INTERVAL", "3600"))
+    scheduler_sync_interval = float(os.environ.get("SCHEDULER_SYNC_INTERVAL", "60"))
+    scheduler_workers = int(os.environ.get("SCHEDULER_WORKERS", "2"))
+    scheduler_max_runs = int(os.environ.get("SCHEDULER_MAX_RUNS", "2"))
+    scheduler_misfire_grace = int(os.environ.get("SCHEDULER_MISFIRE_GRACE", "300"))
+    scheduler_jitter = int(os.environ.get("SCHEDULER_JITTER", "30"))
+    log_level = os.environ.get("LOG_LEVEL", "INFO").upper()
+    log_async = os.environ.get("LOG_ASYNC", "true").lower() in ("1", "true", "yes")
+    log_queue_size = int(os.environ.get("LOG_QUEUE_SIZE", "10000"))
+    # ``event=rate`` pairs, e.g. ``mock_rewrite=0.01,schedule_trigger=0.1``.
+    log_sample_rates = {
+        event.strip(): float(rate)
+        for event, _, rate in (
+            item.partition("=") for item in os.environ.get("LOG_SAMPLE_RATES", DEFAULT_LOG_SAMPLE_RATES).split(",")
+        )
+        if event.strip() and rate.strip()
+    }
     return Settings(
         database_url=database_url,
         artifacts_root=artifacts_root,
         openai_api_key=openai_api_key,
+        openai_base_url=openai_base_url,
+        openai_model=openai_model,
+        tailor_workers=tailor_workers,
+        token_cost_per_1k=token_cost_per_1k,
+        speculative_tailoring=speculative_tailoring,
+        primary_resume_ids=primary_resume_ids,
+        speculative_daily_budget=speculative_daily_budget,
+        render_workers=render_workers,
+        artifact_max_age_days=artifact_max_age_days,
+        artifact_keep_per_job=artifact_keep_per_job,
+        artifact_max_total_bytes=artifact_max_total_bytes,
+        artifact_archive_after_days=artifact_archive_after_days,
+        artifact_sweep_interval=artifact_sweep_interval,
+        scheduler_sync_interval=scheduler_sync_interval,
+        scheduler_workers=scheduler_workers,
+        scheduler_max_runs=scheduler_max_runs,
+        scheduler_misfire_grace=scheduler_misfire_grace,
+        scheduler_jitter=scheduler_jitter,
+        log_level=log_level,
+        log_async=log_async,
+        log_queue_size=log_queue_size,
+        log_sample_rates=log_sample_rates,
     )
@@ -1,9 +1,9 @@
 from __future__ import annotations
 
 import json
-from datetime import datetime
+from datetime import datetime, timezone
 from hashlib import sha256
-from typing import Optional
+from typing import Any, Optional
 
 from . import models
 
@@ -72,6 +72,12 @@ def _row_to_resume_version(row) -> models.ResumeVersion:
             token_usage = json.loads(token_usage)
         except json.JSONDecodeError:
             token_usage = None
+    plan = row["plan_json"]
+    if plan:
+        try:
+            plan = json.loads(plan)
+        except json.JSONDecodeError:
+            plan = None
     return models.ResumeVersion(
         id=row["id"],
         resume_id=row["resume_id"],
@@ -85,6 +91,8 @@ def _row_to_resume_version(row) -> models.ResumeVersion:
         model_name=row["model_name"],
         prompt_hash=row["prompt_hash"],
         token_usage=token_usage,
+        plan=plan,
+        mock=bool(row["mock"]),
     )
 
 
@@ -97,6 +105,10 @@ def _row_to_run(row) -> models.Run:
         finished_at=_parse_datetime(row["finished_at"]),
         status=row["status"],
         error=row["error"],
+        schedule_id=row["schedule_id"],
+        heartbeat_at=row["heartbeat_at"],
+        scheduled_for=_parse_datetime(row["scheduled_for"]),
+        lag_seconds=row["lag_seconds"],
     )
 
 
@@ -112,9 +124,63 @@ def _row_to_schedule(row) -> models.Schedule:
         cron_expr=row["cron_expr"],
         is_enabled=bool(row["is_enabled"]),
         criteria_json=criteria,
+        revision=row["revision"],
+        last_job_posting_id=row["last_job_posting_id"],
+        misfire_grace_seconds=row["misfire_grace_seconds"],
+        coalesce=bool(row["coalesce"]),
+        max_instances=row["max_instances"],
+        jitter_seconds=row["jitter_seconds"],
+        last_fire_at=_parse_datetime(row["last_fire_at"]),
+        misfire_count=row["misfire_count"],
+    )
+
+
+def _row_to_tailor_job(row) -> models.TailorJob:
+    return models.TailorJob(
+        id=row["id"],
+        resume_id=row["resume_id"],
+        job_posting_id=row["job_posting_id"],
+        status=row["status"],
+        idempotency_key=row["idempotency_key"],
+        attempts=row["attempts"],
+        claimed_by=row["claimed_by"],
+        heartbeat_at=row["heartbeat_at"],
+        resume_version_id=row["resume_version_id"],
+        artifact_path=row["artifact_path"],
+        mock=None if row["mock"] is None else bool(row["mock"]),
+        error=row["error"],
+        created_at=_parse_datetime(row["created_at"]),
+        finished_at=_parse_datetime(row["finished_at"]),
+        batch_id=row["batch_id"],
+        cached=bool(row["cached"]),
+        kind=row["kind"],
+        priority=row["priority"],
+        base_resume_hash=row["base_resume_hash"],
+    )
+
+
+def _row_to_tailor_batch(row) -> models.TailorBatch:
+    filter_json = row["filter_json"]
+    if filter_json:
+        try:
+            filter_json = json.loads(filter_json)
+        except json.JSONDecodeError:
+            filter_json = None
+    return models.TailorBatch(
+        id=row["id"],
+        status=row["status"],
+        total=row["total"],
+        filter_json=filter_json,
+        created_at=_parse_datetime(row["created_at"]),
+        finished_at=_parse_datetime(row["finished_at"]),
     )
 
 
+def _job_hash(job_posting: models.JobPosting) -> str:
+    job_material = job_posting.raw_text or job_posting.title
+    return sha256(job_material.encode("utf-8", "ignore")).hexdigest()
+
+
 def get_or_create_company(connection, name: str) -> models.Company:
     row = connection.execute(
         "SELECT * FROM companies WHERE name = ?", (name,)
@@ -141,19 +207,35 @@ def create_job_posting(
     url: Optional[str],
     raw_text: Optional[str],
     external_id: Optional[str],
-) -> models.JobPosting:
+    skip_duplicate: bool = False,
+) -> Optional[models.JobPosting]:
+    """Insert a posting; with ``skip_duplicate`` an existing ``url_hash`` returns None instead of raising."""
+
     company_id = company.id if company else None
-    material = url or raw_text or title
-    url_hash = sha256(material.encode("utf-8", "ignore")).hexdigest()
+    conflict = "ON CONFLICT (url_hash) DO NOTHING" if skip_duplicate else ""
     cursor = connection.execute(
-        """
+        f"""
         INSERT INTO job_postings (company_id, title, location, url, raw_text, external_id, url_hash)
         VALUES (?, ?, ?, ?, ?, ?, ?)
+        {conflict}
         """,
-        (company_id, title, location, url, raw_text, external_id, url_hash),
+        (company_id, title, location, url, raw_text, external_id, job_url_hash(title, url, raw_text)),
     )
-    job_id = cursor.lastrowid
-    return get_job_posting(connection, job_id)
+    if not cursor.rowcount:
+        return None
+    return get_job_posting(connection, cursor.lastrowid)
+
+
+def job_url_hash(title: str, url: Optional[str], raw_text: Optional[str]) -> str:
+    """The dedup key of a posting: its URL, else its text, else its title."""
+
+    material = url or raw_text or title
+    return sha256(material.encode("utf-8", "ignore")).hexdigest()
+
+
+def delete_job_posting(connection, job_id: int) -> bool:
+    cursor = connection.execute("DELETE FROM job_postings WHERE id = ?", (job_id,))
+    return cursor.rowcount > 0
 
 
 def list_job_postings(connection) -> list[models.JobPosting]:
@@ -168,6 +250,75 @@ def list_job_postings(connection) -> list[models.JobPosting]:
     return [_row_to_job(row) for row in rows]
 
 
+def _job_posting_filters(
+    *,
+    company: str | tuple[str, ...] | None = None,
+    title: str | tuple[str, ...] | None = None,
+    location: str | tuple[str, ...] | None = None,
+    collected_after: Optional[datetime] = None,
+    collected_before: Optional[datetime] = None,
+) -> tuple[list[str], list]:
+    """Build WHERE clauses over ``job_postings AS jp`` joined to ``companies AS c``.
+
+    Text filters are case-insensitive substring matches; a tuple matches if
+    any of its values does.
+    """
+
+    clauses: list[str] = []
+    params: list = []
+    for column, values in (("c.name", company), ("jp.title", title), ("jp.location", location)):
+        values = (values,) if isinstance(values, str) else tuple(value for value in values or () if value)
+        if values:
+            clauses.append("(" + " OR ".join(f"{column} LIKE ?" for _ in values) + ")")
+            params.extend(f"%{value}%" for value in values)
+    if collected_after is not None:
+        clauses.append("jp.collected_at >= ?")
+        params.append(_sql_timestamp(collected_after))
+    if collected_before is not None:
+        clauses.append("jp.collected_at < ?")
+        params.append(_sql_timestamp(collected_before))
+    return clauses, params
+
+
+def list_job_postings_after(
+    connection,
+    *,
+    after_id: int,
+    up_to_id: Optional[int] = None,
+    limit: int = 100,
+    **filters,
+) -> list[models.JobPosting]:
+    """Return postings with ``after_id < id <= up_to_id`` matching ``filters``, in id order.
+
+    Accepts the filters of :func:`_job_posting_filters`.  Walking the primary
+    key keeps each page proportional to the postings ingested since
+    ``after_id`` rather than to the table size.
+    """
+
+    clauses, params = _job_posting_filters(**filters)
+    clauses.insert(0, "jp.id > ?")
+    params.insert(0, after_id)
+    if up_to_id is not None:
+        clauses.append("jp.id <= ?")
+        params.append(up_to_id)
+    rows = connection.execute(
+        f"""
+        SELECT jp.*, c.name AS company_name, c.aliases AS company_aliases, c.logo_url AS company_logo_url
+        FROM job_postings AS jp
+        LEFT JOIN companies AS c ON jp.company_id = c.id
+        WHERE {' AND '.join(clauses)}
+        ORDER BY jp.id
+        LIMIT ?
+        """,
+        (*params, limit),
+    ).fetchall()
+    return [_row_to_job(row) for row in rows]
+
+
+def max_job_posting_id(connection) -> int:
+    return connection.execute("SELECT COALESCE(MAX(id), 0) FROM job_postings").fetchone()[0]
+
+
 def create_resume(
     connection,
     *,
@@ -194,6 +345,25 @@ def list_resumes(connection) -> list[models.Resume]:
     return [_row_to_resume(row) for row in rows]
 
 
+def get_resumes(connection, resume_ids: list[int]) -> list[models.Resume]:
+    if not resume_ids:
+        return []
+    placeholders = ", ".join("?" for _ in resume_ids)
+    rows = connection.execute(
+        f"SELECT * FROM resumes WHERE id IN ({placeholders}) ORDER BY id", list(resume_ids)
+    ).fetchall()
+    return [_row_to_resume(row) for row in rows]
+
+
+def get_latest_resume(connection) -> Optional[models.Resume]:
+    row = connection.execute(
+        "SELECT * FROM resumes ORDER BY created_at DESC, id DESC LIMIT 1"
+    ).fetchone()
+    if row:
+        return _row_to_resume(row)
+    return None
+
+
 def get_resume(connection, resume_id: int) -> Optional[models.Resume]:
     row = connection.execute(
         "SELECT * FROM resumes WHERE id = ?", (resume_id,)
@@ -218,6 +388,27 @@ def get_job_posting(connection, job_id: int) -> Optional[models.JobPosting]:
     return None
 
 
+def find_job_posting_ids(
+    connection,
+    *,
+    company: Optional[str] = None,
+    title: Optional[str] = None,
+    location: Optional[str] = None,
+) -> list[int]:
+    clauses, params = _job_posting_filters(company=company, title=title, location=location)
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+    rows = connection.execute(
+        f"""
+        SELECT jp.id FROM job_postings AS jp
+        LEFT JOIN companies AS c ON jp.company_id = c.id
+        {where}
+        ORDER BY jp.id
+        """,
+        params,
+    ).fetchall()
+    return [row["id"] for row in rows]
+
+
 def create_resume_version(
     connection,
     *,
@@ -228,28 +419,32 @@ def create_resume_version(
     model_name: str,
     prompt_hash: str,
     token_usage: Optional[dict],
+    plan: Optional[dict] = None,
+    mock: bool = False,
 ) -> models.ResumeVersion:
-    job_material = job_posting.raw_text or job_posting.title
     cursor = connection.execute(
         """
         INSERT INTO resume_versions (
             resume_id, job_posting_id, file_path,
             base_resume_hash, job_hash, input_signature,
-            template_version, model_name, prompt_hash, token_usage
+            template_version, model_name, prompt_hash, token_usage,
+            plan_json, mock
         )
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
         """,
         (
             resume.id,
             job_posting.id,
             file_path,
             resume.text_hash,
-            sha256(job_material.encode("utf-8", "ignore")).hexdigest(),
+            _job_hash(job_posting),
             sha256(f"{resume.id}:{job_posting.id}".encode()).hexdigest(),
             template_version,
             model_name,
             prompt_hash,
             json.dumps(token_usage) if token_usage else None,
+            json.dumps(plan) if plan is not None else None,
+            1 if mock else 0,
         ),
     )
     version_id = cursor.lastrowid
@@ -260,15 +455,148 @@ def create_resume_version(
     return _row_to_resume_version(row)
 
 
+def find_reusable_resume_version(
+    connection,
+    *,
+    resume: models.Resume,
+    job_posting: models.JobPosting,
+    template_version: str,
+    model_name: str,
+    allow_mock: bool,
+) -> Optional[models.ResumeVersion]:
+    """Return the newest version produced from identical inputs by ``model_name``, if any.
+
+    Mock output is only reused when ``allow_mock`` is set, i.e. while the mock
+    service is the one configured.  Versions whose artifact retention has
+    deleted (no live or archived catalog row) are never reused.
+    """
+
+    row = connection.execute(
+        """
+        SELECT * FROM resume_versions
+        WHERE resume_id = ? AND job_posting_id = ? AND base_resume_hash IS ?
+          AND job_hash = ? AND template_version = ? AND model_name = ? AND (mock = 0 OR ?)
+          AND EXISTS (SELECT 1 FROM artifacts WHERE artifacts.path = resume_versions.file_path)
+        ORDER BY id DESC
+        LIMIT 1
+        """,
+        (
+            resume.id,
+            job_posting.id,
+            resume.text_hash,
+            _job_hash(job_posting),
+            template_version,
+            model_name,
+            int(allow_mock),
+        ),
+    ).fetchone()
+    if row:
+        return _row_to_resume_version(row)
+    return None
+
+
+def get_resume_version(connection, version_id: int) -> Optional[models.ResumeVersion]:
+    row = connection.execute(
+        "SELECT * FROM resume_versions WHERE id = ?", (version_id,)
+    ).fetchone()
+    if row:
+        return _row_to_resume_version(row)
+    return None
+
+
+def list_outdated_resume_versions(
+    connection,
+    *,
+    template_version: str,
+    after_id: int = 0,
+    limit: int = 100,
+) -> list[models.ResumeVersion]:
+    """Return versions rendered with a template other than ``template_version``, by id."""
+
+    rows = connection.execute(
+        """
+        SELECT * FROM resume_versions
+        WHERE (template_version IS NULL OR template_version != ?) AND id > ?
+        ORDER BY id
+        LIMIT ?
+        """,
+        (template_version, after_id, limit),
+    ).fetchall()
+    return [_row_to_resume_version(row) for row in rows]
+
+
+def count_outdated_resume_versions(connection, *, template_version: str) -> int:
+    row = connection.execute(
+        """
+        SELECT COUNT(*) AS total FROM resume_versions
+        WHERE template_version IS NULL OR template_version != ?
+        """,
+        (template_version,),
+    ).fetchone()
+    return row["total"]
+
+
+def update_resume_version_artifact(
+    connection,
+    version_id: int,
+    *,
+    file_path: str,
+    template_version: str,
+    plan: Optional[dict] = None,
+) -> None:
+    """Point a version, and the tailoring jobs that produced it, at a re-rendered artifact.
+
+    The version's plan is backfilled if it had none.
+    """
+
+    connection.execute(
+        """
+        UPDATE resume_versions
+        SET file_path = ?, template_version = ?, plan_json = COALESCE(plan_json, ?)
+        WHERE id = ?
+        """,
+        (file_path, template_version, json.dumps(plan) if plan is not None else None, version_id),
+    )
+    connection.execute("UPDATE tailor_jobs SET artifact_path = ? WHERE resume_version_id = ?", (file_path, version_id))
+
+
+def artifact_path_in_use(connection, path: str) -> bool:
+    """Whether a resume version or tailoring job still points at the artifact ``path``."""
+
+    row = connection.execute(
+        """
+        SELECT EXISTS (SELECT 1 FROM resume_versions WHERE file_path = ?)
+            OR EXISTS (SELECT 1 FROM tailor_jobs WHERE artifact_path = ?) AS in_use
+        """,
+        (path, path),
+    ).fetchone()
+    return bool(row["in_use"])
+
+
 def create_run(
     connection,
     *,
     triggered_by: str,
     run_type: str,
+    schedule_id: Optional[int] = None,
+    heartbeat_at: Optional[float] = None,
+    scheduled_for: Optional[datetime] = None,
+    lag_seconds: Optional[float] = None,
 ) -> models.Run:
     cursor = connection.execute(
-        "INSERT INTO runs (triggered_by, type, status) VALUES (?, ?, ?)",
-        (triggered_by, run_type, "running"),
+        """
+        INSERT INTO runs (triggered_by, type, status, schedule_id, heartbeat_at, scheduled_for, lag_seconds)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+        """,
+        (
+            triggered_by,
+            run_type,
+            "running",
+            schedule_id,
+            heartbeat_at,
+            _sql_timestamp(scheduled_for) if scheduled_for else None,
+            lag_seconds,
+        ),
     )
     run_id = cursor.lastrowid
     row = connection.execute(
@@ -277,6 +605,50 @@ def create_run(
     return _row_to_run(row)
 
 
+def start_schedule_run(
+    connection,
+    schedule_id: int,
+    *,
+    max_instances: int,
+    stale_before: float,
+    triggered_by: str,
+    heartbeat_at: float,
+    scheduled_for: Optional[datetime] = None,
+    lag_seconds: Optional[float] = None,
+) -> Optional[models.Run]:
+    """Insert a running run of ``schedule_id`` unless ``max_instances`` are already live.
+
+    The count and the insert are a single statement, so two nodes, or a
+    manual trigger and a cron fire, cannot both slip under the limit.
+    Returns None when the limit is reached.
+    """
+
+    cursor = connection.execute(
+        """
+        INSERT INTO runs (triggered_by, type, status, schedule_id, heartbeat_at, scheduled_for, lag_seconds)
+        SELECT ?, 'scheduled', 'running', ?, ?, ?, ?
+        WHERE (
+            SELECT COUNT(*) FROM runs
+            WHERE schedule_id = ? AND status = 'running' AND heartbeat_at >= ?
+        ) < ?
+        """,
+        (
+            triggered_by,
+            schedule_id,
+            heartbeat_at,
+            _sql_timestamp(scheduled_for) if scheduled_for else None,
+            lag_seconds,
+            schedule_id,
+            stale_before,
+            max_instances,
+        ),
+    )
+    if cursor.rowcount == 0:
+        return None
+    row = connection.execute("SELECT * FROM runs WHERE id = ?", (cursor.lastrowid,)).fetchone()
+    return _row_to_run(row)
+
+
 def finish_run(
     connection,
     run: models.Run,
@@ -294,16 +666,64 @@ def finish_run(
     return _row_to_run(row)
 
 
+def heartbeat_run(connection, run_id: int, *, now: float) -> bool:
+    cursor = connection.execute(
+        "UPDATE runs SET heartbeat_at = ? WHERE id = ? AND status = 'running'", (now, run_id)
+    )
+    return cursor.rowcount == 1
+
+
+def fail_stale_runs(connection, *, stale_before: float) -> list[int]:
+    """Fail heartbeating runs whose owner stopped beating before ``stale_before``.
+
+    Runs started without a heartbeat are left alone.
+    """
+
+    rows = connection.execute(
+        """
+        UPDATE runs
+        SET status = 'failed', error = 'Run interrupted: heartbeat expired', finished_at = CURRENT_TIMESTAMP
+        WHERE status = 'running' AND heartbeat_at < ?
+        RETURNING id
+        """,
+        (stale_before,),
+    ).fetchall()
+    return [row["id"] for row in rows]
+
+
 def create_schedule(
     connection,
     *,
     cron_expr: str,
     is_enabled: bool,
     criteria_json: Optional[dict],
+    misfire_grace_seconds: Optional[int] = None,
+    coalesce: bool = True,
+    max_instances: int = 1,
+    jitter_seconds: Optional[int] = None,
 ) -> models.Schedule:
+    """Insert a schedule whose high-water mark starts at the newest posting.
+
+    Only postings that arrive after the schedule is created are tailored, so
+    a new schedule never fans out over the whole backlog on its first run.
+    """
+
     cursor = connection.execute(
-        "INSERT INTO schedules (cron_expr, is_enabled, criteria_json) VALUES (?, ?, ?)",
-        (cron_expr, 1 if is_enabled else 0, json.dumps(criteria_json) if criteria_json else None),
+        """
+        INSERT INTO schedules (
+            cron_expr, is_enabled, criteria_json, misfire_grace_seconds, coalesce, max_instances, jitter_seconds,
+            last_job_posting_id
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, (SELECT COALESCE(MAX(id), 0) FROM job_postings))
+        """,
+        (
+            cron_expr,
+            1 if is_enabled else 0,
+            json.dumps(criteria_json) if criteria_json else None,
+            misfire_grace_seconds,
+            1 if coalesce else 0,
+            max_instances,
+            jitter_seconds,
+        ),
     )
     schedule_id = cursor.lastrowid
     row = connection.execute(
@@ -326,6 +746,132 @@ def get_schedule(connection, schedule_id: int) -> Optional[models.Schedule]:
     return None
 
 
+def get_schedules(connection, schedule_ids: list[int]) -> list[models.Schedule]:
+    schedules: list[models.Schedule] = []
+    # Chunked to stay under SQLite's bound-parameter limit.
+    for start in range(0, len(schedule_ids), 500):
+        chunk = schedule_ids[start : start + 500]
+        placeholders = ", ".join("?" for _ in chunk)
+        rows = connection.execute(
+            f"SELECT * FROM schedules WHERE id IN ({placeholders}) ORDER BY id", chunk
+        ).fetchall()
+        schedules.extend(_row_to_schedule(row) for row in rows)
+    return schedules
+
+
+def advance_schedule_watermark(connection, schedule_id: int, job_posting_id: int) -> None:
+    """Record that postings up to ``job_posting_id`` were handled; never moves backwards.
+
+    The revision is left alone so the scheduler does not reload the schedule.
+    """
+
+    connection.execute(
+        "UPDATE schedules SET last_job_posting_id = MAX(last_job_posting_id, ?) WHERE id = ?",
+        (job_posting_id, schedule_id),
+    )
+
+
+def list_schedule_revisions(connection) -> dict[int, int]:
+    """Return ``{schedule_id: revision}`` so callers can reload only what changed."""
+
+    rows = connection.execute("SELECT id, revision FROM schedules").fetchall()
+    return {row["id"]: row["revision"] for row in rows}
+
+
+def update_schedule(
+    connection,
+    schedule_id: int,
+    *,
+    cron_expr: Optional[str] = None,
+    is_enabled: Optional[bool] = None,
+    criteria_json: Optional[dict] = None,
+    misfire_grace_seconds: Optional[int] = None,
+    coalesce: Optional[bool] = None,
+    max_instances: Optional[int] = None,
+    jitter_seconds: Optional[int] = None,
+) -> Optional[models.Schedule]:
+    """Apply the given changes (``None`` leaves a field as is) and bump the revision."""
+
+    changes: dict[str, Any] = {
+        "cron_expr": cron_expr,
+        "is_enabled": None if is_enabled is None else int(is_enabled),
+        "misfire_grace_seconds": misfire_grace_seconds,
+        "coalesce": None if coalesce is None else int(coalesce),
+        "max_instances": max_instances,
+        "jitter_seconds": jitter_seconds,
+    }
+    assignments = ["revision = revision + 1"]
+    params: list[Any] = []
+    for column, value in changes.items():
+        if value is not None:
+            assignments.append(f"{column} = ?")
+            params.append(value)
+    if criteria_json is not None:
+        assignments.append("criteria_json = ?")
+        params.append(json.dumps(criteria_json) if criteria_json else None)
+    connection.execute(
+        f"UPDATE schedules SET {', '.join(assignments)} WHERE id = ?", (*params, schedule_id)
+    )
+    return get_schedule(connection, schedule_id)
+
+
+def record_schedule_fire(connection, schedule_id: int, fire_at: datetime) -> None:
+    """Remember the latest occurrence that ran, for catch-up after a restart."""
+
+    connection.execute(
+        "UPDATE schedules SET last_fire_at = MAX(COALESCE(last_fire_at, ''), ?) WHERE id = ?",
+        (_sql_timestamp(fire_at), schedule_id),
+    )
+
+
+def record_schedule_misfires(connection, schedule_id: int, count: int, *, through: datetime) -> bool:
+    """Count ``count`` skipped occurrences up to ``through``, once across nodes.
+
+    Every node sees the same misfires; only the first to move ``last_fire_at``
+    past ``through`` records them.  Returns whether this call counted them.
+    """
+
+    cursor = connection.execute(
+        """
+        UPDATE schedules SET misfire_count = misfire_count + ?, last_fire_at = ?
+        WHERE id = ? AND (last_fire_at IS NULL OR last_fire_at < ?)
+        """,
+        (count, _sql_timestamp(through), schedule_id, _sql_timestamp(through)),
+    )
+    return cursor.rowcount == 1
+
+
+def schedule_lag_stats(connection) -> dict[int, dict[str, Any]]:
+    """Per-schedule start lag (seconds after the jittered due time) over recorded runs."""
+
+    rows = connection.execute(
+        """
+        SELECT
+            schedule_id,
+            COUNT(*) AS runs,
+            AVG(lag_seconds) AS avg_lag_seconds,
+            MAX(lag_seconds) AS max_lag_seconds,
+            (
+                SELECT latest.lag_seconds FROM runs AS latest
+                WHERE latest.schedule_id = runs.schedule_id AND latest.lag_seconds IS NOT NULL
+                ORDER BY latest.id DESC LIMIT 1
+            ) AS last_lag_seconds
+        FROM runs
+        WHERE schedule_id IS NOT NULL AND lag_seconds IS NOT NULL
+        GROUP BY schedule_id
+        """
+    ).fetchall()
+    return {
+        row["schedule_id"]: {
+            "runs": row["runs"],
+            "last_lag_seconds": row["last_lag_seconds"],
+            "avg_lag_seconds": row["avg_lag_seconds"],
+            "max_lag_seconds": row["max_lag_seconds"],
+        }
+        for row in rows
+    }
+
+
 def record_token_usage(total_tokens: int, prompt_tokens: int, completion_tokens: int) -> dict:
     return {
         "total_tokens": total_tokens,
@@ -338,4 +884,843 @@ def list_runs(connection) -> list[models.Run]:
     rows = connection.execute(
         "SELECT * FROM runs ORDER BY started_at DESC, id DESC"
     ).fetchall()
-    return [_row_to_run(row) for row in rows]
+    runs = [_row_to_run(row) for row in rows]
+    timings = get_run_stage_timings(connection, [run.id for run in runs])
+    for run in runs:
+        run.stage_timings = timings.get(run.id)
+    return runs
+
+
+def record_stage_timings(
+    connection,
+    totals: dict[str, tuple[float, int]],
+    *,
+    run_id: Optional[int] = None,
+    resume_version_id: Optional[int] = None,
+) -> None:
+    """Store ``{stage: (seconds, calls)}`` from a span recorder.
+
+    Rows with a ``resume_version_id`` time one tailoring; rows with only a
+    ``run_id`` cover a whole run.
+    """
+
+    connection.executemany(
+        """
+        INSERT INTO stage_timings (run_id, resume_version_id, stage, duration_ms, calls)
+        VALUES (?, ?, ?, ?, ?)
+        """,
+        [
+            (run_id, resume_version_id, stage, round(seconds * 1000, 3), calls)
+            for stage, (seconds, calls) in totals.items()
+        ],
+    )
+
+
+def get_run_stage_timings(connection, run_ids: list[int]) -> dict[int, dict[str, float]]:
+    """Return ``{run_id: {stage: milliseconds}}`` for whole-run timings."""
+
+    timings: dict[int, dict[str, float]] = {}
+    for start in range(0, len(run_ids), 500):
+        chunk = run_ids[start : start + 500]
+        placeholders = ", ".join("?" for _ in chunk)
+        rows = connection.execute(
+            f"""
+            SELECT run_id, stage, duration_ms FROM stage_timings
+            WHERE run_id IN ({placeholders}) AND resume_version_id IS NULL
+            ORDER BY id
+            """,
+            chunk,
+        ).fetchall()
+        for row in rows:
+            timings.setdefault(row["run_id"], {})[row["stage"]] = row["duration_ms"]
+    return timings
+
+
+def get_version_stage_timings(connection, resume_version_id: int) -> dict[str, float]:
+    rows = connection.execute(
+        "SELECT stage, duration_ms FROM stage_timings WHERE resume_version_id = ? ORDER BY id",
+        (resume_version_id,),
+    ).fetchall()
+    return {row["stage"]: row["duration_ms"] for row in rows}
+
+
+def stage_timing_percentiles(
+    connection, *, per: str = "version", since: Optional[datetime] = None
+) -> list[dict[str, Any]]:
+    """p50/p95/max duration of each stage, one sample per tailoring (``per="version"``) or run.
+
+    Percentiles use the nearest-rank method: the smallest sample with at
+    least p% of the samples at or below it.
+    """
+
+    if per not in ("version", "run"):
+        raise ValueError("per must be 'version' or 'run'")
+    owner = "resume_version_id IS NOT NULL" if per == "version" else "resume_version_id IS NULL AND run_id IS NOT NULL"
+    params: list[Any] = []
+    window = ""
+    if since is not None:
+        window = "AND recorded_at >= ?"
+        params.append(_sql_timestamp(since))
+    rows = connection.execute(
+        f"""
+        WITH ranked AS (
+            SELECT
+                stage,
+                duration_ms,
+                ROW_NUMBER() OVER (PARTITION BY stage ORDER BY duration_ms) AS position,
+                COUNT(*) OVER (PARTITION BY stage) AS samples
+            FROM stage_timings
+            WHERE {owner} {window}
+        )
+        SELECT
+            stage,
+            MAX(samples) AS samples,
+            MIN(CASE WHEN position >= 0.50 * samples THEN duration_ms END) AS p50_ms,
+            MIN(CASE WHEN position >= 0.95 * samples THEN duration_ms END) AS p95_ms,
+            MAX(duration_ms) AS max_ms
+        FROM ranked
+        GROUP BY stage
+        ORDER BY stage
+        """,
+        params,
+    ).fetchall()
+    return [dict(row) for row in rows]
+
+
+def enqueue_tailor_job(
+    connection,
+    *,
+    resume_id: int,
+    job_posting_id: int,
+    idempotency_key: Optional[str] = None,
+    batch_id: Optional[int] = None,
+    kind: str = "tailor",
+    priority: int = 0,
+    base_resume_hash: Optional[str] = None,
+) -> models.TailorJob:
+    """Queue a tailoring job, returning the existing job for a reused key."""
+
+    if idempotency_key:
+        existing = get_tailor_job_by_key(connection, idempotency_key)
+        if existing:
+            return existing
+    cursor = connection.execute(
+        """
+        INSERT INTO tailor_jobs (
+            resume_id, job_posting_id, idempotency_key, batch_id, kind, priority, base_resume_hash
+        )
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT(idempotency_key) DO NOTHING
+        """,
+        (resume_id, job_posting_id, idempotency_key, batch_id, kind, priority, base_resume_hash),
+    )
+    if cursor.rowcount == 0:
+        return get_tailor_job_by_key(connection, idempotency_key)
+    return get_tailor_job(connection, cursor.lastrowid)
+
+
+def get_tailor_job(connection, job_id: int) -> Optional[models.TailorJob]:
+    row = connection.execute(
+        "SELECT * FROM tailor_jobs WHERE id = ?", (job_id,)
+    ).fetchone()
+    if row:
+        return _row_to_tailor_job(row)
+    return None
+
+
+def get_tailor_job_by_key(connection, idempotency_key: str) -> Optional[models.TailorJob]:
+    row = connection.execute(
+        "SELECT * FROM tailor_jobs WHERE idempotency_key = ?", (idempotency_key,)
+    ).fetchone()
+    if row:
+        return _row_to_tailor_job(row)
+    return None
+
+
+def claim_tailor_job(
+    connection,
+    *,
+    worker_id: str,
+    now: float,
+    stale_before: float,
+    max_attempts: int,
+    job_id: Optional[int] = None,
+) -> Optional[models.TailorJob]:
+    """Atomically claim the oldest highest-priority runnable job (or ``job_id``).
+
+    Runnable means queued, or running with a heartbeat older than
+    ``stale_before`` because its worker died.  The claim is a single UPDATE so
+    concurrent workers never receive the same job.
+    """
+
+    expired = connection.execute(
+        """
+        UPDATE tailor_jobs
+        SET status = 'failed', error = 'Worker heartbeat expired', finished_at = CURRENT_TIMESTAMP
+        WHERE status = 'running' AND heartbeat_at < ? AND attempts >= ?
+        RETURNING batch_id
+        """,
+        (stale_before, max_attempts),
+    ).fetchall()
+    for batch_id in {row["batch_id"] for row in expired if row["batch_id"] is not None}:
+        finish_tailor_batch_if_done(connection, batch_id)
+    id_filter = "AND id = ?" if job_id is not None else ""
+    params: list = [worker_id, now, stale_before, max_attempts]
+    if job_id is not None:
+        params.append(job_id)
+    row = connection.execute(
+        f"""
+        UPDATE tailor_jobs
+        SET status = 'running', claimed_by = ?, claimed_at = CURRENT_TIMESTAMP,
+            heartbeat_at = ?, attempts = attempts + 1
+        WHERE id = (
+            SELECT id FROM tailor_jobs
+            WHERE (status = 'queued' OR (status = 'running' AND heartbeat_at < ?))
+              AND attempts < ? {id_filter}
+            ORDER BY priority DESC, id
+            LIMIT 1
+        )
+        RETURNING id
+        """,
+        params,
+    ).fetchone()
+    if row:
+        return get_tailor_job(connection, row["id"])
+    return None
+
+
+def heartbeat_tailor_job(connection, job_id: int, *, worker_id: str, now: float) -> bool:
+    cursor = connection.execute(
+        "UPDATE tailor_jobs SET heartbeat_at = ? WHERE id = ? AND claimed_by = ? AND status = 'running'",
+        (now, job_id, worker_id),
+    )
+    return cursor.rowcount > 0
+
+
+def complete_tailor_job(
+    connection,
+    job_id: int,
+    *,
+    worker_id: str,
+    resume_version_id: Optional[int] = None,
+    artifact_path: Optional[str] = None,
+    mock: Optional[bool] = None,
+    model_calls: int = 0,
+    token_usage: Optional[dict] = None,
+) -> None:
+    connection.execute(
+        f"""
+        UPDATE tailor_jobs
+        SET status = 'succeeded', resume_version_id = ?, artifact_path = ?, mock = ?,
+            error = NULL, finished_at = CURRENT_TIMESTAMP, {_USAGE_ASSIGNMENTS}
+        WHERE id = ? AND claimed_by = ?
+        """,
+        (
+            resume_version_id,
+            artifact_path,
+            None if mock is None else int(mock),
+            *_usage_params(model_calls, token_usage),
+            job_id,
+            worker_id,
+        ),
+    )
+
+
+def fail_tailor_job(
+    connection,
+    job_id: int,
+    *,
+    worker_id: str,
+    error: str,
+    retry: bool,
+    model_calls: int = 0,
+    token_usage: Optional[dict] = None,
+) -> None:
+    usage = _usage_params(model_calls, token_usage)
+    if retry:
+        connection.execute(
+            f"""
+            UPDATE tailor_jobs SET status = 'queued', error = ?, claimed_by = NULL, {_USAGE_ASSIGNMENTS}
+            WHERE id = ? AND claimed_by = ?
+            """,
+            (error, *usage, job_id, worker_id),
+        )
+        return
+    connection.execute(
+        f"""
+        UPDATE tailor_jobs SET status = 'failed', error = ?, finished_at = CURRENT_TIMESTAMP, {_USAGE_ASSIGNMENTS}
+        WHERE id = ? AND claimed_by = ?
+        """,
+        (error, *usage, job_id, worker_id),
+    )
+
+
+# Model usage accumulates over attempts, so calls made by a failed try still count.
+_USAGE_ASSIGNMENTS = (
+    "model_calls = model_calls + ?, prompt_tokens = prompt_tokens + ?, "
+    "completion_tokens = completion_tokens + ?, total_tokens = total_tokens + ?"
+)
+
+
+def _usage_params(model_calls: int, token_usage: Optional[dict]) -> tuple[int, int, int, int]:
+    token_usage = token_usage or {}
+    return (
+        model_calls,
+        token_usage.get("prompt_tokens") or 0,
+        token_usage.get("completion_tokens") or 0,
+        token_usage.get("total_tokens") or 0,
+    )
+
+
+def cancel_tailor_job(connection, job_id: int, *, worker_id: str, reason: str) -> None:
+    connection.execute(
+        """
+        UPDATE tailor_jobs SET status = 'cancelled', error = ?, finished_at = CURRENT_TIMESTAMP
+        WHERE id = ? AND claimed_by = ?
+        """,
+        (reason, job_id, worker_id),
+    )
+
+
+def cancel_queued_tailor_jobs(
+    connection,
+    *,
+    kind: str,
+    reason: str,
+    job_posting_id: Optional[int] = None,
+    resume_id: Optional[int] = None,
+) -> int:
+    clauses = ["status = 'queued'", "kind = ?"]
+    params: list = [reason, kind]
+    if job_posting_id is not None:
+        clauses.append("job_posting_id = ?")
+        params.append(job_posting_id)
+    if resume_id is not None:
+        clauses.append("resume_id = ?")
+        params.append(resume_id)
+    cursor = connection.execute(
+        f"""
+        UPDATE tailor_jobs SET status = 'cancelled', error = ?, finished_at = CURRENT_TIMESTAMP
+        WHERE {' AND '.join(clauses)}
+        """,
+        params,
+    )
+    return cursor.rowcount
+
+
+def count_tailor_jobs_by_status(connection) -> dict[str, int]:
+    rows = connection.execute("SELECT status, COUNT(*) AS jobs FROM tailor_jobs GROUP BY status").fetchall()
+    return {row["status"]: row["jobs"] for row in rows}
+
+
+def count_tailor_jobs_today(connection, *, kind: str) -> int:
+    row = connection.execute(
+        "SELECT COUNT(*) AS total FROM tailor_jobs WHERE kind = ? AND created_at >= date('now')",
+        (kind,),
+    ).fetchone()
+    return row["total"]
+
+
+def record_cached_tailor_job(
+    connection,
+    *,
+    version: models.ResumeVersion,
+    batch_id: Optional[int] = None,
+) -> models.TailorJob:
+    """Record a job satisfied by an existing resume version (no model call)."""
+
+    cursor = connection.execute(
+        """
+        INSERT INTO tailor_jobs (
+            resume_id, job_posting_id, status, batch_id, cached,
+            resume_version_id, artifact_path, finished_at
+        )
+        VALUES (?, ?, 'succeeded', ?, 1, ?, ?, CURRENT_TIMESTAMP)
+        """,
+        (version.resume_id, version.job_posting_id, batch_id, version.id, version.file_path),
+    )
+    return get_tailor_job(connection, cursor.lastrowid)
+
+
+def create_tailor_batch(connection, *, total: int, filter_json: Optional[dict]) -> models.TailorBatch:
+    cursor = connection.execute(
+        "INSERT INTO tailor_batches (total, filter_json) VALUES (?, ?)",
+        (total, json.dumps(filter_json) if filter_json else None),
+    )
+    return get_tailor_batch(connection, cursor.lastrowid)
+
+
+def get_tailor_batch(connection, batch_id: int) -> Optional[models.TailorBatch]:
+    row = connection.execute(
+        "SELECT * FROM tailor_batches WHERE id = ?", (batch_id,)
+    ).fetchone()
+    if row:
+        return _row_to_tailor_batch(row)
+    return None
+
+
+def finish_tailor_batch_if_done(connection, batch_id: int) -> bool:
+    """Mark the batch finished once none of its jobs is queued or running.
+
+    Called by whoever moves a batch job to a terminal state, so reading a
+    batch never has to write.  Returns whether this call finished it.
+    """
+
+    cursor = connection.execute(
+        """
+        UPDATE tailor_batches
+        SET status = CASE
+                WHEN EXISTS (SELECT 1 FROM tailor_jobs WHERE batch_id = :id AND status = 'failed')
+                THEN 'completed_with_errors' ELSE 'completed'
+            END,
+            finished_at = CURRENT_TIMESTAMP
+        WHERE id = :id AND finished_at IS NULL
+          AND NOT EXISTS (
+              SELECT 1 FROM tailor_jobs WHERE batch_id = :id AND status IN ('queued', 'running')
+          )
+        """,
+        {"id": batch_id},
+    )
+    return cursor.rowcount > 0
+
+
+def list_batch_tailor_jobs(connection, batch_id: int) -> list[models.TailorJob]:
+    rows = connection.execute(
+        "SELECT * FROM tailor_jobs WHERE batch_id = ? ORDER BY id", (batch_id,)
+    ).fetchall()
+    return [_row_to_tailor_job(row) for row in rows]
+
+
+def tailor_batch_stats(connection, batch_id: int) -> dict:
+    """Aggregate status counts, timing and token usage for a batch.
+
+    Model calls and tokens are the ones each job's worker actually made, so
+    plan-cache hits and jobs that joined another caller's run count zero.
+    """
+
+    row = connection.execute(
+        """
+        SELECT
+            COUNT(*) AS jobs,
+            SUM(status = 'queued') AS queued,
+            SUM(status = 'running') AS running,
+            SUM(status = 'succeeded') AS succeeded,
+            SUM(status = 'failed') AS failed,
+            SUM(cached) AS cached,
+            SUM(CASE WHEN cached = 0 THEN attempts ELSE 0 END) AS attempts,
+            MAX(finished_at) AS last_finished_at,
+            SUM(model_calls) AS model_calls,
+            SUM(prompt_tokens) AS prompt_tokens,
+            SUM(completion_tokens) AS completion_tokens,
+            SUM(total_tokens) AS total_tokens
+        FROM tailor_jobs
+        WHERE batch_id = ?
+        """,
+        (batch_id,),
+    ).fetchone()
+    stats = {key: row[key] or 0 for key in row.keys() if key != "last_finished_at"}
+    stats["last_finished_at"] = _parse_datetime(row["last_finished_at"])
+    return stats
+
+
+def get_cached_rewrite(connection, *, prompt_hash: str, model_name: str) -> Optional[models.PlanCacheEntry]:
+    row = connection.execute(
+        "SELECT * FROM plan_cache WHERE prompt_hash = ? AND model_name = ?",
+        (prompt_hash, model_name),
+    ).fetchone()
+    if not row:
+        return None
+    return models.PlanCacheEntry(
+        prompt_hash=row["prompt_hash"],
+        model_name=row["model_name"],
+        plan=json.loads(row["plan_json"]),
+        rendered_text=row["rendered_text"],
+        token_usage=json.loads(row["token_usage"]) if row["token_usage"] else None,
+        mock=bool(row["mock"]),
+        created_at=_parse_datetime(row["created_at"]),
+    )
+
+
+def store_cached_rewrite(connection, entry: models.PlanCacheEntry) -> None:
+    connection.execute(
+        """
+        INSERT INTO plan_cache (prompt_hash, model_name, plan_json, rendered_text, token_usage, mock)
+        VALUES (?, ?, ?, ?, ?, ?)
+        ON CONFLICT(prompt_hash, model_name) DO UPDATE SET
+            plan_json = excluded.plan_json,
+            rendered_text = excluded.rendered_text,
+            token_usage = excluded.token_usage,
+            mock = excluded.mock,
+            created_at = CURRENT_TIMESTAMP
+        """,
+        (
+            entry.prompt_hash,
+            entry.model_name,
+            json.dumps(entry.plan),
+            entry.rendered_text,
+            json.dumps(entry.token_usage) if entry.token_usage else None,
+            1 if entry.mock else 0,
+        ),
+    )
+
+
+def _row_to_lease(row) -> models.Lease:
+    return models.Lease(
+        name=row["name"],
+        owner=row["owner"],
+        expires_at=row["expires_at"],
+        result=json.loads(row["result_json"]) if row["result_json"] else None,
+        completed_at=row["completed_at"],
+    )
+
+
+def acquire_lease(connection, name: str, *, owner: str, now: float, expires_at: float) -> bool:
+    """Take ``name`` if it is free or its previous holder's lease expired."""
+
+    connection.execute(
+        """
+        INSERT INTO leases (name, owner, expires_at) VALUES (?, ?, ?)
+        ON CONFLICT(name) DO UPDATE SET
+            owner = excluded.owner,
+            expires_at = excluded.expires_at,
+            result_json = NULL,
+            completed_at = NULL
+        WHERE leases.expires_at < ?
+        """,
+        (name, owner, expires_at, now),
+    )
+    row = connection.execute("SELECT owner FROM leases WHERE name = ?", (name,)).fetchone()
+    return row is not None and row["owner"] == owner
+
+
+def renew_lease(connection, name: str, *, owner: str, expires_at: float) -> bool:
+    cursor = connection.execute(
+        "UPDATE leases SET expires_at = ? WHERE name = ? AND owner = ? AND completed_at IS NULL",
+        (expires_at, name, owner),
+    )
+    return cursor.rowcount > 0
+
+
+def complete_lease(
+    connection,
+    name: str,
+    *,
+    owner: str,
+    now: float,
+    expires_at: float,
+    result: Optional[dict] = None,
+) -> bool:
+    cursor = connection.execute(
+        """
+        UPDATE leases SET result_json = ?, completed_at = ?, expires_at = ?
+        WHERE name = ? AND owner = ?
+        """,
+        (json.dumps(result) if result is not None else None, now, expires_at, name, owner),
+    )
+    return cursor.rowcount > 0
+
+
+def release_lease(connection, name: str, *, owner: str) -> None:
+    connection.execute("DELETE FROM leases WHERE name = ? AND owner = ?", (name, owner))
+
+
+def purge_expired_leases(connection, *, prefix: str, now: float) -> int:
+    """Delete expired leases whose name starts with ``prefix``."""
+
+    cursor = connection.execute(
+        "DELETE FROM leases WHERE name >= ? AND name < ? AND expires_at < ?",
+        (prefix, prefix + "\uffff", now),
+    )
+    return cursor.rowcount
+
+
+def get_lease(connection, name: str) -> Optional[models.Lease]:
+    row = connection.execute("SELECT * FROM leases WHERE name = ?", (name,)).fetchone()
+    if row:
+        return _row_to_lease(row)
+    return None
+
+
+def _sql_timestamp(value: datetime) -> str:
+    """Format ``value`` like SQLite's CURRENT_TIMESTAMP (UTC); naive values are taken as UTC."""
+
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc)
+    return value.strftime("%Y-%m-%d %H:%M:%S")
+
+
+def _row_to_artifact(row) -> models.Artifact:
+    meta = row["meta_json"]
+    if meta:
+        try:
+            meta = json.loads(meta)
+        except json.JSONDecodeError:
+            meta = None
+    return models.Artifact(
+        id=row["id"],
+        path=row["path"],
+        folder=row["folder"],
+        file_name=row["file_name"],
+        size=row["size"],
+        sha256=row["sha256"],
+        company=row["company"],
+        job_key=row["job_key"],
+        job_posting_id=row["job_posting_id"],
+        resume_id=row["resume_id"],
+        template_version=row["template_version"],
+        model_name=row["model_name"],
+        prompt_hash=row["prompt_hash"],
+        mock=bool(row["mock"]),
+        meta=meta,
+        created_at=_parse_datetime(row["created_at"]),
+        archive_path=row["archive_path"],
+        archive_member=row["archive_member"],
+    )
+
+
+def create_artifact_record(
+    connection,
+    *,
+    path: str,
+    folder: str,
+    file_name: str,
+    size: int,
+    sha256_hex: str,
+    company: Optional[str],
+    job_key: Optional[str],
+    job_posting_id: Optional[int] = None,
+    resume_id: Optional[int] = None,
+    template_version: Optional[str] = None,
+    model_name: Optional[str] = None,
+    prompt_hash: Optional[str] = None,
+    mock: bool = False,
+    meta: Optional[dict] = None,
+    created_at: Optional[datetime] = None,
+) -> models.Artifact:
+    search_text = " ".join(
+        part for part in (company, job_key, folder, file_name, model_name, template_version) if part
+    ).lower()
+    connection.execute(
+        """
+        INSERT INTO artifacts (
+            path, folder, file_name, size, sha256, company, job_key, job_posting_id, resume_id,
+            template_version, model_name, prompt_hash, mock, meta_json, search_text, created_at
+        )
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, COALESCE(?, CURRENT_TIMESTAMP))
+        ON CONFLICT(path) DO UPDATE SET
+            size = excluded.size,
+            sha256 = excluded.sha256,
+            meta_json = excluded.meta_json,
+            search_text = excluded.search_text
+        """,
+        (
+            path,
+            folder,
+            file_name,
+            size,
+            sha256_hex,
+            company,
+            job_key,
+            job_posting_id,
+            resume_id,
+            template_version,
+            model_name,
+            prompt_hash,
+            1 if mock else 0,
+            json.dumps(meta) if meta else None,
+            search_text,
+            _sql_timestamp(created_at) if created_at else None,
+        ),
+    )
+    return get_artifact_by_path(connection, path)
+
+
+def get_artifact(connection, artifact_id: int) -> Optional[models.Artifact]:
+    row = connection.execute("SELECT * FROM artifacts WHERE id = ?", (artifact_id,)).fetchone()
+    if row:
+        return _row_to_artifact(row)
+    return None
+
+
+def get_artifact_by_path(connection, path: str) -> Optional[models.Artifact]:
+    row = connection.execute("SELECT * FROM artifacts WHERE path = ?", (path,)).fetchone()
+    if row:
+        return _row_to_artifact(row)
+    return None
+
+
+def _escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _artifact_filters(
+    *,
+    query: Optional[str] = None,
+    company: Optional[str] = None,
+    job_posting_id: Optional[int] = None,
+    resume_id: Optional[int] = None,
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
+) -> tuple[str, list]:
+    clauses: list[str] = []
+    params: list = []
+    if query:
+        needle = query.lower()
+        if len(needle) >= 3:
+            # A quoted phrase on the trigram index matches the text as a literal substring.
+            clauses.append("id IN (SELECT rowid FROM artifacts_search WHERE artifacts_search MATCH ?)")
+            params.append('"' + needle.replace('"', '""') + '"')
+        else:
+            # Trigrams need three characters, so one- and two-character queries scan the catalog.
+            clauses.append("search_text LIKE ? ESCAPE '\\'")
+            params.append(f"%{_escape_like(needle)}%")
+    if company:
+        clauses.append("company = ? COLLATE NOCASE")
+        params.append(company)
+    if job_posting_id is not None:
+        clauses.append("job_posting_id = ?")
+        params.append(job_posting_id)
+    if resume_id is not None:
+        clauses.append("resume_id = ?")
+        params.append(resume_id)
+    if created_after is not None:
+        clauses.append("created_at >= ?")
+        params.append(_sql_timestamp(created_after))
+    if created_before is not None:
+        clauses.append("created_at < ?")
+        params.append(_sql_timestamp(created_before))
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+    return where, params
+
+
+def list_artifacts(connection, *, limit: int = 50, offset: int = 0, **filters) -> list[models.Artifact]:
+    """Page through the artifact catalog, newest first.
+
+    Accepts the filters of :func:`_artifact_filters` (free-text ``query``,
+    ``company``, ``job_posting_id``, ``resume_id`` and a created_at window).
+    """
+
+    where, params = _artifact_filters(**filters)
+    rows = connection.execute(
+        f"SELECT * FROM artifacts {where} ORDER BY created_at DESC, id DESC LIMIT ? OFFSET ?",
+        (*params, limit, offset),
+    ).fetchall()
+    return [_row_to_artifact(row) for row in rows]
+
+
+def list_artifacts_after(connection, *, after_id: int = 0, limit: int = 500, **filters) -> list[models.Artifact]:
+    """Keyset-paginate the catalog in id order, for walking large result sets."""
+
+    where, params = _artifact_filters(**filters)
+    where = f"{where} AND id > ?" if where else "WHERE id > ?"
+    rows = connection.execute(
+        f"SELECT * FROM artifacts {where} ORDER BY id LIMIT ?",
+        (*params, after_id, limit),
+    ).fetchall()
+    return [_row_to_artifact(row) for row in rows]
+
+
+def count_artifacts(connection, **filters) -> int:
+    where, params = _artifact_filters(**filters)
+    row = connection.execute(f"SELECT COUNT(*) AS total FROM artifacts {where}", params).fetchone()
+    return row["total"]
+
+
+def get_counts(connection) -> dict[str, int]:
+    row = connection.execute(
+        """
+        SELECT
+            (SELECT COUNT(*) FROM resumes) AS resumes,
+            (SELECT COUNT(*) FROM job_postings) AS job_postings,
+            (SELECT COUNT(*) FROM artifacts) AS artifacts,
+            (SELECT COUNT(*) FROM schedules) AS schedules
+        """
+    ).fetchone()
+    return dict(row)
+
+
+def list_artifacts_created_before(
+    connection,
+    *,
+    created_before: datetime,
+    limit: int,
+    live_only: bool = False,
+    after_id: int = 0,
+) -> list[models.Artifact]:
+    """Return artifacts created before ``created_before``, in id order after ``after_id``."""
+
+    live = "AND archive_path IS NULL" if live_only else ""
+    rows = connection.execute(
+        f"""
+        SELECT * FROM artifacts
+        WHERE created_at < ? AND id > ? {live}
+        ORDER BY id
+        LIMIT ?
+        """,
+        (_sql_timestamp(created_before), after_id, limit),
+    ).fetchall()
+    return [_row_to_artifact(row) for row in rows]
+
+
+def list_excess_artifacts(connection, *, keep_per_job: int, limit: int) -> list[models.Artifact]:
+    """Return artifacts beyond the newest ``keep_per_job`` in each company/job folder."""
+
+    rows = connection.execute(
+        """
+        SELECT * FROM (
+            SELECT artifacts.*,
+                   ROW_NUMBER() OVER (PARTITION BY folder ORDER BY created_at DESC, id DESC) AS position
+            FROM artifacts
+        )
+        WHERE position > ?
+        ORDER BY id
+        LIMIT ?
+        """,
+        (keep_per_job, limit),
+    ).fetchall()
+    return [_row_to_artifact(row) for row in rows]
+
+
+def list_oldest_live_artifacts(connection, *, limit: int) -> list[models.Artifact]:
+    rows = connection.execute(
+        "SELECT * FROM artifacts WHERE archive_path IS NULL ORDER BY created_at, id LIMIT ?",
+        (limit,),
+    ).fetchall()
+    return [_row_to_artifact(row) for row in rows]
+
+
+def live_artifact_bytes(connection) -> int:
+    row = connection.execute(
+        "SELECT COALESCE(SUM(size), 0) AS total FROM artifacts WHERE archive_path IS NULL"
+    ).fetchone()
+    return row["total"]
+
+
+def mark_artifact_archived(connection, artifact_id: int, *, archive_path: str, archive_member: str) -> None:
+    connection.execute(
+        "UPDATE artifacts SET archive_path = ?, archive_member = ? WHERE id = ?",
+        (archive_path, archive_member, artifact_id),
+    )
+
+
+def delete_artifact_records(connection, artifact_ids: list[int]) -> None:
+    connection.executemany("DELETE FROM artifacts WHERE id = ?", [(artifact_id,) for artifact_id in artifact_ids])
+
+
+def delete_bundle_artifact_records(connection, archive_path: str) -> int:
+    cursor = connection.execute("DELETE FROM artifacts WHERE archive_path = ?", (archive_path,))
+    return cursor.rowcount
+
+
+def count_bundle_artifacts(connection, archive_path: str) -> int:
+    row = connection.execute(
+        "SELECT COUNT(*) AS total FROM artifacts WHERE archive_path = ?", (archive_path,)
+    ).fetchone()
+    return row["total"]
+
+
+def count_live_folder_artifacts(connection, folder: str) -> int:
+    row = connection.execute(
+        "SELECT COUNT(*) AS total FROM artifacts WHERE folder = ? AND archive_path IS NULL", (folder,)
+    ).fetchone()
+    return row["total"]
@@ -1,18 +1,96 @@
 from __future__ import annotations
 
 import sqlite3
+import time
 from contextlib import contextmanager
 from pathlib import Path
 from threading import Lock
 from typing import Iterator
 
 from .config import get_settings
+from .utils.metrics import REGISTRY
 
 
 _INIT_LOCK = Lock()
 _INITIALIZED = False
 _DATABASE_LOCATION: str | Path = ":memory:"
 
+DB_SESSION_SECONDS = REGISTRY.histogram(
+    "fitresume_db_session_duration_seconds",
+    "Time from opening a database session to its commit or rollback.",
+    ("outcome",),
+)
+
+# Columns added to tables after they first shipped.  ``CREATE TABLE IF NOT
+# EXISTS`` leaves older databases untouched, so these are added with ALTER
+# TABLE before ``db/init.sql`` runs (its indexes may reference them).
+_COLUMN_MIGRATIONS: tuple[tuple[str, str, str], ...] = (
+    ("tailor_jobs", "batch_id", "INTEGER REFERENCES tailor_batches(id) ON DELETE CASCADE"),
+    ("tailor_jobs", "cached", "INTEGER NOT NULL DEFAULT 0"),
+    ("tailor_jobs", "kind", "TEXT NOT NULL DEFAULT 'tailor'"),
+    ("tailor_jobs", "priority", "INTEGER NOT NULL DEFAULT 0"),
+    ("tailor_jobs", "base_resume_hash", "TEXT"),
+    ("resume_versions", "plan_json", "TEXT"),
+    ("resume_versions", "mock", "INTEGER NOT NULL DEFAULT 0"),
+    ("artifacts", "archive_path", "TEXT"),
+    ("artifacts", "archive_member", "TEXT"),
+    ("schedules", "revision", "INTEGER NOT NULL DEFAULT 1"),
+    ("schedules", "last_job_posting_id", "INTEGER NOT NULL DEFAULT 0"),
+    ("runs", "schedule_id", "INTEGER REFERENCES schedules(id) ON DELETE SET NULL"),
+    ("runs", "heartbeat_at", "REAL"),
+    ("runs", "scheduled_for", "DATETIME"),
+    ("runs", "lag_seconds", "REAL"),
+    ("schedules", "misfire_grace_seconds", "INTEGER"),
+    ("schedules", "coalesce", "INTEGER NOT NULL DEFAULT 1"),
+    ("schedules", "max_instances", "INTEGER NOT NULL DEFAULT 1"),
+    ("schedules", "jitter_seconds", "INTEGER"),
+    ("schedules", "last_fire_at", "DATETIME"),
+    ("schedules", "misfire_count", "INTEGER NOT NULL DEFAULT 0"),
+    ("tailor_jobs", "model_calls", "INTEGER NOT NULL DEFAULT 0"),
+    ("tailor_jobs", "prompt_tokens", "INTEGER NOT NULL DEFAULT 0"),
+    ("tailor_jobs", "completion_tokens", "INTEGER NOT NULL DEFAULT 0"),
+    ("tailor_jobs", "total_tokens", "INTEGER NOT NULL DEFAULT 0"),
+)
+
+# Statements run once, right after their column is added, to give existing
+# rows a value other than the column default.
+_COLUMN_BACKFILLS: dict[tuple[str, str], str] = {
+    # Existing schedules start from the newest posting rather than tailoring
+    # every posting already in the table on their next run.
+    ("schedules", "last_job_posting_id"): (
+        "UPDATE schedules SET last_job_posting_id = (SELECT COALESCE(MAX(id), 0) FROM job_postings)"
+    ),
+}
+
+
+def _apply_column_migrations(connection: sqlite3.Connection) -> None:
+    for table, column, ddl in _COLUMN_MIGRATIONS:
+        existing = {row[1] for row in connection.execute(f"PRAGMA table_info({table})")}
+        if existing and column not in existing:
+            connection.execute(f"ALTER TABLE {table} ADD COLUMN {column} {ddl}")
+            backfill = _COLUMN_BACKFILLS.get((table, column))
+            if backfill:
+                connection.execute(backfill)
+
+
+def initialize_schema(connection: sqlite3.Connection) -> None:
+    """Create or migrate the schema on ``connection`` and commit."""
+
+    connection.execute("PRAGMA foreign_keys = ON")
+    _apply_column_migrations(connection)
+    new_search_index = not _table_exists(connection, "artifacts_search")
+    init_sql = Path("db/init.sql").read_text(encoding="utf-8")
+    connection.executescript(init_sql)
+    if new_search_index:
+        # Index catalog rows written before the full-text table existed.
+        connection.execute("INSERT INTO artifacts_search (artifacts_search) VALUES ('rebuild')")
+    connection.commit()
+
+
+def _table_exists(connection: sqlite3.Connection, name: str) -> bool:
+    row = connection.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (name,)).fetchone()
+    return row is not None
+
 
 def _ensure_initialized() -> None:
     global _INITIALIZED, _DATABASE_LOCATION
@@ -37,13 +115,12 @@ def _ensure_initialized() -> None:
 
         if target != ":memory:":
             connection = sqlite3.connect(target)
+            # WAL lets readers proceed while a queue worker holds the write lock.
+            connection.execute("PRAGMA journal_mode = WAL")
         else:
             connection = sqlite3.connect(target)
         try:
-            connection.execute("PRAGMA foreign_keys = ON")
-            init_sql = Path("db/init.sql").read_text(encoding="utf-8")
-            connection.executescript(init_sql)
-            connection.commit()
+            initialize_schema(connection)
         finally:
             connection.close()
 
@@ -57,11 +134,15 @@ def session_scope() -> Iterator[sqlite3.Connection]:
     connection = sqlite3.connect(_DATABASE_LOCATION)
     connection.row_factory = sqlite3.Row
     connection.execute("PRAGMA foreign_keys = ON")
+    started = time.perf_counter()
+    outcome = "rollback"
     try:
         yield connection
         connection.commit()
+        outcome = "commit"
     except Exception:
         connection.rollback()
         raise
     finally:
         connection.close()
+        DB_SESSION_SECONDS.observe(time.perf_counter() - started, outcome=outcome)
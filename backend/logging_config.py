@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import atexit
+import itertools
+import logging
+import queue
+import sys
+from logging.handlers import QueueHandler, QueueListener
+from typing import Mapping, Optional, TextIO
+
+import structlog
+
+from .config import Settings, get_settings
+from .utils.metrics import REGISTRY
+
+
+LOG_EVENTS_DROPPED = REGISTRY.counter(
+    "fitresume_log_events_dropped_total", "Log events not written, by reason.", ("reason",)
+)
+
+_listener: Optional[QueueListener] = None
+
+
+class EventSampler:
+    """Processor keeping one in ``1 / rate`` of each configured event.
+
+    Only ``debug`` and ``info`` events are sampled; warnings and errors are
+    always kept.  Sampling is by count rather than random, so a rate of 0.1
+    keeps exactly every tenth event, and kept events carry ``sample_rate`` so
+    log queries can scale counts back up.  It is meant to run first, before
+    any timestamping or rendering is spent on an event that will be dropped.
+    """
+
+    def __init__(self, rates: Mapping[str, float]) -> None:
+        self.every: dict[str, int] = {}
+        for event, rate in rates.items():
+            if not 0 < rate <= 1:
+                raise ValueError(f"Sample rate for {event!r} must be in (0, 1], got {rate}")
+            if rate < 1:
+                self.every[event] = round(1 / rate)
+        # ``next()`` on itertools.count is atomic under the GIL.
+        self._counters = {event: itertools.count() for event in self.every}
+
+    def __call__(self, logger, method_name: str, event_dict: dict) -> dict:
+        every = self.every.get(event_dict.get("event"))
+        if every is None or method_name not in ("debug", "info"):
+            return event_dict
+        if next(self._counters[event_dict["event"]]) % every:
+            LOG_EVENTS_DROPPED.inc(reason="sampled")
+            raise structlog.DropEvent
+        event_dict["sample_rate"] = 1 / every
+        return event_dict
+
+
+class _NonBlockingQueueHandler(QueueHandler):
+    """Hand records to the listener thread without formatting or waiting.
+
+    The stock ``QueueHandler.prepare`` renders the message on the calling
+    thread; here the event dict travels as-is and is rendered by the
+    listener.  When the queue is full the record is dropped (and counted)
+    rather than blocking the request.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            LOG_EVENTS_DROPPED.inc(reason="queue_full")
+
+
+def configure_logging(settings: Optional[Settings] = None, *, stream: Optional[TextIO] = None) -> None:
+    """Configure structlog and the root logger to emit one JSON object per line.
+
+    On the calling thread an event is only level-checked, sampled,
+    timestamped and has its exception formatted; JSON rendering and the
+    write happen on a listener thread fed by a bounded queue (unless
+    ``LOG_ASYNC`` is off).  Records from plain stdlib loggers are rendered
+    as JSON by the same formatter.  Calling it again replaces the previous
+    setup.
+    """
+
+    global _listener
+    settings = settings or get_settings()
+    shutdown_logging()
+
+    handler = logging.StreamHandler(stream or sys.stderr)
+    handler.setFormatter(
+        structlog.stdlib.ProcessorFormatter(
+            processors=[
+                structlog.processors.EventRenamer("event"),
+                structlog.processors.format_exc_info,
+                structlog.processors.JSONRenderer(),
+            ]
+        )
+    )
+    root = logging.getLogger()
+    for existing in list(root.handlers):
+        root.removeHandler(existing)
+    if settings.log_async:
+        records: queue.Queue = queue.Queue(maxsize=max(settings.log_queue_size, 1))
+        root.addHandler(_NonBlockingQueueHandler(records))
+        _listener = QueueListener(records, handler, respect_handler_level=True)
+        _listener.start()
+    else:
+        root.addHandler(handler)
+    root.setLevel(settings.log_level)
+
+    structlog.configure(
+        processors=[
+            EventSampler(settings.log_sample_rates),
+            structlog.processors.add_log_level,
+            structlog.processors.TimeStamper(fmt="iso"),
+            # Tracebacks are formatted here so frames are not kept alive in the queue.
+            structlog.processors.format_exc_info,
+            structlog.stdlib.ProcessorFormatter.wrap_for_formatter,
+        ],
+        logger_factory=structlog.stdlib.LoggerFactory(),
+        wrapper_class=structlog.stdlib.BoundLogger,
+        cache_logger_on_first_use=True,
+    )
+
+
+def shutdown_logging() -> None:
+    """Flush queued records and stop the listener thread, if one is running."""
+
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+atexit.register(shutdown_logging)
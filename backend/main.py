@@ -1,21 +1,26 @@
 from __future__ import annotations
 
-import logging
-from pathlib import Path
-from typing import List
+import json
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, Iterator, List, Optional
 
 import structlog
-from fastapi import FastAPI, File, HTTPException, UploadFile
+from fastapi import FastAPI, File, Header, HTTPException, UploadFile
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, Response, StreamingResponse
 from nicegui import app as nicegui_app
 
 from . import crud, schemas
-from .config import get_settings
 from .db import session_scope
-from .services import app_service
+from .logging_config import configure_logging
+from .services import app_service, batch_service, export_service, rerender_service, retention_service
+from .services.artifact_service import ArtifactService
+from .services.job_queue import IdempotencyConflict, job_queue
 from .services.resume_extraction import ResumeExtractionError
 from .services.scheduler_service import scheduler_service
+from .utils import http_utils
+from .utils.docx_utils import iter_chunks
+from .utils.metrics import CONTENT_TYPE, REGISTRY, timed_route
 from ui.pages import artifacts as artifacts_page  # noqa: F401
 from ui.pages import dashboard  # noqa: F401
 from ui.pages import job_board  # noqa: F401
@@ -24,21 +29,13 @@ from ui.pages import runs as runs_page  # noqa: F401
 from ui.pages import scheduler as scheduler_page  # noqa: F401
 
 
-logging.basicConfig(level=logging.INFO)
-structlog.configure(
-    processors=[
-        structlog.processors.TimeStamper(fmt="iso"),
-        structlog.processors.add_log_level,
-        structlog.processors.EventRenamer("event"),
-        structlog.processors.format_exc_info,
-        structlog.processors.JSONRenderer(),
-    ],
-    logger_factory=structlog.stdlib.LoggerFactory(),
-    wrapper_class=structlog.stdlib.BoundLogger,
-    cache_logger_on_first_use=True,
-)
+configure_logging()
 logger = structlog.get_logger(__name__)
 
+DOCX_MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+# Artifact files are never rewritten in place, so clients may cache them indefinitely.
+ARTIFACT_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
 
 # Ensure the database schema exists before handling requests.
 with session_scope():
@@ -58,21 +55,40 @@ app.add_middleware(
 async def on_startup() -> None:
     scheduler_service.start()
     scheduler_service.sync_schedules()
+    job_queue.start()
+    retention_service.retention_sweeper.start()
+    with session_scope() as session:
+        catalog_empty = crud.count_artifacts(session) == 0
+    if catalog_empty:
+        backfilled = ArtifactService().reindex()
+        if backfilled:
+            logger.info("artifact_catalog_backfilled", artifacts=backfilled)
     logger.info("startup_complete")
 
 
 @app.on_event("shutdown")
 async def on_shutdown() -> None:
+    retention_service.retention_sweeper.shutdown()
+    job_queue.shutdown()
     scheduler_service.shutdown()
     logger.info("shutdown_complete")
 
 
+@app.get("/metrics")
+def metrics() -> Response:
+    """Prometheus text exposition of this process's metrics."""
+
+    return Response(content=REGISTRY.collect(), media_type=CONTENT_TYPE)
+
+
 @app.get("/health")
+@timed_route
 def health() -> dict[str, str]:
     return {"status": "ok"}
 
 
 @app.post("/api/resumes", response_model=schemas.Resume)
+@timed_route
 async def upload_resume(file: UploadFile = File(...)) -> schemas.Resume:
     content = await file.read()
     try:
@@ -83,6 +99,7 @@ async def upload_resume(file: UploadFile = File(...)) -> schemas.Resume:
 
 
 @app.get("/api/resumes", response_model=List[schemas.Resume])
+@timed_route
 async def list_resumes() -> List[schemas.Resume]:
     with session_scope() as session:
         resumes = crud.list_resumes(session)
@@ -90,19 +107,30 @@ async def list_resumes() -> List[schemas.Resume]:
 
 
 @app.post("/api/job_postings", response_model=schemas.JobPosting)
+@timed_route
 async def create_job_posting(payload: schemas.JobPostingCreate) -> schemas.JobPosting:
     job = app_service.create_job_posting(payload)
     return schemas.JobPosting.from_orm(job)
 
 
 @app.get("/api/job_postings", response_model=List[schemas.JobPosting])
+@timed_route
 async def list_job_postings() -> List[schemas.JobPosting]:
     with session_scope() as session:
         jobs = crud.list_job_postings(session)
         return [schemas.JobPosting.from_orm(job) for job in jobs]
 
 
+@app.delete("/api/job_postings/{job_id}")
+@timed_route
+async def delete_job_posting(job_id: int) -> dict[str, str]:
+    if not app_service.delete_job_posting(job_id):
+        raise HTTPException(status_code=404, detail="Job posting not found")
+    return {"status": "deleted"}
+
+
 @app.post("/api/job_postings/upload_csv", response_model=schemas.UploadJobCSVResponse)
+@timed_route
 async def upload_job_csv(file: UploadFile = File(...)) -> schemas.UploadJobCSVResponse:
     content = await file.read()
     ids = app_service.import_jobs_from_csv(content)
@@ -110,9 +138,29 @@ async def upload_job_csv(file: UploadFile = File(...)) -> schemas.UploadJobCSVRe
 
 
 @app.post("/api/tailor", response_model=schemas.TailorResponse)
-async def tailor_resume(request: schemas.TailorRequest) -> schemas.TailorResponse:
+@timed_route
+def tailor_resume(request: schemas.TailorRequest) -> schemas.TailorResponse:
+    # A plain ``def`` runs in the threadpool: tailoring and the idempotent
+    # wait in ``run_sync`` block for seconds and must not stall the event loop.
     try:
+        if request.run_async:
+            return _tailor_job_response(job_queue.enqueue(request))
+        if request.idempotency_key:
+            job = job_queue.run_sync(request)
+            if job.status == "failed":
+                raise HTTPException(status_code=500, detail=job.error)
+            if job.status != "succeeded":
+                # Still running elsewhere when the wait ran out: hand back the job to poll.
+                return Response(
+                    content=json.dumps(_tailor_job_response(job).to_dict()),
+                    status_code=202,
+                    headers={"Location": f"/api/tailor/jobs/{job.id}"},
+                    media_type="application/json",
+                )
+            return _tailor_job_response(job)
         version, artifact_path, mock = app_service.tailor_resume(request)
+    except IdempotencyConflict as exc:
+        raise HTTPException(status_code=409, detail=str(exc))
     except ValueError as exc:
         raise HTTPException(status_code=404, detail=str(exc))
     response = schemas.TailorResponse(
@@ -123,37 +171,322 @@ async def tailor_resume(request: schemas.TailorRequest) -> schemas.TailorRespons
     return response
 
 
+@app.get("/api/tailor/jobs/{job_id}", response_model=schemas.TailorJob)
+@timed_route
+async def get_tailor_job(job_id: int) -> schemas.TailorJob:
+    job = job_queue.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Tailoring job not found")
+    return schemas.TailorJob.from_orm(job)
+
+
+@app.post("/api/tailor/stream")
+@timed_route
+async def stream_tailor_resume(request: schemas.TailorRequest) -> StreamingResponse:
+    try:
+        resume, job = app_service.load_tailor_inputs(request)
+    except ValueError as exc:
+        raise HTTPException(status_code=404, detail=str(exc))
+    return StreamingResponse(
+        _sse(app_service.stream_tailor_resume(resume, job)),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@app.post("/api/tailor/preview")
+@timed_route
+async def preview_tailored_resume(request: schemas.TailorPreviewRequest) -> StreamingResponse:
+    try:
+        content, rewrite_result = app_service.preview_tailoring(request)
+    except ValueError as exc:
+        raise HTTPException(status_code=404, detail=str(exc))
+    return StreamingResponse(
+        iter_chunks(content),
+        media_type=DOCX_MEDIA_TYPE,
+        headers={
+            "Content-Length": str(len(content)),
+            "Content-Disposition": 'attachment; filename="resume_preview.docx"',
+            "X-Resume-Mock": "1" if rewrite_result.mock else "0",
+        },
+    )
+
+
+@app.post("/api/tailor/batch", response_model=schemas.TailorBatch)
+@timed_route
+async def create_tailor_batch(payload: schemas.TailorBatchRequest) -> schemas.TailorBatch:
+    try:
+        batch = batch_service.create_batch(payload)
+    except ValueError as exc:
+        raise HTTPException(status_code=404, detail=str(exc))
+    return _tailor_batch_response(batch.id)
+
+
+@app.get("/api/tailor/batch/{batch_id}", response_model=schemas.TailorBatch)
+@timed_route
+async def get_tailor_batch(batch_id: int) -> schemas.TailorBatch:
+    return _tailor_batch_response(batch_id)
+
+
+@app.get("/api/tailor/batch/{batch_id}/events")
+@timed_route
+async def stream_tailor_batch(batch_id: int) -> StreamingResponse:
+    _tailor_batch_response(batch_id)
+    return StreamingResponse(
+        _sse(batch_service.iter_batch_events(batch_id)),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@app.get("/api/resume_versions/rerender")
+@timed_route
+async def rerender_status() -> dict:
+    return {
+        "template_version": ArtifactService.TEMPLATE_VERSION,
+        "outdated": rerender_service.outdated_count(),
+    }
+
+
+@app.post("/api/resume_versions/rerender", response_model=schemas.Run)
+@timed_route
+async def start_rerender(batch_size: int = 100, limit: Optional[int] = None) -> schemas.Run:
+    try:
+        run = rerender_service.start_rerender(batch_size=max(batch_size, 1), limit=limit)
+    except rerender_service.RerenderInProgress as exc:
+        raise HTTPException(status_code=409, detail=str(exc)) from exc
+    return schemas.Run.from_orm(run)
+
+
 @app.get("/api/runs", response_model=List[schemas.Run])
+@timed_route
 async def list_runs() -> List[schemas.Run]:
     with session_scope() as session:
         runs = crud.list_runs(session)
         return [schemas.Run.from_orm(run) for run in runs]
 
 
+@app.get("/api/stage_timings", response_model=List[schemas.StageTimingStats])
+@timed_route
+async def stage_timings(per: str = "version", days: Optional[int] = None) -> List[schemas.StageTimingStats]:
+    """p50/p95 time per stage, per tailored version or per run, optionally over the last ``days``."""
+
+    since = datetime.now(timezone.utc) - timedelta(days=days) if days else None
+    try:
+        with session_scope() as session:
+            stats = crud.stage_timing_percentiles(session, per=per, since=since)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    return [schemas.StageTimingStats(**row) for row in stats]
+
+
 @app.post("/api/schedules", response_model=schemas.Schedule)
+@timed_route
 async def create_schedule(payload: schemas.ScheduleCreate) -> schemas.Schedule:
-    schedule = app_service.create_schedule(payload)
+    try:
+        schedule = app_service.create_schedule(payload)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    scheduler_service.sync_schedules()
+    return schemas.Schedule.from_orm(schedule)
+
+
+@app.patch("/api/schedules/{schedule_id}", response_model=schemas.Schedule)
+@timed_route
+async def update_schedule(schedule_id: int, payload: schemas.ScheduleUpdate) -> schemas.Schedule:
+    try:
+        schedule = app_service.update_schedule(schedule_id, payload)
+    except LookupError as exc:
+        raise HTTPException(status_code=404, detail=str(exc))
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
     scheduler_service.sync_schedules()
     return schemas.Schedule.from_orm(schedule)
 
 
 @app.get("/api/schedules", response_model=List[schemas.Schedule])
+@timed_route
 async def list_schedules() -> List[schemas.Schedule]:
     with session_scope() as session:
         schedules = crud.list_schedules(session)
-        return [schemas.Schedule.from_orm(schedule) for schedule in schedules]
+        lag = crud.schedule_lag_stats(session)
+    items = []
+    for schedule in schedules:
+        item = schemas.Schedule.from_orm(schedule)
+        item.next_fire_at = scheduler_service.next_fire_time(schedule.id)
+        if schedule.id in lag:
+            item.lag = schemas.ScheduleLag(**lag[schedule.id])
+        items.append(item)
+    return items
 
 
 @app.post("/api/schedules/{schedule_id}/trigger")
-async def trigger_schedule(schedule_id: int) -> dict[str, str]:
-    scheduler_service.run_now(schedule_id)
-    return {"status": "triggered"}
+@timed_route
+async def trigger_schedule(schedule_id: int) -> dict[str, object]:
+    try:
+        run_id = scheduler_service.trigger(schedule_id)
+    except LookupError as exc:
+        raise HTTPException(status_code=404, detail=str(exc))
+    if run_id is None:
+        raise HTTPException(status_code=409, detail="Schedule is already running its maximum number of instances")
+    return {"status": "triggered", "run_id": run_id}
+
+
+@app.get("/api/artifacts", response_model=schemas.ArtifactPage)
+@timed_route
+async def list_artifacts(
+    q: Optional[str] = None,
+    company: Optional[str] = None,
+    job_posting_id: Optional[int] = None,
+    resume_id: Optional[int] = None,
+    limit: int = 50,
+    offset: int = 0,
+) -> schemas.ArtifactPage:
+    limit = min(max(limit, 1), 500)
+    offset = max(offset, 0)
+    filters = dict(query=q, company=company, job_posting_id=job_posting_id, resume_id=resume_id)
+    with session_scope() as session:
+        artifacts = crud.list_artifacts(session, limit=limit, offset=offset, **filters)
+        total = crud.count_artifacts(session, **filters)
+    return schemas.ArtifactPage(
+        items=[schemas.Artifact.from_orm(artifact) for artifact in artifacts],
+        total=total,
+        limit=limit,
+        offset=offset,
+    )
+
+
+@app.post("/api/artifacts/reindex")
+@timed_route
+async def reindex_artifacts() -> dict[str, int]:
+    return {"added": ArtifactService().reindex()}
+
+
+@app.get("/api/artifacts/retention")
+@timed_route
+async def artifact_retention_usage() -> dict:
+    return retention_service.usage()
+
+
+@app.post("/api/artifacts/retention/sweep", response_model=schemas.RetentionReport)
+@timed_route
+async def sweep_artifacts() -> schemas.RetentionReport:
+    return retention_service.sweep()
+
+
+@app.get("/api/artifacts/export")
+@timed_route
+async def export_artifacts(
+    q: Optional[str] = None,
+    company: Optional[str] = None,
+    job_posting_id: Optional[int] = None,
+    resume_id: Optional[int] = None,
+    created_after: Optional[str] = None,
+    created_before: Optional[str] = None,
+) -> StreamingResponse:
+    try:
+        window = [datetime.fromisoformat(value) if value else None for value in (created_after, created_before)]
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=f"Invalid date: {exc}") from exc
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S")
+    return StreamingResponse(
+        export_service.stream_export(
+            query=q,
+            company=company,
+            job_posting_id=job_posting_id,
+            resume_id=resume_id,
+            created_after=window[0],
+            created_before=window[1],
+        ),
+        media_type="application/zip",
+        headers={"Content-Disposition": f'attachment; filename="artifacts_{stamp}.zip"'},
+    )
 
 
 @app.get("/api/artifacts/download")
-async def download_artifact(path: str):
-    artifacts_root = get_settings().artifacts_root.resolve()
-    target = Path(path).resolve()
-    if not target.exists() or not str(target).startswith(str(artifacts_root)):
+@timed_route
+async def download_artifact(
+    path: str,
+    if_none_match: Optional[str] = Header(None),
+    if_range: Optional[str] = Header(None),
+    range_header: Optional[str] = Header(None, alias="range"),
+):
+    with session_scope() as session:
+        artifact = crud.get_artifact_by_path(session, path)
+    if artifact is None or not retention_service.artifact_available(artifact):
         raise HTTPException(status_code=404, detail="Artifact not found")
-    return FileResponse(target)
+
+    etag = http_utils.strong_etag(artifact.sha256)
+    headers = {
+        "ETag": etag,
+        "Cache-Control": ARTIFACT_CACHE_CONTROL,
+        "Accept-Ranges": "bytes",
+    }
+    if http_utils.etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+
+    byte_range = None
+    if range_header and (not if_range or if_range.strip() == etag):
+        try:
+            byte_range = http_utils.parse_range(range_header, artifact.size)
+        except http_utils.RangeNotSatisfiable:
+            return Response(status_code=416, headers={**headers, "Content-Range": f"bytes */{artifact.size}"})
+    disposition = f'attachment; filename="{artifact.file_name}"'
+    if byte_range is None:
+        if artifact.archive_path is None:
+            return FileResponse(
+                artifact.path,
+                headers={**headers, "Content-Length": str(artifact.size)},
+                media_type=DOCX_MEDIA_TYPE,
+                filename=artifact.file_name,
+            )
+        # Packed into a retention bundle: read it back through the archive.
+        return StreamingResponse(
+            http_utils.iter_file_range(retention_service.open_artifact(artifact), 0, artifact.size - 1),
+            headers={**headers, "Content-Length": str(artifact.size), "Content-Disposition": disposition},
+            media_type=DOCX_MEDIA_TYPE,
+        )
+    start, end = byte_range
+    return StreamingResponse(
+        http_utils.iter_file_range(retention_service.open_artifact(artifact), start, end),
+        status_code=206,
+        headers={
+            **headers,
+            "Content-Range": f"bytes {start}-{end}/{artifact.size}",
+            "Content-Length": str(end - start + 1),
+            "Content-Disposition": disposition,
+        },
+        media_type=DOCX_MEDIA_TYPE,
+    )
+
+
+def _sse(events: Iterable[dict]) -> Iterator[str]:
+    for event in events:
+        yield f"event: {event['event']}\ndata: {json.dumps(event)}\n\n"
+
+
+def _tailor_job_response(job) -> schemas.TailorResponse:
+    return schemas.TailorResponse(
+        resume_version_id=job.resume_version_id,
+        artifact_path=job.artifact_path,
+        mock=bool(job.mock),
+        job_id=job.id,
+        status=job.status,
+    )
+
+
+def _tailor_batch_response(batch_id: int) -> schemas.TailorBatch:
+    snapshot = batch_service.get_batch(batch_id)
+    if snapshot is None:
+        raise HTTPException(status_code=404, detail="Tailoring batch not found")
+    batch, stats, items = snapshot
+    return schemas.TailorBatch(
+        id=batch.id,
+        status=batch.status,
+        total=batch.total,
+        stats=stats,
+        items=[schemas.TailorJob.from_orm(item) for item in items],
+        filter_json=batch.filter_json,
+        created_at=batch.created_at,
+        finished_at=batch.finished_at,
+    )
@@ -51,6 +51,8 @@ class ResumeVersion:
     model_name: Optional[str] = None
     prompt_hash: Optional[str] = None
     token_usage: Optional[dict] = field(default=None)
+    plan: Optional[dict] = field(default=None)
+    mock: bool = False
 
 
 @dataclass
@@ -62,6 +64,11 @@ class Run:
     finished_at: Optional[datetime]
     status: Optional[str]
     error: Optional[str]
+    schedule_id: Optional[int] = None
+    heartbeat_at: Optional[float] = None
+    scheduled_for: Optional[datetime] = None
+    lag_seconds: Optional[float] = None
+    stage_timings: Optional[dict] = None
 
 
 @dataclass
@@ -70,3 +77,86 @@ class Schedule:
     cron_expr: str
     is_enabled: bool
     criteria_json: Optional[dict]
+    revision: int = 1
+    last_job_posting_id: int = 0
+    misfire_grace_seconds: Optional[int] = None
+    coalesce: bool = True
+    max_instances: int = 1
+    jitter_seconds: Optional[int] = None
+    last_fire_at: Optional[datetime] = None
+    misfire_count: int = 0
+
+
+@dataclass
+class TailorJob:
+    id: int
+    resume_id: int
+    job_posting_id: int
+    status: str
+    idempotency_key: Optional[str]
+    attempts: int
+    claimed_by: Optional[str]
+    heartbeat_at: Optional[float]
+    resume_version_id: Optional[int]
+    artifact_path: Optional[str]
+    mock: Optional[bool]
+    error: Optional[str]
+    created_at: Optional[datetime]
+    finished_at: Optional[datetime]
+    batch_id: Optional[int] = None
+    cached: bool = False
+    kind: str = "tailor"
+    priority: int = 0
+    base_resume_hash: Optional[str] = None
+
+
+@dataclass
+class TailorBatch:
+    id: int
+    status: str
+    total: int
+    filter_json: Optional[dict]
+    created_at: Optional[datetime]
+    finished_at: Optional[datetime]
+
+
+@dataclass
+class PlanCacheEntry:
+    prompt_hash: str
+    model_name: str
+    plan: dict
+    rendered_text: str
+    token_usage: Optional[dict]
+    mock: bool
+    created_at: Optional[datetime] = None
+
+
+@dataclass
+class Lease:
+    name: str
+    owner: str
+    expires_at: float
+    result: Optional[dict] = None
+    completed_at: Optional[float] = None
+
+
+@dataclass
+class Artifact:
+    id: int
+    path: str
+    folder: str
+    file_name: str
+    size: int
+    sha256: str
+    company: Optional[str]
+    job_key: Optional[str]
+    job_posting_id: Optional[int]
+    resume_id: Optional[int]
+    template_version: Optional[str]
+    model_name: Optional[str]
+    prompt_hash: Optional[str]
+    mock: bool
+    meta: Optional[dict]
+    created_at: Optional[datetime]
+    archive_path: Optional[str] = None
+    archive_member: Optional[str] = None
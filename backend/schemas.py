@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from dataclasses import dataclass, asdict, fields
+from dataclasses import dataclass, asdict, field, fields
 from datetime import datetime
 from typing import Any, List, Optional, Type, TypeVar, get_args, get_origin
 
@@ -15,6 +15,8 @@ def _serialize(value: Any) -> Any:
         return value.to_dict()
     if isinstance(value, list):
         return [_serialize(item) for item in value]
+    if isinstance(value, dict):
+        return {key: _serialize(item) for key, item in value.items()}
     return value
 
 
@@ -119,6 +121,27 @@ class Run(SchemaBase):
     finished_at: Optional[datetime]
     status: Optional[str]
     error: Optional[str]
+    schedule_id: Optional[int] = None
+    scheduled_for: Optional[datetime] = None
+    lag_seconds: Optional[float] = None
+    stage_timings: Optional[dict] = None
+
+
+@dataclass
+class StageTimingStats(SchemaBase):
+    stage: str
+    samples: int
+    p50_ms: float
+    p95_ms: float
+    max_ms: float
+
+
+@dataclass
+class ScheduleLag(SchemaBase):
+    runs: int = 0
+    last_lag_seconds: Optional[float] = None
+    avg_lag_seconds: Optional[float] = None
+    max_lag_seconds: Optional[float] = None
 
 
 @dataclass
@@ -127,6 +150,16 @@ class Schedule(SchemaBase):
     cron_expr: str
     is_enabled: bool
     criteria_json: Optional[dict]
+    revision: int = 1
+    last_job_posting_id: int = 0
+    misfire_grace_seconds: Optional[int] = None
+    coalesce: bool = True
+    max_instances: int = 1
+    jitter_seconds: Optional[int] = None
+    last_fire_at: Optional[datetime] = None
+    misfire_count: int = 0
+    next_fire_at: Optional[datetime] = None
+    lag: Optional[ScheduleLag] = None
 
 
 @dataclass
@@ -134,19 +167,130 @@ class ScheduleCreate(SchemaBase):
     cron_expr: str
     is_enabled: bool = True
     criteria_json: Optional[dict] = None
+    misfire_grace_seconds: Optional[int] = None
+    coalesce: bool = True
+    max_instances: int = 1
+    jitter_seconds: Optional[int] = None
+
+
+@dataclass
+class ScheduleUpdate(SchemaBase):
+    cron_expr: Optional[str] = None
+    is_enabled: Optional[bool] = None
+    criteria_json: Optional[dict] = None
+    misfire_grace_seconds: Optional[int] = None
+    coalesce: Optional[bool] = None
+    max_instances: Optional[int] = None
+    jitter_seconds: Optional[int] = None
 
 
 @dataclass
 class TailorRequest(SchemaBase):
     resume_id: int
     job_posting_id: int
+    run_async: bool = False
+    idempotency_key: Optional[str] = None
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "TailorRequest":
+        # ``async`` is a reserved word in Python, so the wire name is mapped here.
+        data = dict(data)
+        if "async" in data:
+            data["run_async"] = bool(data.pop("async"))
+        return cls(**data)
+
+
+@dataclass
+class TailorPreviewRequest(SchemaBase):
+    resume_id: int
+    job_posting_id: int
+    persist: bool = False
 
 
 @dataclass
 class TailorResponse(SchemaBase):
-    resume_version_id: int
-    artifact_path: str
+    resume_version_id: Optional[int] = None
+    artifact_path: Optional[str] = None
+    mock: bool = False
+    job_id: Optional[int] = None
+    status: Optional[str] = None
+
+
+@dataclass
+class TailorJob(SchemaBase):
+    id: int
+    resume_id: int
+    job_posting_id: int
+    status: str
+    attempts: int
+    idempotency_key: Optional[str] = None
+    resume_version_id: Optional[int] = None
+    artifact_path: Optional[str] = None
+    mock: Optional[bool] = None
+    error: Optional[str] = None
+    created_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    batch_id: Optional[int] = None
+    cached: Optional[bool] = None
+    kind: Optional[str] = None
+
+
+@dataclass
+class TailorBatchRequest(SchemaBase):
+    resume_ids: List[int]
+    job_posting_ids: Optional[List[int]] = None
+    job_filter: Optional[dict] = None
+
+
+@dataclass
+class TailorBatch(SchemaBase):
+    id: int
+    status: str
+    total: int
+    stats: dict = field(default_factory=dict)
+    items: List[TailorJob] = field(default_factory=list)
+    filter_json: Optional[dict] = None
+    created_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+
+@dataclass
+class Artifact(SchemaBase):
+    id: int
+    path: str
+    folder: str
+    file_name: str
+    size: int
+    sha256: str
+    company: Optional[str] = None
+    job_key: Optional[str] = None
+    job_posting_id: Optional[int] = None
+    resume_id: Optional[int] = None
+    template_version: Optional[str] = None
+    model_name: Optional[str] = None
+    prompt_hash: Optional[str] = None
     mock: bool = False
+    meta: Optional[dict] = None
+    created_at: Optional[datetime] = None
+    archive_path: Optional[str] = None
+
+
+@dataclass
+class ArtifactPage(SchemaBase):
+    items: List[Artifact]
+    total: int
+    limit: int
+    offset: int
+
+
+@dataclass
+class RetentionReport(SchemaBase):
+    run_id: Optional[int] = None
+    deleted: int = 0
+    archived: int = 0
+    bundles_removed: int = 0
+    bytes_reclaimed: int = 0
+    skipped: bool = False
 
 
 @dataclass
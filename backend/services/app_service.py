@@ -2,13 +2,38 @@ from __future__ import annotations
 
 import csv
 import io
+import time
 from pathlib import Path
+from typing import Iterator
+
+import structlog
+
 from .. import crud
 from ..db import session_scope
-from ..schemas import JobPostingCreate, ScheduleCreate, TailorRequest
-from .artifact_service import ArtifactService
+from ..schemas import JobPostingCreate, ScheduleCreate, ScheduleUpdate, TailorPreviewRequest, TailorRequest
+from ..utils import spans
+from ..utils.metrics import REGISTRY
+from .artifact_service import ArtifactService, artifact_names
+from .cron import parse_cron
+from .schedule_criteria import ScheduleCriteria
 from .resume_extraction import extract_text
-from .rewrite_service import get_rewrite_service
+from . import speculative_service
+from .single_flight import SingleFlight
+from .rewrite_service import MockRewriteService, RewriteResult, compute_prompt_hash, get_rewrite_service
+
+logger = structlog.get_logger(__name__)
+
+PLAN_CACHE_LOOKUPS = REGISTRY.counter(
+    "fitresume_plan_cache_lookups_total", "Precomputed rewrite lookups by result.", ("result",)
+)
+IMPORT_ROWS = REGISTRY.counter("fitresume_import_rows_total", "CSV job import rows by outcome.", ("outcome",))
+IMPORT_SECONDS = REGISTRY.histogram("fitresume_import_duration_seconds", "Time to import one CSV upload.")
+IMPORT_ROWS_PER_SECOND = REGISTRY.gauge(
+    "fitresume_import_last_rows_per_second", "Row throughput of the most recent CSV import."
+)
+
+# Single-flight leases for tailoring runs are named ``tailor:<resume>:<job>:...``.
+TAILOR_LEASE_PREFIX = "tailor:"
 
 UPLOAD_ROOT = Path("uploads/resumes")
 UPLOAD_ROOT.mkdir(parents=True, exist_ok=True)
@@ -47,24 +72,221 @@ def create_job_posting(payload: JobPostingCreate):
             raw_text=payload.raw_text,
             external_id=payload.external_id,
         )
-        return job
+    speculative_service.schedule_jobs([job.id])
+    return job
 
 
-def tailor_resume(request: TailorRequest):
+def delete_job_posting(job_id: int) -> bool:
+    with session_scope() as connection:
+        cancelled = speculative_service.cancel_for_job_posting(connection, job_id)
+        deleted = crud.delete_job_posting(connection, job_id)
+    if deleted:
+        logger.info("job_posting_deleted", job_posting_id=job_id, cancelled_speculative=cancelled)
+    return deleted
+
+
+def load_tailor_inputs(request: TailorRequest):
     with session_scope() as connection:
         resume = crud.get_resume(connection, request.resume_id)
         job = crud.get_job_posting(connection, request.job_posting_id)
-        if not resume or not job:
-            raise ValueError("Resume or job posting not found")
-        service = get_rewrite_service()
+    if not resume or not job:
+        raise ValueError("Resume or job posting not found")
+    return resume, job
+
+
+def tailor_resume(request: TailorRequest):
+    """Tailor a resume for a job, coalescing identical concurrent requests.
+
+    Callers tailoring the same resume/job inputs (same prompt hash, model and
+    template version) at the same time share one model run and one artifact.
+    The time spent in each stage is stored against the new resume version.
+    """
+
+    with spans.recording() as recorder:
+        with spans.span("db_read"):
+            resume, job = load_tailor_inputs(request)
+        return tailor_pair(resume, job, recorder)
+
+
+def tailor_pair(resume, job, recorder: spans.SpanRecorder):
+    """Tailor already loaded inputs through the shared single flight and plan cache.
+
+    Scheduled runs use this too, so a user and the scheduler tailoring the
+    same pair at once share one model run.  ``recorder`` is the caller's
+    current recorder; its totals are stored against the new version.
+    """
+
+    service = get_rewrite_service()
+    prompt_hash = compute_prompt_hash(resume.text or "", job.raw_text or job.title)
+    key = (
+        f"{TAILOR_LEASE_PREFIX}{resume.id}:{job.id}:{prompt_hash}:"
+        f"{service.model_name}:{ArtifactService.TEMPLATE_VERSION}"
+    )
+    return _tailor_flight.run(key, lambda: _tailor(service, resume, job, recorder))
+
+
+def _tailor(service, resume, job, recorder: spans.SpanRecorder):
+    with spans.span("plan_cache"):
+        rewrite_result = cached_rewrite(service, resume, job)
+    if rewrite_result is None:
         rewrite_result = service.rewrite(resume.text or "", job.raw_text or job.title)
-        artifact_service = ArtifactService()
-        artifact_path = artifact_service.create_artifact(
-            company_name=job.company.name if job.company else "Unknown",
-            job_key=f"{job.id}_{job.title}",
+    artifact_service = ArtifactService()
+    artifact_path = _write_artifact(artifact_service, resume, job, rewrite_result)
+    version = _record_version(artifact_service, resume, job, artifact_path, rewrite_result)
+    with session_scope() as connection:
+        crud.record_stage_timings(connection, recorder.totals(), resume_version_id=version.id)
+    return version, artifact_path, rewrite_result.mock
+
+
+def _serialize_tailoring(outcome) -> dict:
+    version, artifact_path, mock = outcome
+    return {"resume_version_id": version.id, "artifact_path": str(artifact_path), "mock": mock}
+
+
+def _deserialize_tailoring(payload: dict):
+    with session_scope() as connection:
+        version = crud.get_resume_version(connection, payload["resume_version_id"])
+    if version is None:
+        raise ValueError("Shared resume version no longer exists")
+    return version, Path(payload["artifact_path"]), payload["mock"]
+
+
+_tailor_flight = SingleFlight(serialize=_serialize_tailoring, deserialize=_deserialize_tailoring)
+
+
+def preview_tailoring(request: TailorPreviewRequest) -> tuple[bytes, RewriteResult]:
+    """Tailor and render a resume in memory, returning the DOCX bytes.
+
+    Nothing touches disk unless ``request.persist`` is set, in which case the
+    artifact file and resume version are written on a background thread after
+    the bytes have been handed back to the caller.
+    """
+
+    resume, job = load_tailor_inputs(request)
+    service = get_rewrite_service()
+    rewrite_result = cached_rewrite(service, resume, job) or service.rewrite(
+        resume.text or "", job.raw_text or job.title
+    )
+    artifact_service = ArtifactService()
+    content = artifact_service.render_bytes(rewrite_result)
+    if request.persist:
+        company_name, job_key = artifact_names(job)
+        future = artifact_service.persist_async(
+            company_name=company_name,
+            job_key=job_key,
             rewrite_result=rewrite_result,
+            content=content,
+            resume_id=resume.id,
+            job_posting_id=job.id,
         )
-        version = crud.create_resume_version(
+        future.add_done_callback(
+            lambda done: _record_persisted_preview(done, artifact_service, resume, job, rewrite_result)
+        )
+    return content, rewrite_result
+
+
+def _record_persisted_preview(future, artifact_service, resume, job, rewrite_result) -> None:
+    try:
+        artifact_path = future.result()
+        version = _record_version(artifact_service, resume, job, artifact_path, rewrite_result)
+    except Exception as exc:
+        logger.error("preview_persist_error", resume_id=resume.id, job_posting_id=job.id, error=str(exc))
+        return
+    logger.info("preview_persisted", resume_version_id=version.id, artifact_path=str(artifact_path))
+
+
+def stream_tailor_resume(resume, job) -> Iterator[dict]:
+    """Tailor ``resume`` for ``job`` while yielding progress events.
+
+    Events are plain dicts with an ``event`` key: ``queued``, ``plan_started``,
+    ``plan_token``, ``render_started``, ``render_token`` (or a single
+    ``plan_cached`` when a speculative result exists), ``artifact_rendering``,
+    ``artifact_written`` and finally ``version``.  Failures after the stream has
+    started are reported as an ``error`` event instead of an exception.
+    """
+
+    yield {"event": "queued", "resume_id": resume.id, "job_posting_id": job.id}
+    try:
+        service = get_rewrite_service()
+        rewrite_result = cached_rewrite(service, resume, job)
+        if rewrite_result is not None:
+            yield {"event": "plan_cached"}
+        else:
+            for event in service.stream_rewrite(resume.text or "", job.raw_text or job.title):
+                if event.stage == "completed":
+                    rewrite_result = event.result
+                    continue
+                payload = {"event": event.stage}
+                if event.delta:
+                    payload["delta"] = event.delta
+                yield payload
+        if rewrite_result is None:
+            raise RuntimeError("Rewrite stream ended without a result")
+        yield {"event": "artifact_rendering"}
+        artifact_service = ArtifactService()
+        artifact_path = _write_artifact(artifact_service, resume, job, rewrite_result)
+        yield {"event": "artifact_written", "artifact_path": str(artifact_path)}
+        version = _record_version(artifact_service, resume, job, artifact_path, rewrite_result)
+    except Exception as exc:
+        logger.error("tailor_stream_error", resume_id=resume.id, job_posting_id=job.id, error=str(exc))
+        yield {"event": "error", "detail": str(exc)}
+        return
+    yield {
+        "event": "version",
+        "resume_version_id": version.id,
+        "artifact_path": str(artifact_path),
+        "mock": rewrite_result.mock,
+    }
+
+
+def cached_rewrite(service, resume, job) -> RewriteResult | None:
+    """Return a precomputed rewrite for these exact inputs, if one exists."""
+
+    prompt_hash = compute_prompt_hash(resume.text or "", job.raw_text or job.title)
+    with session_scope() as connection:
+        entry = crud.get_cached_rewrite(connection, prompt_hash=prompt_hash, model_name=service.model_name)
+    PLAN_CACHE_LOOKUPS.inc(result="miss" if entry is None else "hit")
+    if entry is None:
+        return None
+    logger.info("plan_cache_hit", resume_id=resume.id, job_posting_id=job.id)
+    return RewriteResult(
+        plan=entry.plan,
+        rendered_text=entry.rendered_text,
+        model_name=entry.model_name,
+        prompt_hash=entry.prompt_hash,
+        token_usage=entry.token_usage,
+        mock=entry.mock,
+    )
+
+
+def find_reusable_version(connection, resume, job):
+    """Return an existing version from identical inputs made by the configured model, if any."""
+
+    service = get_rewrite_service()
+    return crud.find_reusable_resume_version(
+        connection,
+        resume=resume,
+        job_posting=job,
+        template_version=ArtifactService.TEMPLATE_VERSION,
+        model_name=service.model_name,
+        allow_mock=isinstance(service, MockRewriteService),
+    )
+
+
+def _write_artifact(artifact_service: ArtifactService, resume, job, rewrite_result: RewriteResult) -> Path:
+    company_name, job_key = artifact_names(job)
+    return artifact_service.create_artifact(
+        company_name=company_name,
+        job_key=job_key,
+        rewrite_result=rewrite_result,
+        resume_id=resume.id,
+        job_posting_id=job.id,
+    )
+
+
+def _record_version(artifact_service: ArtifactService, resume, job, artifact_path: Path, rewrite_result: RewriteResult):
+    with spans.span("commit"), session_scope() as connection:
+        return crud.create_resume_version(
             connection,
             resume=resume,
             job_posting=job,
@@ -73,21 +295,32 @@ def tailor_resume(request: TailorRequest):
             model_name=rewrite_result.model_name,
             prompt_hash=rewrite_result.prompt_hash,
             token_usage=rewrite_result.token_usage,
+            plan=rewrite_result.plan,
+            mock=rewrite_result.mock,
         )
-        return version, artifact_path, rewrite_result.mock
 
 
 def import_jobs_from_csv(content: bytes | str) -> list[int]:
+    """Create postings from CSV rows and return the new ids.
+
+    Rows without a title are skipped, as are rows repeating a posting that
+    already exists (same URL, or same text when there is no URL), so
+    re-importing a feed or one with reposts is safe.
+    """
+
     if isinstance(content, bytes):
         text = content.decode("utf-8")
     else:
         text = content
     reader = csv.DictReader(io.StringIO(text))
     created_ids: list[int] = []
+    skipped = duplicates = 0
+    started = time.perf_counter()
     with session_scope() as connection:
         for row in reader:
             title = row.get("title")
             if not title:
+                skipped += 1
                 continue
             company = None
             company_name = row.get("company")
@@ -101,17 +334,65 @@ def import_jobs_from_csv(content: bytes | str) -> list[int]:
                 url=row.get("url"),
                 raw_text=row.get("description") or row.get("raw_text"),
                 external_id=row.get("external_id"),
+                skip_duplicate=True,
             )
+            if job is None:
+                duplicates += 1
+                continue
             created_ids.append(job.id)
+    elapsed = time.perf_counter() - started
+    IMPORT_SECONDS.observe(elapsed)
+    IMPORT_ROWS.inc(len(created_ids), outcome="created")
+    IMPORT_ROWS.inc(skipped, outcome="skipped")
+    IMPORT_ROWS.inc(duplicates, outcome="duplicate")
+    if elapsed > 0:
+        IMPORT_ROWS_PER_SECOND.set((len(created_ids) + skipped + duplicates) / elapsed)
+    speculative_service.schedule_jobs(created_ids)
     return created_ids
 
 
 def create_schedule(payload: ScheduleCreate):
+    _validate_schedule(payload)
     with session_scope() as connection:
         schedule = crud.create_schedule(
             connection,
             cron_expr=payload.cron_expr,
             is_enabled=payload.is_enabled,
             criteria_json=payload.criteria_json,
+            misfire_grace_seconds=payload.misfire_grace_seconds,
+            coalesce=payload.coalesce,
+            max_instances=payload.max_instances,
+            jitter_seconds=payload.jitter_seconds,
         )
         return schedule
+
+
+def update_schedule(schedule_id: int, payload: ScheduleUpdate):
+    _validate_schedule(payload)
+    with session_scope() as connection:
+        schedule = crud.update_schedule(
+            connection,
+            schedule_id,
+            cron_expr=payload.cron_expr,
+            is_enabled=payload.is_enabled,
+            criteria_json=payload.criteria_json,
+            misfire_grace_seconds=payload.misfire_grace_seconds,
+            coalesce=payload.coalesce,
+            max_instances=payload.max_instances,
+            jitter_seconds=payload.jitter_seconds,
+        )
+    if schedule is None:
+        raise LookupError("Schedule not found")
+    return schedule
+
+
+def _validate_schedule(payload: ScheduleCreate | ScheduleUpdate) -> None:
+    if payload.cron_expr is not None:
+        parse_cron(payload.cron_expr)
+    ScheduleCriteria.parse(payload.criteria_json)
+    for name in ("misfire_grace_seconds", "jitter_seconds"):
+        value = getattr(payload, name)
+        if value is not None and value < 0:
+            raise ValueError(f"{name} must not be negative")
+    if payload.max_instances is not None and payload.max_instances < 1:
+        raise ValueError("max_instances must be at least 1")
@@ -1,20 +1,30 @@
- codex/build-fitresume-project-with-full-features-nhskwq
 from __future__ import annotations
 
+import hashlib
 import json
 import re
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timezone
 from pathlib import Path
+from typing import Any, Mapping
 
+from .. import crud, models
 from ..config import get_settings
-from ..utils.docx_utils import (
-    RenderContext,
-    create_placeholder_template,
-    render_resume_docx,
-)
+from ..db import session_scope
+from ..utils.docx_template import load_template, template_cache_size
+from ..utils import spans
+from ..utils.docx_utils import create_placeholder_template
+from ..utils.metrics import REGISTRY
 from .rewrite_service import RewriteResult
 
 
+# Background writers for artifacts that were already streamed to a client.
+_PERSIST_EXECUTOR = ThreadPoolExecutor(max_workers=2, thread_name_prefix="artifact-persist")
+
+RENDER_SECONDS = REGISTRY.histogram("fitresume_artifact_render_seconds", "Time to render one DOCX artifact in memory.")
+REGISTRY.gauge("fitresume_template_cache_entries", "Compiled DOCX templates held in memory.", callback=template_cache_size)
+
+
 class ArtifactService:
     TEMPLATE_VERSION = "1.0"
 
@@ -30,21 +40,79 @@ class ArtifactService:
         company_name: str,
         job_key: str,
         rewrite_result: RewriteResult,
+        content: bytes | None = None,
+        resume_id: int | None = None,
+        job_posting_id: int | None = None,
+        connection=None,
     ) -> Path:
+        """Write the artifact and its metadata to disk and index it in the catalog.
+
+        ``content`` lets callers that already rendered the DOCX in memory
+        (see :meth:`render_bytes`) persist those exact bytes.  Pass
+        ``connection`` when calling from inside an open write transaction so
+        the catalog row joins it instead of waiting on the database lock.
+        """
+
+        artifact_path = self.new_artifact_path(company_name, job_key)
+        if content is None:
+            with spans.span("docx_render"):
+                content = self.render_bytes(rewrite_result)
+        with spans.span("docx_write"):
+            artifact_path.write_bytes(content)
+
+        index_args = dict(
+            path=artifact_path,
+            size=len(content),
+            sha256_hex=hashlib.sha256(content).hexdigest(),
+            company_name=company_name,
+            job_key=job_key,
+            rewrite_result=rewrite_result,
+            resume_id=resume_id,
+            job_posting_id=job_posting_id,
+        )
+        with spans.span("commit"):
+            if connection is not None:
+                artifact = self.index_artifact(connection, **index_args)
+            else:
+                with session_scope() as session:
+                    artifact = self.index_artifact(session, **index_args)
+        with spans.span("docx_write"):
+            self.write_meta(artifact)
+        return artifact_path
+
+    def write_meta(self, artifact: models.Artifact) -> None:
+        """Write ``artifact``'s metadata as its folder's ``meta.json``."""
+
+        (Path(artifact.path).parent / "meta.json").write_text(json.dumps(artifact.meta, indent=2), encoding="utf-8")
+
+    def new_artifact_path(self, company_name: str, job_key: str, *, suffix: str | None = None) -> Path:
+        """Return a fresh, timestamped file path in the folder for this company and job."""
+
         folder = self._resolve_folder(company_name, job_key)
         folder.mkdir(parents=True, exist_ok=True)
-        timestamp = datetime.now(timezone.utc)
-        filename = f"resume_{timestamp.strftime('%Y%m%d_%H%M%S')}.docx"
-        artifact_path = folder / filename
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S_%f")
+        return folder / (f"resume_{stamp}_{suffix}.docx" if suffix else f"resume_{stamp}.docx")
 
-        context = self._build_context(rewrite_result)
-        render_resume_docx(artifact_path, context)
+    def index_artifact(
+        self,
+        connection,
+        *,
+        path: Path,
+        size: int,
+        sha256_hex: str,
+        company_name: str,
+        job_key: str,
+        rewrite_result: RewriteResult,
+        resume_id: int | None = None,
+        job_posting_id: int | None = None,
+    ) -> models.Artifact:
+        """Record an artifact file that was already written in the catalog."""
 
-        meta_path = folder / "meta.json"
+        timestamp = datetime.now(timezone.utc)
         meta_payload = {
             "company": company_name,
             "job_key": job_key,
-            "artifact": artifact_path.name,
+            "artifact": path.name,
             "created_at": timestamp.isoformat(),
             "template_version": self.TEMPLATE_VERSION,
             "model_name": rewrite_result.model_name,
@@ -54,8 +122,107 @@ class ArtifactService:
         }
         if rewrite_result.token_usage:
             meta_payload["token_usage"] = rewrite_result.token_usage
-        meta_path.write_text(json.dumps(meta_payload, indent=2), encoding="utf-8")
-        return artifact_path
+        return crud.create_artifact_record(
+            connection,
+            path=str(path),
+            folder=path.parent.name,
+            file_name=path.name,
+            size=size,
+            sha256_hex=sha256_hex,
+            company=company_name,
+            job_key=job_key,
+            job_posting_id=job_posting_id,
+            resume_id=resume_id,
+            template_version=self.TEMPLATE_VERSION,
+            model_name=rewrite_result.model_name,
+            prompt_hash=rewrite_result.prompt_hash,
+            mock=rewrite_result.mock,
+            meta=meta_payload,
+            created_at=timestamp,
+        )
+
+    def reindex(self) -> int:
+        """Backfill catalog rows for artifact files written before the catalog existed.
+
+        Walks the artifacts root once, reading each folder's ``meta.json`` for
+        the company/job fields, and returns the number of rows added.
+        """
+
+        added = 0
+        if not self.artifacts_root.exists():
+            return added
+        with session_scope() as connection:
+            for folder in sorted(self.artifacts_root.iterdir()):
+                if not folder.is_dir():
+                    continue
+                meta: dict[str, Any] = {}
+                meta_path = folder / "meta.json"
+                if meta_path.exists():
+                    try:
+                        meta = json.loads(meta_path.read_text(encoding="utf-8"))
+                    except json.JSONDecodeError:
+                        meta = {}
+                for file_path in sorted(folder.glob("*.docx")):
+                    if crud.get_artifact_by_path(connection, str(file_path)):
+                        continue
+                    content = file_path.read_bytes()
+                    stat = file_path.stat()
+                    describes_file = meta.get("artifact") == file_path.name
+                    crud.create_artifact_record(
+                        connection,
+                        path=str(file_path),
+                        folder=folder.name,
+                        file_name=file_path.name,
+                        size=len(content),
+                        sha256_hex=hashlib.sha256(content).hexdigest(),
+                        company=meta.get("company"),
+                        job_key=meta.get("job_key"),
+                        job_posting_id=_job_posting_id(meta.get("job_key")),
+                        template_version=meta.get("template_version") if describes_file else None,
+                        model_name=meta.get("model_name") if describes_file else None,
+                        prompt_hash=meta.get("prompt_hash") if describes_file else None,
+                        mock=bool(meta.get("mock_output")) if describes_file else False,
+                        meta=meta if describes_file else None,
+                        created_at=datetime.fromtimestamp(stat.st_mtime, timezone.utc),
+                    )
+                    added += 1
+        return added
+
+    def render_bytes(self, rewrite_result: RewriteResult) -> bytes:
+        """Render the artifact for ``rewrite_result`` in memory without persisting it."""
+
+        with RENDER_SECONDS.time():
+            return load_template(self.template_path).render(self.build_context(rewrite_result.plan))
+
+    def persist_async(
+        self,
+        *,
+        company_name: str,
+        job_key: str,
+        rewrite_result: RewriteResult,
+        content: bytes,
+        resume_id: int | None = None,
+        job_posting_id: int | None = None,
+    ) -> "Future[Path]":
+        """Persist already-rendered ``content`` on a background thread."""
+
+        return _PERSIST_EXECUTOR.submit(
+            self.create_artifact,
+            company_name=company_name,
+            job_key=job_key,
+            rewrite_result=rewrite_result,
+            content=content,
+            resume_id=resume_id,
+            job_posting_id=job_posting_id,
+        )
+
+    def render_artifact(self, context: Mapping[str, Any], destination: Path | str) -> Path:
+        """Render ``context`` (summary, skills, experience, ...) into ``destination``."""
+
+        destination_path = Path(destination)
+        destination_path.parent.mkdir(parents=True, exist_ok=True)
+        destination_path.write_bytes(load_template(self.template_path).render(context))
+        return destination_path
 
     def _resolve_folder(self, company_name: str, job_key: str) -> Path:
         folder_name = f"{self._sanitize(company_name)}__{self._sanitize(job_key)}"
@@ -64,97 +231,42 @@ class ArtifactService:
     def _sanitize(self, value: str) -> str:
         return re.sub(r"[^A-Za-z0-9_-]", "_", value.strip() or "job")[:60]
 
-    def _build_context(self, rewrite_result: RewriteResult) -> RenderContext:
-        plan = rewrite_result.plan
-        skills = [str(skill) for skill in plan.get("skills", []) if str(skill).strip()]
-        experience_blocks: list[str] = []
+    def build_context(self, plan: Mapping[str, Any]) -> dict[str, Any]:
+        """Map a rewrite plan onto the names available to resume templates.
+
+        Each ``experience`` entry carries the plan fields (``employer``,
+        ``role``, ``start``, ``end``, ``bullets``) for ``{%p for %}`` blocks and
+        a preformatted ``text`` used when a template inserts the list directly.
+        """
+
+        experience: list[dict[str, Any]] = []
         for exp in plan.get("experience", []):
             header = f"{exp.get('employer', '')} — {exp.get('role', '')} ({exp.get('start', '')} - {exp.get('end', '')})"
-            bullets = [f"• {bullet}" for bullet in exp.get("bullets", []) if str(bullet).strip()]
+            bullets = [str(bullet) for bullet in exp.get("bullets", []) if str(bullet).strip()]
             block_lines = [header.strip()] if header.strip() else []
-            block_lines.extend(bullets)
+            block_lines.extend(f"• {bullet}" for bullet in bullets)
             if block_lines:
-                experience_blocks.append("\n".join(block_lines))
-        education = [str(item) for item in plan.get("education", []) if str(item).strip()]
-        certifications = [str(item) for item in plan.get("certifications", []) if str(item).strip()]
-        return RenderContext(
-            summary=str(plan.get("summary", "")),
-            skills=skills,
-            experience=experience_blocks,
-            education=education,
-            certifications=certifications,
-        )
+                experience.append({**exp, "bullets": bullets, "text": "\n".join(block_lines)})
+        return {
+            "summary": str(plan.get("summary", "")),
+            "skills": [str(skill) for skill in plan.get("skills", []) if str(skill).strip()],
+            "experience": experience,
+            "education": [str(item) for item in plan.get("education", []) if str(item).strip()],
+            "certifications": [str(item) for item in plan.get("certifications", []) if str(item).strip()],
+        }
 
     def _ensure_template_exists(self) -> None:
         create_placeholder_template(self.template_path)
 
-"""Services for generating resume artifacts from templates."""
-from __future__ import annotations
-
-from pathlib import Path
-from typing import Any, Mapping
-
-from docxtpl import DocxTemplate
-from docx import Document
 
+def _job_posting_id(job_key: Any) -> int | None:
+    """Recover the posting id from ``"<id>_<title>"`` job keys."""
 
-class ArtifactService:
-    """Service responsible for rendering DOCX resume artifacts."""
+    prefix = str(job_key or "").split("_", 1)[0]
+    return int(prefix) if prefix.isdigit() else None
 
-    def __init__(self, template_path: str | Path | None = None) -> None:
-        self.template_path = Path(template_path or "templates/resume_template.docx")
-        self._ensure_template_exists()
 
-    def _ensure_template_exists(self) -> None:
-        """Create the DOCX template if it is missing from disk.
+def artifact_names(job: models.JobPosting) -> tuple[str, str]:
+    """Return the ``(company_name, job_key)`` artifacts for ``job`` are filed under."""
 
-        The project historically stored a binary template in version control.
-        This helper recreates the template at runtime when it is not present so
-        artifact generation can continue without shipping binary assets.
-        """
-
-        if self.template_path.exists():
-            return
-
-        self.template_path.parent.mkdir(parents=True, exist_ok=True)
-
-        document = Document()
-        document.add_heading("Professional Summary", level=1)
-        document.add_paragraph("{{ summary }}")
-
-        document.add_heading("Skills", level=1)
-        document.add_paragraph("{{ skills }}")
-
-        document.add_heading("Experience", level=1)
-        document.add_paragraph("{{ experience }}")
-
-        document.add_heading("Education", level=1)
-        document.add_paragraph("{{ education }}")
-
-        document.add_heading("Certifications", level=1)
-        document.add_paragraph("{{ certifications }}")
-
-        document.save(self.template_path)
-
-    def render_artifact(
-        self, context: Mapping[str, Any], destination: str | Path
-    ) -> Path:
-        """Render the resume artifact into ``destination`` using the template.
-
-        Parameters
-        ----------
-        context:
-            A mapping with the keys expected by the template (``summary``,
-            ``skills``, ``experience``, ``education``, ``certifications``).
-        destination:
-            Where the rendered document should be written.
-        """
-
-        template = DocxTemplate(str(self.template_path))
-        template.render(dict(context))
-
-        destination_path = Path(destination)
-        destination_path.parent.mkdir(parents=True, exist_ok=True)
-        template.save(str(destination_path))
-        return destination_path
- main
+    return (job.company.name if job.company else "Unknown", f"{job.id}_{job.title}")
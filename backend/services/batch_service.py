@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import time
+from datetime import datetime, timezone
+from typing import Iterator
+
+import structlog
+
+from .. import crud, models
+from ..config import get_settings
+from ..db import session_scope
+from ..schemas import TailorBatchRequest
+from . import app_service
+from .job_queue import job_queue
+
+
+logger = structlog.get_logger(__name__)
+
+MAX_BATCH_PAIRS = 5000
+
+
+def create_batch(request: TailorBatchRequest) -> models.TailorBatch:
+    """Fan a resume × job matrix out onto the tailoring queue.
+
+    Duplicate pairs are collapsed, and pairs whose resume text, job text,
+    template version and model match an existing resume version are recorded
+    as cached results without another model call.  Everything else is queued under the
+    batch id so the worker pool processes the pairs concurrently.
+    """
+
+    resume_ids = list(dict.fromkeys(request.resume_ids or []))
+    if not resume_ids:
+        raise ValueError("At least one resume id is required")
+    job_filter = request.job_filter or {}
+    with session_scope() as connection:
+        if request.job_posting_ids:
+            job_ids = list(dict.fromkeys(request.job_posting_ids))
+        else:
+            job_ids = crud.find_job_posting_ids(
+                connection,
+                company=job_filter.get("company"),
+                title=job_filter.get("title"),
+                location=job_filter.get("location"),
+            )
+        resumes = {resume_id: crud.get_resume(connection, resume_id) for resume_id in resume_ids}
+        jobs = {job_id: crud.get_job_posting(connection, job_id) for job_id in job_ids}
+        missing = [f"resume {key}" for key, value in resumes.items() if not value]
+        missing += [f"job posting {key}" for key, value in jobs.items() if not value]
+        if missing:
+            raise ValueError(f"Not found: {', '.join(missing)}")
+        if not jobs:
+            raise ValueError("No job postings match the batch selection")
+        total = len(resumes) * len(jobs)
+        if total > MAX_BATCH_PAIRS:
+            raise ValueError(f"Batch of {total} pairs exceeds the limit of {MAX_BATCH_PAIRS}")
+
+        batch = crud.create_tailor_batch(
+            connection,
+            total=total,
+            filter_json={"resume_ids": resume_ids, "job_posting_ids": job_ids, "job_filter": job_filter or None},
+        )
+        cached = 0
+        for resume in resumes.values():
+            for job in jobs.values():
+                version = app_service.find_reusable_version(connection, resume, job)
+                if version:
+                    crud.record_cached_tailor_job(connection, version=version, batch_id=batch.id)
+                    cached += 1
+                    continue
+                crud.enqueue_tailor_job(
+                    connection,
+                    resume_id=resume.id,
+                    job_posting_id=job.id,
+                    idempotency_key=f"batch:{batch.id}:{resume.id}:{job.id}",
+                    batch_id=batch.id,
+                )
+        # A batch served entirely from existing versions has nothing left to run.
+        crud.finish_tailor_batch_if_done(connection, batch.id)
+    job_queue.wake()
+    logger.info("tailor_batch_created", batch_id=batch.id, total=total, cached=cached)
+    return batch
+
+
+def get_batch(batch_id: int) -> tuple[models.TailorBatch, dict, list[models.TailorJob]] | None:
+    """Return the batch, its throughput/cost stats and the per-pair jobs."""
+
+    with session_scope() as connection:
+        batch = crud.get_tailor_batch(connection, batch_id)
+        if not batch:
+            return None
+        counts = crud.tailor_batch_stats(connection, batch_id)
+        items = crud.list_batch_tailor_jobs(connection, batch_id)
+    return batch, _summarize(batch, counts), items
+
+
+def iter_batch_events(batch_id: int, poll_interval: float = 0.5) -> Iterator[dict]:
+    """Yield an ``item`` event as each pair finishes, then a ``batch`` summary."""
+
+    reported: set[int] = set()
+    while True:
+        snapshot = get_batch(batch_id)
+        if snapshot is None:
+            yield {"event": "error", "detail": "Batch not found"}
+            return
+        batch, stats, items = snapshot
+        for item in items:
+            if item.id in reported or item.status not in ("succeeded", "failed"):
+                continue
+            reported.add(item.id)
+            yield {
+                "event": "item",
+                "job_id": item.id,
+                "resume_id": item.resume_id,
+                "job_posting_id": item.job_posting_id,
+                "status": item.status,
+                "cached": item.cached,
+                "resume_version_id": item.resume_version_id,
+                "artifact_path": item.artifact_path,
+                "error": item.error,
+            }
+        if batch.finished_at is not None:
+            yield {"event": "batch", "batch_id": batch.id, "status": batch.status, "stats": stats}
+            return
+        time.sleep(poll_interval)
+
+
+def _summarize(batch: models.TailorBatch, counts: dict) -> dict:
+    last_finished_at = counts.pop("last_finished_at")
+    if batch.finished_at:
+        end = last_finished_at or batch.finished_at
+    else:
+        end = datetime.now(timezone.utc).replace(tzinfo=None)
+    elapsed = max((end - batch.created_at).total_seconds(), 0.0) if batch.created_at else 0.0
+    completed = counts["succeeded"] + counts["failed"]
+    return {
+        **counts,
+        "completed": completed,
+        "elapsed_seconds": round(elapsed, 3),
+        "throughput_per_minute": round(completed / elapsed * 60, 2) if elapsed else None,
+        "estimated_cost_usd": round(counts["total_tokens"] / 1000 * get_settings().token_cost_per_1k, 6),
+    }
@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+from bisect import bisect_left
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+
+
+class CronError(ValueError):
+    """Raised for cron expressions that cannot be parsed or never fire."""
+
+
+_MONTH_NAMES = {name: index for index, name in enumerate(
+    ("JAN", "FEB", "MAR", "APR", "MAY", "JUN", "JUL", "AUG", "SEP", "OCT", "NOV", "DEC"), start=1
+)}
+_WEEKDAY_NAMES = {name: index for index, name in enumerate(("SUN", "MON", "TUE", "WED", "THU", "FRI", "SAT"))}
+
+# (name, lowest, highest, symbolic names)
+_FIELDS = (
+    ("minute", 0, 59, {}),
+    ("hour", 0, 23, {}),
+    ("day of month", 1, 31, {}),
+    ("month", 1, 12, _MONTH_NAMES),
+    ("day of week", 0, 7, _WEEKDAY_NAMES),
+)
+
+_MACROS = {
+    "@yearly": "0 0 1 1 *",
+    "@annually": "0 0 1 1 *",
+    "@monthly": "0 0 1 * *",
+    "@weekly": "0 0 * * 0",
+    "@daily": "0 0 * * *",
+    "@midnight": "0 0 * * *",
+    "@hourly": "0 * * * *",
+}
+
+# Long enough to find the next 29 February after a run of non-leap years.
+_SEARCH_YEARS = 9
+
+
+@dataclass(frozen=True)
+class CronExpression:
+    """A parsed five-field cron expression, evaluated in UTC.
+
+    As in classic cron, when both day fields are restricted a day matches if
+    *either* one does.
+    """
+
+    expression: str
+    minutes: tuple[int, ...]
+    hours: tuple[int, ...]
+    days: frozenset[int]
+    months: tuple[int, ...]
+    weekdays: frozenset[int]
+    any_day: bool
+    any_weekday: bool
+
+    def next_after(self, moment: datetime) -> datetime:
+        """Return the first fire time strictly after ``moment``.
+
+        The search jumps whole months, days and hours at a time, so it costs a
+        handful of steps however sparse the expression is.
+        """
+
+        if moment.tzinfo is None:
+            moment = moment.replace(tzinfo=timezone.utc)
+        current = moment.astimezone(timezone.utc).replace(second=0, microsecond=0) + timedelta(minutes=1)
+        last_year = current.year + _SEARCH_YEARS
+        while current.year <= last_year:
+            if current.month not in self.months:
+                index = bisect_left(self.months, current.month)
+                if index < len(self.months):
+                    current = current.replace(month=self.months[index], day=1, hour=0, minute=0)
+                else:
+                    current = current.replace(year=current.year + 1, month=self.months[0], day=1, hour=0, minute=0)
+                continue
+            if not self._day_matches(current):
+                current = (current + timedelta(days=1)).replace(hour=0, minute=0)
+                continue
+            if current.hour not in self.hours:
+                index = bisect_left(self.hours, current.hour)
+                if index < len(self.hours):
+                    current = current.replace(hour=self.hours[index], minute=0)
+                else:
+                    current = (current + timedelta(days=1)).replace(hour=0, minute=0)
+                continue
+            index = bisect_left(self.minutes, current.minute)
+            if index < len(self.minutes):
+                return current.replace(minute=self.minutes[index])
+            current = (current + timedelta(hours=1)).replace(minute=0)
+        raise CronError(f"Cron expression {self.expression!r} never fires")
+
+    def _day_matches(self, moment: datetime) -> bool:
+        day_ok = moment.day in self.days
+        weekday_ok = (moment.weekday() + 1) % 7 in self.weekdays
+        if self.any_day or self.any_weekday:
+            return day_ok and weekday_ok
+        return day_ok or weekday_ok
+
+
+@lru_cache(maxsize=1024)
+def parse_cron(expression: str) -> CronExpression:
+    """Parse ``minute hour day-of-month month day-of-week``.
+
+    Each field accepts ``*``, values, ``a-b`` ranges, ``/step`` suffixes and
+    comma separated lists; months and weekdays also accept three-letter names
+    (``JAN``, ``MON``) and weekday ``7`` means Sunday.  The ``@hourly``,
+    ``@daily``, ``@weekly``, ``@monthly`` and ``@yearly`` shortcuts are
+    supported too.
+    """
+
+    text = _MACROS.get(expression.strip().lower(), expression)
+    parts = text.split()
+    if len(parts) != 5:
+        raise CronError(f"Cron expression {expression!r} must have 5 fields, got {len(parts)}")
+    values = [_parse_field(part, *spec) for part, spec in zip(parts, _FIELDS)]
+    minutes, hours, days, months, weekdays = values
+    weekdays = {0 if day == 7 else day for day in weekdays}
+    cron = CronExpression(
+        expression=expression,
+        minutes=tuple(sorted(minutes)),
+        hours=tuple(sorted(hours)),
+        days=frozenset(days),
+        months=tuple(sorted(months)),
+        weekdays=frozenset(weekdays),
+        any_day=parts[2] == "*",
+        any_weekday=parts[4] == "*",
+    )
+    cron.next_after(datetime(2000, 1, 1, tzinfo=timezone.utc))
+    return cron
+
+
+def _parse_field(text: str, name: str, low: int, high: int, names: dict[str, int]) -> set[int]:
+    values: set[int] = set()
+    for item in text.split(","):
+        base, _, step_text = item.partition("/")
+        step = 1
+        if step_text:
+            if not step_text.isdigit() or int(step_text) == 0:
+                raise CronError(f"Invalid step {step_text!r} in {name} field {text!r}")
+            step = int(step_text)
+        if base == "*":
+            start, end = low, high
+        elif "-" in base:
+            first, _, last = base.partition("-")
+            start, end = _parse_value(first, name, low, high, names), _parse_value(last, name, low, high, names)
+            if start > end:
+                raise CronError(f"Range {base!r} in {name} field runs backwards")
+        else:
+            start = _parse_value(base, name, low, high, names)
+            end = high if step_text else start
+        values.update(range(start, end + 1, step))
+    return values
+
+
+def _parse_value(text: str, name: str, low: int, high: int, names: dict[str, int]) -> int:
+    upper = text.upper()
+    if upper in names:
+        return names[upper]
+    if not text.isdigit():
+        raise CronError(f"Invalid {name} value {text!r}")
+    value = int(text)
+    if not low <= value <= high:
+        raise CronError(f"{name.capitalize()} value {value} is outside {low}-{high}")
+    return value
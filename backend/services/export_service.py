@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+from datetime import datetime
+from pathlib import Path
+from functools import partial
+from typing import BinaryIO, Callable, Iterator, Optional, Union
+
+import structlog
+
+from .. import crud
+from ..config import get_settings
+from ..db import session_scope
+from ..utils.zip_utils import stream_files
+from .retention_service import open_artifact
+
+
+logger = structlog.get_logger(__name__)
+
+PAGE_SIZE = 500
+
+
+def iter_export_members(
+    *,
+    query: Optional[str] = None,
+    company: Optional[str] = None,
+    job_posting_id: Optional[int] = None,
+    resume_id: Optional[int] = None,
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
+) -> Iterator[tuple[str, Union[Path, Callable[[], BinaryIO]]]]:
+    """Yield ``(archive name, source)`` for every catalogued artifact matching the filter.
+
+    Live artifacts are yielded as paths; artifacts packed into a retention
+    bundle are yielded as an opener that reads the member from the bundle.
+
+    The catalog is read a page at a time with a short-lived connection per
+    page, so the database is never held open while the client downloads.
+    """
+
+    artifacts_root = get_settings().artifacts_root.resolve()
+    after_id = 0
+    while True:
+        with session_scope() as connection:
+            page = crud.list_artifacts_after(
+                connection,
+                after_id=after_id,
+                limit=PAGE_SIZE,
+                query=query,
+                company=company,
+                job_posting_id=job_posting_id,
+                resume_id=resume_id,
+                created_after=created_after,
+                created_before=created_before,
+            )
+        if not page:
+            return
+        after_id = page[-1].id
+        for artifact in page:
+            name = f"{artifact.folder}/{artifact.file_name}"
+            if artifact.archive_path is not None:
+                yield name, partial(open_artifact, artifact)
+                continue
+            path = Path(artifact.path).resolve()
+            if not path.is_relative_to(artifacts_root):
+                logger.warning("export_skipped_outside_root", artifact_id=artifact.id)
+                continue
+            yield name, path
+
+
+def stream_export(**filters) -> Iterator[bytes]:
+    """Stream a ZIP archive of the matching artifacts; see :func:`iter_export_members`."""
+
+    logger.info("artifact_export_started", **{key: value for key, value in filters.items() if value is not None})
+    yield from stream_files(iter_export_members(**filters))
@@ -0,0 +1,268 @@
+from __future__ import annotations
+
+import threading
+import time
+import uuid
+
+import structlog
+
+from .. import crud, models
+from ..config import get_settings
+from ..db import session_scope
+from ..schemas import TailorRequest
+from ..utils.metrics import REGISTRY
+from . import app_service, speculative_service
+from .rewrite_service import ModelUsage, metering
+
+
+logger = structlog.get_logger(__name__)
+
+
+class IdempotencyConflict(RuntimeError):
+    """Raised when an idempotency key is reused for a different resume/job pair."""
+
+
+class TailorJobQueue:
+    """Persistent tailoring queue backed by the ``tailor_jobs`` table.
+
+    Requests are written as ``queued`` rows and picked up by a pool of worker
+    threads.  A worker claims a row with a single atomic UPDATE, refreshes its
+    ``heartbeat_at`` while the model runs and records the resulting resume
+    version when it finishes.  Rows whose heartbeat goes stale (for example
+    because the process crashed) become claimable again, up to
+    ``MAX_ATTEMPTS`` tries.  Because the queue lives in the database, the HTTP
+    request only pays for one INSERT and any number of processes can share the
+    work.
+    """
+
+    HEARTBEAT_INTERVAL = 10.0
+    STALE_AFTER = 60.0
+    MAX_ATTEMPTS = 3
+    POLL_INTERVAL = 1.0
+
+    def __init__(self) -> None:
+        self.worker_prefix = uuid.uuid4().hex[:8]
+        self._threads: list[threading.Thread] = []
+        self._stop = threading.Event()
+        self._wakeup = threading.Event()
+
+    def start(self, workers: int | None = None) -> None:
+        if self._threads:
+            return
+        count = workers if workers is not None else get_settings().tailor_workers
+        self._stop.clear()
+        for index in range(max(count, 0)):
+            thread = threading.Thread(
+                target=self._worker_loop,
+                args=(f"{self.worker_prefix}-{index}",),
+                name=f"tailor-worker-{index}",
+                daemon=True,
+            )
+            thread.start()
+            self._threads.append(thread)
+        logger.info("tailor_queue_started", workers=len(self._threads))
+
+    def shutdown(self) -> None:
+        if not self._threads:
+            return
+        self._stop.set()
+        self._wakeup.set()
+        for thread in self._threads:
+            thread.join(timeout=5)
+        self._threads = []
+        logger.info("tailor_queue_stopped")
+
+    def enqueue(self, request: TailorRequest) -> models.TailorJob:
+        with session_scope() as connection:
+            if not crud.get_resume(connection, request.resume_id) or not crud.get_job_posting(
+                connection, request.job_posting_id
+            ):
+                raise ValueError("Resume or job posting not found")
+            job = crud.enqueue_tailor_job(
+                connection,
+                resume_id=request.resume_id,
+                job_posting_id=request.job_posting_id,
+                idempotency_key=request.idempotency_key,
+            )
+        if (job.resume_id, job.job_posting_id) != (request.resume_id, request.job_posting_id):
+            raise IdempotencyConflict(
+                f"Idempotency key {request.idempotency_key!r} was already used for resume {job.resume_id} "
+                f"and job posting {job.job_posting_id}"
+            )
+        self.wake()
+        return job
+
+    def wake(self) -> None:
+        """Nudge idle workers after rows were queued outside :meth:`enqueue`."""
+
+        self._wakeup.set()
+
+    def get(self, job_id: int) -> models.TailorJob | None:
+        with session_scope() as connection:
+            return crud.get_tailor_job(connection, job_id)
+
+    def run_sync(self, request: TailorRequest, timeout: float = 300.0) -> models.TailorJob:
+        """Enqueue ``request`` and execute it on the calling thread.
+
+        Used for synchronous requests that carry an idempotency key: a retry
+        with the same key returns the stored result, or waits for the worker
+        that is already executing it, instead of producing a second version.
+        If ``timeout`` passes first the job is returned still queued or
+        running, for the caller to poll.
+        """
+
+        job = self.enqueue(request)
+        worker_id = f"{self.worker_prefix}-inline-{threading.get_ident()}"
+        claimed = self._claim(worker_id, job_id=job.id)
+        if claimed:
+            self._execute(claimed, worker_id)
+        deadline = time.monotonic() + timeout
+        while True:
+            current = self.get(job.id)
+            if current.status in ("succeeded", "failed") or time.monotonic() >= deadline:
+                return current
+            time.sleep(0.1)
+
+    def run_pending(self, limit: int | None = None) -> int:
+        """Drain queued jobs on the calling thread; returns how many ran."""
+
+        worker_id = f"{self.worker_prefix}-drain"
+        processed = 0
+        while limit is None or processed < limit:
+            job = self._claim(worker_id)
+            if not job:
+                break
+            self._execute(job, worker_id)
+            processed += 1
+        return processed
+
+    def _worker_loop(self, worker_id: str) -> None:
+        while not self._stop.is_set():
+            try:
+                job = self._claim(worker_id)
+            except Exception as exc:  # pragma: no cover - transient database errors
+                logger.error("tailor_claim_error", worker_id=worker_id, error=str(exc))
+                job = None
+            if job is None:
+                self._wakeup.wait(self.POLL_INTERVAL)
+                self._wakeup.clear()
+                continue
+            self._execute(job, worker_id)
+
+    def _claim(self, worker_id: str, job_id: int | None = None) -> models.TailorJob | None:
+        now = time.time()
+        with session_scope() as connection:
+            return crud.claim_tailor_job(
+                connection,
+                worker_id=worker_id,
+                now=now,
+                stale_before=now - self.STALE_AFTER,
+                max_attempts=self.MAX_ATTEMPTS,
+                job_id=job_id,
+            )
+
+    def _execute(self, job: models.TailorJob, worker_id: str) -> None:
+        logger.info("tailor_job_started", job_id=job.id, worker_id=worker_id, attempt=job.attempts, kind=job.kind)
+        if job.kind == speculative_service.SPECULATIVE_KIND:
+            self._execute_speculative(job, worker_id)
+            return
+        request = TailorRequest(resume_id=job.resume_id, job_posting_id=job.job_posting_id)
+        with _Heartbeat(job.id, worker_id, self.HEARTBEAT_INTERVAL), metering() as usage:
+            try:
+                version, artifact_path, mock = app_service.tailor_resume(request)
+            except ValueError as exc:
+                self._fail(job, worker_id, str(exc), retry=False, usage=usage)
+                return
+            except Exception as exc:
+                self._fail(job, worker_id, str(exc), retry=job.attempts < self.MAX_ATTEMPTS, usage=usage)
+                return
+        with session_scope() as connection:
+            crud.complete_tailor_job(
+                connection,
+                job.id,
+                worker_id=worker_id,
+                resume_version_id=version.id,
+                artifact_path=str(artifact_path),
+                mock=mock,
+                model_calls=usage.calls,
+                token_usage=usage.token_usage(),
+            )
+            if job.batch_id is not None:
+                crud.finish_tailor_batch_if_done(connection, job.batch_id)
+        logger.info("tailor_job_completed", job_id=job.id, resume_version_id=version.id)
+
+    def _execute_speculative(self, job: models.TailorJob, worker_id: str) -> None:
+        with _Heartbeat(job.id, worker_id, self.HEARTBEAT_INTERVAL):
+            try:
+                cancel_reason = speculative_service.precompute(job)
+            except Exception as exc:
+                self._fail(job, worker_id, str(exc), retry=job.attempts < self.MAX_ATTEMPTS)
+                return
+        with session_scope() as connection:
+            if cancel_reason:
+                crud.cancel_tailor_job(connection, job.id, worker_id=worker_id, reason=cancel_reason)
+            else:
+                crud.complete_tailor_job(connection, job.id, worker_id=worker_id)
+        logger.info("speculative_job_finished", job_id=job.id, cancelled=cancel_reason)
+
+    def _fail(
+        self, job: models.TailorJob, worker_id: str, error: str, *, retry: bool, usage: ModelUsage | None = None
+    ) -> None:
+        with session_scope() as connection:
+            crud.fail_tailor_job(
+                connection,
+                job.id,
+                worker_id=worker_id,
+                error=error,
+                retry=retry,
+                model_calls=usage.calls if usage else 0,
+                token_usage=usage.token_usage() if usage else None,
+            )
+            if job.batch_id is not None and not retry:
+                crud.finish_tailor_batch_if_done(connection, job.batch_id)
+        logger.error("tailor_job_failed", job_id=job.id, error=error, retry=retry)
+        if retry:
+            self._wakeup.set()
+
+
+class _Heartbeat:
+    """Refresh a claimed job's heartbeat from a side thread while it runs."""
+
+    def __init__(self, job_id: int, worker_id: str, interval: float) -> None:
+        self.job_id = job_id
+        self.worker_id = worker_id
+        self.interval = interval
+        self._done = threading.Event()
+        self._thread = threading.Thread(target=self._beat, daemon=True)
+
+    def __enter__(self) -> "_Heartbeat":
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self._done.set()
+        self._thread.join()
+
+    def _beat(self) -> None:
+        while not self._done.wait(self.interval):
+            try:
+                with session_scope() as connection:
+                    crud.heartbeat_tailor_job(
+                        connection, self.job_id, worker_id=self.worker_id, now=time.time()
+                    )
+            except Exception as exc:  # pragma: no cover - heartbeat is best effort
+                logger.warning("tailor_heartbeat_error", job_id=self.job_id, error=str(exc))
+
+
+job_queue = TailorJobQueue()
+
+
+def _jobs_by_status() -> dict[tuple[str], int]:
+    with session_scope() as connection:
+        return {(status,): jobs for status, jobs in crud.count_tailor_jobs_by_status(connection).items()}
+
+
+REGISTRY.gauge("fitresume_tailor_queue_jobs", "Rows in the tailoring queue by status.", ("status",), callback=_jobs_by_status)
+REGISTRY.gauge(
+    "fitresume_tailor_queue_workers", "Tailoring worker threads in this process.", callback=lambda: len(job_queue._threads)
+)
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import threading
+import time
+from typing import Optional
+
+import structlog
+
+from .. import crud, models
+from ..db import session_scope
+
+
+logger = structlog.get_logger(__name__)
+
+
+def acquire(name: str, owner: str, ttl: float) -> bool:
+    now = time.time()
+    with session_scope() as connection:
+        return crud.acquire_lease(connection, name, owner=owner, now=now, expires_at=now + ttl)
+
+
+def renew(name: str, owner: str, ttl: float) -> bool:
+    with session_scope() as connection:
+        return crud.renew_lease(connection, name, owner=owner, expires_at=time.time() + ttl)
+
+
+def complete(name: str, owner: str, *, keep_for: float, result: Optional[dict] = None) -> bool:
+    """Mark ``name`` done, keeping the row (and ``result``) for ``keep_for`` seconds."""
+
+    now = time.time()
+    with session_scope() as connection:
+        return crud.complete_lease(
+            connection, name, owner=owner, now=now, expires_at=now + keep_for, result=result
+        )
+
+
+def release(name: str, owner: str) -> None:
+    with session_scope() as connection:
+        crud.release_lease(connection, name, owner=owner)
+
+
+def get(name: str) -> Optional[models.Lease]:
+    with session_scope() as connection:
+        return crud.get_lease(connection, name)
+
+
+class LeaseKeeper:
+    """Renew a held lease from a side thread until the ``with`` block exits.
+
+    Renewal happens every third of the TTL, so a holder that is still alive
+    never loses the lease while a crashed one lets it expire within ``ttl``.
+    ``lost`` is set if a renewal finds the lease taken over by someone else.
+    """
+
+    def __init__(self, name: str, owner: str, ttl: float) -> None:
+        self.name = name
+        self.owner = owner
+        self.ttl = ttl
+        self.lost = threading.Event()
+        self._done = threading.Event()
+        self._thread = threading.Thread(target=self._renew, daemon=True)
+
+    def __enter__(self) -> "LeaseKeeper":
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self._done.set()
+        self._thread.join()
+
+    def _renew(self) -> None:
+        while not self._done.wait(self.ttl / 3):
+            try:
+                if not renew(self.name, self.owner, self.ttl):
+                    self.lost.set()
+                    logger.warning("lease_lost", name=self.name, owner=self.owner)
+                    return
+            except Exception as exc:  # pragma: no cover - renewal is retried next tick
+                logger.warning("lease_renew_error", name=self.name, error=str(exc))
@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import hashlib
+import multiprocessing
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass
+from itertools import islice
+from pathlib import Path
+from typing import Any, Iterable, Iterator, Mapping, Optional, Union
+
+import structlog
+
+from ..config import get_settings
+from ..utils.docx_template import load_template
+from ..utils.docx_utils import RenderContext
+
+
+logger = structlog.get_logger(__name__)
+
+
+@dataclass(frozen=True)
+class RenderTask:
+    """One artifact to render.
+
+    With a ``destination`` the worker writes the file itself and only the
+    path, size and hash travel back to the parent; without one the rendered
+    bytes are returned.
+    """
+
+    context: Union[RenderContext, Mapping[str, Any]]
+    destination: Optional[Path] = None
+    key: Any = None
+
+
+@dataclass(frozen=True)
+class RenderOutcome:
+    key: Any
+    size: int = 0
+    sha256: Optional[str] = None
+    path: Optional[Path] = None
+    content: Optional[bytes] = None
+    error: Optional[str] = None
+
+
+class RenderExecutor:
+    """Render batches of artifacts across a pool of worker processes.
+
+    Tasks are pulled lazily from the input iterable in chunks of
+    ``chunk_size`` and at most ``max_in_flight`` chunks are queued in the
+    pool at any time, so memory stays bounded however large the batch is.
+    Each worker compiles the template once and reuses it for every task.
+    Outcomes are yielded as chunks finish, so they are not in input order;
+    use ``RenderTask.key`` to match them up.  ``workers=0`` renders inline on
+    the calling thread, which is cheaper for a handful of artifacts.
+    """
+
+    def __init__(
+        self,
+        template_path: Path,
+        *,
+        workers: Optional[int] = None,
+        chunk_size: int = 16,
+        max_in_flight: Optional[int] = None,
+        compress: bool = False,
+    ) -> None:
+        self.template_path = Path(template_path).resolve()
+        self.workers = get_settings().render_workers if workers is None else workers
+        self.chunk_size = max(chunk_size, 1)
+        self.max_in_flight = max_in_flight or max(self.workers, 1) * 2
+        self.compress = compress
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    def __enter__(self) -> "RenderExecutor":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.shutdown()
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def render_many(self, tasks: Iterable[RenderTask]) -> Iterator[RenderOutcome]:
+        iterator = iter(tasks)
+        if self.workers <= 0:
+            for task in iterator:
+                yield _render_task(self.template_path, self.compress, task)
+            return
+
+        pool = self._ensure_pool()
+        pending: set[Future] = set()
+        while True:
+            while len(pending) < self.max_in_flight:
+                chunk = list(islice(iterator, self.chunk_size))
+                if not chunk:
+                    break
+                pending.add(pool.submit(_render_chunk, self.template_path, self.compress, chunk))
+            if not pending:
+                return
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield from future.result()
+
+    def _ensure_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            # Spawned rather than forked: the web process runs queue and
+            # scheduler threads whose locks must not leak into children.
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+            logger.info("render_pool_started", workers=self.workers)
+        return self._pool
+
+
+def _render_chunk(template_path: Path, compress: bool, tasks: list[RenderTask]) -> list[RenderOutcome]:
+    return [_render_task(template_path, compress, task) for task in tasks]
+
+
+def _render_task(template_path: Path, compress: bool, task: RenderTask) -> RenderOutcome:
+    context = task.context.as_template_context() if isinstance(task.context, RenderContext) else task.context
+    try:
+        content = load_template(template_path).render(context, compress=compress)
+        digest = hashlib.sha256(content).hexdigest()
+        if task.destination is None:
+            return RenderOutcome(key=task.key, size=len(content), sha256=digest, content=content)
+        task.destination.parent.mkdir(parents=True, exist_ok=True)
+        task.destination.write_bytes(content)
+    except Exception as exc:
+        return RenderOutcome(key=task.key, error=str(exc))
+    return RenderOutcome(key=task.key, size=len(content), sha256=digest, path=task.destination)
@@ -0,0 +1,251 @@
+from __future__ import annotations
+
+import json
+import threading
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+import structlog
+
+from .. import crud, models
+from ..db import session_scope
+from . import lease_service
+from .artifact_service import ArtifactService, artifact_names
+from .render_executor import RenderExecutor, RenderTask
+from .rewrite_service import RewriteResult
+
+
+logger = structlog.get_logger(__name__)
+
+RERENDER_LEASE = "rerender"
+LEASE_TTL = 60.0
+
+
+class RerenderInProgress(RuntimeError):
+    """Raised when another worker already holds the re-render lease."""
+
+
+@dataclass
+class RerenderReport:
+    run_id: int
+    rendered: int = 0
+    failed: int = 0
+    skipped: int = 0
+    remaining: int = 0
+
+
+def outdated_count() -> int:
+    with session_scope() as connection:
+        return crud.count_outdated_resume_versions(
+            connection, template_version=ArtifactService.TEMPLATE_VERSION
+        )
+
+
+def rerender_outdated(
+    *,
+    batch_size: int = 100,
+    limit: Optional[int] = None,
+    workers: Optional[int] = None,
+) -> RerenderReport:
+    """Regenerate artifacts for versions rendered with an older template.
+
+    Artifacts are rebuilt from the plan stored with each version, so no model
+    calls are made.  Versions are processed in id order, ``batch_size`` at a
+    time, and each batch is committed as soon as it is rendered: a version
+    only leaves the work set once it points at an artifact built with the
+    current ``TEMPLATE_VERSION``, so an interrupted job simply continues where
+    it stopped the next time it runs.  The folder's ``meta.json`` is rewritten
+    for the new file, and the superseded artifact's file and catalog row are
+    removed once nothing points at them.  ``limit`` caps how many versions one
+    invocation looks at.  Only one re-render runs at a time across workers.
+    """
+
+    owner, run = _claim()
+    return _run(run, owner, batch_size=batch_size, limit=limit, workers=workers)
+
+
+def start_rerender(
+    *,
+    batch_size: int = 100,
+    limit: Optional[int] = None,
+    workers: Optional[int] = None,
+) -> models.Run:
+    """Start :func:`rerender_outdated` on a background thread and return its run."""
+
+    owner, run = _claim()
+    threading.Thread(
+        target=_run,
+        args=(run, owner),
+        kwargs={"batch_size": batch_size, "limit": limit, "workers": workers},
+        name="artifact-rerender",
+        daemon=True,
+    ).start()
+    return run
+
+
+def _claim() -> tuple[str, models.Run]:
+    owner = uuid.uuid4().hex
+    if not lease_service.acquire(RERENDER_LEASE, owner, LEASE_TTL):
+        raise RerenderInProgress("An artifact re-render is already running")
+    with session_scope() as connection:
+        run = crud.create_run(connection, triggered_by="system", run_type="rerender")
+    return owner, run
+
+
+def _run(
+    run: models.Run,
+    owner: str,
+    *,
+    batch_size: int,
+    limit: Optional[int],
+    workers: Optional[int],
+) -> RerenderReport:
+    report = RerenderReport(run_id=run.id)
+    artifact_service = ArtifactService()
+    template_version = ArtifactService.TEMPLATE_VERSION
+    logger.info("rerender_started", run_id=run.id, template_version=template_version)
+    try:
+        keeper = lease_service.LeaseKeeper(RERENDER_LEASE, owner, LEASE_TTL)
+        executor = RenderExecutor(artifact_service.template_path, workers=workers)
+        with keeper, executor:
+            after_id = 0
+            seen = 0
+            while limit is None or seen < limit:
+                size = batch_size if limit is None else min(batch_size, limit - seen)
+                with session_scope() as connection:
+                    versions = crud.list_outdated_resume_versions(
+                        connection, template_version=template_version, after_id=after_id, limit=size
+                    )
+                    postings = {
+                        posting_id: crud.get_job_posting(connection, posting_id)
+                        for posting_id in {version.job_posting_id for version in versions}
+                    }
+                if not versions:
+                    break
+                after_id = versions[-1].id
+                seen += len(versions)
+                _rerender_batch(artifact_service, executor, versions, postings, report)
+                if keeper.lost.is_set():
+                    raise RerenderInProgress("Lost the re-render lease to another worker")
+        with session_scope() as connection:
+            report.remaining = crud.count_outdated_resume_versions(connection, template_version=template_version)
+            error = f"{report.failed} versions failed to render" if report.failed else None
+            status = "completed_with_errors" if report.failed else "success"
+            crud.finish_run(connection, run, status=status, error=error)
+    except Exception as exc:
+        with session_scope() as connection:
+            crud.finish_run(connection, run, status="failed", error=str(exc))
+        logger.error("rerender_failed", run_id=run.id, error=str(exc))
+        raise
+    finally:
+        lease_service.release(RERENDER_LEASE, owner)
+    logger.info(
+        "rerender_finished",
+        run_id=run.id,
+        rendered=report.rendered,
+        failed=report.failed,
+        skipped=report.skipped,
+        remaining=report.remaining,
+    )
+    return report
+
+
+def _rerender_batch(
+    artifact_service: ArtifactService,
+    executor: RenderExecutor,
+    versions: list[models.ResumeVersion],
+    postings: dict[int, Optional[models.JobPosting]],
+    report: RerenderReport,
+) -> None:
+    pending: dict[int, tuple[models.ResumeVersion, dict, str, str]] = {}
+    tasks: list[RenderTask] = []
+    for version in versions:
+        plan = version.plan if version.plan is not None else _recover_plan(version)
+        posting = postings.get(version.job_posting_id)
+        if plan is None or posting is None:
+            report.skipped += 1
+            logger.warning("rerender_skipped", resume_version_id=version.id, has_plan=plan is not None)
+            continue
+        company_name, job_key = artifact_names(posting)
+        destination = artifact_service.new_artifact_path(company_name, job_key, suffix=f"v{version.id}")
+        pending[version.id] = (version, plan, company_name, job_key)
+        tasks.append(RenderTask(context=artifact_service.build_context(plan), destination=destination, key=version.id))
+
+    outcomes = list(executor.render_many(tasks))
+    written: list[models.Artifact] = []
+    replaced: list[str] = []
+    with session_scope() as connection:
+        for outcome in outcomes:
+            version, plan, company_name, job_key = pending[outcome.key]
+            if outcome.error:
+                report.failed += 1
+                logger.error("rerender_version_failed", resume_version_id=version.id, error=outcome.error)
+                continue
+            artifact = artifact_service.index_artifact(
+                connection,
+                path=outcome.path,
+                size=outcome.size,
+                sha256_hex=outcome.sha256,
+                company_name=company_name,
+                job_key=job_key,
+                rewrite_result=RewriteResult(
+                    plan=plan,
+                    rendered_text="",
+                    model_name=version.model_name or "",
+                    prompt_hash=version.prompt_hash or "",
+                    token_usage=version.token_usage,
+                    mock=version.mock,
+                ),
+                resume_id=version.resume_id,
+                job_posting_id=version.job_posting_id,
+            )
+            crud.update_resume_version_artifact(
+                connection,
+                version.id,
+                file_path=str(outcome.path),
+                template_version=ArtifactService.TEMPLATE_VERSION,
+                plan=plan,
+            )
+            written.append(artifact)
+            if _retire(connection, version.file_path):
+                replaced.append(version.file_path)
+            report.rendered += 1
+    for artifact in written:
+        artifact_service.write_meta(artifact)
+    for path in replaced:
+        Path(path).unlink(missing_ok=True)
+
+
+def _retire(connection, path: str) -> bool:
+    """Drop the catalog row of a superseded artifact nothing points at any more.
+
+    Returns whether its file should be deleted: archived artifacts stay in
+    their bundle until retention removes it.
+    """
+
+    if crud.artifact_path_in_use(connection, path):
+        return False
+    artifact = crud.get_artifact_by_path(connection, path)
+    if artifact is None:
+        return True
+    crud.delete_artifact_records(connection, [artifact.id])
+    return artifact.archive_path is None
+
+
+def _recover_plan(version: models.ResumeVersion) -> Optional[dict]:
+    """Find the plan for versions recorded before plans were stored with them."""
+
+    with session_scope() as connection:
+        artifact = crud.get_artifact_by_path(connection, version.file_path)
+    if artifact is not None and artifact.meta and isinstance(artifact.meta.get("plan"), dict):
+        return artifact.meta["plan"]
+    meta_path = Path(version.file_path).parent / "meta.json"
+    try:
+        meta = json.loads(meta_path.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return None
+    if meta.get("artifact") == Path(version.file_path).name and isinstance(meta.get("plan"), dict):
+        return meta["plan"]
+    return None
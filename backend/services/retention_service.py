@@ -0,0 +1,350 @@
+from __future__ import annotations
+
+import os
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import BinaryIO, Iterable, Optional
+from zipfile import ZIP_DEFLATED, ZipFile
+
+import structlog
+
+from .. import crud, models
+from ..config import Settings, get_settings
+from ..db import session_scope
+from ..schemas import RetentionReport
+from . import lease_service
+
+
+logger = structlog.get_logger(__name__)
+
+RETENTION_LEASE = "artifact-retention"
+ARCHIVE_DIRNAME = "_archive"
+BATCH_SIZE = 500
+
+
+def open_artifact(artifact: models.Artifact) -> BinaryIO:
+    """Open an artifact for reading, whether it is a live file or packed in a bundle."""
+
+    if artifact.archive_path is None:
+        return open(artifact.path, "rb")
+    # The member keeps the archive's file handle alive after the ZipFile is closed.
+    with ZipFile(artifact.archive_path) as bundle:
+        return bundle.open(artifact.archive_member)
+
+
+def artifact_available(artifact: models.Artifact) -> bool:
+    return Path(artifact.archive_path or artifact.path).is_file()
+
+
+def sweep(settings: Optional[Settings] = None, *, now: Optional[datetime] = None) -> RetentionReport:
+    """Apply the configured retention policies once.
+
+    Policies run in order: delete artifacts older than
+    ``artifact_max_age_days``; keep only the newest ``artifact_keep_per_job``
+    per company/job folder; pack live artifacts older than
+    ``artifact_archive_after_days`` into per-month bundles; and finally evict
+    the oldest artifacts (then the oldest bundles) until disk usage is under
+    ``artifact_max_total_bytes``.  A zero setting disables that policy.
+    Candidates come from the artifact catalog, never from directory scans,
+    and only one sweep runs at a time across processes.
+    """
+
+    settings = settings or get_settings()
+    now = now or datetime.now(timezone.utc)
+    owner = uuid.uuid4().hex
+    if not lease_service.acquire(RETENTION_LEASE, owner, 300.0):
+        return RetentionReport(skipped=True)
+    with session_scope() as connection:
+        run = crud.create_run(connection, triggered_by="system", run_type="retention")
+    report = RetentionReport(run_id=run.id)
+    try:
+        with lease_service.LeaseKeeper(RETENTION_LEASE, owner, 300.0):
+            _Sweep(settings, now, report).run()
+    except Exception as exc:
+        with session_scope() as connection:
+            crud.finish_run(connection, run, status="failed", error=str(exc))
+        logger.error("retention_sweep_failed", error=str(exc))
+        raise
+    finally:
+        lease_service.release(RETENTION_LEASE, owner)
+    with session_scope() as connection:
+        crud.finish_run(connection, run, status="success")
+    logger.info(
+        "retention_sweep_finished",
+        deleted=report.deleted,
+        archived=report.archived,
+        bundles_removed=report.bundles_removed,
+        bytes_reclaimed=report.bytes_reclaimed,
+    )
+    return report
+
+
+def usage(settings: Optional[Settings] = None) -> dict:
+    settings = settings or get_settings()
+    with session_scope() as connection:
+        live_bytes = crud.live_artifact_bytes(connection)
+        artifacts = crud.count_artifacts(connection)
+    bundles = _bundles(settings)
+    return {
+        "artifacts": artifacts,
+        "live_bytes": live_bytes,
+        "bundles": len(bundles),
+        "bundle_bytes": sum(path.stat().st_size for path in bundles),
+        "policy": {
+            "max_age_days": settings.artifact_max_age_days,
+            "keep_per_job": settings.artifact_keep_per_job,
+            "max_total_bytes": settings.artifact_max_total_bytes,
+            "archive_after_days": settings.artifact_archive_after_days,
+        },
+    }
+
+
+class _Sweep:
+    def __init__(self, settings: Settings, now: datetime, report: RetentionReport) -> None:
+        self.settings = settings
+        self.now = now
+        self.report = report
+        self.archive_root = settings.artifacts_root / ARCHIVE_DIRNAME
+
+    def run(self) -> None:
+        if self.settings.artifact_max_age_days:
+            cutoff = self.now - timedelta(days=self.settings.artifact_max_age_days)
+            self._drain(
+                lambda connection: crud.list_artifacts_created_before(
+                    connection, created_before=cutoff, limit=BATCH_SIZE
+                )
+            )
+        if self.settings.artifact_keep_per_job:
+            self._drain(
+                lambda connection: crud.list_excess_artifacts(
+                    connection, keep_per_job=self.settings.artifact_keep_per_job, limit=BATCH_SIZE
+                )
+            )
+        if self.settings.artifact_archive_after_days:
+            self._archive(self.now - timedelta(days=self.settings.artifact_archive_after_days))
+        if self.settings.artifact_max_total_bytes:
+            self._enforce_quota(self.settings.artifact_max_total_bytes)
+
+    def _drain(self, select) -> None:
+        while True:
+            with session_scope() as connection:
+                batch = select(connection)
+            if not batch:
+                return
+            self._delete(batch)
+
+    def _delete(self, artifacts: list[models.Artifact]) -> None:
+        with session_scope() as connection:
+            crud.delete_artifact_records(connection, [artifact.id for artifact in artifacts])
+        for artifact in artifacts:
+            if artifact.archive_path is None:
+                self.report.bytes_reclaimed += _unlink(Path(artifact.path))
+        self.report.deleted += len(artifacts)
+        self._cleanup_folders({artifact.folder for artifact in artifacts})
+        self._cleanup_bundles({artifact.archive_path for artifact in artifacts if artifact.archive_path})
+
+    def _archive(self, cutoff: datetime) -> None:
+        """Pack live artifacts created before ``cutoff`` into per-month bundles.
+
+        Every cold artifact is gathered first, so each bundle is copied and
+        replaced once per sweep however many artifacts it receives.
+        """
+
+        self.archive_root.mkdir(parents=True, exist_ok=True)
+        writers: dict[Path, _BundleWriter] = {}
+        folders: set[str] = set()
+        try:
+            after_id = 0
+            while True:
+                with session_scope() as connection:
+                    batch = crud.list_artifacts_created_before(
+                        connection, created_before=cutoff, limit=BATCH_SIZE, live_only=True, after_id=after_id
+                    )
+                if not batch:
+                    break
+                after_id = batch[-1].id
+                for artifact in batch:
+                    bundle = self.archive_root / f"{(artifact.created_at or self.now).strftime('%Y-%m')}.zip"
+                    writer = writers.get(bundle)
+                    if writer is None:
+                        writer = writers[bundle] = _BundleWriter(bundle)
+                    writer.add(artifact)
+                    folders.add(artifact.folder)
+            for writer in writers.values():
+                self._commit_bundle(writer)
+        finally:
+            for writer in writers.values():
+                writer.discard()
+        self._cleanup_folders(folders)
+
+    def _commit_bundle(self, writer: _BundleWriter) -> None:
+        """Replace the bundle with its extended copy, then retire the packed originals."""
+
+        writer.replace()
+        with session_scope() as connection:
+            for artifact_id, _, member in writer.packed:
+                crud.mark_artifact_archived(
+                    connection, artifact_id, archive_path=str(writer.bundle), archive_member=member
+                )
+            crud.delete_artifact_records(connection, writer.missing)
+        freed = sum(_unlink(Path(path)) for _, path, _ in writer.packed)
+        self.report.archived += len(writer.packed)
+        self.report.deleted += len(writer.missing)
+        self.report.bytes_reclaimed += freed - (writer.bundle.stat().st_size - writer.before)
+
+    def _enforce_quota(self, limit: int) -> None:
+        while True:
+            with session_scope() as connection:
+                live_bytes = crud.live_artifact_bytes(connection)
+            bundles = _bundles(self.settings)
+            total = live_bytes + sum(path.stat().st_size for path in bundles)
+            if total <= limit:
+                return
+            with session_scope() as connection:
+                oldest = crud.list_oldest_live_artifacts(connection, limit=BATCH_SIZE)
+            if oldest:
+                excess = total - limit
+                victims: list[models.Artifact] = []
+                for artifact in oldest:
+                    victims.append(artifact)
+                    excess -= artifact.size
+                    if excess <= 0:
+                        break
+                self._delete(victims)
+            elif bundles:
+                self._remove_bundle(bundles[0])
+            else:
+                return
+
+    def _remove_bundle(self, bundle: Path) -> None:
+        with session_scope() as connection:
+            self.report.deleted += crud.delete_bundle_artifact_records(connection, str(bundle))
+        self.report.bytes_reclaimed += _unlink(bundle)
+        self.report.bundles_removed += 1
+
+    def _cleanup_bundles(self, bundles: Iterable[str]) -> None:
+        for bundle in bundles:
+            with session_scope() as connection:
+                remaining = crud.count_bundle_artifacts(connection, bundle)
+            if not remaining:
+                self._remove_bundle(Path(bundle))
+
+    def _cleanup_folders(self, folders: Iterable[str]) -> None:
+        """Remove company/job folders that no longer hold any live artifact."""
+
+        for folder in folders:
+            with session_scope() as connection:
+                remaining = crud.count_live_folder_artifacts(connection, folder)
+            if remaining:
+                continue
+            path = self.settings.artifacts_root / folder
+            self.report.bytes_reclaimed += _unlink(path / "meta.json")
+            try:
+                path.rmdir()
+            except OSError:
+                pass
+
+
+class _BundleWriter:
+    """Extends a month bundle on a temporary copy that atomically replaces it.
+
+    Concurrent downloads keep reading the old bundle until :meth:`replace`,
+    so they never see a half-written archive.
+    """
+
+    def __init__(self, bundle: Path) -> None:
+        self.bundle = bundle
+        self.before = bundle.stat().st_size if bundle.exists() else 0
+        handle, temp_name = tempfile.mkstemp(dir=bundle.parent, suffix=".zip.tmp")
+        os.close(handle)
+        self.temp_path = Path(temp_name)
+        self.packed: list[tuple[int, str, str]] = []
+        self.missing: list[int] = []
+        if self.before:
+            shutil.copyfile(bundle, self.temp_path)
+        self._archive: Optional[ZipFile] = ZipFile(
+            self.temp_path, "a" if self.before else "w", compression=ZIP_DEFLATED
+        )
+        self._members = set(self._archive.namelist())
+
+    def add(self, artifact: models.Artifact) -> None:
+        member = f"{artifact.folder}/{artifact.file_name}"
+        if not Path(artifact.path).is_file():
+            self.missing.append(artifact.id)
+            return
+        if member not in self._members:
+            self._archive.write(artifact.path, member)
+            self._members.add(member)
+        self.packed.append((artifact.id, artifact.path, member))
+
+    def replace(self) -> None:
+        self._close()
+        os.replace(self.temp_path, self.bundle)
+
+    def discard(self) -> None:
+        self._close()
+        self.temp_path.unlink(missing_ok=True)
+
+    def _close(self) -> None:
+        if self._archive is not None:
+            self._archive.close()
+            self._archive = None
+
+
+def _bundles(settings: Settings) -> list[Path]:
+    archive_root = settings.artifacts_root / ARCHIVE_DIRNAME
+    if not archive_root.is_dir():
+        return []
+    return sorted(archive_root.glob("*.zip"))
+
+
+def _unlink(path: Path) -> int:
+    try:
+        size = path.stat().st_size
+        path.unlink()
+    except FileNotFoundError:
+        return 0
+    return size
+
+
+class RetentionSweeper:
+    """Run :func:`sweep` every ``artifact_sweep_interval`` seconds on a daemon thread."""
+
+    def __init__(self) -> None:
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    def start(self) -> None:
+        settings = get_settings()
+        if self._thread is not None or not settings.retention_enabled:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._loop, args=(settings.artifact_sweep_interval,), name="artifact-retention", daemon=True
+        )
+        self._thread.start()
+        logger.info("retention_sweeper_started", interval=settings.artifact_sweep_interval)
+
+    def shutdown(self) -> None:
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join(timeout=5)
+        self._thread = None
+
+    def _loop(self, interval: float) -> None:
+        while not self._stop.wait(interval):
+            started = time.monotonic()
+            try:
+                sweep()
+            except Exception as exc:  # pragma: no cover - logged and retried next interval
+                logger.error("retention_sweeper_error", error=str(exc))
+            logger.info("retention_sweeper_tick", seconds=round(time.monotonic() - started, 3))
+
+
+retention_sweeper = RetentionSweeper()
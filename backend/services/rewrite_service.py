@@ -2,16 +2,28 @@ from __future__ import annotations
 
 import json
 import logging
+from contextlib import contextmanager
+from contextvars import ContextVar
 from dataclasses import dataclass
+from functools import lru_cache
 from hashlib import sha256
-from typing import Protocol
+from typing import Any, Iterator, Optional, Protocol
 
 import structlog
 
 from ..config import get_settings
+from ..utils import spans
+from ..utils.metrics import REGISTRY
 
 logger = structlog.get_logger(__name__)
 
+MODEL_CALLS = REGISTRY.counter(
+    "fitresume_model_calls_total", "Model calls made while tailoring.", ("model", "stage")
+)
+MODEL_TOKENS = REGISTRY.counter(
+    "fitresume_model_tokens_total", "Tokens reported by the model API.", ("model", "kind")
+)
+
 SYSTEM_PROMPT = "You are a professional resume editor. Do not invent employers, roles, skills, or dates. Keep ATS-friendly formatting."
 PLAN_PROMPT = (
     "Given the job posting and resume text, produce a JSON plan with keys summary, skills, experience, "
@@ -33,101 +45,213 @@ class RewriteResult:
     mock: bool = False
 
 
+@dataclass
+class ModelUsage:
+    """Model calls and tokens spent inside a :func:`metering` block."""
+
+    calls: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    total_tokens: int = 0
+
+    def token_usage(self) -> dict:
+        return {
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "total_tokens": self.total_tokens,
+        }
+
+
+_meter: ContextVar[Optional[ModelUsage]] = ContextVar("model_usage", default=None)
+
+
+@contextmanager
+def metering() -> Iterator[ModelUsage]:
+    """Count the model calls this context actually makes.
+
+    Plan-cache hits and callers that join another caller's single flight
+    make no calls of their own, so they meter zero.
+    """
+
+    usage = ModelUsage()
+    token = _meter.set(usage)
+    try:
+        yield usage
+    finally:
+        _meter.reset(token)
+
+
+@dataclass
+class RewriteEvent:
+    """Incremental progress emitted while a rewrite is streaming.
+
+    ``stage`` is one of ``plan_started``, ``plan_token``, ``render_started``,
+    ``render_token`` or ``completed``.  Token events carry the text ``delta``
+    received from the model; the final ``completed`` event carries the
+    assembled :class:`RewriteResult`.
+    """
+
+    stage: str
+    delta: str = ""
+    result: RewriteResult | None = None
+
+
 class RewriteService(Protocol):
+    model_name: str
+
     def rewrite(self, resume_text: str, job_text: str) -> RewriteResult:
         ...
 
+    def stream_rewrite(self, resume_text: str, job_text: str) -> Iterator[RewriteEvent]:
+        ...
+
 
 class MockRewriteService:
     model_name = "mock"
 
     def rewrite(self, resume_text: str, job_text: str) -> RewriteResult:  # noqa: D401
         logger.info("mock_rewrite", resume_length=len(resume_text), job_length=len(job_text))
-        plan = {
-            "summary": "[MOCK OUTPUT] Tailored summary based on provided resume and job description.",
-            "skills": ["[MOCK OUTPUT] Skill A", "Skill B"],
-            "experience": [
-                {
-                    "employer": "Current Employer",
-                    "role": "Relevant Role",
-                    "start": "2020",
-                    "end": "Present",
-                    "bullets": [
-                        "Aligned achievements with job posting keywords.",
-                        "Demonstrated leadership and impact in relevant projects.",
-                    ],
-                }
-            ],
-            "education": ["Degree, University"],
-            "certifications": ["Certification"]
-        }
-        rendered = _render_from_plan(plan)
-        prompt_hash = sha256((resume_text + job_text).encode()).hexdigest()
+        with spans.span("plan"):
+            plan = {
+                "summary": "[MOCK OUTPUT] Tailored summary based on provided resume and job description.",
+                "skills": ["[MOCK OUTPUT] Skill A", "Skill B"],
+                "experience": [
+                    {
+                        "employer": "Current Employer",
+                        "role": "Relevant Role",
+                        "start": "2020",
+                        "end": "Present",
+                        "bullets": [
+                            "Aligned achievements with job posting keywords.",
+                            "Demonstrated leadership and impact in relevant projects.",
+                        ],
+                    }
+                ],
+                "education": ["Degree, University"],
+                "certifications": ["Certification"]
+            }
+        with spans.span("render"):
+            rendered = _render_from_plan(plan)
+        _record_model_call(self.model_name, "plan", None)
+        _record_model_call(self.model_name, "render", None)
+        prompt_hash = compute_prompt_hash(resume_text, job_text)
         return RewriteResult(plan=plan, rendered_text=rendered, model_name=self.model_name, prompt_hash=prompt_hash, mock=True)
 
+    def stream_rewrite(self, resume_text: str, job_text: str) -> Iterator[RewriteEvent]:
+        result = self.rewrite(resume_text, job_text)
+        yield RewriteEvent("plan_started")
+        for chunk in _chunk_text(json.dumps(result.plan)):
+            yield RewriteEvent("plan_token", delta=chunk)
+        yield RewriteEvent("render_started")
+        for chunk in _chunk_text(result.rendered_text):
+            yield RewriteEvent("render_token", delta=chunk)
+        yield RewriteEvent("completed", result=result)
+
 
 class OpenAIRewriteService:
-    def __init__(self, api_key: str) -> None:
+    def __init__(self, api_key: str, *, base_url: str | None = None, model_name: str = "gpt-4o-mini") -> None:
         from openai import OpenAI
 
-        self.client = OpenAI(api_key=api_key)
-        self.model_name = "gpt-4o-mini"
+        self.client = OpenAI(api_key=api_key, base_url=base_url)
+        self.model_name = model_name
 
     def rewrite(self, resume_text: str, job_text: str) -> RewriteResult:
-        prompt_hash = sha256((resume_text + job_text).encode()).hexdigest()
-        plan_response = self.client.responses.create(
-            model=self.model_name,
-            input=[
-                {
-                    "role": "system",
-                    "content": SYSTEM_PROMPT,
-                },
-                {
-                    "role": "user",
-                    "content": f"{PLAN_PROMPT}\nJob Posting:\n{job_text}\nResume:\n{resume_text}",
-                },
-            ],
-            response_format={"type": "json_object"},
-        )
-        plan_text = plan_response.output[0].content[0].text
-        plan = json.loads(plan_text)
+        prompt_hash = compute_prompt_hash(resume_text, job_text)
+        with spans.span("plan"):
+            plan_response = self.client.responses.create(
+                model=self.model_name,
+                input=_plan_input(resume_text, job_text),
+                response_format={"type": "json_object"},
+            )
+            plan_text = plan_response.output[0].content[0].text
+            plan = json.loads(plan_text)
+        _record_model_call(self.model_name, "plan", getattr(plan_response, "usage", None))
 
-        render_response = self.client.responses.create(
-            model=self.model_name,
-            input=[
-                {
-                    "role": "system",
-                    "content": SYSTEM_PROMPT,
-                },
-                {
-                    "role": "user",
-                    "content": f"{RENDER_PROMPT}\nPlan JSON:\n{json.dumps(plan)}",
-                },
-            ],
-        )
-        rendered_text = render_response.output[0].content[0].text
-        token_usage = getattr(render_response, "usage", None)
-        token_data = None
-        if token_usage:
-            token_data = {
-                "total_tokens": token_usage.total_tokens,
-                "prompt_tokens": token_usage.prompt_tokens,
-                "completion_tokens": token_usage.completion_tokens,
-            }
+        with spans.span("render"):
+            render_response = self.client.responses.create(
+                model=self.model_name,
+                input=_render_input(plan),
+            )
+            rendered_text = render_response.output[0].content[0].text
+        _record_model_call(self.model_name, "render", getattr(render_response, "usage", None))
         return RewriteResult(
             plan=plan,
             rendered_text=rendered_text,
             model_name=self.model_name,
             prompt_hash=prompt_hash,
-            token_usage=token_data,
+            token_usage=_token_data(getattr(render_response, "usage", None)),
+        )
+
+    def stream_rewrite(self, resume_text: str, job_text: str) -> Iterator[RewriteEvent]:
+        prompt_hash = compute_prompt_hash(resume_text, job_text)
+        yield RewriteEvent("plan_started")
+        plan_parts: list[str] = []
+        for delta, _ in self._stream_text(
+            _plan_input(resume_text, job_text),
+            stage="plan",
+            response_format={"type": "json_object"},
+        ):
+            if delta:
+                plan_parts.append(delta)
+                yield RewriteEvent("plan_token", delta=delta)
+        plan = json.loads("".join(plan_parts))
+
+        yield RewriteEvent("render_started")
+        render_parts: list[str] = []
+        usage = None
+        for delta, usage in self._stream_text(_render_input(plan), stage="render"):
+            if delta:
+                render_parts.append(delta)
+                yield RewriteEvent("render_token", delta=delta)
+        yield RewriteEvent(
+            "completed",
+            result=RewriteResult(
+                plan=plan,
+                rendered_text="".join(render_parts),
+                model_name=self.model_name,
+                prompt_hash=prompt_hash,
+                token_usage=_token_data(usage),
+            ),
         )
 
+    def _stream_text(self, input_messages: list[dict], *, stage: str, **kwargs: Any) -> Iterator[tuple[str, Any]]:
+        """Yield ``(delta, usage)`` pairs from a streamed Responses API call.
+
+        ``usage`` stays ``None`` until the ``response.completed`` event arrives,
+        at which point a final pair with an empty delta is emitted.
+        """
+
+        stream = self.client.responses.create(
+            model=self.model_name,
+            input=input_messages,
+            stream=True,
+            **kwargs,
+        )
+        for event in stream:
+            event_type = getattr(event, "type", "")
+            if event_type == "response.output_text.delta":
+                yield event.delta, None
+            elif event_type == "response.completed":
+                usage = getattr(event.response, "usage", None)
+                _record_model_call(self.model_name, stage, usage)
+                yield "", usage
+
+
+def compute_prompt_hash(resume_text: str, job_text: str) -> str:
+    return sha256((resume_text + job_text).encode()).hexdigest()
+
 
 def get_rewrite_service() -> RewriteService:
     settings = get_settings()
-    if settings.openai_api_key:
+    return _rewrite_service(settings.openai_api_key, settings.openai_base_url, settings.openai_model)
+
+
+@lru_cache(maxsize=4)
+def _rewrite_service(api_key: str | None, base_url: str | None, model_name: str) -> RewriteService:
+    # One service (and so one HTTP client and connection pool) per configuration, shared by all requests.
+    if api_key:
         try:
-            return OpenAIRewriteService(settings.openai_api_key)
+            return OpenAIRewriteService(api_key, base_url=base_url, model_name=model_name)
         except Exception as exc:  # pragma: no cover - openai configuration errors
             logging.getLogger(__name__).warning("Failed to init OpenAI service, using mock", exc_info=exc)
     return MockRewriteService()
@@ -149,3 +273,56 @@ def _render_from_plan(plan: dict) -> str:
     sections.append("Education\n" + "\n".join(plan.get("education", [])))
     sections.append("Certifications\n" + "\n".join(plan.get("certifications", [])))
     return "\n\n".join(section.strip() for section in sections if section)
+
+
+def _plan_input(resume_text: str, job_text: str) -> list[dict]:
+    return [
+        {
+            "role": "system",
+            "content": SYSTEM_PROMPT,
+        },
+        {
+            "role": "user",
+            "content": f"{PLAN_PROMPT}\nJob Posting:\n{job_text}\nResume:\n{resume_text}",
+        },
+    ]
+
+
+def _render_input(plan: dict) -> list[dict]:
+    return [
+        {
+            "role": "system",
+            "content": SYSTEM_PROMPT,
+        },
+        {
+            "role": "user",
+            "content": f"{RENDER_PROMPT}\nPlan JSON:\n{json.dumps(plan)}",
+        },
+    ]
+
+
+def _record_model_call(model_name: str, stage: str, token_usage: Any) -> None:
+    MODEL_CALLS.inc(model=model_name, stage=stage)
+    usage = _meter.get()
+    if usage is not None:
+        usage.calls += 1
+    for kind, count in (_token_data(token_usage) or {}).items():
+        if count:
+            MODEL_TOKENS.inc(count, model=model_name, kind=kind.removesuffix("_tokens"))
+            if usage is not None:
+                setattr(usage, kind, getattr(usage, kind) + count)
+
+
+def _token_data(token_usage: Any) -> dict | None:
+    if not token_usage:
+        return None
+    return {
+        "total_tokens": token_usage.total_tokens,
+        "prompt_tokens": token_usage.prompt_tokens,
+        "completion_tokens": token_usage.completion_tokens,
+    }
+
+
+def _chunk_text(text: str, size: int = 32) -> Iterator[str]:
+    for start in range(0, len(text), size):
+        yield text[start : start + size]
@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Mapping, Optional
+
+
+class CriteriaError(ValueError):
+    """Raised for ``criteria_json`` documents that cannot be applied."""
+
+
+_TEXT_KEYS = ("company", "title", "location")
+
+
+@dataclass(frozen=True)
+class ScheduleCriteria:
+    """Which job postings and resumes a schedule tailors.
+
+    ``criteria_json`` accepts these keys, all optional::
+
+        {
+            "company": ["Acme", "Globex"],         # substring of the company name
+            "title": ["python", "data"],           # substring of the title
+            "location": "remote",                  # substring of the location
+            "collected_within_days": 7,            # relative collected_at window
+            "collected_after": "2026-01-01T00:00:00+00:00",
+            "collected_before": "2026-07-01T00:00:00+00:00",
+            "resume_ids": [3, 5],                  # defaults to the newest resume
+            "max_jobs": 100                        # cap on postings per run
+        }
+
+    The text keys match like the batch ``job_filter`` (case-insensitive
+    substrings) and also take a list, which matches if any value does.
+    Different keys are combined with AND.
+    """
+
+    company: tuple[str, ...] = ()
+    title: tuple[str, ...] = ()
+    location: tuple[str, ...] = ()
+    collected_within_days: Optional[int] = None
+    collected_after: Optional[datetime] = None
+    collected_before: Optional[datetime] = None
+    resume_ids: tuple[int, ...] = ()
+    max_jobs: Optional[int] = None
+
+    @classmethod
+    def parse(cls, data: Optional[Mapping[str, Any]]) -> "ScheduleCriteria":
+        if not data:
+            return cls()
+        if not isinstance(data, Mapping):
+            raise CriteriaError("Schedule criteria must be a JSON object")
+        unknown = set(data) - set(cls.__dataclass_fields__)
+        if unknown:
+            allowed = ", ".join(cls.__dataclass_fields__)
+            raise CriteriaError(f"Unknown schedule criteria {sorted(unknown)}; expected any of: {allowed}")
+        values: dict[str, Any] = {key: _strings(key, data[key]) for key in _TEXT_KEYS if key in data}
+        for key in ("collected_within_days", "max_jobs"):
+            if data.get(key) is not None:
+                values[key] = _positive_int(key, data[key])
+        for key in ("collected_after", "collected_before"):
+            if data.get(key) is not None:
+                values[key] = _timestamp(key, data[key])
+        if data.get("resume_ids") is not None:
+            ids = data["resume_ids"]
+            if not isinstance(ids, list):
+                raise CriteriaError("resume_ids must be a list of resume ids")
+            values["resume_ids"] = tuple(_positive_int("resume_ids", value) for value in ids)
+        return cls(**values)
+
+    def job_filters(self, now: Optional[datetime] = None) -> dict[str, Any]:
+        """Keyword arguments for :func:`backend.crud.list_job_postings_after`."""
+
+        collected_after = self.collected_after
+        if self.collected_within_days:
+            window_start = (now or datetime.now(timezone.utc)) - timedelta(days=self.collected_within_days)
+            collected_after = max(collected_after, window_start) if collected_after else window_start
+        return {
+            "company": self.company,
+            "title": self.title,
+            "location": self.location,
+            "collected_after": collected_after,
+            "collected_before": self.collected_before,
+        }
+
+
+def _strings(key: str, value: Any) -> tuple[str, ...]:
+    items = [value] if isinstance(value, str) else value
+    if not isinstance(items, list) or not all(isinstance(item, str) for item in items):
+        raise CriteriaError(f"{key} must be a string or a list of strings")
+    return tuple(item.strip() for item in items if item.strip())
+
+
+def _positive_int(key: str, value: Any) -> int:
+    if isinstance(value, bool) or not isinstance(value, int) or value <= 0:
+        raise CriteriaError(f"{key} must be a positive integer")
+    return value
+
+
+def _timestamp(key: str, value: Any) -> datetime:
+    try:
+        moment = datetime.fromisoformat(str(value))
+    except ValueError as exc:
+        raise CriteriaError(f"{key} must be an ISO 8601 timestamp") from exc
+    return moment if moment.tzinfo else moment.replace(tzinfo=timezone.utc)
@@ -1,87 +1,738 @@
 from __future__ import annotations
 
+import hashlib
+import heapq
+import os
+import socket
+import threading
+import time
+import uuid
+from collections import deque
+from contextvars import copy_context
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from itertools import islice
+from pathlib import Path
+from typing import Optional
+
 import structlog
 
-from .. import crud
+from .. import crud, models
+from ..config import get_settings
 from ..db import session_scope
-from .artifact_service import ArtifactService
-from .rewrite_service import get_rewrite_service
+from ..utils import spans
+from ..utils.metrics import REGISTRY
+from . import app_service, lease_service
+from .cron import CronError, CronExpression, parse_cron
+from .schedule_criteria import ScheduleCriteria
 
 
 logger = structlog.get_logger(__name__)
 
+OCCURRENCE_LEASE_PREFIX = "schedule:"
+# Leases swept by the scheduler once expired: its own occurrence claims and
+# the single-flight leases of tailoring runs.
+LEASE_PREFIXES = (OCCURRENCE_LEASE_PREFIX, app_service.TAILOR_LEASE_PREFIX)
+# Upper bound on occurrences enumerated when catching up after downtime.
+MAX_CATCH_UP = 1000
+
+SCHEDULE_LAG_SECONDS = REGISTRY.histogram(
+    "fitresume_scheduler_lag_seconds",
+    "Delay between an occurrence's jittered due time and the start of its run.",
+    buckets=(0.1, 0.5, 1.0, 5.0, 15.0, 30.0, 60.0, 120.0, 300.0, 900.0, 3600.0),
+)
+SCHEDULE_MISFIRES = REGISTRY.counter(
+    "fitresume_scheduler_misfires_total", "Schedule occurrences skipped, by reason.", ("reason",)
+)
+
+
+@dataclass
+class _FanOutReport:
+    jobs: int = 0
+    pairs: int = 0
+    failed: int = 0
+
+
+@dataclass
+class _Entry:
+    revision: int
+    cron: Optional[CronExpression]
+    grace: float
+    jitter: float
+    coalesce: bool
+    next_fire: Optional[datetime] = None
+    next_due: Optional[datetime] = None
+
+    def schedule_next(self, schedule_id: int, fire_at: Optional[datetime]) -> None:
+        self.next_fire = fire_at
+        self.next_due = fire_at + _jitter(schedule_id, fire_at, self.jitter) if fire_at else None
+
 
 class SchedulerService:
-    """Lightweight scheduler facade used in the test environment.
-
-    The original project relied on APScheduler for cron style execution.
-    Those dependencies are not available in the execution environment so we
-    provide a greatly simplified implementation that can synchronise schedules
-    from the database and execute them immediately on demand.  This keeps the
-    service surface compatible with the rest of the code base and exercises the
-    same data paths during the automated tests.
+    """Fire enabled schedules when their cron expressions come due.
+
+    Next fire times live in a min-heap keyed by time, and a single daemon
+    thread sleeps until the earliest one, so each fire costs O(log n)
+    however many schedules exist.  Entries replaced by :meth:`sync_schedules`
+    are left in the heap and skipped when they surface.
+
+    Misfires follow per-schedule policy (defaults from settings):
+
+    * each occurrence is delayed by a deterministic offset of up to
+      ``jitter_seconds``, so hundreds of ``0 8 * * *`` schedules do not hit
+      the model API in the same second;
+    * an occurrence that cannot start within ``misfire_grace_seconds`` of its
+      due time is dropped and counted in ``misfire_count``;
+    * with ``coalesce`` several overdue occurrences collapse into one run;
+    * occurrences missed while every node was down are caught up (within
+      the grace period) when a scheduler first loads the schedule;
+    * an occurrence is skipped while ``max_instances`` runs of the schedule
+      are already running anywhere.
+
+    Every app instance runs its own scheduler against the shared database,
+    so each occurrence is claimed through a lease named after the schedule
+    and fire time (see :meth:`claim_occurrence`) and exactly one node runs
+    it.  A node only claims while one of its ``scheduler_max_runs`` slots is
+    free, so busy nodes leave occurrences to idle ones and work spreads
+    across the cluster.  The winner renews the lease while the run lasts and
+    marks it complete afterwards; if it dies instead, the lease expires and
+    a node that lost the race takes the occurrence over.
     """
 
+    HEARTBEAT_INTERVAL = 10.0
+    STALE_AFTER = 60.0
+    JOB_PAGE_SIZE = 50
+    OCCURRENCE_TTL = 60.0
+    # Completed occurrence leases are kept this long so nodes whose clocks
+    # lag behind still see that the occurrence already ran.
+    OCCURRENCE_KEEP = 86400.0
+    # How often a node with no free run slot re-checks for one.
+    BUSY_POLL_INTERVAL = 1.0
+
     def __init__(self) -> None:
-        self.rewrite_service = get_rewrite_service()
-        self.artifact_service = ArtifactService()
         self.started = False
+        self._entries: dict[int, _Entry] = {}
+        self._heap: list[tuple[datetime, int, int]] = []
+        self._wakeup = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self.node_id = f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+        # Occurrences (schedule_id, fire_at, due_at) waiting for a free run
+        # slot, and (check_at, schedule_id, fire_at) for occurrences to look at
+        # later: jittered catch-ups and ones another node holds.
+        self._ready: deque[tuple[int, datetime, datetime]] = deque()
+        self._deferred: list[tuple[float, int, datetime]] = []
+        self._slots = threading.BoundedSemaphore(max(get_settings().scheduler_max_runs, 1))
+        self._runner: Optional[ThreadPoolExecutor] = None
+        self._manual_runner: Optional[ThreadPoolExecutor] = None
 
     def start(self) -> None:
+        if self._thread is not None:
+            return
         self.started = True
-        logger.info("scheduler_started")
+        self.recover_stale_runs()
+        self._runner = ThreadPoolExecutor(
+            max_workers=max(get_settings().scheduler_max_runs, 1), thread_name_prefix="scheduled-run"
+        )
+        self._thread = threading.Thread(target=self._loop, name="scheduler", daemon=True)
+        self._thread.start()
+        logger.info("scheduler_started", node_id=self.node_id)
 
     def shutdown(self) -> None:
-        if self.started:
+        with self._wakeup:
+            manual, self._manual_runner = self._manual_runner, None
+        if manual is not None:
+            manual.shutdown(wait=False)
+        if not self.started:
+            return
+        with self._wakeup:
             self.started = False
-            logger.info("scheduler_stopped")
+            self._wakeup.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+        if self._runner is not None:
+            self._runner.shutdown(wait=False, cancel_futures=True)
+            self._runner = None
+        logger.info("scheduler_stopped")
 
-    def sync_schedules(self) -> None:  # pragma: no cover - not used in tests
-        logger.info("scheduler_sync")
+    def sync_schedules(self) -> int:
+        """Reload schedules whose revision changed since the last sync.
 
-    def run_now(self, schedule_id: int) -> None:
-        self._run_schedule(schedule_id)
+        Only ``(id, revision)`` pairs are read for the whole table; full rows
+        are fetched for new or edited schedules alone.  Returns how many
+        schedules were added, changed or dropped.
+        """
+
+        with session_scope() as connection:
+            revisions = crud.list_schedule_revisions(connection)
+            with self._wakeup:
+                changed = [
+                    schedule_id
+                    for schedule_id, revision in revisions.items()
+                    if schedule_id not in self._entries or self._entries[schedule_id].revision != revision
+                ]
+            schedules = crud.get_schedules(connection, changed) if changed else []
+        settings = get_settings()
+        now = _utcnow()
+        misfired: list[tuple[int, int, datetime]] = []
+        with self._wakeup:
+            removed = [schedule_id for schedule_id in self._entries if schedule_id not in revisions]
+            for schedule_id in removed:
+                del self._entries[schedule_id]
+            for schedule in schedules:
+                cron: Optional[CronExpression] = None
+                if schedule.is_enabled:
+                    try:
+                        cron = parse_cron(schedule.cron_expr)
+                    except CronError as exc:
+                        logger.warning("schedule_invalid_cron", schedule_id=schedule.id, error=str(exc))
+                entry = _Entry(
+                    revision=schedule.revision,
+                    cron=cron,
+                    grace=_or_default(schedule.misfire_grace_seconds, settings.scheduler_misfire_grace),
+                    jitter=_or_default(schedule.jitter_seconds, settings.scheduler_jitter),
+                    coalesce=schedule.coalesce,
+                )
+                if cron and schedule.last_fire_at and schedule.id not in self._entries:
+                    catch_up, dropped = _missed_occurrences(cron, schedule.last_fire_at, now, entry)
+                    for fire_at in catch_up:
+                        check_at = now + _jitter(schedule.id, fire_at, entry.jitter)
+                        heapq.heappush(self._deferred, (check_at.timestamp(), schedule.id, fire_at))
+                    if dropped:
+                        misfired.append((schedule.id, len(dropped), dropped[-1]))
+                entry.schedule_next(schedule.id, cron.next_after(now) if cron else None)
+                self._entries[schedule.id] = entry
+                if entry.next_due is not None:
+                    heapq.heappush(self._heap, (entry.next_due, schedule.id, schedule.revision))
+            if schedules or removed:
+                self._wakeup.notify_all()
+        for schedule_id, count, through in misfired:
+            self._record_misfires(schedule_id, count, through, reason="missed_while_down")
+        if schedules or removed:
+            logger.info("scheduler_sync", changed=len(schedules), removed=len(removed), active=len(self._entries))
+        return len(schedules) + len(removed)
+
+    def next_fire_time(self, schedule_id: int) -> Optional[datetime]:
+        """Return the nominal (unjittered) next fire time this node has queued."""
+
+        with self._wakeup:
+            entry = self._entries.get(schedule_id)
+            return entry.next_fire if entry else None
+
+    def run_now(self, schedule_id: int) -> Optional[int]:
+        """Run ``schedule_id`` on the calling thread and return the run id.
+
+        Like :meth:`trigger`, but waits for the run to finish.
+        """
+
+        schedule, run = self._start_run(schedule_id, triggered_by="user")
+        if run is None:
+            return None
+        self._complete_run(schedule, run)
+        return run.id
+
+    def trigger(self, schedule_id: int) -> Optional[int]:
+        """Start a manual run of ``schedule_id`` in the background and return its run id.
+
+        The run counts against ``max_instances`` like any occurrence, so a
+        trigger cannot overlap a cron fire of the same schedule beyond that
+        limit.  Returns None when the limit is reached; raises LookupError
+        for an unknown schedule.
+        """
+
+        schedule, run = self._start_run(schedule_id, triggered_by="user")
+        if schedule is None:
+            raise LookupError(f"Schedule {schedule_id} not found")
+        if run is None:
+            return None
+        with self._wakeup:
+            if self._manual_runner is None:
+                self._manual_runner = ThreadPoolExecutor(
+                    max_workers=max(get_settings().scheduler_max_runs, 1), thread_name_prefix="manual-run"
+                )
+            runner = self._manual_runner
+        runner.submit(self._complete_run, schedule, run)
+        return run.id
+
+    def claim_occurrence(self, schedule_id: int, fire_at: datetime) -> bool:
+        """Try to become the node that runs ``schedule_id`` at ``fire_at``.
+
+        Returns False when another node holds or already finished the
+        occurrence.  If it is still running elsewhere, a takeover check is
+        queued for when that node's lease would expire.
+        """
+
+        name = occurrence_lease_name(schedule_id, fire_at)
+        if lease_service.acquire(name, self.node_id, self.OCCURRENCE_TTL):
+            return True
+        lease = lease_service.get(name)
+        if lease is None:
+            # Released between the two calls: the holder gave it up.
+            return lease_service.acquire(name, self.node_id, self.OCCURRENCE_TTL)
+        if lease.completed_at is None:
+            with self._wakeup:
+                heapq.heappush(self._deferred, (lease.expires_at, schedule_id, fire_at))
+        return False
+
+    def execute_occurrence(self, schedule_id: int, fire_at: datetime) -> Optional[int]:
+        """Run a claimed occurrence while renewing its lease; return the run id.
+
+        Returns None without running when ``max_instances`` runs of the
+        schedule are already in progress on live nodes.
+        """
+
+        name = occurrence_lease_name(schedule_id, fire_at)
+        schedule, run = self._start_run(schedule_id, triggered_by="scheduler", scheduled_for=fire_at)
+        if run is None:
+            lease_service.complete(
+                name, self.node_id, keep_for=self.OCCURRENCE_KEEP, result={"node": self.node_id, "skipped": True}
+            )
+            if schedule is not None:
+                self._record_misfires(
+                    schedule_id, 1, fire_at, reason="max_instances", max_instances=schedule.max_instances
+                )
+            return None
+        try:
+            with lease_service.LeaseKeeper(name, self.node_id, self.OCCURRENCE_TTL) as keeper:
+                self._complete_run(schedule, run)
+        except Exception:
+            lease_service.release(name, self.node_id)
+            raise
+        if keeper.lost.is_set():
+            logger.warning("schedule_occurrence_lease_lost", schedule_id=schedule_id, fire_at=fire_at.isoformat())
+        else:
+            lease_service.complete(
+                name, self.node_id, keep_for=self.OCCURRENCE_KEEP, result={"node": self.node_id, "run_id": run.id}
+            )
+        return run.id
+
+    def recover_stale_runs(self) -> list[int]:
+        """Fail scheduled runs whose process died mid-run so they stop showing as running."""
+
+        with session_scope() as connection:
+            run_ids = crud.fail_stale_runs(connection, stale_before=time.time() - self.STALE_AFTER)
+        if run_ids:
+            logger.warning("scheduled_runs_recovered", run_ids=run_ids)
+        return run_ids
+
+    def purge_expired_leases(self) -> int:
+        """Delete expired occurrence and tailoring single-flight leases; return how many."""
+
+        now = time.time()
+        with session_scope() as connection:
+            return sum(crud.purge_expired_leases(connection, prefix=prefix, now=now) for prefix in LEASE_PREFIXES)
+
+    def _start_run(
+        self, schedule_id: int, *, triggered_by: str, scheduled_for: Optional[datetime] = None
+    ) -> tuple[Optional[models.Schedule], Optional[models.Run]]:
+        """Commit a ``running`` run row for the schedule unless ``max_instances`` are live.
+
+        Returns ``(schedule, run)``; ``run`` is None when the schedule is
+        missing or at its limit.  ``scheduled_for`` is the occurrence being
+        run, recorded with its lag and as the schedule's last fire.
+        """
 
-    def _run_schedule(self, schedule_id: int) -> None:
-        logger.info("schedule_trigger", schedule_id=schedule_id)
         with session_scope() as connection:
             schedule = crud.get_schedule(connection, schedule_id)
             if not schedule:
                 logger.warning("schedule_missing", schedule_id=schedule_id)
+                return None, None
+            lag = None
+            if scheduled_for is not None:
+                # Measured from the jittered due time: the jitter is deliberate, not lag.
+                jitter = _or_default(schedule.jitter_seconds, get_settings().scheduler_jitter)
+                due_at = scheduled_for + _jitter(schedule_id, scheduled_for, jitter)
+                lag = (_utcnow() - due_at).total_seconds()
+            now = time.time()
+            run = crud.start_schedule_run(
+                connection,
+                schedule_id,
+                max_instances=schedule.max_instances,
+                stale_before=now - self.STALE_AFTER,
+                triggered_by=triggered_by,
+                heartbeat_at=now,
+                scheduled_for=scheduled_for,
+                lag_seconds=lag,
+            )
+            if run is not None and scheduled_for is not None:
+                crud.record_schedule_fire(connection, schedule_id, scheduled_for)
+        if run is None:
+            logger.info("schedule_at_max_instances", schedule_id=schedule_id, max_instances=schedule.max_instances)
+            return schedule, None
+        logger.info("schedule_trigger", schedule_id=schedule_id, run_id=run.id, triggered_by=triggered_by)
+        if lag is not None:
+            SCHEDULE_LAG_SECONDS.observe(max(lag, 0.0))
+        return schedule, run
+
+    def _complete_run(self, schedule: models.Schedule, run: models.Run) -> None:
+        """Tailor the schedule's resumes against postings that arrived since its last run.
+
+        Postings come from ``criteria_json`` (see :class:`ScheduleCriteria`)
+        and are walked in id order from the schedule's high-water mark, so a
+        recurring run costs time proportional to new postings only.  Each
+        (resume, posting) pair runs on a bounded thread pool and commits its
+        own short transaction; the run row is committed as ``running`` up
+        front and its heartbeat refreshed while pairs execute, so a crashed
+        process is detected by :meth:`recover_stale_runs`.  The mark advances
+        page by page up to the first posting with a failed pair, which is
+        retried on the next run; pairs behind it that already succeeded are
+        reused rather than tailored again.  Stage timings are stored per pair
+        against its resume version and summed over the whole run against the
+        run.
+        """
+
+        with spans.recording() as recorder:
+            self._execute_run(schedule, run)
+        with session_scope() as connection:
+            crud.record_stage_timings(connection, recorder.totals(), run_id=run.id)
+
+    def _execute_run(self, schedule: models.Schedule, run: models.Run) -> None:
+        schedule_id = schedule.id
+        try:
+            criteria = ScheduleCriteria.parse(schedule.criteria_json)
+            with spans.span("db_read"), session_scope() as connection:
+                if criteria.resume_ids:
+                    resumes = crud.get_resumes(connection, list(criteria.resume_ids))
+                else:
+                    latest = crud.get_latest_resume(connection)
+                    resumes = [latest] if latest else []
+                ceiling = crud.max_job_posting_id(connection)
+            if not resumes:
+                with session_scope() as connection:
+                    crud.finish_run(connection, run, status="skipped", error="No resumes available")
+                logger.info("schedule_skipped", schedule_id=schedule_id, reason="no_resumes")
                 return
-            run = crud.create_run(connection, triggered_by="scheduler", run_type="scheduled")
-            try:
-                resumes = crud.list_resumes(connection)
-                jobs = crud.list_job_postings(connection)
-                resume = resumes[0] if resumes else None
-                job = jobs[0] if jobs else None
-                if not resume or not job:
-                    crud.finish_run(connection, run, status="skipped", error="No resumes or job postings available")
-                    logger.info("schedule_skipped", schedule_id=schedule_id)
-                    return
-                rewrite_result = self.rewrite_service.rewrite(
-                    resume.text or "", job.raw_text or job.title
-                )
-                artifact_path = self.artifact_service.create_artifact(
-                    company_name=job.company.name if job.company else "Unknown",
-                    job_key=f"{job.id}_{job.title}",
-                    rewrite_result=rewrite_result,
-                )
-                crud.create_resume_version(
-                    connection,
-                    resume=resume,
-                    job_posting=job,
-                    file_path=str(artifact_path),
-                    template_version=self.artifact_service.TEMPLATE_VERSION,
-                    model_name=rewrite_result.model_name,
-                    prompt_hash=rewrite_result.prompt_hash,
-                    token_usage=rewrite_result.token_usage,
-                )
-                crud.finish_run(connection, run, status="success")
-                logger.info("schedule_completed", schedule_id=schedule_id)
-            except Exception as exc:  # pragma: no cover - defensive logging path
+            with _RunHeartbeat(run.id, self.HEARTBEAT_INTERVAL):
+                report = self._fan_out(schedule, criteria, resumes, ceiling)
+        except Exception as exc:
+            with session_scope() as connection:
                 crud.finish_run(connection, run, status="failed", error=str(exc))
-                logger.error("schedule_error", schedule_id=schedule_id, error=str(exc))
+            logger.error("schedule_error", schedule_id=schedule_id, run_id=run.id, error=str(exc))
+            return
+        if report.failed:
+            status, error = "completed_with_errors", f"{report.failed} of {report.pairs} pairs failed"
+        elif report.pairs:
+            status, error = "success", None
+        else:
+            status, error = "skipped", "No new job postings match the schedule criteria"
+        with session_scope() as connection:
+            crud.finish_run(connection, run, status=status, error=error)
+        logger.info(
+            "schedule_completed",
+            schedule_id=schedule_id,
+            run_id=run.id,
+            jobs=report.jobs,
+            pairs=report.pairs,
+            failed=report.failed,
+        )
+
+    def _fan_out(
+        self,
+        schedule: models.Schedule,
+        criteria: ScheduleCriteria,
+        resumes: list[models.Resume],
+        ceiling: int,
+    ) -> "_FanOutReport":
+        report = _FanOutReport()
+        filters = criteria.job_filters(_utcnow())
+        after_id = schedule.last_job_posting_id
+        blocked = False
+        workers = max(get_settings().scheduler_workers, 1)
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"schedule-{schedule.id}") as pool:
+            while criteria.max_jobs is None or report.jobs < criteria.max_jobs:
+                size = self.JOB_PAGE_SIZE
+                if criteria.max_jobs is not None:
+                    size = min(size, criteria.max_jobs - report.jobs)
+                with spans.span("db_read"), session_scope() as connection:
+                    jobs = crud.list_job_postings_after(
+                        connection, after_id=after_id, up_to_id=ceiling, limit=size, **filters
+                    )
+                if not jobs:
+                    # Nothing else matches below the ceiling: skip the gap too.
+                    after_id = ceiling
+                    break
+                after_id = jobs[-1].id
+                report.jobs += len(jobs)
+                failed_jobs = self._tailor_page(pool, workers * 2, resumes, jobs, report)
+                if failed_jobs and not blocked:
+                    blocked = True
+                    self._advance(schedule.id, min(failed_jobs) - 1)
+                elif not blocked:
+                    self._advance(schedule.id, after_id)
+        if not blocked:
+            self._advance(schedule.id, after_id)
+        return report
+
+    def _tailor_page(
+        self,
+        pool: ThreadPoolExecutor,
+        max_in_flight: int,
+        resumes: list[models.Resume],
+        jobs: list[models.JobPosting],
+        report: "_FanOutReport",
+    ) -> set[int]:
+        """Run every (resume, job) pair with at most ``max_in_flight`` queued; return failed job ids."""
+
+        pairs = iter([(resume, job) for job in jobs for resume in resumes])
+        pending: dict[Future, int] = {}
+        failed_jobs: set[int] = set()
+        while True:
+            for resume, job in islice(pairs, max_in_flight - len(pending)):
+                # Each pair runs in a copy of this context so its spans reach the run's recorder.
+                pending[pool.submit(copy_context().run, self._tailor_pair, resume, job)] = job.id
+            if not pending:
+                return failed_jobs
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                job_id = pending.pop(future)
+                report.pairs += 1
+                try:
+                    future.result()
+                except Exception as exc:
+                    report.failed += 1
+                    failed_jobs.add(job_id)
+                    logger.error("schedule_pair_failed", job_posting_id=job_id, error=str(exc))
+
+    def _tailor_pair(self, resume: models.Resume, job: models.JobPosting) -> Path:
+        """Tailor one pair unless a version from identical inputs already exists.
+
+        The reuse check keeps postings that already succeeded from being
+        tailored again when a run retries from behind a failed posting.  New
+        work goes through :func:`app_service.tailor_pair`, sharing the plan
+        cache and single flight with user requests for the same pair.
+        """
+
+        with spans.span("db_read"), session_scope() as connection:
+            version = app_service.find_reusable_version(connection, resume, job)
+        if version is not None:
+            return Path(version.file_path)
+        with spans.recording() as recorder:
+            _, artifact_path, _ = app_service.tailor_pair(resume, job, recorder)
+        return artifact_path
+
+    def _advance(self, schedule_id: int, job_posting_id: int) -> None:
+        with session_scope() as connection:
+            crud.advance_schedule_watermark(connection, schedule_id, job_posting_id)
+
+    def _loop(self) -> None:
+        interval = get_settings().scheduler_sync_interval
+        last_sync = time.monotonic()
+        while True:
+            with self._wakeup:
+                if not self.started:
+                    return
+                delay = interval - (time.monotonic() - last_sync)
+                earliest = self._earliest()
+                if earliest is not None:
+                    delay = min(delay, (earliest - _utcnow()).total_seconds())
+                if self._deferred:
+                    delay = min(delay, self._deferred[0][0] - time.time())
+                if self._ready:
+                    delay = min(delay, self.BUSY_POLL_INTERVAL)
+                if delay > 0:
+                    self._wakeup.wait(delay)
+                if not self.started:
+                    return
+            try:
+                if time.monotonic() - last_sync >= interval:
+                    last_sync = time.monotonic()
+                    self.sync_schedules()
+                    self.recover_stale_runs()
+                    self.purge_expired_leases()
+                self._enqueue(self._pop_due(_utcnow()))
+                self._enqueue(self._pop_deferred(time.time()))
+                self._dispatch_ready()
+            except Exception as exc:  # pragma: no cover - keep the timer alive
+                logger.error("scheduler_loop_error", error=str(exc))
+
+    def _enqueue(self, occurrences: list[tuple[int, datetime, datetime]]) -> None:
+        """Queue occurrences for dispatch, collapsing overdue ones of coalescing schedules."""
+
+        coalesced: list[tuple[int, datetime]] = []
+        with self._wakeup:
+            for occurrence in occurrences:
+                entry = self._entries.get(occurrence[0])
+                if entry is not None and entry.coalesce:
+                    for queued in [item for item in self._ready if item[0] == occurrence[0]]:
+                        self._ready.remove(queued)
+                        coalesced.append((queued[0], queued[1]))
+                self._ready.append(occurrence)
+        for schedule_id, fire_at in coalesced:
+            self._record_misfires(schedule_id, 1, fire_at, reason="coalesced")
+
+    def _dispatch_ready(self) -> None:
+        """Claim and start ready occurrences while this node has free run slots."""
+
+        while self._ready and self._slots.acquire(blocking=False):
+            with self._wakeup:
+                schedule_id, fire_at, due_at = self._ready.popleft()
+                entry = self._entries.get(schedule_id)
+            if entry is None:
+                self._slots.release()
+                continue
+            late = (_utcnow() - due_at).total_seconds()
+            if late > entry.grace:
+                self._slots.release()
+                self._record_misfires(schedule_id, 1, fire_at, reason="late", late_seconds=round(late, 3))
+                continue
+            try:
+                claimed = self.claim_occurrence(schedule_id, fire_at)
+            except Exception as exc:
+                logger.error("schedule_claim_error", schedule_id=schedule_id, error=str(exc))
+                claimed = False
+            if not claimed:
+                self._slots.release()
+                continue
+            self._runner.submit(self._execute_in_slot, schedule_id, fire_at)
+
+    def _execute_in_slot(self, schedule_id: int, fire_at: datetime) -> None:
+        try:
+            self.execute_occurrence(schedule_id, fire_at)
+        except Exception as exc:  # pragma: no cover - _complete_run records its own failures
+            logger.error("schedule_occurrence_error", schedule_id=schedule_id, error=str(exc))
+        finally:
+            self._slots.release()
+            with self._wakeup:
+                self._wakeup.notify_all()
+
+    def _pop_deferred(self, now: float) -> list[tuple[int, datetime, datetime]]:
+        due: list[tuple[int, datetime, datetime]] = []
+        with self._wakeup:
+            while self._deferred and self._deferred[0][0] <= now:
+                _, schedule_id, fire_at = heapq.heappop(self._deferred)
+                if schedule_id in self._entries:
+                    due.append((schedule_id, fire_at, datetime.fromtimestamp(now, timezone.utc)))
+        return due
+
+    def _record_misfires(self, schedule_id: int, count: int, through: datetime, *, reason: str, **details) -> None:
+        with session_scope() as connection:
+            counted = crud.record_schedule_misfires(connection, schedule_id, count, through=through)
+        if counted:
+            SCHEDULE_MISFIRES.inc(count, reason=reason)
+            logger.warning(
+                "schedule_misfire", schedule_id=schedule_id, count=count, through=through.isoformat(), reason=reason, **details
+            )
+
+    def _earliest(self) -> Optional[datetime]:
+        """Return the earliest live fire time, discarding superseded heap entries."""
+
+        while self._heap:
+            due_at, schedule_id, revision = self._heap[0]
+            if self._is_current(due_at, schedule_id, revision):
+                return due_at
+            heapq.heappop(self._heap)
+        return None
+
+    def _pop_due(self, now: datetime) -> list[tuple[int, datetime, datetime]]:
+        """Pop every occurrence due at ``now`` as ``(schedule_id, fire_at, due_at)``.
+
+        Each schedule's following occurrence is queued in its place, so a
+        loop that fell behind sees every overdue occurrence within the grace
+        period; older ones are skipped outright.
+        """
+
+        due: list[tuple[int, datetime, datetime]] = []
+        with self._wakeup:
+            while self._heap and self._heap[0][0] <= now:
+                due_at, schedule_id, revision = heapq.heappop(self._heap)
+                if not self._is_current(due_at, schedule_id, revision):
+                    continue
+                entry = self._entries[schedule_id]
+                fire_at = entry.next_fire
+                following = entry.cron.next_after(fire_at)
+                horizon = now - timedelta(seconds=entry.grace)
+                if following < horizon:
+                    following = entry.cron.next_after(horizon)
+                entry.schedule_next(schedule_id, following)
+                heapq.heappush(self._heap, (entry.next_due, schedule_id, revision))
+                due.append((schedule_id, fire_at, due_at))
+        return due
+
+    def _is_current(self, due_at: datetime, schedule_id: int, revision: int) -> bool:
+        entry = self._entries.get(schedule_id)
+        return entry is not None and entry.revision == revision and entry.next_due == due_at
+
+
+class _RunHeartbeat:
+    """Refresh a run's heartbeat from a side thread while it does slow work."""
+
+    def __init__(self, run_id: int, interval: float) -> None:
+        self.run_id = run_id
+        self.interval = interval
+        self._done = threading.Event()
+        self._thread = threading.Thread(target=self._beat, daemon=True)
+
+    def __enter__(self) -> "_RunHeartbeat":
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self._done.set()
+        self._thread.join()
+
+    def _beat(self) -> None:
+        while not self._done.wait(self.interval):
+            try:
+                with session_scope() as connection:
+                    crud.heartbeat_run(connection, self.run_id, now=time.time())
+            except Exception as exc:  # pragma: no cover - heartbeat is best effort
+                logger.warning("run_heartbeat_error", run_id=self.run_id, error=str(exc))
+
+
+def _missed_occurrences(
+    cron: CronExpression, last_fire_at: datetime, now: datetime, entry: _Entry
+) -> tuple[list[datetime], list[datetime]]:
+    """Split occurrences after ``last_fire_at`` up to ``now`` into (to run, dropped)."""
+
+    horizon = now - timedelta(seconds=entry.grace)
+    dropped: list[datetime] = []
+    moment = cron.next_after(last_fire_at)
+    while moment < horizon and len(dropped) < MAX_CATCH_UP:
+        dropped.append(moment)
+        moment = cron.next_after(moment)
+    if moment < horizon:
+        moment = cron.next_after(horizon)
+    catch_up: list[datetime] = []
+    while moment <= now and len(catch_up) < MAX_CATCH_UP:
+        catch_up.append(moment)
+        moment = cron.next_after(moment)
+    if entry.coalesce and len(catch_up) > 1:
+        dropped.extend(catch_up[:-1])
+        catch_up = catch_up[-1:]
+    return catch_up, dropped
+
+
+def _jitter(schedule_id: int, fire_at: datetime, seconds: float) -> timedelta:
+    """A stable offset in ``[0, seconds)``, identical on every node for one occurrence."""
+
+    if seconds <= 0:
+        return timedelta(0)
+    digest = hashlib.sha256(f"{schedule_id}:{fire_at.isoformat()}".encode()).digest()
+    return timedelta(seconds=seconds * int.from_bytes(digest[:8], "big") / 2**64)
+
+
+def _or_default(value: Optional[int], default: int) -> float:
+    return float(default if value is None else value)
+
+
+def occurrence_lease_name(schedule_id: int, fire_at: datetime) -> str:
+    return f"{OCCURRENCE_LEASE_PREFIX}{schedule_id}:{fire_at.astimezone(timezone.utc):%Y-%m-%dT%H:%M}"
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
 
 
 scheduler_service = SchedulerService()
+
+REGISTRY.gauge(
+    "fitresume_scheduler_ready_occurrences",
+    "Due occurrences waiting for a free run slot on this node.",
+    callback=lambda: len(scheduler_service._ready),
+)
+REGISTRY.gauge(
+    "fitresume_scheduler_tracked_schedules",
+    "Schedules loaded into this node's timer heap.",
+    callback=lambda: len(scheduler_service._entries),
+)
@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Callable, Generic, Optional, TypeVar
+
+import structlog
+
+from . import lease_service
+
+
+logger = structlog.get_logger(__name__)
+
+T = TypeVar("T")
+
+
+@dataclass
+class _Call:
+    done: threading.Event = field(default_factory=threading.Event)
+    result: Any = None
+    error: Optional[BaseException] = None
+
+
+class SingleFlight(Generic[T]):
+    """Coalesce concurrent calls that share a key into one execution.
+
+    Within a process, the first caller for a key becomes the leader and the
+    others block on an event and receive the leader's result (or exception).
+    Across processes the leader additionally holds a row in the ``leases``
+    table; callers in other workers poll that row and rebuild the result from
+    the JSON the leader stores there on completion.  Completed leases are kept
+    for ``share_for`` seconds so callers that arrive just after the leader
+    finished also reuse its result.  If the leader dies its lease expires and
+    a waiting caller takes over.
+    """
+
+    def __init__(
+        self,
+        *,
+        serialize: Callable[[T], dict],
+        deserialize: Callable[[dict], T],
+        lease_ttl: float = 30.0,
+        share_for: float = 5.0,
+        poll_interval: float = 0.2,
+        timeout: float = 600.0,
+    ) -> None:
+        self.serialize = serialize
+        self.deserialize = deserialize
+        self.lease_ttl = lease_ttl
+        self.share_for = share_for
+        self.poll_interval = poll_interval
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._calls: dict[str, _Call] = {}
+
+    def run(self, key: str, fn: Callable[[], T]) -> T:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+        if not leader:
+            logger.info("single_flight_joined", key=key, scope="process")
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = self._run_across_workers(key, fn)
+            return call.result
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+
+    def _run_across_workers(self, key: str, fn: Callable[[], T]) -> T:
+        owner = uuid.uuid4().hex
+        deadline = time.monotonic() + self.timeout
+        while True:
+            if lease_service.acquire(key, owner, self.lease_ttl):
+                return self._lead(key, owner, fn)
+            lease = lease_service.get(key)
+            if lease is not None and lease.completed_at is not None and lease.result is not None:
+                logger.info("single_flight_joined", key=key, scope="database")
+                return self.deserialize(lease.result)
+            if time.monotonic() >= deadline:
+                raise TimeoutError(f"Timed out waiting for in-flight computation {key}")
+            time.sleep(self.poll_interval)
+
+    def _lead(self, key: str, owner: str, fn: Callable[[], T]) -> T:
+        try:
+            with lease_service.LeaseKeeper(key, owner, self.lease_ttl):
+                result = fn()
+        except BaseException:
+            lease_service.release(key, owner)
+            raise
+        lease_service.complete(key, owner, keep_for=self.share_for, result=self.serialize(result))
+        return result
@@ -0,0 +1,114 @@
+"""Opt-in speculative pre-tailoring of newly ingested job postings.
+
+When ``SPECULATIVE_TAILORING`` is enabled, every job created through the API
+or a CSV import queues a low-priority ``speculative`` tailoring job for each
+resume listed in ``PRIMARY_RESUME_IDS``.  Workers run the model for those
+pairs when nothing more urgent is queued and store the result in
+``plan_cache``; a later "Tailor Resume" click for the same inputs then only
+renders the DOCX.  ``SPECULATIVE_DAILY_BUDGET`` caps how many speculative jobs
+are queued per UTC day.
+"""
+
+from __future__ import annotations
+
+from typing import Iterable, Optional
+
+import structlog
+
+from .. import crud, models
+from ..config import get_settings
+from ..db import session_scope
+from .rewrite_service import compute_prompt_hash, get_rewrite_service
+
+
+logger = structlog.get_logger(__name__)
+
+SPECULATIVE_KIND = "speculative"
+SPECULATIVE_PRIORITY = -10
+
+
+def schedule_jobs(job_ids: Iterable[int]) -> int:
+    """Queue speculative work for ``job_ids``; returns the number queued."""
+
+    settings = get_settings()
+    job_ids = list(job_ids)
+    if not settings.speculative_tailoring or not settings.primary_resume_ids or not job_ids:
+        return 0
+    queued = 0
+    with session_scope() as connection:
+        remaining = settings.speculative_daily_budget - crud.count_tailor_jobs_today(
+            connection, kind=SPECULATIVE_KIND
+        )
+        resumes = [
+            resume
+            for resume in (crud.get_resume(connection, resume_id) for resume_id in settings.primary_resume_ids)
+            if resume
+        ]
+        for job_id in job_ids:
+            for resume in resumes:
+                if remaining <= 0:
+                    logger.warning("speculative_budget_exhausted", queued=queued, skipped_job_id=job_id)
+                    return queued
+                crud.enqueue_tailor_job(
+                    connection,
+                    resume_id=resume.id,
+                    job_posting_id=job_id,
+                    idempotency_key=f"{SPECULATIVE_KIND}:{resume.id}:{job_id}:{resume.text_hash}",
+                    kind=SPECULATIVE_KIND,
+                    priority=SPECULATIVE_PRIORITY,
+                    base_resume_hash=resume.text_hash,
+                )
+                queued += 1
+                remaining -= 1
+    logger.info("speculative_jobs_queued", queued=queued)
+    return queued
+
+
+def cancel_for_job_posting(connection, job_posting_id: int) -> int:
+    return crud.cancel_queued_tailor_jobs(
+        connection,
+        kind=SPECULATIVE_KIND,
+        reason="Job posting deleted",
+        job_posting_id=job_posting_id,
+    )
+
+
+def precompute(job: models.TailorJob) -> Optional[str]:
+    """Run the model for a speculative job and cache the result.
+
+    Returns a cancellation reason when the work is no longer wanted (the
+    resume left the primary set or its text changed, or the job posting was
+    deleted), otherwise ``None``.
+    """
+
+    if job.resume_id not in get_settings().primary_resume_ids:
+        return "Resume is no longer a primary resume"
+    with session_scope() as connection:
+        resume = crud.get_resume(connection, job.resume_id)
+        posting = crud.get_job_posting(connection, job.job_posting_id)
+    if not posting:
+        return "Job posting deleted"
+    if not resume or resume.text_hash != job.base_resume_hash:
+        return "Resume changed since the job was queued"
+
+    service = get_rewrite_service()
+    resume_text = resume.text or ""
+    job_text = posting.raw_text or posting.title
+    prompt_hash = compute_prompt_hash(resume_text, job_text)
+    with session_scope() as connection:
+        if crud.get_cached_rewrite(connection, prompt_hash=prompt_hash, model_name=service.model_name):
+            return None
+    result = service.rewrite(resume_text, job_text)
+    with session_scope() as connection:
+        crud.store_cached_rewrite(
+            connection,
+            models.PlanCacheEntry(
+                prompt_hash=result.prompt_hash,
+                model_name=result.model_name,
+                plan=result.plan,
+                rendered_text=result.rendered_text,
+                token_usage=result.token_usage,
+                mock=result.mock,
+            ),
+        )
+    return None
@@ -0,0 +1,331 @@
+"""Compile DOCX templates with ``{{ placeholder }}`` tokens into fast renderers.
+
+A template is an ordinary DOCX file.  It is parsed once into a list of static
+XML segments and slots, so rendering an artifact is a walk over that list and
+a string join rather than a fresh pass over the XML.  Supported syntax, all at
+the paragraph level of ``word/document.xml`` and any header/footer parts:
+
+* ``{{ name }}`` or ``{{ item.field }}`` inserts an escaped value.  When a
+  paragraph holds exactly one placeholder the paragraph is repeated for every
+  line of the value (``- {{ skills }}`` produces one bullet per skill) and is
+  dropped when the value is empty.  With several placeholders in a paragraph
+  the values are inlined, lists joined by commas.
+* A paragraph containing ``{%p for item in experience %}`` starts a repeated
+  block that ends at the paragraph containing ``{%p endfor %}``; the tag
+  paragraphs themselves are removed.  Blocks nest.
+
+Word frequently splits a token across several runs (spell checking, edits,
+formatting changes).  Compilation first moves each token's text into the run
+where it starts so the rest of the paragraph keeps its formatting.
+
+Compiled templates are cached per path and revalidated by mtime and size; a
+changed file is only recompiled if its SHA-256 differs from what was compiled.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import re
+import threading
+from dataclasses import dataclass
+from html import escape
+from io import BytesIO
+from pathlib import Path
+from typing import Any, Iterable, Mapping, Sequence, Union
+from zipfile import ZipFile
+
+from .zip_utils import PreparedEntry, end_of_central_directory, prepare_entry
+
+
+_PARAGRAPH = re.compile(r"<w:p(?:\s[^>]*)?/>|<w:p(?:\s[^>]*)?>.*?</w:p>", re.DOTALL)
+_TEXT = re.compile(r"(<w:t(?:\s[^>]*)?>)(.*?)(</w:t>)", re.DOTALL)
+_TOKEN = re.compile(r"\{\{\s*[\w.]+\s*\}\}|\{%p?\s*(?:for\s+\w+\s+in\s+[\w.]+|endfor)\s*%\}")
+_FIELD = re.compile(r"\{\{\s*([\w.]+)\s*\}\}")
+_FOR = re.compile(r"\{%p?\s*for\s+(\w+)\s+in\s+([\w.]+)\s*%\}")
+_ENDFOR = re.compile(r"\{%p?\s*endfor\s*%\}")
+_TEMPLATED_PART = re.compile(r"word/(document|header\d*|footer\d*)\.xml")
+
+_CACHE_LIMIT = 32
+
+
+class TemplateError(ValueError):
+    """Raised when a template contains unbalanced or malformed block tags."""
+
+
+@dataclass(frozen=True)
+class _Field:
+    path: tuple[str, ...]
+
+
+@dataclass(frozen=True)
+class _RepeatParagraph:
+    before: str
+    path: tuple[str, ...]
+    after: str
+
+
+@dataclass(frozen=True)
+class _Loop:
+    name: str
+    path: tuple[str, ...]
+    body: tuple["_Node", ...]
+
+
+_Node = Union[str, _Field, _RepeatParagraph, _Loop]
+
+
+class CompiledTemplate:
+    """A DOCX template reduced to static ZIP records and compiled XML parts."""
+
+    def __init__(
+        self,
+        static_parts: Sequence[tuple[str, bytes]],
+        parts: Sequence[tuple[str, tuple[_Node, ...]]],
+        sha256: str,
+    ) -> None:
+        self.sha256 = sha256
+        self._static_parts = tuple(static_parts)
+        self._parts = tuple(parts)
+        self._prefixes: dict[bool, tuple[bytes, list[PreparedEntry]]] = {}
+
+    def render(self, context: Mapping[str, Any], *, compress: bool = False) -> bytes:
+        """Return the DOCX bytes for ``context``."""
+
+        prefix, static_entries = self._prefix(compress)
+        central_parts = []
+        offset = 0
+        for entry in static_entries:
+            central_parts.append(entry.central_record(offset))
+            offset += len(entry.local_record)
+        local_parts = [prefix]
+        for name, nodes in self._parts:
+            out: list[str] = []
+            _render(nodes, context, out)
+            entry = prepare_entry(name, "".join(out).encode("utf-8"), compress=compress)
+            central_parts.append(entry.central_record(offset))
+            local_parts.append(entry.local_record)
+            offset += len(entry.local_record)
+        central = b"".join(central_parts)
+        return b"".join(local_parts) + central + end_of_central_directory(len(central_parts), len(central), offset)
+
+    def _prefix(self, compress: bool) -> tuple[bytes, list[PreparedEntry]]:
+        cached = self._prefixes.get(compress)
+        if cached is None:
+            entries = [prepare_entry(name, data, compress=compress) for name, data in self._static_parts]
+            cached = self._prefixes[compress] = (b"".join(entry.local_record for entry in entries), entries)
+        return cached
+
+
+def compile_template(data: bytes) -> CompiledTemplate:
+    """Compile the DOCX package in ``data``."""
+
+    static_parts: list[tuple[str, bytes]] = []
+    parts: list[tuple[str, tuple[_Node, ...]]] = []
+    with ZipFile(BytesIO(data)) as archive:
+        for name in archive.namelist():
+            content = archive.read(name)
+            if _TEMPLATED_PART.fullmatch(name) and b"{" in content:
+                parts.append((name, _compile_xml(content.decode("utf-8"))))
+            else:
+                static_parts.append((name, content))
+    return CompiledTemplate(static_parts, parts, hashlib.sha256(data).hexdigest())
+
+
+@dataclass
+class _CacheEntry:
+    mtime_ns: int
+    size: int
+    template: CompiledTemplate
+
+
+_lock = threading.Lock()
+_by_path: dict[str, _CacheEntry] = {}
+_by_hash: dict[str, CompiledTemplate] = {}
+
+
+def load_template(path: Path | str) -> CompiledTemplate:
+    """Return the compiled template at ``path``, compiling it only when it changed."""
+
+    resolved = Path(path).resolve()
+    stat = resolved.stat()
+    key = str(resolved)
+    with _lock:
+        entry = _by_path.get(key)
+    if entry is not None and entry.mtime_ns == stat.st_mtime_ns and entry.size == stat.st_size:
+        return entry.template
+
+    data = resolved.read_bytes()
+    digest = hashlib.sha256(data).hexdigest()
+    with _lock:
+        template = _by_hash.get(digest)
+    if template is None:
+        template = compile_template(data)
+    with _lock:
+        _by_hash[digest] = template
+        while len(_by_hash) > _CACHE_LIMIT:
+            del _by_hash[next(iter(_by_hash))]
+        _by_path.pop(key, None)
+        _by_path[key] = _CacheEntry(stat.st_mtime_ns, stat.st_size, template)
+        while len(_by_path) > _CACHE_LIMIT:
+            del _by_path[next(iter(_by_path))]
+    return template
+
+
+def template_cache_size() -> int:
+    with _lock:
+        return len(_by_hash)
+
+
+def clear_template_cache() -> None:
+    with _lock:
+        _by_path.clear()
+        _by_hash.clear()
+
+
+def _compile_xml(xml: str) -> tuple[_Node, ...]:
+    root: list[_Node] = []
+    # Open ``for`` blocks: (loop variable, iterated path, enclosing node list).
+    stack: list[tuple[str, tuple[str, ...], list[_Node]]] = []
+    current = root
+    position = 0
+    for match in _PARAGRAPH.finditer(xml):
+        paragraph = match.group(0)
+        if "{" not in paragraph:
+            continue
+        paragraph = _merge_split_tokens(paragraph)
+        text = "".join(node.group(2) for node in _TEXT.finditer(paragraph))
+        loop = _FOR.search(text)
+        end_loop = _ENDFOR.search(text)
+        if loop is None and end_loop is None and _FIELD.search(text) is None:
+            continue
+        _append(current, xml[position : match.start()])
+        position = match.end()
+        if loop is not None:
+            stack.append((loop.group(1), tuple(loop.group(2).split(".")), current))
+            current = []
+        elif end_loop is not None:
+            if not stack:
+                raise TemplateError("endfor without a matching for block")
+            name, path, parent = stack.pop()
+            parent.append(_Loop(name, path, tuple(current)))
+            current = parent
+        else:
+            _compile_paragraph(paragraph, current)
+    if stack:
+        raise TemplateError(f"for block over {'.'.join(stack[-1][1])} is never closed")
+    _append(current, xml[position:])
+    return tuple(root)
+
+
+def _compile_paragraph(paragraph: str, out: list[_Node]) -> None:
+    fields = list(_FIELD.finditer(paragraph))
+    if len(fields) == 1:
+        field = fields[0]
+        out.append(
+            _RepeatParagraph(
+                paragraph[: field.start()],
+                tuple(field.group(1).split(".")),
+                paragraph[field.end() :],
+            )
+        )
+        return
+    position = 0
+    for field in fields:
+        _append(out, paragraph[position : field.start()])
+        out.append(_Field(tuple(field.group(1).split("."))))
+        position = field.end()
+    _append(out, paragraph[position:])
+
+
+def _merge_split_tokens(paragraph: str) -> str:
+    """Move every token's characters into the ``<w:t>`` where the token starts."""
+
+    nodes = list(_TEXT.finditer(paragraph))
+    texts = [node.group(2) for node in nodes]
+    joined = "".join(texts)
+    owners: list[int] = []
+    for index, text in enumerate(texts):
+        owners.extend([index] * len(text))
+    changed = False
+    for token in _TOKEN.finditer(joined):
+        first = owners[token.start()]
+        if owners[token.end() - 1] != first:
+            owners[token.start() : token.end()] = [first] * (token.end() - token.start())
+            changed = True
+    if not changed:
+        return paragraph
+
+    rebuilt = [""] * len(texts)
+    for char, owner in zip(joined, owners):
+        rebuilt[owner] += char
+    pieces: list[str] = []
+    position = 0
+    for node, text in zip(nodes, rebuilt):
+        open_tag = node.group(1)
+        if "xml:space" not in open_tag:
+            open_tag = open_tag[:-1] + ' xml:space="preserve">'
+        pieces.append(paragraph[position : node.start()])
+        pieces.append(open_tag + text + node.group(3))
+        position = node.end()
+    pieces.append(paragraph[position:])
+    return "".join(pieces)
+
+
+def _append(out: list[_Node], segment: str) -> None:
+    if not segment:
+        return
+    if out and isinstance(out[-1], str):
+        out[-1] += segment
+    else:
+        out.append(segment)
+
+
+def _render(nodes: Iterable[_Node], scope: Mapping[str, Any], out: list[str]) -> None:
+    for node in nodes:
+        if isinstance(node, str):
+            out.append(node)
+        elif isinstance(node, _Field):
+            out.append(escape(_inline(_lookup(scope, node.path)), quote=False))
+        elif isinstance(node, _RepeatParagraph):
+            for line in _lines(_lookup(scope, node.path)):
+                out.append(node.before)
+                out.append(escape(line, quote=False))
+                out.append(node.after)
+        else:
+            value = _lookup(scope, node.path)
+            items = _lines(value) if isinstance(value, str) else (value or ())
+            for item in items:
+                _render(node.body, {**scope, node.name: item}, out)
+
+
+def _lookup(scope: Mapping[str, Any], path: tuple[str, ...]) -> Any:
+    value: Any = scope
+    for name in path:
+        if isinstance(value, Mapping):
+            value = value.get(name)
+        else:
+            value = getattr(value, name, None)
+        if value is None:
+            return None
+    return value
+
+
+def _lines(value: Any) -> list[str]:
+    if value is None:
+        return []
+    if isinstance(value, str):
+        return [line.strip() for line in value.splitlines() if line.strip()]
+    if isinstance(value, Mapping):
+        return _lines(value.get("text"))
+    if isinstance(value, Iterable):
+        lines: list[str] = []
+        for item in value:
+            lines.extend(_lines(item))
+        return lines
+    return _lines(str(value))
+
+
+def _inline(value: Any) -> str:
+    if isinstance(value, (list, tuple)):
+        return ", ".join(_inline(item) for item in value if _inline(item))
+    return " ".join(_lines(value))
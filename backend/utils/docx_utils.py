@@ -19,11 +19,14 @@ same minimal structure used in the unit tests.
 from __future__ import annotations
 
 from dataclasses import dataclass
+from functools import lru_cache
 from html import escape
 from pathlib import Path
-from typing import Iterable
+from typing import Iterable, Iterator, Sequence
 from xml.etree import ElementTree as ET
-from zipfile import ZipFile, ZipInfo
+from zipfile import ZipFile
+
+from .zip_utils import end_of_central_directory, prepare_entry
 
 
 _WORD_NAMESPACE = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
@@ -46,7 +49,10 @@ def extract_docx_text(path: Path) -> str:
 
 
 def create_placeholder_template(path: Path) -> None:
-    """Create a very small DOCX template with placeholder tokens."""
+    """Create a very small DOCX template with placeholder tokens.
+
+    See :mod:`backend.utils.docx_template` for the supported template syntax.
+    """
 
     if path.exists():
         return
@@ -56,7 +62,7 @@ def create_placeholder_template(path: Path) -> None:
         "Summary",
         "{{ summary }}",
         "Skills",
-        "{{ skills }}",
+        "- {{ skills }}",
         "Experience",
         "{{ experience }}",
         "Education",
@@ -77,6 +83,17 @@ class RenderContext:
     education: Iterable[str]
     certifications: Iterable[str]
 
+    def as_template_context(self) -> dict[str, object]:
+        """Return the fields as the mapping :mod:`docx_template` renders."""
+
+        return {
+            "summary": self.summary,
+            "skills": list(self.skills),
+            "experience": list(self.experience),
+            "education": list(self.education),
+            "certifications": list(self.certifications),
+        }
+
     def iter_paragraphs(self) -> Iterable[str]:
         yield "Summary"
         yield from _split_lines(self.summary)
@@ -91,11 +108,24 @@ class RenderContext:
         yield from _split_lines("\n".join(self.certifications))
 
 
-def render_resume_docx(path: Path, context: RenderContext) -> None:
+def render_resume_docx(path: Path, context: RenderContext, *, compress: bool = False) -> None:
     """Render the resume artifact as a DOCX file using the provided context."""
 
-    paragraphs = [para for para in context.iter_paragraphs() if para]
-    _write_docx(path, paragraphs)
+    path.write_bytes(render_resume_docx_bytes(context, compress=compress))
+
+
+def render_resume_docx_bytes(context: RenderContext, *, compress: bool = False) -> bytes:
+    """Render the resume artifact in memory and return the DOCX bytes."""
+
+    return build_docx((para for para in context.iter_paragraphs() if para), compress=compress)
+
+
+def iter_chunks(data: bytes, chunk_size: int = 64 * 1024) -> Iterator[memoryview]:
+    """Yield zero-copy slices of ``data`` for streaming responses."""
+
+    view = memoryview(data)
+    for start in range(0, len(view), chunk_size):
+        yield view[start : start + chunk_size]
 
 
 def _split_lines(text: str) -> Iterable[str]:
@@ -105,58 +135,110 @@ def _split_lines(text: str) -> Iterable[str]:
             yield cleaned
 
 
-def _write_docx(path: Path, paragraphs: Iterable[str]) -> None:
-    """Write a minimal DOCX file with the supplied paragraphs."""
-
-    paragraphs = list(paragraphs)
-    document_xml = [
-        "<?xml version='1.0' encoding='UTF-8'?>",
-        f"<w:document xmlns:w='{_WORD_NAMESPACE}'>",
-        "  <w:body>",
-    ]
-    for paragraph in paragraphs:
-        document_xml.append(_paragraph_xml(paragraph))
-    document_xml.append("  </w:body>")
-    document_xml.append("</w:document>")
-    document_bytes = "\n".join(document_xml).encode("utf-8")
-
-    with ZipFile(path, "w") as archive:
-        archive.writestr(
-            ZipInfo("[Content_Types].xml"),
-            """<?xml version='1.0' encoding='UTF-8'?>
+_STATIC_PARTS: tuple[tuple[str, str], ...] = (
+    (
+        "[Content_Types].xml",
+        """<?xml version='1.0' encoding='UTF-8'?>
 <Types xmlns='http://schemas.openxmlformats.org/package/2006/content-types'>
   <Default Extension='rels' ContentType='application/vnd.openxmlformats-package.relationships+xml'/>
   <Default Extension='xml' ContentType='application/xml'/>
   <Override PartName='/word/document.xml' ContentType='application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml'/>
 </Types>
 """,
-        )
-        archive.writestr(
-            ZipInfo("_rels/.rels"),
-            """<?xml version='1.0' encoding='UTF-8'?>
+    ),
+    (
+        "_rels/.rels",
+        """<?xml version='1.0' encoding='UTF-8'?>
 <Relationships xmlns='http://schemas.openxmlformats.org/package/2006/relationships'>
   <Relationship Id='R1' Type='http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument' Target='word/document.xml'/>
 </Relationships>
 """,
-        )
-        archive.writestr(
-            ZipInfo("word/_rels/document.xml.rels"),
-            """<?xml version='1.0' encoding='UTF-8'?>
+    ),
+    (
+        "word/_rels/document.xml.rels",
+        """<?xml version='1.0' encoding='UTF-8'?>
 <Relationships xmlns='http://schemas.openxmlformats.org/package/2006/relationships'>
 </Relationships>
 """,
-        )
-        archive.writestr(
-            ZipInfo("word/styles.xml"),
-            """<?xml version='1.0' encoding='UTF-8'?>
+    ),
+    (
+        "word/styles.xml",
+        """<?xml version='1.0' encoding='UTF-8'?>
 <w:styles xmlns:w='http://schemas.openxmlformats.org/wordprocessingml/2006/main'>
   <w:style w:type='paragraph' w:default='1' w:styleId='Normal'>
     <w:name w:val='Normal'/>
   </w:style>
 </w:styles>
 """,
+    ),
+)
+
+_DOCUMENT_HEAD = (
+    "<?xml version='1.0' encoding='UTF-8'?>\n"
+    f"<w:document xmlns:w='{_WORD_NAMESPACE}'>\n"
+    "  <w:body>\n"
+)
+_DOCUMENT_TAIL = "\n  </w:body>\n</w:document>"
+
+
+class _DocxSkeleton:
+    """The static package parts of every artifact, precompiled as ZIP records.
+
+    The content types, relationships and styles never change, so their local
+    records and central directory entries are built once.  Rendering an
+    artifact only has to encode ``word/document.xml`` and append it.
+    """
+
+    def __init__(self, *, compress: bool) -> None:
+        self.compress = compress
+        self.prefix = b""
+        central_parts: list[bytes] = []
+        for name, content in _STATIC_PARTS:
+            entry = prepare_entry(name, content.encode("utf-8"), compress=compress)
+            central_parts.append(entry.central_record(len(self.prefix)))
+            self.prefix += entry.local_record
+        self.central_prefix = b"".join(central_parts)
+        self.count = len(_STATIC_PARTS) + 1
+
+    def build(self, document_xml: bytes) -> bytes:
+        document = prepare_entry("word/document.xml", document_xml, compress=self.compress)
+        offset = len(self.prefix)
+        central = self.central_prefix + document.central_record(offset)
+        return b"".join(
+            (
+                self.prefix,
+                document.local_record,
+                central,
+                end_of_central_directory(self.count, len(central), offset + len(document.local_record)),
+            )
         )
-        archive.writestr(ZipInfo("word/document.xml"), document_bytes)
+
+
+@lru_cache(maxsize=2)
+def _skeleton(compress: bool) -> _DocxSkeleton:
+    return _DocxSkeleton(compress=compress)
+
+
+def build_docx(paragraphs: Iterable[str | Sequence[Sequence[str]]], *, compress: bool = False) -> bytes:
+    """Return the bytes of a minimal DOCX package containing ``paragraphs``.
+
+    A block that is a sequence of rows instead of a string becomes a table
+    with one paragraph per cell.  Output is deterministic: identical
+    paragraphs always produce identical bytes.  ``compress`` switches all
+    parts to DEFLATE (the static parts are precompressed once).
+    """
+
+    body = "\n".join(
+        _paragraph_xml(block) if isinstance(block, str) else _table_xml(block) for block in paragraphs
+    )
+    document_xml = (_DOCUMENT_HEAD + body + _DOCUMENT_TAIL).encode("utf-8")
+    return _skeleton(compress).build(document_xml)
+
+
+def _write_docx(path: Path, paragraphs: Iterable[str], *, compress: bool = False) -> None:
+    """Write a minimal DOCX file with the supplied paragraphs."""
+
+    path.write_bytes(build_docx(paragraphs, compress=compress))
 
 
 def _paragraph_xml(text: str) -> str:
@@ -165,3 +247,9 @@ def _paragraph_xml(text: str) -> str:
     text = escape(text)
     return f"  <w:p><w:r><w:t xml:space='preserve'>{text}</w:t></w:r></w:p>"
 
+
+def _table_xml(rows: Sequence[Sequence[str]]) -> str:
+    cells = (
+        "<w:tr>" + "".join(f"<w:tc>{_paragraph_xml(cell).strip()}</w:tc>" for cell in row) + "</w:tr>" for row in rows
+    )
+    return "  <w:tbl>" + "".join(cells) + "</w:tbl>"
@@ -0,0 +1,67 @@
+"""Helpers for HTTP validators and byte ranges on file downloads (RFC 9110)."""
+
+from __future__ import annotations
+
+from typing import BinaryIO, Iterator, Optional
+
+
+class RangeNotSatisfiable(ValueError):
+    """Raised when a ``Range`` header selects no bytes of the representation."""
+
+
+def strong_etag(digest: str) -> str:
+    return f'"{digest}"'
+
+
+def etag_matches(header: Optional[str], etag: str) -> bool:
+    """Weak comparison of ``etag`` against an ``If-None-Match`` header value."""
+
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    candidates = (candidate.strip() for candidate in header.split(","))
+    return any(candidate.removeprefix("W/") == etag for candidate in candidates)
+
+
+def parse_range(header: Optional[str], size: int) -> Optional[tuple[int, int]]:
+    """Return the inclusive ``(start, end)`` byte range requested, or ``None`` for the full body.
+
+    Only single ``bytes`` ranges are honoured; multi-range and malformed
+    headers are ignored, which the specification allows.  Raises
+    :class:`RangeNotSatisfiable` when the range starts past the end.
+    """
+
+    if not header or not header.startswith("bytes=") or "," in header:
+        return None
+    first, _, last = header[len("bytes=") :].strip().partition("-")
+    try:
+        start = int(first) if first else None
+        end = int(last) if last else None
+    except ValueError:
+        return None
+    if start is None:
+        if not end:
+            raise RangeNotSatisfiable(header)
+        start, end = max(size - end, 0), size - 1
+    elif end is None:
+        end = size - 1
+    if start >= size:
+        raise RangeNotSatisfiable(header)
+    if start > end:
+        return None
+    return start, min(end, size - 1)
+
+
+def iter_file_range(handle: BinaryIO, start: int, end: int, chunk_size: int = 64 * 1024) -> Iterator[bytes]:
+    """Yield bytes ``start`` through ``end`` (inclusive) of ``handle`` in chunks, then close it."""
+
+    remaining = end - start + 1
+    with handle:
+        handle.seek(start)
+        while remaining > 0:
+            chunk = handle.read(min(chunk_size, remaining))
+            if not chunk:
+                return
+            remaining -= len(chunk)
+            yield chunk
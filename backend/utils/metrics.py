@@ -0,0 +1,351 @@
+from __future__ import annotations
+
+import functools
+import inspect
+import math
+import threading
+import time
+from bisect import bisect_left
+from typing import Any, Callable, Iterable, Mapping, Optional
+
+
+# Latency buckets (seconds) shared by the duration histograms.
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class Registry:
+    """In-process metrics with Prometheus text exposition.
+
+    Counters and histograms are sharded per thread: each thread updates
+    cells in its own dict, so recording takes no lock and never contends
+    with other threads or with a scrape.  :meth:`collect` sums the shards
+    under the registry lock, folding shards of finished threads into one
+    retired shard so thread churn does not grow the registry.  Gauges are
+    single values (a plain store) or callbacks evaluated at scrape time.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._metrics: dict[str, _Metric] = {}
+        self._shards: list[tuple[threading.Thread, dict]] = []
+        self._retired: dict = {}
+
+    def counter(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> "Counter":
+        return self._register(Counter(self, name, documentation, tuple(labelnames)))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str] = (),
+        buckets: Iterable[float] = DEFAULT_BUCKETS,
+    ) -> "Histogram":
+        return self._register(Histogram(self, name, documentation, tuple(labelnames), tuple(sorted(buckets))))
+
+    def gauge(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str] = (),
+        callback: Optional[Callable[[], Any]] = None,
+    ) -> "Gauge":
+        """Register a gauge.
+
+        With ``callback`` the value is read at scrape time; the callback
+        returns a number, or ``{label values tuple: number}`` for a labelled
+        gauge.
+        """
+
+        return self._register(Gauge(self, name, documentation, tuple(labelnames), callback))
+
+    def _register(self, metric: "_Metric") -> Any:
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                if type(existing) is not type(metric) or existing.labelnames != metric.labelnames:
+                    raise ValueError(f"Metric {metric.name} is already registered differently")
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def _shard(self) -> dict:
+        try:
+            return self._local.shard
+        except AttributeError:
+            shard: dict = {}
+            self._local.shard = shard
+            with self._lock:
+                self._shards.append((threading.current_thread(), shard))
+            return shard
+
+    def _merged(self) -> dict:
+        with self._lock:
+            live = []
+            for thread, shard in self._shards:
+                if thread.is_alive():
+                    live.append((thread, shard))
+                else:
+                    _merge_into(self._retired, shard)
+            self._shards = live
+            merged: dict = {}
+            _merge_into(merged, self._retired)
+            for _, shard in live:
+                _merge_into(merged, shard)
+            metrics = sorted(self._metrics.values(), key=lambda metric: metric.name)
+        return {"cells": merged, "metrics": metrics}
+
+    def collect(self) -> str:
+        """Render every metric in the Prometheus text format."""
+
+        snapshot = self._merged()
+        lines: list[str] = []
+        for metric in snapshot["metrics"]:
+            lines.append(f"# HELP {metric.name} {_escape_help(metric.documentation)}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.samples(snapshot["cells"]))
+        return "\n".join(lines) + "\n"
+
+    def value(self, name: str, **labels: str) -> float:
+        """Current value of a counter or gauge sample (or a histogram's count); for tests and tools."""
+
+        metric = self._metrics[name]
+        key = tuple(str(labels.get(label, "")) for label in metric.labelnames)
+        return metric.current(self._merged()["cells"], key)
+
+    def reset(self) -> None:
+        """Forget recorded values (metric definitions stay registered)."""
+
+        with self._lock:
+            for _, shard in self._shards:
+                shard.clear()
+            self._retired.clear()
+            for metric in self._metrics.values():
+                if isinstance(metric, Gauge):
+                    metric._values.clear()
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, registry: Registry, name: str, documentation: str, labelnames: tuple[str, ...]) -> None:
+        self.registry = registry
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+
+    def _key(self, labels: Mapping[str, Any]) -> tuple[str, ...]:
+        if len(labels) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[label]) for label in self.labelnames)
+
+    def _label_text(self, key: tuple[str, ...], extra: str = "") -> str:
+        pairs = [f'{label}="{_escape_label(value)}"' for label, value in zip(self.labelnames, key)]
+        if extra:
+            pairs.append(extra)
+        return "{" + ",".join(pairs) + "}" if pairs else ""
+
+    def _cells(self, cells: dict) -> list[tuple[tuple[str, ...], list[float]]]:
+        return sorted((key[1], cell) for key, cell in cells.items() if key[0] == self.name)
+
+    def samples(self, cells: dict) -> list[str]:
+        raise NotImplementedError
+
+    def current(self, cells: dict, key: tuple[str, ...]) -> float:
+        cell = cells.get((self.name, key))
+        return cell[0] if cell else 0.0
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount: float = 1.0, **labels: Any) -> None:
+        key = (self.name, self._key(labels))
+        shard = self.registry._shard()
+        cell = shard.get(key)
+        if cell is None:
+            cell = shard[key] = [0.0]
+        cell[0] += amount
+
+    def samples(self, cells: dict) -> list[str]:
+        return [f"{self.name}{self._label_text(key)} {_number(cell[0])}" for key, cell in self._cells(cells)]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        registry: Registry,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...],
+        buckets: tuple[float, ...],
+    ) -> None:
+        super().__init__(registry, name, documentation, labelnames)
+        self.buckets = buckets
+
+    def observe(self, value: float, **labels: Any) -> None:
+        key = (self.name, self._key(labels))
+        shard = self.registry._shard()
+        cell = shard.get(key)
+        if cell is None:
+            # Per-bucket counts, then the +Inf bucket, the sum and the count.
+            cell = shard[key] = [0.0] * (len(self.buckets) + 3)
+        cell[bisect_left(self.buckets, value)] += 1
+        cell[-2] += value
+        cell[-1] += 1
+
+    def time(self, **labels: Any) -> "_Timer":
+        """Observe the duration of a ``with`` block."""
+
+        return _Timer(self, labels)
+
+    def samples(self, cells: dict) -> list[str]:
+        lines: list[str] = []
+        for key, cell in self._cells(cells):
+            cumulative = 0.0
+            for bound, count in zip(self.buckets + (math.inf,), cell):
+                cumulative += count
+                le = 'le="+Inf"' if bound == math.inf else f'le="{_number(bound)}"'
+                lines.append(f"{self.name}_bucket{self._label_text(key, le)} {_number(cumulative)}")
+            lines.append(f"{self.name}_sum{self._label_text(key)} {_number(cell[-2])}")
+            lines.append(f"{self.name}_count{self._label_text(key)} {_number(cell[-1])}")
+        return lines
+
+    def current(self, cells: dict, key: tuple[str, ...]) -> float:
+        cell = cells.get((self.name, key))
+        return cell[-1] if cell else 0.0
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def __init__(
+        self,
+        registry: Registry,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...],
+        callback: Optional[Callable[[], Any]],
+    ) -> None:
+        super().__init__(registry, name, documentation, labelnames)
+        self.callback = callback
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def set(self, value: float, **labels: Any) -> None:
+        self._values[self._key(labels)] = float(value)
+
+    def _read(self) -> dict[tuple[str, ...], float]:
+        if self.callback is None:
+            return dict(self._values)
+        try:
+            value = self.callback()
+        except Exception:  # a failing callback must not break the scrape
+            return {}
+        if isinstance(value, Mapping):
+            return {tuple(str(part) for part in key): float(number) for key, number in value.items()}
+        return {(): float(value)}
+
+    def samples(self, cells: dict) -> list[str]:
+        return [f"{self.name}{self._label_text(key)} {_number(value)}" for key, value in sorted(self._read().items())]
+
+    def current(self, cells: dict, key: tuple[str, ...]) -> float:
+        return self._read().get(key, 0.0)
+
+
+class _Timer:
+    def __init__(self, histogram: Histogram, labels: Mapping[str, Any]) -> None:
+        self.histogram = histogram
+        self.labels = labels
+
+    def __enter__(self) -> "_Timer":
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.histogram.observe(time.perf_counter() - self.started, **self.labels)
+
+
+def _merge_into(target: dict, shard: dict) -> None:
+    # ``list(...)`` snapshots the dict; its owner thread may add keys meanwhile.
+    for key, cell in list(shard.items()):
+        existing = target.get(key)
+        if existing is None:
+            target[key] = list(cell)
+        else:
+            for index, value in enumerate(cell):
+                existing[index] += value
+
+
+def _number(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _escape_help(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("\n", "\\n")
+
+
+REGISTRY = Registry()
+
+HTTP_REQUEST_SECONDS = REGISTRY.histogram(
+    "fitresume_http_request_duration_seconds",
+    "Time spent in API route handlers.",
+    ("handler", "status"),
+)
+
+
+def timed_route(handler: Callable) -> Callable:
+    """Record a route handler's latency, labelled by handler name and status code.
+
+    ``HTTPException`` (anything with a ``status_code``) is recorded with its
+    status and other exceptions as 500.  Streaming routes are timed until the response object is returned, not
+    until the body has been sent.
+    """
+
+    def observe(started: float, status: int) -> None:
+        HTTP_REQUEST_SECONDS.observe(time.perf_counter() - started, handler=handler.__name__, status=status)
+
+    if inspect.iscoroutinefunction(handler):
+
+        @functools.wraps(handler)
+        async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+            started = time.perf_counter()
+            status = 500
+            try:
+                result = await handler(*args, **kwargs)
+                status = getattr(result, "status_code", 200)
+                return result
+            except Exception as exc:
+                status = getattr(exc, "status_code", 500)
+                raise
+            finally:
+                observe(started, status)
+
+        return async_wrapper
+
+    @functools.wraps(handler)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        started = time.perf_counter()
+        status = 500
+        try:
+            result = handler(*args, **kwargs)
+            status = getattr(result, "status_code", 200)
+            return result
+        except Exception as exc:
+            status = getattr(exc, "status_code", 500)
+            raise
+        finally:
+            observe(started, status)
+
+    return wrapper
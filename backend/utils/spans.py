@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+
+class SpanRecorder:
+    """Accumulate wall-clock time per named stage.
+
+    A stage entered several times (one ``db_read`` per page, say) sums its
+    durations and counts its calls.  Recorders are thread-safe, so worker
+    threads started with :func:`contextvars.copy_context` can record into
+    the recorder of the code that spawned them.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._stages: dict[str, list[float]] = {}
+
+    def add(self, stage: str, seconds: float, calls: int = 1) -> None:
+        with self._lock:
+            totals = self._stages.setdefault(stage, [0.0, 0])
+            totals[0] += seconds
+            totals[1] += calls
+
+    def merge(self, other: "SpanRecorder") -> None:
+        for stage, (seconds, calls) in other.totals().items():
+            self.add(stage, seconds, calls)
+
+    def totals(self) -> dict[str, tuple[float, int]]:
+        """Return ``{stage: (seconds, calls)}`` in the order stages first ran."""
+
+        with self._lock:
+            return {stage: (seconds, int(calls)) for stage, (seconds, calls) in self._stages.items()}
+
+
+_current: ContextVar[Optional[SpanRecorder]] = ContextVar("span_recorder", default=None)
+
+
+def current() -> Optional[SpanRecorder]:
+    return _current.get()
+
+
+@contextmanager
+def recording() -> Iterator[SpanRecorder]:
+    """Make a fresh recorder current for the block.
+
+    Spans recorded inside the block are also added to the enclosing
+    recorder, if any, when the block exits.
+    """
+
+    recorder = SpanRecorder()
+    parent = _current.get()
+    token = _current.set(recorder)
+    try:
+        yield recorder
+    finally:
+        _current.reset(token)
+        if parent is not None:
+            parent.merge(recorder)
+
+
+@contextmanager
+def span(stage: str) -> Iterator[None]:
+    """Time the block as ``stage`` on the current recorder; a no-op without one."""
+
+    recorder = _current.get()
+    if recorder is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        recorder.add(stage, time.perf_counter() - started)
@@ -0,0 +1,322 @@
+"""Minimal ZIP record writers for building archives from prepared entries.
+
+``zipfile`` recompresses and re-encodes headers for every archive it writes.
+The DOCX artifacts we produce are mostly identical static parts, so the
+helpers here let callers prepare an entry once (CRC, optional DEFLATE, local
+header) and then assemble archives by concatenating bytes.  All entries use a
+fixed 1980-01-01 timestamp and no extra fields, which keeps the output
+byte-for-byte deterministic for the same inputs.
+
+:func:`stream_files` covers the opposite case: archiving existing files
+without holding large ones in memory.  Each file's CRC and size go in its
+local header, as streaming readers need, and ZIP64 records are added when an
+archive outgrows the classic 4 GiB and 65,535-entry limits.
+"""
+
+from __future__ import annotations
+
+import os
+import struct
+import zlib
+from dataclasses import dataclass
+from datetime import datetime
+from functools import partial
+from pathlib import Path
+from typing import BinaryIO, Callable, Iterable, Iterator, Union
+
+STORED = 0
+DEFLATED = 8
+
+_LOCAL_HEADER = struct.Struct("<4s2B4HL2L2H")
+_CENTRAL_HEADER = struct.Struct("<4s4B4HL2L5H2L")
+_END_OF_CENTRAL_DIR = struct.Struct("<4s4H2LH")
+_ZIP64_END_OF_CENTRAL_DIR = struct.Struct("<4sQ2H2L4Q")
+_ZIP64_LOCATOR = struct.Struct("<4sLQL")
+_ZIP64_EXTRA_ID = 0x0001
+
+# General purpose flag: names are UTF-8.
+FLAG_UTF8 = 0x800
+# Sizes, offsets and counts at or above these limits move to ZIP64 records,
+# leaving the classic field set to its all-ones marker.
+_ZIP32_LIMIT = 0xFFFFFFFF
+_MAX_ENTRIES = 0xFFFF
+_ZIP64_MARKER = 0xFFFFFFFF
+_ZIP64_COUNT_MARKER = 0xFFFF
+# Files up to this size are read once and held while their header is
+# written; larger ones are read twice (checksum, then content).
+_BUFFER_LIMIT = 8 * 1024 * 1024
+
+_VERSION = 20
+_ZIP64_VERSION = 45
+# DOS date/time for 1980-01-01 00:00:00, the earliest representable value.
+DOS_TIME = 0
+DOS_DATE = (0 << 9) | (1 << 5) | 1
+
+
+@dataclass(frozen=True)
+class PreparedEntry:
+    """A ZIP member whose local record is fully precomputed."""
+
+    name: bytes
+    method: int
+    crc: int
+    compressed_size: int
+    size: int
+    local_record: bytes
+
+    def central_record(self, offset: int) -> bytes:
+        return central_header(self.name, self.method, self.crc, self.compressed_size, self.size, offset)
+
+
+def local_header(
+    name: bytes,
+    method: int,
+    crc: int,
+    compressed_size: int,
+    size: int,
+    flags: int = 0,
+    dos_time: int = DOS_TIME,
+    dos_date: int = DOS_DATE,
+    extra: bytes = b"",
+    version: int = _VERSION,
+) -> bytes:
+    return _LOCAL_HEADER.pack(
+        b"PK\x03\x04",
+        version,
+        0,
+        flags,
+        method,
+        dos_time,
+        dos_date,
+        crc,
+        compressed_size,
+        size,
+        len(name),
+        len(extra),
+    ) + name + extra
+
+
+def central_header(
+    name: bytes,
+    method: int,
+    crc: int,
+    compressed_size: int,
+    size: int,
+    offset: int,
+    flags: int = 0,
+    dos_time: int = DOS_TIME,
+    dos_date: int = DOS_DATE,
+    extra: bytes = b"",
+    version: int = _VERSION,
+) -> bytes:
+    return _CENTRAL_HEADER.pack(
+        b"PK\x01\x02",
+        version,
+        0,
+        version,
+        0,
+        flags,
+        method,
+        dos_time,
+        dos_date,
+        crc,
+        compressed_size,
+        size,
+        len(name),
+        len(extra),
+        0,
+        0,
+        0,
+        0,
+        offset,
+    ) + name + extra
+
+
+def deflate(data: bytes, level: int = 6) -> bytes:
+    compressor = zlib.compressobj(level, zlib.DEFLATED, -15)
+    return compressor.compress(data) + compressor.flush()
+
+
+def prepare_entry(name: str, data: bytes, *, compress: bool = False) -> PreparedEntry:
+    encoded_name = name.encode("ascii")
+    crc = zlib.crc32(data)
+    payload = deflate(data) if compress else data
+    method = DEFLATED if compress else STORED
+    return PreparedEntry(
+        name=encoded_name,
+        method=method,
+        crc=crc,
+        compressed_size=len(payload),
+        size=len(data),
+        local_record=local_header(encoded_name, method, crc, len(payload), len(data)) + payload,
+    )
+
+
+def end_of_central_directory(count: int, size: int, offset: int) -> bytes:
+    return _END_OF_CENTRAL_DIR.pack(b"PK\x05\x06", 0, 0, count, count, size, offset, 0)
+
+
+def build_archive(entries: Iterable[PreparedEntry]) -> bytes:
+    """Concatenate prepared entries into a complete ZIP archive."""
+
+    local_parts: list[bytes] = []
+    central_parts: list[bytes] = []
+    offset = 0
+    for entry in entries:
+        local_parts.append(entry.local_record)
+        central_parts.append(entry.central_record(offset))
+        offset += len(entry.local_record)
+    central = b"".join(central_parts)
+    return b"".join(local_parts) + central + end_of_central_directory(len(central_parts), len(central), offset)
+
+
+def dos_timestamp(moment: datetime) -> tuple[int, int]:
+    """Return the ``(time, date)`` DOS encoding of ``moment``, clamped to 1980."""
+
+    if moment.year < 1980:
+        return DOS_TIME, DOS_DATE
+    dos_time = (moment.hour << 11) | (moment.minute << 5) | (moment.second // 2)
+    dos_date = ((moment.year - 1980) << 9) | (moment.month << 5) | moment.day
+    return dos_time, dos_date
+
+
+def stream_files(
+    members: Iterable[tuple[str, Union[Path, Callable[[], BinaryIO]]]],
+    chunk_size: int = 64 * 1024,
+) -> Iterator[bytes]:
+    """Yield a STORED ZIP archive of ``(archive name, source)`` pairs.
+
+    A source is a file path or a callable returning an open binary file
+    (entries from callables get the fixed 1980 timestamp).
+
+    Every local header carries the entry's CRC and size, so the archive can
+    be unpacked by streaming readers as it arrives.  Files up to
+    ``_BUFFER_LIMIT`` are read once and held only while their entry is
+    written; larger files are read once for the checksum and again for the
+    content, so memory use does not depend on file sizes.  Only the small
+    central directory record of each entry is kept until the end.  Entries
+    and archives beyond the 4 GiB and 65,535-entry limits get ZIP64 records
+    instead of failing part way.  Files that vanish before they are opened
+    are skipped.
+    """
+
+    central_parts: list[bytes] = []
+    offset = 0
+    for archive_name, source in members:
+        opener = source if callable(source) else partial(open, source, "rb")
+        try:
+            handle = opener()
+        except FileNotFoundError:
+            continue
+        with handle:
+            if callable(source):
+                dos_time, dos_date = DOS_TIME, DOS_DATE
+            else:
+                dos_time, dos_date = dos_timestamp(datetime.fromtimestamp(os.fstat(handle.fileno()).st_mtime))
+            crc, size, content = _checksum(handle, chunk_size)
+        name = archive_name.encode("utf-8")
+        flags = 0 if name.isascii() else FLAG_UTF8
+        big = size >= _ZIP32_LIMIT
+        header = local_header(
+            name,
+            STORED,
+            crc,
+            _ZIP64_MARKER if big else size,
+            _ZIP64_MARKER if big else size,
+            flags,
+            dos_time,
+            dos_date,
+            extra=_zip64_extra(size, size) if big else b"",
+            version=_ZIP64_VERSION if big else _VERSION,
+        )
+        yield header
+        if content is not None:
+            yield from content
+        else:
+            yield from _reread(opener, crc, size, chunk_size)
+        far = offset >= _ZIP32_LIMIT
+        central_parts.append(
+            central_header(
+                name,
+                STORED,
+                crc,
+                _ZIP64_MARKER if big else size,
+                _ZIP64_MARKER if big else size,
+                _ZIP64_MARKER if far else offset,
+                flags,
+                dos_time,
+                dos_date,
+                extra=_zip64_extra(*((size, size) if big else ()), *((offset,) if far else ())),
+                version=_ZIP64_VERSION if big or far else _VERSION,
+            )
+        )
+        offset += len(header) + size
+    central = b"".join(central_parts)
+    yield central + _end_records(len(central_parts), len(central), offset)
+
+
+def _checksum(handle: BinaryIO, chunk_size: int) -> tuple[int, int, list[bytes] | None]:
+    """Return ``(crc, size, chunks)``; ``chunks`` is None once the file exceeds ``_BUFFER_LIMIT``."""
+
+    crc = 0
+    size = 0
+    chunks: list[bytes] | None = []
+    while True:
+        chunk = handle.read(chunk_size)
+        if not chunk:
+            return crc, size, chunks
+        crc = zlib.crc32(chunk, crc)
+        size += len(chunk)
+        if chunks is not None:
+            chunks.append(chunk)
+            if size > _BUFFER_LIMIT:
+                chunks = None
+
+
+def _reread(opener: Callable[[], BinaryIO], crc: int, size: int, chunk_size: int) -> Iterator[bytes]:
+    check = 0
+    read = 0
+    with opener() as handle:
+        while True:
+            chunk = handle.read(chunk_size)
+            if not chunk:
+                break
+            check = zlib.crc32(chunk, check)
+            read += len(chunk)
+            yield chunk
+    if (check, read) != (crc, size):
+        raise ValueError("File changed while it was being archived")
+
+
+def _zip64_extra(*values: int) -> bytes:
+    return struct.pack(f"<2H{len(values)}Q", _ZIP64_EXTRA_ID, 8 * len(values), *values)
+
+
+def _end_records(count: int, size: int, offset: int) -> bytes:
+    """End of central directory, preceded by the ZIP64 end records when a field overflows."""
+
+    if count < _MAX_ENTRIES and size < _ZIP32_LIMIT and offset < _ZIP32_LIMIT:
+        return end_of_central_directory(count, size, offset)
+    zip64_end = _ZIP64_END_OF_CENTRAL_DIR.pack(
+        b"PK\x06\x06",
+        _ZIP64_END_OF_CENTRAL_DIR.size - 12,
+        _ZIP64_VERSION,
+        _ZIP64_VERSION,
+        0,
+        0,
+        count,
+        count,
+        size,
+        offset,
+    )
+    locator = _ZIP64_LOCATOR.pack(b"PK\x06\x07", 0, offset + size, 1)
+    return zip64_end + locator + _END_OF_CENTRAL_DIR.pack(
+        b"PK\x05\x06",
+        0,
+        0,
+        _ZIP64_COUNT_MARKER,
+        _ZIP64_COUNT_MARKER,
+        _ZIP64_MARKER,
+        _ZIP64_MARKER,
+        0,
+    )
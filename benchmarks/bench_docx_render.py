@@ -0,0 +1,85 @@
+"""Microbenchmark for DOCX artifact rendering.
+
+Run with ``python -m benchmarks.bench_docx_render``.  Reports artifacts per
+second for in-memory builds, compiled-template renders and file writes, and
+exits non-zero when either in-memory rate falls below ``--target`` (default
+1000/s on one core).
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from backend.utils.docx_template import load_template
+from backend.utils.docx_utils import RenderContext, build_docx, create_placeholder_template, render_resume_docx
+
+
+def sample_context() -> RenderContext:
+    return RenderContext(
+        summary="Data scientist with eight years of experience shipping ML systems & analytics <at scale>.",
+        skills=[f"Skill {index}" for index in range(12)],
+        experience=[
+            "\n".join(
+                [f"Employer {block} — Senior Engineer (2018 - 2023)"]
+                + [f"• Delivered measurable impact on initiative {bullet}." for bullet in range(5)]
+            )
+            for block in range(4)
+        ],
+        education=["MSc Computer Science, Example University"],
+        certifications=["Cloud Architect", "Data Engineer"],
+    )
+
+
+def measure(iterations: int, compress: bool) -> dict[str, float]:
+    context = sample_context()
+    paragraphs = [para for para in context.iter_paragraphs() if para]
+    build_docx(paragraphs, compress=compress)  # warm the skeleton cache
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        build_docx(paragraphs, compress=compress)
+    in_memory = iterations / (time.perf_counter() - start)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        target = Path(tmp)
+        template_path = target / "resume_template.docx"
+        create_placeholder_template(template_path)
+        template_context = context.as_template_context()
+        start = time.perf_counter()
+        for _ in range(iterations):
+            load_template(template_path).render(template_context, compress=compress)
+        template = iterations / (time.perf_counter() - start)
+
+        start = time.perf_counter()
+        for index in range(iterations):
+            render_resume_docx(target / f"resume_{index}.docx", context, compress=compress)
+        to_disk = iterations / (time.perf_counter() - start)
+    return {
+        "in_memory_per_second": in_memory,
+        "template_per_second": template,
+        "to_disk_per_second": to_disk,
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=5000)
+    parser.add_argument("--target", type=float, default=1000.0)
+    parser.add_argument("--compress", action="store_true", help="Use DEFLATE for all parts")
+    args = parser.parse_args(argv)
+
+    results = measure(args.iterations, args.compress)
+    for name, value in results.items():
+        print(f"{name}: {value:,.0f}")
+    if min(results["in_memory_per_second"], results["template_per_second"]) < args.target:
+        print(f"below target of {args.target:,.0f} artifacts/s", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,108 @@
+"""Logging overhead per simulated API request.
+
+Run with ``python -m benchmarks.bench_logging``.  Each simulated request
+emits the events a typical tailor request logs (a bound ``info``, a sampled
+``mock_rewrite``, two ``debug`` events and a ``warning``) into a discarded
+stream, and the benchmark prints microseconds per request for:
+
+* ``sync``: the previous setup, rendering JSON on the calling thread;
+* ``async``: :func:`backend.logging_config.configure_logging` with the queue
+  listener and the default sample rates;
+* ``disabled``: the same pipeline with ``LOG_LEVEL=ERROR``.
+
+Exits non-zero when ``async`` is slower than ``--target`` microseconds per
+request.
+"""
+
+from __future__ import annotations
+
+import argparse
+import dataclasses
+import io
+import logging
+import sys
+import time
+
+import structlog
+
+from backend.config import get_settings
+from backend.logging_config import configure_logging, shutdown_logging
+from backend.utils.metrics import REGISTRY
+
+
+class _NullStream(io.TextIOBase):
+    def write(self, text: str) -> int:
+        return len(text)
+
+
+def _configure_sync(stream) -> None:
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(logging.StreamHandler(stream))
+    root.setLevel(logging.INFO)
+    structlog.configure(
+        processors=[
+            structlog.processors.TimeStamper(fmt="iso"),
+            structlog.processors.add_log_level,
+            structlog.processors.EventRenamer("event"),
+            structlog.processors.format_exc_info,
+            structlog.processors.JSONRenderer(),
+        ],
+        logger_factory=structlog.stdlib.LoggerFactory(),
+        wrapper_class=structlog.stdlib.BoundLogger,
+    )
+
+
+def simulate_request(logger, index: int) -> None:
+    request_logger = logger.bind(request_id=index, route="tailor_resume")
+    request_logger.info("tailor_requested", resume_id=index % 50, job_posting_id=index % 400)
+    request_logger.debug("plan_lookup", key=f"plan-{index}")
+    request_logger.info("mock_rewrite", resume_length=4200, job_length=1800)
+    request_logger.debug("render_context", sections=6)
+    if index % 100 == 0:
+        request_logger.warning("slow_render", seconds=1.2)
+
+
+def measure(mode: str, iterations: int) -> float:
+    stream = _NullStream()
+    settings = get_settings()
+    if mode == "sync":
+        _configure_sync(stream)
+    else:
+        level = "ERROR" if mode == "disabled" else "INFO"
+        configure_logging(dataclasses.replace(settings, log_async=True, log_level=level), stream=stream)
+    logger = structlog.get_logger("benchmarks.logging")
+    try:
+        for index in range(min(iterations, 1000)):
+            simulate_request(logger, index)
+        start = time.perf_counter()
+        for index in range(iterations):
+            simulate_request(logger, index)
+        elapsed = time.perf_counter() - start
+    finally:
+        shutdown_logging()
+    return elapsed / iterations * 1_000_000
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=20000)
+    parser.add_argument("--target", type=float, default=50.0, help="Maximum async microseconds per request")
+    args = parser.parse_args(argv)
+
+    results = {mode: measure(mode, args.iterations) for mode in ("sync", "async", "disabled")}
+    print(f"{'mode':>8}  {'us/request':>10}  {'vs sync':>7}")
+    for mode, micros in results.items():
+        print(f"{mode:>8}  {micros:>10.1f}  {micros / results['sync']:>6.2f}x")
+    full = REGISTRY.value("fitresume_log_events_dropped_total", reason="queue_full")
+    if full:
+        print(f"{full:.0f} events dropped on a full queue; raise LOG_QUEUE_SIZE for a like-for-like run")
+    if results["async"] > args.target:
+        print(f"async logging costs {results['async']:.1f}us per request, above the {args.target:.1f}us target")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,62 @@
+"""Throughput of :class:`RenderExecutor` as the worker count grows.
+
+Run with ``python -m benchmarks.bench_render_executor``.  Renders ``--count``
+artifacts for each worker count in ``--workers`` (``0`` is the inline
+baseline) and prints artifacts per second and the speedup over inline.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from backend.services.render_executor import RenderExecutor, RenderTask
+from backend.utils.docx_utils import create_placeholder_template
+
+from .bench_docx_render import sample_context
+
+
+def measure(template_path: Path, count: int, workers: int, output: Path | None) -> float:
+    context = sample_context().as_template_context()
+    tasks = (
+        RenderTask(context=context, destination=output / f"resume_{index}.docx" if output else None, key=index)
+        for index in range(count)
+    )
+    with RenderExecutor(template_path, workers=workers) as executor:
+        if workers:
+            # Start the pool and compile the template in every worker before timing.
+            list(executor.render_many(RenderTask(context=context) for _ in range(workers * executor.chunk_size)))
+        start = time.perf_counter()
+        failures = sum(1 for outcome in executor.render_many(tasks) if outcome.error)
+        elapsed = time.perf_counter() - start
+    if failures:
+        raise RuntimeError(f"{failures} renders failed")
+    return count / elapsed
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=5000)
+    parser.add_argument("--workers", default="0,1,2,4", help="Comma separated worker counts")
+    parser.add_argument("--to-disk", action="store_true", help="Have workers write files instead of returning bytes")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        template_path = root / "resume_template.docx"
+        create_placeholder_template(template_path)
+        baseline = None
+        print(f"{'workers':>7}  {'artifacts/s':>12}  {'speedup':>7}")
+        for workers in (int(value) for value in args.workers.split(",")):
+            output = root / f"out_{workers}" if args.to_disk else None
+            rate = measure(template_path, args.count, workers, output)
+            baseline = baseline or rate
+            print(f"{workers:>7}  {rate:>12,.0f}  {rate / baseline:>6.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
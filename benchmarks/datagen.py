@@ -0,0 +1,410 @@
+"""Deterministic synthetic data for load and scale testing.
+
+Run with ``python -m benchmarks.datagen --out DIR`` to write any of:
+
+* ``resumes/``: DOCX resumes with tables and long sections (``--resumes``);
+* ``jobs.csv`` / ``jobs.jsonl``: job feeds in the CSV upload format, with a
+  share of reposted (duplicate) postings (``--jobs``, ``--duplicate-rate``);
+* ``companies.csv``: companies with aliases (``--companies``);
+* ``fitresume.db``: a SQLite database pre-populated with all of the above
+  (``--database``).
+
+Every item is derived from ``--seed`` and its own index, so output is
+identical whatever ``--workers`` is; the work is split across processes in
+chunks.  The same functions back the ``synthetic_db`` test fixture and the
+benchmark suite.
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import io
+import json
+import multiprocessing
+import os
+import random
+import sqlite3
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from functools import partial
+from hashlib import sha256
+from pathlib import Path
+from typing import Callable, Iterator, Sequence
+
+from backend import crud, db
+from backend.utils.docx_utils import build_docx
+
+
+JOB_FIELDS = ("title", "company", "location", "url", "external_id", "description")
+
+_COMPANY_STEMS = (
+    "Acme", "Globex", "Initech", "Umbrella", "Stark", "Wayne", "Hooli", "Vandelay", "Soylent", "Tyrell",
+    "Cyberdyne", "Aperture", "Wonka", "Oscorp", "Massive", "Pied Piper", "Gringotts", "Monarch", "Nakatomi", "Dunder",
+)
+_COMPANY_SUFFIXES = ("Labs", "Systems", "Analytics", "Health", "Robotics", "Logistics", "Capital", "Media", "Energy", "Foods")
+_LEGAL_FORMS = ("Inc.", "LLC", "GmbH", "Ltd", "Corporation")
+_TITLES = (
+    "Data Scientist", "Data Engineer", "Machine Learning Engineer", "Analytics Engineer", "Backend Engineer",
+    "Platform Engineer", "Product Analyst", "Research Scientist", "Site Reliability Engineer", "Engineering Manager",
+)
+_LEVELS = ("Junior", "", "", "Senior", "Staff", "Lead", "Principal")
+_LOCATIONS = ("Remote", "Berlin", "New York, NY", "London", "San Francisco, CA", "Toronto", "Amsterdam", "Austin, TX")
+_SKILLS = (
+    "Python", "SQL", "Spark", "Airflow", "dbt", "Kubernetes", "Terraform", "PyTorch", "TensorFlow", "scikit-learn",
+    "Kafka", "PostgreSQL", "Snowflake", "AWS", "GCP", "Docker", "FastAPI", "Pandas", "Tableau", "Go",
+)
+_VERBS = ("Built", "Led", "Designed", "Shipped", "Scaled", "Automated", "Migrated", "Reduced", "Improved", "Launched")
+_OBJECTS = (
+    "a streaming ingestion pipeline", "the feature store", "experiment tooling", "forecasting models",
+    "the billing data warehouse", "a recommendation service", "on-call runbooks", "batch ETL jobs",
+    "model monitoring", "the search ranking stack",
+)
+_OUTCOMES = (
+    "cutting latency by {n}%", "saving ${n}k a year", "for {n} internal teams", "raising conversion {n}%",
+    "processing {n}M events a day", "with {n}% less infrastructure",
+)
+_SCHOOLS = ("Example University", "Institute of Technology", "State University", "Polytechnic School")
+_DEGREES = ("BSc Computer Science", "MSc Statistics", "BEng Software Engineering", "MSc Data Science", "PhD Physics")
+
+
+@dataclass
+class Company:
+    name: str
+    aliases: tuple[str, ...]
+
+
+@dataclass
+class SyntheticResume:
+    filename: str
+    content: bytes
+    text: str
+
+
+def _rng(seed: int, kind: str, index: int) -> random.Random:
+    # String seeds hash deterministically (unlike ``hash()``), independent of process.
+    return random.Random(f"{seed}:{kind}:{index}")
+
+
+def _chunks(total: int, size: int) -> list[tuple[int, int]]:
+    return [(start, min(start + size, total)) for start in range(0, total, size)]
+
+
+def _map_chunks(func: Callable, total: int, chunk_size: int, workers: int) -> Iterator:
+    """Yield ``func(start, stop)`` for consecutive chunks, in order, across ``workers`` processes."""
+
+    chunks = _chunks(total, chunk_size)
+    if workers <= 1 or len(chunks) <= 1:
+        for start, stop in chunks:
+            yield func(start, stop)
+        return
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=min(workers, len(chunks)), mp_context=context) as pool:
+        yield from pool.map(func, *zip(*chunks))
+
+
+def generate_companies(count: int, *, seed: int = 0) -> list[Company]:
+    """Return ``count`` companies with unique names and two to four aliases each."""
+
+    companies = []
+    for index in range(count):
+        rng = _rng(seed, "company", index)
+        stem = _COMPANY_STEMS[index % len(_COMPANY_STEMS)]
+        suffix = _COMPANY_SUFFIXES[(index // len(_COMPANY_STEMS)) % len(_COMPANY_SUFFIXES)]
+        generation = index // (len(_COMPANY_STEMS) * len(_COMPANY_SUFFIXES))
+        name = f"{stem} {suffix}" + (f" {generation + 1}" if generation else "")
+        candidates = [
+            f"{name} {rng.choice(_LEGAL_FORMS)}",
+            name.upper(),
+            "".join(word[0] for word in name.split() if word[0].isalpha()).upper(),
+            f"{stem}{suffix}".lower(),
+        ]
+        companies.append(Company(name=name, aliases=tuple(rng.sample(candidates, rng.randint(2, 4)))))
+    return companies
+
+
+def _is_repost(seed: int, index: int, duplicate_rate: float) -> bool:
+    return index > 0 and _rng(seed, "repost", index).random() < duplicate_rate
+
+
+def _original_job(seed: int, index: int, companies: Sequence[Company]) -> dict[str, str]:
+    rng = _rng(seed, "job", index)
+    company = companies[rng.randrange(len(companies))] if companies else None
+    title = " ".join(part for part in (rng.choice(_LEVELS), rng.choice(_TITLES)) if part)
+    skills = rng.sample(_SKILLS, 6)
+    paragraphs = [
+        f"{company.name if company else 'We'} is hiring a {title} to join a team of {rng.randint(4, 40)}.",
+        "Recent team wins: " + "; ".join(f"{rng.choice(_VERBS).lower()} {rng.choice(_OBJECTS)}" for _ in range(3)) + ".",
+        f"Must have: {', '.join(skills[:4])}. Nice to have: {', '.join(skills[4:])}.",
+        f"Compensation {rng.randint(80, 220)}k-{rng.randint(221, 320)}k, {rng.randint(20, 35)} days of leave.",
+    ]
+    return {
+        "title": title,
+        "company": company.name if company else "",
+        "location": rng.choice(_LOCATIONS),
+        "url": f"https://jobs.example.com/{seed}/{index}",
+        "external_id": f"ext-{seed}-{index}",
+        "description": "\n\n".join(paragraphs),
+    }
+
+
+def job_row(index: int, *, seed: int, companies: Sequence[Company], duplicate_rate: float = 0.0) -> dict[str, str]:
+    """Return feed row ``index``.
+
+    A share ``duplicate_rate`` of rows repost an earlier original posting:
+    same URL (so the same dedup key) under a new ``external_id``, as job
+    boards do when a posting is refreshed.
+    """
+
+    if not _is_repost(seed, index, duplicate_rate):
+        return _original_job(seed, index, companies)
+    original = _rng(seed, "repost-of", index).randrange(index)
+    while _is_repost(seed, original, duplicate_rate):
+        original -= 1
+    row = _original_job(seed, original, companies)
+    row["external_id"] = f"ext-{seed}-{index}"
+    return row
+
+
+def _render_jobs(start: int, stop: int, *, seed: int, companies: Sequence[Company], duplicate_rate: float, fmt: str) -> str:
+    buffer = io.StringIO()
+    rows = (job_row(index, seed=seed, companies=companies, duplicate_rate=duplicate_rate) for index in range(start, stop))
+    if fmt == "csv":
+        csv.DictWriter(buffer, JOB_FIELDS).writerows(rows)
+    elif fmt == "jsonl":
+        buffer.writelines(json.dumps(row) + "\n" for row in rows)
+    else:
+        raise ValueError(f"Unknown feed format: {fmt}")
+    return buffer.getvalue()
+
+
+def iter_job_feed(
+    count: int,
+    *,
+    seed: int = 0,
+    companies: Sequence[Company] = (),
+    duplicate_rate: float = 0.1,
+    fmt: str = "csv",
+    workers: int = 1,
+    chunk_size: int = 5000,
+) -> Iterator[str]:
+    """Yield a CSV (with header) or JSONL feed of ``count`` rows in text chunks."""
+
+    if fmt == "csv":
+        yield ",".join(JOB_FIELDS) + "\r\n"
+    render = partial(_render_jobs, seed=seed, companies=tuple(companies), duplicate_rate=duplicate_rate, fmt=fmt)
+    yield from _map_chunks(render, count, chunk_size, workers)
+
+
+def jobs_csv(count: int, **options) -> str:
+    """The whole CSV feed as one string (see :func:`iter_job_feed`)."""
+
+    return "".join(iter_job_feed(count, fmt="csv", **options))
+
+
+def write_job_feed(path: Path, count: int, **options) -> Path:
+    fmt = "jsonl" if path.suffix == ".jsonl" else "csv"
+    with path.open("w", encoding="utf-8", newline="") as handle:
+        for chunk in iter_job_feed(count, fmt=fmt, **options):
+            handle.write(chunk)
+    return path
+
+
+def generate_resume(index: int, *, seed: int = 0, roles: int = 4, bullets: int = 6, table_rows: int = 8) -> SyntheticResume:
+    """Build resume ``index``: long summary and project sections, a skills table, roles and an education table.
+
+    ``text`` matches what :func:`extract_docx_text` returns for ``content``.
+    """
+
+    rng = _rng(seed, "resume", index)
+    skills = rng.sample(_SKILLS, min(table_rows, len(_SKILLS)))
+    blocks: list = [
+        f"Candidate {seed}-{index}",
+        f"candidate{index}@example.com · {rng.choice(_LOCATIONS)}",
+        "Summary",
+        " ".join(
+            f"{rng.choice(_VERBS)} {rng.choice(_OBJECTS)} {rng.choice(_OUTCOMES).format(n=rng.randint(5, 90))}."
+            for _ in range(max(bullets, 3))
+        ),
+        "Skills",
+        [["Skill", "Years", "Level"]]
+        + [[skill, str(rng.randint(1, 12)), rng.choice(("Working", "Advanced", "Expert"))] for skill in skills],
+        "Experience",
+    ]
+    year = 2024
+    for role in range(roles):
+        start = year - rng.randint(1, 4)
+        blocks.append(f"{rng.choice(_TITLES)} — {rng.choice(_COMPANY_STEMS)} {rng.choice(_COMPANY_SUFFIXES)} ({start} - {year})")
+        blocks.extend(
+            f"• {rng.choice(_VERBS)} {rng.choice(_OBJECTS)}, {rng.choice(_OUTCOMES).format(n=rng.randint(5, 90))}."
+            for _ in range(bullets)
+        )
+        year = start
+    blocks.append("Projects")
+    blocks.extend(
+        f"{rng.choice(_OBJECTS).capitalize()} ({rng.choice(_SKILLS)}): "
+        + " ".join(f"{rng.choice(_VERBS)} {rng.choice(_OBJECTS)}." for _ in range(bullets))
+        for _ in range(max(roles // 2, 1))
+    )
+    blocks.append("Education")
+    blocks.append(
+        [["Degree", "School", "Year"]]
+        + [[rng.choice(_DEGREES), rng.choice(_SCHOOLS), str(year - 4 * step)] for step in range(1, 3)]
+    )
+    lines: list[str] = []
+    for block in blocks:
+        lines.extend([block] if isinstance(block, str) else (cell for row in block for cell in row))
+    return SyntheticResume(
+        filename=f"resume_{seed}_{index}.docx",
+        content=build_docx(blocks),
+        text="\n".join(line.strip() for line in lines if line.strip()),
+    )
+
+
+def _write_resumes(start: int, stop: int, *, directory: Path, seed: int, size: dict) -> list[tuple[str, str]]:
+    written = []
+    for index in range(start, stop):
+        resume = generate_resume(index, seed=seed, **size)
+        path = directory / resume.filename
+        path.write_bytes(resume.content)
+        written.append((str(path), resume.text))
+    return written
+
+
+def write_resumes(
+    directory: Path, count: int, *, seed: int = 0, workers: int = 1, chunk_size: int = 50, **size
+) -> list[tuple[str, str]]:
+    """Write ``count`` resumes into ``directory``; returns ``(path, text)`` pairs in index order."""
+
+    directory.mkdir(parents=True, exist_ok=True)
+    write = partial(_write_resumes, directory=directory.resolve(), seed=seed, size=size)
+    return [item for chunk in _map_chunks(write, count, chunk_size, workers) for item in chunk]
+
+
+def _job_values(start: int, stop: int, *, seed: int, companies: Sequence[Company], duplicate_rate: float) -> list[tuple]:
+    values = []
+    for index in range(start, stop):
+        row = job_row(index, seed=seed, companies=companies, duplicate_rate=duplicate_rate)
+        values.append(
+            (
+                row["company"],
+                row["title"],
+                row["location"],
+                row["url"],
+                row["description"],
+                row["external_id"],
+                crud.job_url_hash(row["title"], row["url"], row["description"]),
+            )
+        )
+    return values
+
+
+def populate_database(
+    path: Path,
+    *,
+    seed: int = 0,
+    companies: int = 200,
+    jobs: int = 10000,
+    resumes: int = 20,
+    duplicate_rate: float = 0.1,
+    resume_dir: Path | None = None,
+    workers: int = 1,
+    chunk_size: int = 5000,
+    **resume_size,
+) -> dict[str, int]:
+    """Create (or extend) the SQLite database at ``path`` with synthetic rows.
+
+    Rows are generated in worker processes and bulk-inserted here; reposted
+    jobs are dropped on their ``url_hash`` exactly as the CSV import does.
+    Resume files go to ``resume_dir`` (default ``resumes/`` next to the
+    database).  Returns the table counts.
+    """
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    connection = sqlite3.connect(path)
+    try:
+        connection.execute("PRAGMA journal_mode = WAL")
+        db.initialize_schema(connection)
+        company_list = generate_companies(companies, seed=seed)
+        connection.executemany(
+            "INSERT INTO companies (name, aliases) VALUES (?, ?) ON CONFLICT (name) DO NOTHING",
+            [(company.name, ", ".join(company.aliases)) for company in company_list],
+        )
+        company_ids = dict(connection.execute("SELECT name, id FROM companies"))
+        values = partial(_job_values, seed=seed, companies=tuple(company_list), duplicate_rate=duplicate_rate)
+        for chunk in _map_chunks(values, jobs, chunk_size, workers):
+            connection.executemany(
+                """
+                INSERT INTO job_postings (company_id, title, location, url, raw_text, external_id, url_hash)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (url_hash) DO NOTHING
+                """,
+                [(company_ids.get(company), *rest) for company, *rest in chunk],
+            )
+        written = write_resumes(resume_dir or path.parent / "resumes", resumes, seed=seed, workers=workers, **resume_size)
+        connection.executemany(
+            "INSERT INTO resumes (file_path, format, text, text_hash) VALUES (?, 'docx', ?, ?)",
+            [(file_path, text, sha256(text.encode("utf-8", "ignore")).hexdigest()) for file_path, text in written],
+        )
+        connection.commit()
+        return {
+            table: connection.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+            for table in ("companies", "job_postings", "resumes")
+        }
+    finally:
+        connection.close()
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--out", type=Path, required=True)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--companies", type=int, default=200)
+    parser.add_argument("--jobs", type=int, default=0, help="Rows per job feed")
+    parser.add_argument("--formats", default="csv,jsonl", help="Job feed formats to write")
+    parser.add_argument("--duplicate-rate", type=float, default=0.1, help="Share of job rows that repost earlier ones")
+    parser.add_argument("--resumes", type=int, default=0)
+    parser.add_argument("--roles", type=int, default=4, help="Experience entries per resume")
+    parser.add_argument("--bullets", type=int, default=6, help="Bullets per role (and sentences per long section)")
+    parser.add_argument("--table-rows", type=int, default=8, help="Rows in each resume's skills table")
+    parser.add_argument("--database", action="store_true", help="Also write a pre-populated fitresume.db")
+    args = parser.parse_args(argv)
+
+    if not 0 <= args.duplicate_rate < 1:
+        parser.error("--duplicate-rate must be in [0, 1)")
+    args.out.mkdir(parents=True, exist_ok=True)
+    size = {"roles": args.roles, "bullets": args.bullets, "table_rows": args.table_rows}
+    started = time.perf_counter()
+    companies = generate_companies(args.companies, seed=args.seed)
+    with (args.out / "companies.csv").open("w", encoding="utf-8", newline="") as handle:
+        writer = csv.writer(handle)
+        writer.writerow(["name", "aliases"])
+        writer.writerows((company.name, ", ".join(company.aliases)) for company in companies)
+    options = {"seed": args.seed, "companies": companies, "duplicate_rate": args.duplicate_rate, "workers": args.workers}
+    for fmt in (value.strip() for value in args.formats.split(",") if value.strip() and args.jobs):
+        path = write_job_feed(args.out / f"jobs.{fmt}", args.jobs, **options)
+        print(f"wrote {args.jobs:,} job rows to {path}")
+    if args.resumes and not args.database:
+        write_resumes(args.out / "resumes", args.resumes, seed=args.seed, workers=args.workers, **size)
+        print(f"wrote {args.resumes:,} resumes to {args.out / 'resumes'}")
+    if args.database:
+        counts = populate_database(
+            args.out / "fitresume.db",
+            seed=args.seed,
+            companies=args.companies,
+            jobs=args.jobs,
+            resumes=args.resumes,
+            duplicate_rate=args.duplicate_rate,
+            workers=args.workers,
+            **size,
+        )
+        print(f"wrote {args.out / 'fitresume.db'}: " + ", ".join(f"{count:,} {table}" for table, count in counts.items()))
+    print(f"done in {time.perf_counter() - started:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,356 @@
+"""A local stand-in for the OpenAI Responses API, for offline load tests.
+
+Run with ``python -m benchmarks.fake_openai --port 8900`` and point the
+backend at it with ``OPENAI_BASE_URL=http://127.0.0.1:8900/v1`` (any
+``OPENAI_API_KEY`` will do).  ``POST /v1/responses`` answers in the shape
+``client.responses.create`` expects, with or without ``stream=True``:
+
+* time to the first token is drawn from ``--latency`` and output then
+  takes ``--tokens-per-second``, whether streamed or returned whole;
+* output length is drawn from ``--output-tokens``; ``json_object`` requests
+  get a resume plan as JSON, others plain resume text;
+* ``--error-rate`` of requests fail with a status from ``--error-statuses``
+  and an OpenAI-style error body.
+
+Distributions are written ``fixed:V``, ``uniform:LOW,HIGH``,
+``lognormal:MEDIAN,SIGMA`` or ``exponential:MEAN``.  ``GET /stats`` returns
+request counters.  :class:`FakeOpenAIServer` runs the same server on a
+background thread for in-process use.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import random
+import sys
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Iterator
+
+
+@dataclass(frozen=True)
+class Distribution:
+    """A sampled quantity, parsed from ``kind:param,param``."""
+
+    kind: str
+    params: tuple[float, ...]
+
+    @classmethod
+    def parse(cls, spec: str) -> "Distribution":
+        kind, _, raw = spec.partition(":")
+        try:
+            params = tuple(float(value) for value in raw.split(",") if value.strip())
+        except ValueError:
+            raise ValueError(f"Invalid distribution parameters: {spec!r}") from None
+        expected = {"fixed": 1, "uniform": 2, "lognormal": 2, "exponential": 1}.get(kind)
+        if expected is None:
+            raise ValueError(f"Unknown distribution {kind!r}; use fixed, uniform, lognormal or exponential")
+        if len(params) != expected or any(value < 0 for value in params):
+            raise ValueError(f"{kind} takes {expected} non-negative parameter(s), got {spec!r}")
+        return cls(kind, params)
+
+    def sample(self, rng: random.Random) -> float:
+        if self.kind == "fixed":
+            return self.params[0]
+        if self.kind == "uniform":
+            return rng.uniform(*self.params)
+        if self.kind == "lognormal":
+            median, sigma = self.params
+            return rng.lognormvariate(math.log(median), sigma) if median else 0.0
+        mean = self.params[0]
+        return rng.expovariate(1 / mean) if mean else 0.0
+
+
+@dataclass
+class FakeModelConfig:
+    latency: Distribution = field(default_factory=lambda: Distribution.parse("lognormal:0.8,0.4"))
+    output_tokens: Distribution = field(default_factory=lambda: Distribution.parse("uniform:300,900"))
+    tokens_per_second: float = 80.0
+    error_rate: float = 0.0
+    error_statuses: tuple[int, ...] = (429, 500, 503)
+    seed: int = 0
+
+
+_WORDS = (
+    "delivered", "scalable", "data", "pipelines", "across", "teams", "improving", "reliability", "and", "reducing",
+    "latency", "for", "customer", "facing", "analytics", "using", "Python", "SQL", "cloud", "services",
+)
+
+
+class _Model:
+    """Request-independent behaviour of the fake model; thread-safe."""
+
+    def __init__(self, config: FakeModelConfig) -> None:
+        self.config = config
+        self._rng = random.Random(config.seed)
+        self._lock = threading.Lock()
+        self.stats = {"requests": 0, "streamed": 0, "errors": 0, "output_tokens": 0}
+
+    def draw(self) -> tuple[float, int, int | None]:
+        """Return ``(latency, output_tokens, error_status or None)`` for one request."""
+
+        with self._lock:
+            latency = self.config.latency.sample(self._rng)
+            tokens = max(int(self.config.output_tokens.sample(self._rng)), 1)
+            failed = self._rng.random() < self.config.error_rate
+            status = self._rng.choice(self.config.error_statuses) if failed else None
+            self.stats["requests"] += 1
+            if status:
+                self.stats["errors"] += 1
+            else:
+                self.stats["output_tokens"] += tokens
+        return latency, tokens, status
+
+    def count_stream(self) -> None:
+        with self._lock:
+            self.stats["streamed"] += 1
+
+    def snapshot(self) -> dict[str, int]:
+        with self._lock:
+            return dict(self.stats)
+
+
+def _wants_json(body: dict) -> bool:
+    text_format = (body.get("text") or {}).get("format") or body.get("response_format") or {}
+    return text_format.get("type") in ("json_object", "json_schema")
+
+
+def _input_tokens(body: dict) -> int:
+    payload = body.get("input", "")
+    return max(len(json.dumps(payload)) // 4, 1)
+
+
+def _words(tokens: int, offset: int = 0) -> str:
+    return " ".join(_WORDS[(offset + index) % len(_WORDS)] for index in range(tokens))
+
+
+def _output_text(body: dict, tokens: int) -> str:
+    if not _wants_json(body):
+        return "Summary\n" + _words(tokens)
+    bullets = max((tokens - 40) // 12, 1)
+    plan = {
+        "summary": _words(20),
+        "skills": ["Python", "SQL", "Spark", "Airflow"],
+        "experience": [
+            {
+                "employer": f"Employer {block}",
+                "role": "Senior Engineer",
+                "start": "2019",
+                "end": "2023",
+                "bullets": [_words(10, block + bullet) for bullet in range(block, bullets, 3)],
+            }
+            for block in range(min(bullets, 3))
+        ],
+        "education": ["MSc Computer Science, Example University"],
+        "certifications": ["Cloud Architect"],
+    }
+    return json.dumps(plan)
+
+
+def _response(body: dict, text: str, output_tokens: int, response_id: str) -> dict[str, Any]:
+    input_tokens = _input_tokens(body)
+    return {
+        "id": response_id,
+        "object": "response",
+        "created_at": int(time.time()),
+        "status": "completed",
+        "model": body.get("model", "fake-model"),
+        "output": [
+            {
+                "type": "message",
+                "id": f"msg_{response_id[5:]}",
+                "status": "completed",
+                "role": "assistant",
+                "content": [{"type": "output_text", "text": text, "annotations": []}],
+            }
+        ],
+        "usage": {
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+            "total_tokens": input_tokens + output_tokens,
+        },
+    }
+
+
+def _error_body(status: int) -> dict[str, Any]:
+    kind = "rate_limit_exceeded" if status == 429 else "server_error"
+    return {"error": {"message": f"Injected {kind} from the fake server", "type": kind, "param": None, "code": kind}}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: "_Server"
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002 - stdlib signature
+        pass
+
+    def do_GET(self) -> None:  # noqa: N802 - stdlib naming
+        if self.path.rstrip("/") in ("/stats", "/v1/stats"):
+            self._send_json(200, self.server.model.snapshot())
+        elif self.path.rstrip("/") == "/v1/models":
+            self._send_json(200, {"object": "list", "data": [{"id": "fake-model", "object": "model"}]})
+        else:
+            self._send_json(404, {"error": {"message": "Not found", "type": "invalid_request_error"}})
+
+    def do_POST(self) -> None:  # noqa: N802 - stdlib naming
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length) if length else b""
+        if self.path.rstrip("/") != "/v1/responses":
+            self._send_json(404, {"error": {"message": "Not found", "type": "invalid_request_error"}})
+            return
+        try:
+            body = json.loads(raw or b"{}")
+        except json.JSONDecodeError:
+            self._send_json(400, {"error": {"message": "Invalid JSON body", "type": "invalid_request_error"}})
+            return
+
+        latency, tokens, status = self.server.model.draw()
+        if status:
+            time.sleep(min(latency, 0.05))
+            self._send_json(status, _error_body(status))
+            return
+        text = _output_text(body, tokens)
+        response_id = f"resp_{uuid.uuid4().hex}"
+        if body.get("stream"):
+            self.server.model.count_stream()
+            self._stream(body, text, tokens, response_id, latency)
+            return
+        rate = self.server.model.config.tokens_per_second
+        time.sleep(latency + (tokens / rate if rate else 0))
+        self._send_json(200, _response(body, text, tokens, response_id))
+
+    def _send_json(self, status: int, payload: dict) -> None:
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _stream(self, body: dict, text: str, tokens: int, response_id: str, first_token: float) -> None:
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+        time.sleep(first_token)
+        interval = 1 / self.server.model.config.tokens_per_second if self.server.model.config.tokens_per_second else 0
+        for event in _stream_events(body, text, tokens, response_id):
+            self.wfile.write(f"event: {event['type']}\ndata: {json.dumps(event)}\n\n".encode("utf-8"))
+            self.wfile.flush()
+            if event["type"] == "response.output_text.delta" and interval:
+                time.sleep(interval)
+
+
+def _stream_events(body: dict, text: str, tokens: int, response_id: str) -> Iterator[dict[str, Any]]:
+    final = _response(body, text, tokens, response_id)
+    item_id = final["output"][0]["id"]
+    sequence = 0
+
+    def event(kind: str, **fields: Any) -> dict[str, Any]:
+        nonlocal sequence
+        sequence += 1
+        return {"type": kind, "sequence_number": sequence, **fields}
+
+    yield event("response.created", response={**final, "status": "in_progress", "output": [], "usage": None})
+    # One delta per whitespace-delimited token keeps the delta count close to output_tokens.
+    pieces = text.split(" ")
+    for index, piece in enumerate(pieces):
+        delta = piece if index == len(pieces) - 1 else piece + " "
+        yield event("response.output_text.delta", item_id=item_id, output_index=0, content_index=0, delta=delta)
+    yield event("response.output_text.done", item_id=item_id, output_index=0, content_index=0, text=text)
+    yield event("response.completed", response=final)
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int], model: _Model) -> None:
+        super().__init__(address, _Handler)
+        self.model = model
+
+
+class FakeOpenAIServer:
+    """Run the fake Responses API on a background thread.
+
+    Use as a context manager; :attr:`base_url` is what ``OPENAI_BASE_URL``
+    should be set to.
+    """
+
+    def __init__(self, config: FakeModelConfig | None = None, host: str = "127.0.0.1", port: int = 0) -> None:
+        self.model = _Model(config or FakeModelConfig())
+        self._server = _Server((host, port), self.model)
+        self._thread: threading.Thread | None = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self) -> "FakeOpenAIServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, name="fake-openai", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> "FakeOpenAIServer":
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.stop()
+
+
+def add_model_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--latency", type=Distribution.parse, default="lognormal:0.8,0.4", help="Seconds to first token")
+    parser.add_argument("--output-tokens", type=Distribution.parse, default="uniform:300,900")
+    parser.add_argument("--tokens-per-second", type=float, default=80.0, help="Output rate after the first token; 0 for instant")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--error-statuses", default="429,500,503")
+    parser.add_argument("--model-seed", type=int, default=0)
+
+
+def model_config(args: argparse.Namespace) -> FakeModelConfig:
+    if not 0 <= args.error_rate <= 1:
+        raise ValueError("--error-rate must be between 0 and 1")
+    return FakeModelConfig(
+        latency=args.latency,
+        output_tokens=args.output_tokens,
+        tokens_per_second=args.tokens_per_second,
+        error_rate=args.error_rate,
+        error_statuses=tuple(int(value) for value in args.error_statuses.split(",") if value.strip()),
+        seed=args.model_seed,
+    )
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    add_model_arguments(parser)
+    args = parser.parse_args(argv)
+
+    server = FakeOpenAIServer(model_config(args), host=args.host, port=args.port)
+    print(f"fake OpenAI API listening on {server.base_url}")
+    try:
+        server._server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server._server.server_close()
+        print(json.dumps(server.model.snapshot()))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
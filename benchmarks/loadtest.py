@@ -0,0 +1,313 @@
+"""Open-loop load driver for the tailoring, listing and CSV upload endpoints.
+
+Run with ``python -m benchmarks.loadtest --in-process`` for a self-contained
+run, or ``--base-url http://127.0.0.1:8000`` against a running backend.
+
+Requests are issued at ``--rps`` for ``--duration`` seconds, split across
+``POST /api/tailor``, ``GET /api/job_postings`` and
+``POST /api/job_postings/upload_csv`` by ``--mix`` weights.  Send times
+are fixed in advance and latency is measured from the scheduled time, so a
+saturated server shows up as growing latency rather than a lower request
+rate.  The report has throughput, errors and p50/p90/p99/max latency per
+endpoint, and is also written to ``--output`` as JSON.
+
+``--in-process`` seeds a throwaway database with :mod:`benchmarks.datagen`,
+starts :mod:`benchmarks.fake_openai` (see its options for latency, token
+and error settings) and points ``OPENAI_BASE_URL`` at it, then calls the
+app through its test client.  Without the ``openai`` package installed the
+backend falls back to the mock rewrite service.
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib.util
+import io
+import json
+import math
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Protocol
+
+from . import datagen
+from .fake_openai import FakeOpenAIServer, add_model_arguments, model_config
+from .suite import isolated_backend
+
+
+ENDPOINTS = ("tailor", "list", "upload")
+
+
+class Transport(Protocol):
+    def request(self, method: str, path: str, *, json_body: Any = None, upload: bytes | None = None) -> tuple[int, Any]:
+        ...
+
+
+class HttpTransport:
+    """Send requests to a running backend with ``urllib``."""
+
+    def __init__(self, base_url: str, timeout: float = 120.0) -> None:
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+
+    def request(self, method: str, path: str, *, json_body: Any = None, upload: bytes | None = None) -> tuple[int, Any]:
+        headers: dict[str, str] = {}
+        data = None
+        if json_body is not None:
+            data = json.dumps(json_body).encode("utf-8")
+            headers["Content-Type"] = "application/json"
+        elif upload is not None:
+            boundary = uuid.uuid4().hex
+            data = (
+                f"--{boundary}\r\n"
+                'Content-Disposition: form-data; name="file"; filename="jobs.csv"\r\n'
+                "Content-Type: text/csv\r\n\r\n"
+            ).encode("utf-8") + upload + f"\r\n--{boundary}--\r\n".encode("utf-8")
+            headers["Content-Type"] = f"multipart/form-data; boundary={boundary}"
+        request = urllib.request.Request(self.base_url + path, data=data, headers=headers, method=method)
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                return response.status, json.loads(response.read() or b"null")
+        except urllib.error.HTTPError as exc:
+            return exc.code, None
+        except (urllib.error.URLError, TimeoutError, ConnectionError):
+            return 0, None
+
+
+class InProcessTransport:
+    """Call the app through the FastAPI test client in this process."""
+
+    def __init__(self, client) -> None:
+        self.client = client
+
+    def request(self, method: str, path: str, *, json_body: Any = None, upload: bytes | None = None) -> tuple[int, Any]:
+        try:
+            if method == "GET":
+                response = self.client.get(path)
+            elif upload is not None:
+                response = self.client.post(path, files={"file": ("jobs.csv", io.BytesIO(upload), "text/csv")})
+            else:
+                response = self.client.post(path, json=json_body)
+        except Exception:  # an unhandled error is a 500 to a real client
+            return 500, None
+        return response.status_code, response.json()
+
+
+@dataclass
+class Sample:
+    endpoint: str
+    latency: float
+    service: float
+    ok: bool
+
+
+@dataclass
+class LoadPlan:
+    rps: float
+    duration: float
+    mix: dict[str, float]
+    concurrency: int = 32
+    upload_rows: int = 100
+    seed: int = 0
+    resume_ids: list[int] = field(default_factory=list)
+    job_ids: list[int] = field(default_factory=list)
+
+
+def parse_mix(spec: str) -> dict[str, float]:
+    mix = {}
+    for item in spec.split(","):
+        name, _, weight = item.partition("=")
+        name = name.strip()
+        if name not in ENDPOINTS:
+            raise ValueError(f"Unknown endpoint {name!r} in mix; expected {', '.join(ENDPOINTS)}")
+        mix[name] = float(weight or 1)
+    if not any(weight > 0 for weight in mix.values()):
+        raise ValueError("The mix needs at least one positive weight")
+    return mix
+
+
+def _operations(transport: Transport, plan: LoadPlan) -> dict[str, Callable[[random.Random, int], Callable[[], int]]]:
+    """Return, per endpoint, a builder producing the call for request ``index``.
+
+    Building (picking ids, generating an upload) happens before the clock
+    starts on a request; only the returned call is timed.
+    """
+
+    companies = datagen.generate_companies(50, seed=plan.seed)
+
+    def tailor(rng: random.Random, index: int) -> Callable[[], int]:
+        payload = {"resume_id": rng.choice(plan.resume_ids), "job_posting_id": rng.choice(plan.job_ids)}
+        return lambda: transport.request("POST", "/api/tailor", json_body=payload)[0]
+
+    def listing(rng: random.Random, index: int) -> Callable[[], int]:
+        return lambda: transport.request("GET", "/api/job_postings")[0]
+
+    def upload(rng: random.Random, index: int) -> Callable[[], int]:
+        # A fresh seed per request keeps the uploaded postings new instead of all duplicates.
+        content = datagen.jobs_csv(plan.upload_rows, seed=plan.seed * 1_000_003 + index + 1, companies=companies)
+        return lambda: transport.request("POST", "/api/job_postings/upload_csv", upload=content.encode("utf-8"))[0]
+
+    return {"tailor": tailor, "list": listing, "upload": upload}
+
+
+def run_load(transport: Transport, plan: LoadPlan) -> tuple[list[Sample], float]:
+    """Issue the planned requests; returns the samples and the wall time until the last completed."""
+
+    if "tailor" in plan.mix and plan.mix["tailor"] > 0 and not (plan.resume_ids and plan.job_ids):
+        raise ValueError("Tailoring needs at least one resume and one job posting")
+    builders = _operations(transport, plan)
+    names = [name for name, weight in plan.mix.items() if weight > 0]
+    weights = [plan.mix[name] for name in names]
+    rng = random.Random(plan.seed)
+    total = max(int(plan.rps * plan.duration), 1)
+    samples: list[Sample] = []
+    lock = threading.Lock()
+
+    def issue(endpoint: str, index: int, request_rng: random.Random, due: float) -> None:
+        picked_up = time.perf_counter()
+        call = builders[endpoint](request_rng, index)
+        started = time.perf_counter()
+        try:
+            status = call()
+        except Exception:
+            status = 0
+        finished = time.perf_counter()
+        # Latency runs from the scheduled send time, less the driver's own time building the request.
+        latency = finished - due - (started - picked_up)
+        with lock:
+            samples.append(Sample(endpoint, latency, finished - started, 200 <= status < 300))
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=plan.concurrency, thread_name_prefix="load") as pool:
+        for index in range(total):
+            due = start + index / plan.rps
+            endpoint = rng.choices(names, weights)[0]
+            request_rng = random.Random(rng.getrandbits(64))
+            delay = due - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            pool.submit(issue, endpoint, index, request_rng, due)
+    return samples, time.perf_counter() - start
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    """Nearest-rank percentile of ``values`` (0 for no values)."""
+
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[max(math.ceil(fraction * len(ordered)) - 1, 0)]
+
+
+def summarize(samples: list[Sample], elapsed: float) -> dict[str, dict[str, float]]:
+    groups: dict[str, list[Sample]] = {"all": samples}
+    for sample in samples:
+        groups.setdefault(sample.endpoint, []).append(sample)
+    report = {}
+    for name, group in groups.items():
+        latencies = [sample.latency * 1000 for sample in group]
+        report[name] = {
+            "requests": len(group),
+            "errors": sum(1 for sample in group if not sample.ok),
+            "throughput_rps": len(group) / elapsed if elapsed else 0.0,
+            "p50_ms": percentile(latencies, 0.50),
+            "p90_ms": percentile(latencies, 0.90),
+            "p99_ms": percentile(latencies, 0.99),
+            "max_ms": max(latencies, default=0.0),
+            "mean_service_ms": sum(sample.service for sample in group) * 1000 / len(group) if group else 0.0,
+        }
+    return report
+
+
+def print_report(report: dict[str, dict[str, float]]) -> None:
+    print(f"{'endpoint':<8}  {'requests':>8}  {'errors':>6}  {'req/s':>7}  {'p50 ms':>8}  {'p90 ms':>8}  {'p99 ms':>8}  {'max ms':>8}")
+    for name, row in report.items():
+        print(
+            f"{name:<8}  {row['requests']:>8}  {row['errors']:>6}  {row['throughput_rps']:>7.1f}  "
+            f"{row['p50_ms']:>8.1f}  {row['p90_ms']:>8.1f}  {row['p99_ms']:>8.1f}  {row['max_ms']:>8.1f}"
+        )
+
+
+def discover_ids(transport: Transport) -> tuple[list[int], list[int]]:
+    resumes = transport.request("GET", "/api/resumes")[1] or []
+    jobs = transport.request("GET", "/api/job_postings")[1] or []
+    return [resume["id"] for resume in resumes], [job["id"] for job in jobs]
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--base-url", help="A running backend, e.g. http://127.0.0.1:8000")
+    target.add_argument("--in-process", action="store_true", help="Seed a temporary backend and call it in-process")
+    parser.add_argument("--rps", type=float, default=20.0)
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds of load")
+    parser.add_argument("--mix", type=parse_mix, default="tailor=1,list=2,upload=0.2", help="endpoint=weight pairs")
+    parser.add_argument("--concurrency", type=int, default=32, help="Maximum requests in flight")
+    parser.add_argument("--upload-rows", type=int, default=100, help="Rows per uploaded CSV")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--seed-jobs", type=int, default=2000, help="Postings in the in-process database")
+    parser.add_argument("--seed-resumes", type=int, default=20, help="Resumes in the in-process database")
+    parser.add_argument("--no-fake-openai", action="store_true", help="In-process: use the mock rewrite service")
+    parser.add_argument("--output", type=Path, help="Write the report as JSON")
+    add_model_arguments(parser)
+    args = parser.parse_args(argv)
+    if args.rps <= 0 or args.duration <= 0:
+        parser.error("--rps and --duration must be positive")
+
+    plan = LoadPlan(
+        rps=args.rps,
+        duration=args.duration,
+        mix=args.mix,
+        concurrency=args.concurrency,
+        upload_rows=args.upload_rows,
+        seed=args.seed,
+    )
+    fake = None
+    with ExitStack() as stack:
+        if args.in_process:
+            root = Path(stack.enter_context(tempfile.TemporaryDirectory()))
+            env = {"LOG_LEVEL": os.environ.get("LOG_LEVEL", "WARNING")}
+            if not args.no_fake_openai:
+                fake = stack.enter_context(FakeOpenAIServer(model_config(args)))
+                env.update(OPENAI_API_KEY="fake-key", OPENAI_BASE_URL=fake.base_url)
+                if importlib.util.find_spec("openai") is None:
+                    print("openai package not installed; tailoring will use the mock rewrite service", file=sys.stderr)
+            stack.enter_context(isolated_backend(root, **env))
+            datagen.populate_database(
+                root / "bench.db", seed=args.seed, jobs=args.seed_jobs, resumes=args.seed_resumes, workers=os.cpu_count() or 1
+            )
+            from fastapi.testclient import TestClient
+
+            from backend.main import app
+
+            transport: Transport = InProcessTransport(stack.enter_context(TestClient(app)))
+        else:
+            transport = HttpTransport(args.base_url)
+        plan.resume_ids, plan.job_ids = discover_ids(transport)
+        print(f"{len(plan.resume_ids)} resumes, {len(plan.job_ids)} postings; {args.rps:g} req/s for {args.duration:g}s")
+        samples, elapsed = run_load(transport, plan)
+
+    report = summarize(samples, elapsed)
+    print_report(report)
+    if fake is not None:
+        print(f"fake model: {json.dumps(fake.model.snapshot())}")
+    if args.output:
+        args.output.write_text(
+            json.dumps({"arguments": {key: str(value) for key, value in vars(args).items()}, "report": report}, indent=2),
+            encoding="utf-8",
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,234 @@
+"""Benchmark suite for the ingestion, listing, tailoring and rendering hot paths.
+
+Run with ``python -m benchmarks.suite`` from the repository root (the schema
+is read from ``db/init.sql``).  Everything runs offline against throwaway
+SQLite databases with the mock rewrite service:
+
+* ``import_jobs_from_csv`` for each ``--rows`` size (1k, 100k and 1M by
+  default) of a :mod:`benchmarks.datagen` feed with ``--duplicate-rate``
+  reposts, followed by ``list_job_postings`` and ``get_counts`` on the
+  table it filled;
+* ``extract_docx_text`` on a small and a huge resume;
+* ``render_resume_docx`` throughput;
+* end-to-end ``tailor_resume``.
+
+Results are written to ``--output`` as JSON.  With ``--baseline`` (a file
+written by an earlier run) each result is compared against it and the
+command exits non-zero when any result is worse by more than
+``--tolerance``.  ``--quick`` shrinks every size for a smoke run.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Iterator
+
+from backend import config, crud, db
+from backend.schemas import TailorRequest
+from backend.services import app_service
+from backend.utils.docx_utils import extract_docx_text, render_resume_docx
+
+from . import datagen
+from .bench_docx_render import sample_context
+
+
+@dataclass
+class Result:
+    name: str
+    value: float
+    unit: str
+    higher_is_better: bool
+
+
+@contextmanager
+def isolated_backend(root: Path, **env: str) -> Iterator[None]:
+    """Point the backend at a fresh SQLite database and artifacts root under ``root``.
+
+    The OpenAI key is cleared (so tailoring uses the mock service) unless
+    ``env`` sets it; ``env`` entries are applied on top.
+    """
+
+    keys = {"DATABASE_URL", "ARTIFACTS_ROOT", "OPENAI_API_KEY", *env}
+    saved_env = {key: os.environ.get(key) for key in keys}
+    saved_db = (db._INITIALIZED, db._DATABASE_LOCATION)
+    os.environ["DATABASE_URL"] = f"sqlite:///{root}/bench.db"
+    os.environ["ARTIFACTS_ROOT"] = str(root / "artifacts")
+    os.environ.pop("OPENAI_API_KEY", None)
+    os.environ.update(env)
+    db._INITIALIZED = False
+    config.get_settings.cache_clear()
+    try:
+        yield
+    finally:
+        for key, value in saved_env.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+        db._INITIALIZED, db._DATABASE_LOCATION = saved_db
+        config.get_settings.cache_clear()
+
+
+def _median_seconds(func: Callable[[], object], repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def bench_ingest(rows: int, repeat: int, duplicate_rate: float) -> list[Result]:
+    content = datagen.jobs_csv(
+        rows, companies=datagen.generate_companies(500), duplicate_rate=duplicate_rate, workers=os.cpu_count() or 1
+    )
+    with tempfile.TemporaryDirectory() as tmp, isolated_backend(Path(tmp)):
+        start = time.perf_counter()
+        created = app_service.import_jobs_from_csv(content)
+        elapsed = time.perf_counter() - start
+        if not created:
+            raise RuntimeError(f"imported none of {rows} rows")
+
+        def list_postings() -> None:
+            with db.session_scope() as connection:
+                crud.list_job_postings(connection)
+
+        def counts() -> None:
+            with db.session_scope() as connection:
+                crud.get_counts(connection)
+
+        return [
+            Result(f"import_jobs_from_csv[{rows}]", rows / elapsed, "rows/s", True),
+            Result(f"list_job_postings[{rows}]", _median_seconds(list_postings, repeat), "s", False),
+            Result(f"get_counts[{rows}]", _median_seconds(counts, repeat * 10), "s", False),
+        ]
+
+
+def bench_extract(huge_roles: int, repeat: int) -> list[Result]:
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for label, size in (("small", {}), ("huge", {"roles": huge_roles, "bullets": 12, "table_rows": 20})):
+            path = Path(tmp) / f"{label}.docx"
+            path.write_bytes(datagen.generate_resume(0, **size).content)
+            seconds = _median_seconds(lambda: extract_docx_text(path), repeat)
+            results.append(Result(f"extract_docx_text[{label}]", seconds, "s", False))
+    return results
+
+
+def bench_render(iterations: int) -> list[Result]:
+    context = sample_context()
+    with tempfile.TemporaryDirectory() as tmp:
+        target = Path(tmp)
+        render_resume_docx(target / "warmup.docx", context)
+        start = time.perf_counter()
+        for index in range(iterations):
+            render_resume_docx(target / f"resume_{index}.docx", context)
+        elapsed = time.perf_counter() - start
+    return [Result("render_resume_docx", iterations / elapsed, "artifacts/s", True)]
+
+
+def bench_tailor(count: int) -> list[Result]:
+    with tempfile.TemporaryDirectory() as tmp, isolated_backend(Path(tmp)):
+        text = datagen.generate_resume(0).text
+        with db.session_scope() as connection:
+            resume = crud.create_resume(
+                connection, file_path=str(Path(tmp) / "resume.docx"), file_format="docx", text=text, text_hash=None
+            )
+        # Distinct postings, so every call runs the rewrite instead of hitting the plan cache.
+        job_ids = app_service.import_jobs_from_csv(datagen.jobs_csv(count + 1, companies=datagen.generate_companies(20)))
+        app_service.tailor_resume(TailorRequest(resume_id=resume.id, job_posting_id=job_ids[-1]))
+        start = time.perf_counter()
+        for job_id in job_ids[:count]:
+            app_service.tailor_resume(TailorRequest(resume_id=resume.id, job_posting_id=job_id))
+        elapsed = time.perf_counter() - start
+    return [Result("tailor_resume[mock]", count / elapsed, "tailors/s", True)]
+
+
+def compare(results: list[Result], baseline: dict, tolerance: float) -> list[str]:
+    """Return the names of results worse than ``baseline`` by more than ``tolerance``."""
+
+    regressions = []
+    previous = baseline.get("results", {})
+    print(f"{'benchmark':<34}  {'value':>14}  {'baseline':>14}  {'change':>8}")
+    for result in results:
+        before = previous.get(result.name, {}).get("value")
+        if not before:
+            print(f"{result.name:<34}  {result.value:>14.6g}  {'-':>14}  {'-':>8}")
+            continue
+        change = (result.value - before) / before
+        worse = -change if result.higher_is_better else change
+        flag = "  REGRESSION" if worse > tolerance else ""
+        print(f"{result.name:<34}  {result.value:>14.6g}  {before:>14.6g}  {change:>+7.1%}{flag}")
+        if flag:
+            regressions.append(result.name)
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", default="1000,100000,1000000", help="Comma separated CSV import sizes")
+    parser.add_argument("--render-iterations", type=int, default=2000)
+    parser.add_argument("--tailor-count", type=int, default=200)
+    parser.add_argument("--huge-roles", type=int, default=400, help="Experience entries in the huge resume")
+    parser.add_argument("--duplicate-rate", type=float, default=0.1, help="Share of reposted rows in the import feeds")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per timing; the median is reported")
+    parser.add_argument("--quick", action="store_true", help="Small sizes for a smoke run")
+    parser.add_argument("--only", help="Comma separated benchmark groups: ingest,extract,render,tailor")
+    parser.add_argument("--output", type=Path, default=Path("bench_results.json"))
+    parser.add_argument("--baseline", type=Path, help="Results file to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="Allowed relative slowdown")
+    args = parser.parse_args(argv)
+
+    if args.quick:
+        args.rows, args.render_iterations, args.tailor_count, args.huge_roles = "200,2000", 200, 20, 40
+    sizes = [int(value) for value in args.rows.split(",") if value.strip()]
+    groups = {
+        "ingest": lambda: [result for rows in sizes for result in bench_ingest(rows, args.repeat, args.duplicate_rate)],
+        "extract": lambda: bench_extract(args.huge_roles, args.repeat),
+        "render": lambda: bench_render(args.render_iterations),
+        "tailor": lambda: bench_tailor(args.tailor_count),
+    }
+    selected = args.only.split(",") if args.only else list(groups)
+    unknown = set(selected) - set(groups)
+    if unknown:
+        parser.error(f"unknown benchmark groups: {', '.join(sorted(unknown))}")
+
+    results: list[Result] = []
+    for group in selected:
+        results.extend(groups[group]())
+
+    args.output.write_text(
+        json.dumps(
+            {
+                "created_at": datetime.now(timezone.utc).isoformat(),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "arguments": {key: str(value) for key, value in vars(args).items()},
+                "results": {result.name: asdict(result) for result in results},
+            },
+            indent=2,
+        ),
+        encoding="utf-8",
+    )
+    baseline = json.loads(args.baseline.read_text(encoding="utf-8")) if args.baseline else {}
+    regressions = compare(results, baseline, args.tolerance)
+    print(f"results written to {args.output}")
+    if regressions:
+        print(f"{len(regressions)} regressed beyond {args.tolerance:.0%}: {', '.join(regressions)}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -38,9 +38,13 @@ CREATE TABLE IF NOT EXISTS resume_versions (
     template_version TEXT,
     model_name TEXT,
     prompt_hash TEXT,
-    token_usage TEXT
+    token_usage TEXT,
+    plan_json TEXT,
+    mock INTEGER NOT NULL DEFAULT 0
 );
 
+CREATE INDEX IF NOT EXISTS idx_resume_versions_template ON resume_versions(template_version, id);
+
 CREATE TABLE IF NOT EXISTS runs (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
     triggered_by TEXT,
@@ -48,12 +52,152 @@ CREATE TABLE IF NOT EXISTS runs (
     started_at DATETIME DEFAULT CURRENT_TIMESTAMP,
     finished_at DATETIME,
     status TEXT,
-    error TEXT
+    error TEXT,
+    schedule_id INTEGER REFERENCES schedules(id) ON DELETE SET NULL,
+    heartbeat_at REAL,
+    scheduled_for DATETIME,
+    lag_seconds REAL
+);
+
+CREATE INDEX IF NOT EXISTS idx_runs_status ON runs(status, heartbeat_at);
+CREATE INDEX IF NOT EXISTS idx_runs_schedule ON runs(schedule_id, id);
+
+-- Time spent per stage (db_read, plan, render, docx_render, docx_write,
+-- commit, ...) for one tailored resume version or one whole run.
+CREATE TABLE IF NOT EXISTS stage_timings (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    run_id INTEGER REFERENCES runs(id) ON DELETE CASCADE,
+    resume_version_id INTEGER REFERENCES resume_versions(id) ON DELETE CASCADE,
+    stage TEXT NOT NULL,
+    duration_ms REAL NOT NULL,
+    calls INTEGER NOT NULL DEFAULT 1,
+    recorded_at DATETIME DEFAULT CURRENT_TIMESTAMP
 );
 
+CREATE INDEX IF NOT EXISTS idx_stage_timings_run ON stage_timings(run_id);
+CREATE INDEX IF NOT EXISTS idx_stage_timings_version ON stage_timings(resume_version_id);
+CREATE INDEX IF NOT EXISTS idx_stage_timings_stage ON stage_timings(stage, recorded_at);
+
 CREATE TABLE IF NOT EXISTS schedules (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
     cron_expr TEXT NOT NULL,
     is_enabled INTEGER DEFAULT 1,
-    criteria_json TEXT
+    criteria_json TEXT,
+    revision INTEGER NOT NULL DEFAULT 1,
+    last_job_posting_id INTEGER NOT NULL DEFAULT 0,
+    misfire_grace_seconds INTEGER,
+    coalesce INTEGER NOT NULL DEFAULT 1,
+    max_instances INTEGER NOT NULL DEFAULT 1,
+    jitter_seconds INTEGER,
+    last_fire_at DATETIME,
+    misfire_count INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE TABLE IF NOT EXISTS tailor_jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    resume_id INTEGER REFERENCES resumes(id) ON DELETE CASCADE,
+    job_posting_id INTEGER REFERENCES job_postings(id) ON DELETE CASCADE,
+    status TEXT NOT NULL DEFAULT 'queued',
+    idempotency_key TEXT UNIQUE,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    claimed_by TEXT,
+    claimed_at DATETIME,
+    heartbeat_at REAL,
+    resume_version_id INTEGER REFERENCES resume_versions(id) ON DELETE SET NULL,
+    artifact_path TEXT,
+    mock INTEGER,
+    error TEXT,
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    finished_at DATETIME,
+    batch_id INTEGER REFERENCES tailor_batches(id) ON DELETE CASCADE,
+    cached INTEGER NOT NULL DEFAULT 0,
+    kind TEXT NOT NULL DEFAULT 'tailor',
+    priority INTEGER NOT NULL DEFAULT 0,
+    base_resume_hash TEXT,
+    model_calls INTEGER NOT NULL DEFAULT 0,
+    prompt_tokens INTEGER NOT NULL DEFAULT 0,
+    completion_tokens INTEGER NOT NULL DEFAULT 0,
+    total_tokens INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE INDEX IF NOT EXISTS idx_tailor_jobs_status ON tailor_jobs(status, id);
+CREATE INDEX IF NOT EXISTS idx_tailor_jobs_claim ON tailor_jobs(status, priority DESC, id);
+
+CREATE TABLE IF NOT EXISTS tailor_batches (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    status TEXT NOT NULL DEFAULT 'running',
+    total INTEGER NOT NULL DEFAULT 0,
+    filter_json TEXT,
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    finished_at DATETIME
 );
+
+CREATE INDEX IF NOT EXISTS idx_tailor_jobs_batch ON tailor_jobs(batch_id, status);
+
+CREATE TABLE IF NOT EXISTS plan_cache (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    prompt_hash TEXT NOT NULL,
+    model_name TEXT NOT NULL,
+    plan_json TEXT NOT NULL,
+    rendered_text TEXT NOT NULL,
+    token_usage TEXT,
+    mock INTEGER NOT NULL DEFAULT 0,
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    UNIQUE (prompt_hash, model_name)
+);
+
+CREATE TABLE IF NOT EXISTS leases (
+    name TEXT PRIMARY KEY,
+    owner TEXT NOT NULL,
+    expires_at REAL NOT NULL,
+    result_json TEXT,
+    completed_at REAL
+);
+
+CREATE TABLE IF NOT EXISTS artifacts (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    path TEXT NOT NULL UNIQUE,
+    folder TEXT NOT NULL,
+    file_name TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    sha256 TEXT NOT NULL,
+    company TEXT,
+    job_key TEXT,
+    job_posting_id INTEGER,
+    resume_id INTEGER,
+    template_version TEXT,
+    model_name TEXT,
+    prompt_hash TEXT,
+    mock INTEGER NOT NULL DEFAULT 0,
+    meta_json TEXT,
+    search_text TEXT NOT NULL DEFAULT '',
+    archive_path TEXT,
+    archive_member TEXT,
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS idx_artifacts_created ON artifacts(created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_artifacts_company ON artifacts(company COLLATE NOCASE, created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_artifacts_job ON artifacts(job_posting_id, created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_artifacts_resume ON artifacts(resume_id, created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_artifacts_folder ON artifacts(folder, created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_artifacts_archive ON artifacts(archive_path);
+
+-- Trigram full-text index over artifacts.search_text, so substring search
+-- does not scan the catalog.  Kept in sync by the triggers below.
+CREATE VIRTUAL TABLE IF NOT EXISTS artifacts_search USING fts5(
+    search_text, content='artifacts', content_rowid='id', tokenize='trigram'
+);
+
+CREATE TRIGGER IF NOT EXISTS artifacts_search_insert AFTER INSERT ON artifacts BEGIN
+    INSERT INTO artifacts_search (rowid, search_text) VALUES (new.id, new.search_text);
+END;
+
+CREATE TRIGGER IF NOT EXISTS artifacts_search_delete AFTER DELETE ON artifacts BEGIN
+    INSERT INTO artifacts_search (artifacts_search, rowid, search_text) VALUES ('delete', old.id, old.search_text);
+END;
+
+CREATE TRIGGER IF NOT EXISTS artifacts_search_update AFTER UPDATE OF search_text ON artifacts BEGIN
+    INSERT INTO artifacts_search (artifacts_search, rowid, search_text) VALUES ('delete', old.id, old.search_text);
+    INSERT INTO artifacts_search (rowid, search_text) VALUES (new.id, new.search_text);
+END;
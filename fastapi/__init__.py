@@ -1,7 +1,8 @@
 from __future__ import annotations
 
 import inspect
-from typing import Any, Callable, Dict, Optional
+import re
+from typing import Any, Callable, Dict, Optional, Tuple
 
 
 class HTTPException(Exception):
@@ -15,6 +16,21 @@ def File(default: Any) -> Any:  # pragma: no cover - marker used for compatibili
     return default
 
 
+class _HeaderParam:
+    def __init__(self, default: Any, alias: Optional[str]) -> None:
+        self.default = default
+        self.alias = alias
+
+    def header_name(self, parameter: str) -> str:
+        return (self.alias or parameter.replace("_", "-")).lower()
+
+
+def Header(default: Any = None, *, alias: Optional[str] = None) -> Any:
+    """Mark a handler parameter as read from a request header (``if_none_match`` -> ``If-None-Match``)."""
+
+    return _HeaderParam(default, alias)
+
+
 class UploadFile:
     def __init__(self, filename: str, content: bytes, content_type: str | None = None) -> None:
         self.filename = filename
@@ -27,7 +43,7 @@ class UploadFile:
 
 class FastAPI:
     def __init__(self) -> None:
-        self._routes: Dict[str, Dict[str, Callable]] = {"GET": {}, "POST": {}}
+        self._routes: Dict[str, Dict[str, Callable]] = {"GET": {}, "POST": {}, "PATCH": {}, "DELETE": {}}
         self._event_handlers: Dict[str, list[Callable]] = {"startup": [], "shutdown": []}
 
     def add_middleware(self, *args: Any, **kwargs: Any) -> None:  # pragma: no cover - noop
@@ -46,6 +62,12 @@ class FastAPI:
     def post(self, path: str, response_model: Optional[Any] = None) -> Callable[[Callable], Callable]:
         return self._register("POST", path)
 
+    def patch(self, path: str, response_model: Optional[Any] = None) -> Callable[[Callable], Callable]:
+        return self._register("PATCH", path)
+
+    def delete(self, path: str, response_model: Optional[Any] = None) -> Callable[[Callable], Callable]:
+        return self._register("DELETE", path)
+
     def _register(self, method: str, path: str) -> Callable[[Callable], Callable]:
         def decorator(func: Callable) -> Callable:
             self._routes[method][path] = func
@@ -56,6 +78,21 @@ class FastAPI:
     def get_route(self, method: str, path: str) -> Callable:
         return self._routes[method][path]
 
+    def match_route(self, method: str, path: str) -> Tuple[Callable, Dict[str, str]]:
+        """Resolve ``path`` against registered routes, extracting ``{param}`` segments."""
+
+        routes = self._routes[method]
+        if path in routes:
+            return routes[path], {}
+        for template, handler in routes.items():
+            if "{" not in template:
+                continue
+            pattern = "^" + re.sub(r"\{(\w+)\}", r"(?P<\1>[^/]+)", template) + "$"
+            match = re.match(pattern, path)
+            if match:
+                return handler, match.groupdict()
+        raise KeyError(path)
+
     async def run_event(self, name: str) -> None:
         handlers = self._event_handlers.get(name, [])
         for handler in handlers:
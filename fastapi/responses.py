@@ -1,3 +1,55 @@
+from __future__ import annotations
+
+from typing import Any, Mapping
+
+
+class Response:
+    def __init__(
+        self,
+        content: bytes | str | None = None,
+        status_code: int = 200,
+        headers: Mapping[str, str] | None = None,
+        media_type: str | None = None,
+    ) -> None:
+        self.body = content.encode("utf-8") if isinstance(content, str) else (content or b"")
+        self.status_code = status_code
+        self.headers = dict(headers or {})
+        self.media_type = media_type
+        if media_type:
+            self.headers.setdefault("content-type", media_type)
+
+
 class FileResponse:
-    def __init__(self, path: str) -> None:
+    def __init__(
+        self,
+        path: Any,
+        status_code: int = 200,
+        headers: Mapping[str, str] | None = None,
+        media_type: str | None = None,
+        filename: str | None = None,
+    ) -> None:
         self.path = path
+        self.status_code = status_code
+        self.headers = dict(headers or {})
+        self.media_type = media_type
+        self.filename = filename
+        if media_type:
+            self.headers.setdefault("content-type", media_type)
+        if filename:
+            self.headers.setdefault("content-disposition", f'attachment; filename="{filename}"')
+
+
+class StreamingResponse:
+    def __init__(
+        self,
+        content: Any,
+        status_code: int = 200,
+        headers: Mapping[str, str] | None = None,
+        media_type: str | None = None,
+    ) -> None:
+        self.body_iterator = content
+        self.status_code = status_code
+        self.headers = dict(headers or {})
+        self.media_type = media_type
+        if media_type:
+            self.headers.setdefault("content-type", media_type)
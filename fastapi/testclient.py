@@ -2,15 +2,33 @@ from __future__ import annotations
 
 import asyncio
 import inspect
-from typing import Any, Callable, Dict, get_type_hints
+import types
+import typing
+from typing import Any, Callable, Dict, get_args, get_origin, get_type_hints
+from urllib.parse import parse_qsl, urlsplit
 
-from . import FastAPI, HTTPException, UploadFile
+from pathlib import Path
+
+from . import FastAPI, HTTPException, UploadFile, _HeaderParam
+from .responses import FileResponse, Response as _Response, StreamingResponse
 
 
 class Response:
-    def __init__(self, status_code: int, data: Any = None) -> None:
+    def __init__(
+        self,
+        status_code: int,
+        data: Any = None,
+        content: bytes = b"",
+        headers: Dict[str, str] | None = None,
+    ) -> None:
         self.status_code = status_code
         self._data = data
+        self.content = content
+        self.headers = headers or {}
+
+    @property
+    def text(self) -> str:
+        return self.content.decode("utf-8")
 
     def json(self) -> Any:
         return self._data
@@ -27,11 +45,31 @@ class TestClient:
     def __exit__(self, exc_type, exc, tb) -> None:
         asyncio.run(self.app.run_event("shutdown"))
 
-    def get(self, path: str, **kwargs: Any) -> Response:
-        return self._request("GET", path, None, None)
+    def get(
+        self,
+        path: str,
+        *,
+        params: Dict[str, Any] | None = None,
+        headers: Dict[str, str] | None = None,
+        **kwargs: Any,
+    ) -> Response:
+        return self._request("GET", path, None, None, params, headers)
+
+    def post(
+        self,
+        path: str,
+        *,
+        json: Any = None,
+        files: Dict[str, Any] | None = None,
+        params: Dict[str, Any] | None = None,
+    ) -> Response:
+        return self._request("POST", path, json, files, params)
+
+    def patch(self, path: str, *, json: Any = None) -> Response:
+        return self._request("PATCH", path, json, None)
 
-    def post(self, path: str, *, json: Any = None, files: Dict[str, Any] | None = None) -> Response:
-        return self._request("POST", path, json, files)
+    def delete(self, path: str, *, params: Dict[str, Any] | None = None) -> Response:
+        return self._request("DELETE", path, None, None, params)
 
     def _request(
         self,
@@ -39,16 +77,33 @@ class TestClient:
         path: str,
         json_payload: Any,
         files: Dict[str, Any] | None,
+        params: Dict[str, Any] | None = None,
+        headers: Dict[str, str] | None = None,
     ) -> Response:
+        url = urlsplit(path)
+        query = dict(parse_qsl(url.query))
+        query.update({key: str(value) for key, value in (params or {}).items()})
         try:
-            handler = self.app.get_route(method, path)
+            handler, path_params = self.app.match_route(method, url.path)
         except KeyError:
             return Response(404, {"detail": "Not Found"})
 
         try:
-            result = self._call_handler(handler, json_payload, files)
+            result = self._call_handler(
+                handler,
+                json_payload,
+                files,
+                {**query, **path_params},
+                {key.lower(): value for key, value in (headers or {}).items()},
+            )
         except HTTPException as exc:
             return Response(exc.status_code, exc.detail)
+        if isinstance(result, StreamingResponse):
+            return Response(result.status_code, content=_consume(result.body_iterator), headers=result.headers)
+        if isinstance(result, FileResponse):
+            return Response(result.status_code, content=Path(result.path).read_bytes(), headers=result.headers)
+        if isinstance(result, _Response):
+            return Response(result.status_code, content=result.body, headers=result.headers)
         return Response(200, _prepare_response(result))
 
     def _call_handler(
@@ -56,7 +111,11 @@ class TestClient:
         handler: Callable,
         json_payload: Any,
         files: Dict[str, Any] | None,
+        params: Dict[str, str] | None = None,
+        headers: Dict[str, str] | None = None,
     ) -> Any:
+        params = params or {}
+        headers = headers or {}
         kwargs: Dict[str, Any] = {}
         files_data: Dict[str, UploadFile] = {}
         if files:
@@ -78,8 +137,13 @@ class TestClient:
             type_hints = {}
         for name, parameter in signature.parameters.items():
             annotation = type_hints.get(name, parameter.annotation)
-            if name in files_data:
+            if isinstance(parameter.default, _HeaderParam):
+                value = headers.get(parameter.default.header_name(name))
+                kwargs[name] = parameter.default.default if value is None else _coerce(value, annotation)
+            elif name in files_data:
                 kwargs[name] = files_data[name]
+            elif name in params:
+                kwargs[name] = _coerce(params[name], annotation)
             elif json_payload is not None:
                 value = json_payload
                 if (
@@ -106,3 +170,25 @@ def _prepare_response(data: Any) -> Any:
     if isinstance(data, dict):
         return {key: _prepare_response(value) for key, value in data.items()}
     return data
+
+
+def _consume(body_iterator: Any) -> bytes:
+    async def collect_async() -> list[Any]:
+        return [chunk async for chunk in body_iterator]
+
+    if hasattr(body_iterator, "__aiter__"):
+        chunks = asyncio.run(collect_async())
+    else:
+        chunks = list(body_iterator)
+    return b"".join(chunk.encode("utf-8") if isinstance(chunk, str) else bytes(chunk) for chunk in chunks)
+
+
+def _coerce(value: str, annotation: Any) -> Any:
+    if get_origin(annotation) in (typing.Union, types.UnionType):
+        candidates = [arg for arg in get_args(annotation) if arg is not type(None)]
+        annotation = candidates[0] if candidates else str
+    if annotation is bool:
+        return value.lower() in ("1", "true", "yes", "on")
+    if annotation in (int, float):
+        return annotation(value)
+    return value
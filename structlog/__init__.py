@@ -2,66 +2,241 @@ from __future__ import annotations
 
 import json
 import logging
-from typing import Any
+import sys
+import traceback
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Callable, Optional
 
+# Compatible subset of structlog: processor chains, stdlib integration with a
+# ``ProcessorFormatter`` for rendering inside logging handlers, and
+# ``DropEvent`` for filtering processors.
 
-class _Logger:
-    def __init__(self, name: str | None = None) -> None:
-        self._logger = logging.getLogger(name or "structlog")
 
-    def info(self, event: str, **kwargs: Any) -> None:
-        self._logger.info("%s %s", event, kwargs)
+class DropEvent(BaseException):
+    """Raise from a processor to discard the event silently."""
 
-    def warning(self, event: str, **kwargs: Any) -> None:
-        self._logger.warning("%s %s", event, kwargs)
 
-    def error(self, event: str, **kwargs: Any) -> None:
-        self._logger.error("%s %s", event, kwargs)
+def _default_renderer(logger: Any, method_name: str, event_dict: dict) -> str:
+    event = event_dict.pop("event", "")
+    return f"{event} {event_dict}"
 
 
-def configure(*args: Any, **kwargs: Any) -> None:  # pragma: no cover - no-op configuration
-    logging.basicConfig(level=logging.INFO)
+@dataclass
+class _Config:
+    processors: list = field(default_factory=lambda: [_default_renderer])
+    logger_factory: Callable[..., Any] = None  # type: ignore[assignment]
+    wrapper_class: Optional[type] = None
+    cache_logger_on_first_use: bool = False
+    generation: int = 0
 
 
-def get_logger(name: str | None = None) -> _Logger:
-    return _Logger(name)
+_CONFIG = _Config()
 
 
-class processors:  # pragma: no cover - simple stubs
-    class TimeStamper:
-        def __init__(self, fmt: str | None = None) -> None:
-            self.fmt = fmt
+def configure(
+    processors: Optional[list] = None,
+    logger_factory: Optional[Callable[..., Any]] = None,
+    wrapper_class: Optional[type] = None,
+    cache_logger_on_first_use: Optional[bool] = None,
+    **_: Any,
+) -> None:
+    """Replace the global configuration; loggers created earlier pick it up on their next call."""
 
-        def __call__(self, *args: Any, **kwargs: Any) -> Any:
-            return kwargs
+    if processors is not None:
+        _CONFIG.processors = list(processors)
+    if logger_factory is not None:
+        _CONFIG.logger_factory = logger_factory
+    if wrapper_class is not None:
+        _CONFIG.wrapper_class = wrapper_class
+    if cache_logger_on_first_use is not None:
+        _CONFIG.cache_logger_on_first_use = cache_logger_on_first_use
+    _CONFIG.generation += 1
 
-    @staticmethod
-    def add_log_level(*args: Any, **kwargs: Any) -> Any:
-        return kwargs
 
-    @staticmethod
-    def EventRenamer(new_name: str) -> Any:
-        def _rename(logger, method_name, event_dict):
-            return event_dict
+def reset_defaults() -> None:
+    generation = _CONFIG.generation
+    _CONFIG.__init__()  # type: ignore[misc]
+    _CONFIG.generation = generation + 1
 
-        return _rename
 
-    @staticmethod
-    def format_exc_info(*args: Any, **kwargs: Any) -> Any:
-        return kwargs
+def get_config() -> dict:
+    return {
+        "processors": list(_CONFIG.processors),
+        "logger_factory": _CONFIG.logger_factory,
+        "wrapper_class": _CONFIG.wrapper_class,
+        "cache_logger_on_first_use": _CONFIG.cache_logger_on_first_use,
+    }
 
-    @staticmethod
-    def JSONRenderer() -> Any:
-        def renderer(logger, method_name, event_dict):
-            return json.dumps(event_dict)
 
-        return renderer
+class _Logger:
+    """A bound logger resolved against the configuration on use.
+
+    The level check happens before any processor runs, so a disabled level
+    costs one ``isEnabledFor`` call and no event-dict work at all.
+    """
+
+    def __init__(self, name: str | None = None, context: Optional[dict] = None) -> None:
+        self._name = name
+        self._context = context or {}
+        self._generation = -1
+        self._logger: Optional[logging.Logger] = None
+
+    def bind(self, **new_values: Any) -> "_Logger":
+        return type(self)(self._name, {**self._context, **new_values})
+
+    def new(self, **new_values: Any) -> "_Logger":
+        return type(self)(self._name, dict(new_values))
 
+    def debug(self, event: str, **kwargs: Any) -> None:
+        self._log(logging.DEBUG, "debug", event, kwargs)
 
-class stdlib:  # pragma: no cover - compatibility shim
+    def info(self, event: str, **kwargs: Any) -> None:
+        self._log(logging.INFO, "info", event, kwargs)
+
+    def warning(self, event: str, **kwargs: Any) -> None:
+        self._log(logging.WARNING, "warning", event, kwargs)
+
+    warn = warning
+
+    def error(self, event: str, **kwargs: Any) -> None:
+        self._log(logging.ERROR, "error", event, kwargs)
+
+    def exception(self, event: str, **kwargs: Any) -> None:
+        kwargs.setdefault("exc_info", True)
+        self._log(logging.ERROR, "error", event, kwargs)
+
+    def critical(self, event: str, **kwargs: Any) -> None:
+        self._log(logging.CRITICAL, "critical", event, kwargs)
+
+    def is_enabled_for(self, level: int) -> bool:
+        return self._stdlib_logger().isEnabledFor(level)
+
+    def _stdlib_logger(self) -> logging.Logger:
+        if self._generation != _CONFIG.generation or self._logger is None:
+            factory = _CONFIG.logger_factory or stdlib.LoggerFactory()
+            self._logger = factory(self._name)
+            self._generation = _CONFIG.generation
+        return self._logger
+
+    def _log(self, level: int, method_name: str, event: str, kwargs: dict) -> None:
+        logger = self._stdlib_logger()
+        if not logger.isEnabledFor(level):
+            return
+        event_dict = {**self._context, **kwargs, "event": event} if self._context else {**kwargs, "event": event}
+        result: Any = event_dict
+        try:
+            for processor in _CONFIG.processors:
+                result = processor(logger, method_name, result)
+        except DropEvent:
+            return
+        if isinstance(result, tuple):
+            args, log_kwargs = result
+            logger.log(level, *args, **log_kwargs)
+        else:
+            logger.log(level, result)
+
+
+def get_logger(name: str | None = None, **initial_values: Any) -> _Logger:
+    return _Logger(name, initial_values)
+
+
+class processors:
+    class TimeStamper:
+        def __init__(self, fmt: str | None = None, utc: bool = True, key: str = "timestamp") -> None:
+            self.fmt = fmt
+            self.utc = utc
+            self.key = key
+
+        def __call__(self, logger: Any, method_name: str, event_dict: dict) -> dict:
+            now = datetime.now(timezone.utc) if self.utc else datetime.now().astimezone()
+            if self.fmt == "iso":
+                event_dict[self.key] = now.isoformat()
+            elif self.fmt:
+                event_dict[self.key] = now.strftime(self.fmt)
+            else:
+                event_dict[self.key] = now.timestamp()
+            return event_dict
+
+    @staticmethod
+    def add_log_level(logger: Any, method_name: str, event_dict: dict) -> dict:
+        event_dict["level"] = "warning" if method_name == "warn" else method_name
+        return event_dict
+
+    class EventRenamer:
+        def __init__(self, to: str, replace_by: str | None = None) -> None:
+            self.to = to
+            self.replace_by = replace_by
+
+        def __call__(self, logger: Any, method_name: str, event_dict: dict) -> dict:
+            event = event_dict.pop("event", None)
+            if self.replace_by is not None and self.replace_by in event_dict:
+                event_dict["event"] = event_dict.pop(self.replace_by)
+            event_dict[self.to] = event
+            return event_dict
+
+    @staticmethod
+    def format_exc_info(logger: Any, method_name: str, event_dict: dict) -> dict:
+        exc_info = event_dict.pop("exc_info", None)
+        if exc_info:
+            if exc_info is True:
+                exc_info = sys.exc_info()
+            elif isinstance(exc_info, BaseException):
+                exc_info = (type(exc_info), exc_info, exc_info.__traceback__)
+            if exc_info[0] is not None:
+                event_dict["exception"] = "".join(traceback.format_exception(*exc_info))
+        return event_dict
+
+    class JSONRenderer:
+        def __init__(self, serializer: Callable[..., str] = json.dumps, **dumps_kw: Any) -> None:
+            self.serializer = serializer
+            dumps_kw.setdefault("default", repr)
+            self.dumps_kw = dumps_kw
+
+        def __call__(self, logger: Any, method_name: str, event_dict: dict) -> str:
+            return self.serializer(event_dict, **self.dumps_kw)
+
+
+class stdlib:
     class LoggerFactory:
-        def __call__(self, *args: Any, **kwargs: Any) -> logging.Logger:
-            return logging.getLogger()
+        def __call__(self, name: str | None = None, *args: Any) -> logging.Logger:
+            return logging.getLogger(name)
 
     class BoundLogger(_Logger):
         pass
+
+    class ProcessorFormatter(logging.Formatter):
+        """Render event dicts handed over by :meth:`wrap_for_formatter` inside a handler.
+
+        This moves the final processors (usually the renderer) from the
+        logging call site to whichever thread runs the handler.  Records from
+        plain stdlib loggers are rendered too, with their message as
+        ``event``.
+        """
+
+        def __init__(self, processors: Optional[list] = None, processor: Any = None, **kwargs: Any) -> None:
+            super().__init__(**kwargs)
+            self.processors = list(processors or ([processor] if processor else []))
+
+        def format(self, record: logging.LogRecord) -> str:
+            if isinstance(record.msg, dict):
+                event_dict = dict(record.msg)
+                method_name = getattr(record, "_method_name", record.levelname.lower())
+            else:
+                event_dict = {
+                    "event": record.getMessage(),
+                    "level": record.levelname.lower(),
+                    "logger": record.name,
+                    "timestamp": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+                }
+                if record.exc_info:
+                    event_dict["exc_info"] = record.exc_info
+                method_name = record.levelname.lower()
+            result: Any = event_dict
+            for processor in self.processors:
+                result = processor(None, method_name, result)
+            return result
+
+        @staticmethod
+        def wrap_for_formatter(logger: Any, method_name: str, event_dict: dict) -> tuple:
+            return (event_dict,), {"extra": {"_method_name": method_name}}
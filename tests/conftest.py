@@ -0,0 +1,39 @@
+from pathlib import Path
+
+import pytest
+
+from backend import config, db
+from benchmarks import datagen
+
+
+@pytest.fixture
+def isolated_db(tmp_path, monkeypatch):
+    """Point the backend at a fresh SQLite file and artifacts root for one test."""
+
+    monkeypatch.setenv("DATABASE_URL", f"sqlite:///{tmp_path}/isolated.db")
+    monkeypatch.setenv("ARTIFACTS_ROOT", str(tmp_path / "artifacts"))
+    monkeypatch.setattr(db, "_INITIALIZED", False)
+    monkeypatch.setattr(db, "_DATABASE_LOCATION", None)
+    config.get_settings.cache_clear()
+    yield config.get_settings()
+    config.get_settings.cache_clear()
+
+
+@pytest.fixture
+def synthetic_db(isolated_db, tmp_path):
+    """``isolated_db`` pre-populated by :mod:`benchmarks.datagen` (seed 0); yields the table counts."""
+
+    database = isolated_db.database_url[len("sqlite:///") :]
+    yield datagen.populate_database(Path(database), companies=20, jobs=500, resumes=5, resume_dir=tmp_path / "resumes")
+
+
+@pytest.fixture(autouse=True)
+def isolated_uploads(tmp_path, monkeypatch):
+    """Keep resume uploads out of the working tree's ``uploads/resumes``."""
+
+    from backend.services import app_service
+
+    upload_root = tmp_path / "uploads"
+    upload_root.mkdir()
+    monkeypatch.setattr(app_service, "UPLOAD_ROOT", upload_root)
+    yield upload_root
@@ -0,0 +1,134 @@
+from backend import crud, models
+from backend.db import session_scope
+from backend.schemas import TailorBatchRequest
+from backend.services import app_service, batch_service
+from backend.services.job_queue import TailorJobQueue
+from backend.services.rewrite_service import MockRewriteService
+
+
+def _batch_inputs(jobs=2):
+    with session_scope() as connection:
+        resume = crud.create_resume(
+            connection, file_path="resume.docx", file_format="docx", text="Python analyst.", text_hash="r1"
+        )
+        company = crud.get_or_create_company(connection, "Batch Service Co")
+        job_ids = [
+            crud.create_job_posting(
+                connection,
+                title=f"Analyst {index}",
+                company=company,
+                location=None,
+                url=None,
+                raw_text=f"Role {index}.",
+                external_id=None,
+            ).id
+            for index in range(jobs)
+        ]
+    return resume.id, job_ids
+
+
+def test_batch_is_finished_by_the_worker_not_by_reads(isolated_db, monkeypatch):
+    resume_id, job_ids = _batch_inputs()
+    batch = batch_service.create_batch(TailorBatchRequest(resume_ids=[resume_id], job_posting_ids=job_ids))
+
+    with session_scope() as connection:
+        failing = crud.list_batch_tailor_jobs(connection, batch.id)[0].job_posting_id
+    tailor = app_service.tailor_resume
+
+    def fail_one(request):
+        if request.job_posting_id == failing:
+            raise ValueError("bad posting")
+        return tailor(request)
+
+    monkeypatch.setattr(app_service, "tailor_resume", fail_one)
+    queue = TailorJobQueue()
+    assert queue.run_pending(limit=1) == 1
+    snapshot, _, _ = batch_service.get_batch(batch.id)
+    assert snapshot.finished_at is None and snapshot.status == "running"
+
+    assert queue.run_pending() == 1
+    with session_scope() as connection:
+        finished = crud.get_tailor_batch(connection, batch.id)
+    assert finished.finished_at is not None
+    assert finished.status == "completed_with_errors"
+
+
+def test_fully_cached_batch_finishes_on_creation(isolated_db):
+    resume_id, job_ids = _batch_inputs(jobs=1)
+    first = batch_service.create_batch(TailorBatchRequest(resume_ids=[resume_id], job_posting_ids=job_ids))
+    TailorJobQueue().run_pending()
+
+    repeat = batch_service.create_batch(TailorBatchRequest(resume_ids=[resume_id], job_posting_ids=job_ids))
+    with session_scope() as connection:
+        assert crud.get_tailor_batch(connection, first.id).status == "completed"
+        assert crud.get_tailor_batch(connection, repeat.id).status == "completed"
+
+
+def test_batch_stats_count_only_model_calls_actually_made(isolated_db):
+    resume_id, job_ids = _batch_inputs()
+    with session_scope() as connection:
+        resume = crud.get_resume(connection, resume_id)
+        posting = crud.get_job_posting(connection, job_ids[0])
+    precomputed = MockRewriteService().rewrite(resume.text, posting.raw_text)
+    with session_scope() as connection:
+        crud.store_cached_rewrite(
+            connection,
+            models.PlanCacheEntry(
+                prompt_hash=precomputed.prompt_hash,
+                model_name=precomputed.model_name,
+                plan=precomputed.plan,
+                rendered_text=precomputed.rendered_text,
+                token_usage=None,
+                mock=True,
+            ),
+        )
+
+    batch = batch_service.create_batch(TailorBatchRequest(resume_ids=[resume_id], job_posting_ids=job_ids))
+    TailorJobQueue().run_pending()
+    _, stats, items = batch_service.get_batch(batch.id)
+    assert stats["succeeded"] == 2 and stats["cached"] == 0
+    # The plan-cache hit made no calls; the other pair made a plan and a render call.
+    assert stats["model_calls"] == 2
+    assert {item.job_posting_id: item.status for item in items} == dict.fromkeys(job_ids, "succeeded")
+
+
+def test_metering_sums_usage_of_every_call():
+    from types import SimpleNamespace
+
+    from backend.services import rewrite_service
+
+    plan = SimpleNamespace(prompt_tokens=100, completion_tokens=40, total_tokens=140)
+    render = SimpleNamespace(prompt_tokens=60, completion_tokens=200, total_tokens=260)
+    with rewrite_service.metering() as usage:
+        rewrite_service._record_model_call("gpt-test", "plan", plan)
+        rewrite_service._record_model_call("gpt-test", "render", render)
+    rewrite_service._record_model_call("gpt-test", "plan", plan)
+    assert usage.calls == 2
+    assert usage.token_usage() == {"prompt_tokens": 160, "completion_tokens": 240, "total_tokens": 400}
+
+
+def test_switching_the_model_does_not_reuse_other_models_versions(isolated_db, monkeypatch):
+    class OtherModel:
+        model_name = "gpt-test"
+
+        def rewrite(self, resume_text, job_text):
+            result = MockRewriteService().rewrite(resume_text, job_text)
+            result.model_name, result.mock = self.model_name, False
+            return result
+
+    resume_id, job_ids = _batch_inputs()
+    request = TailorBatchRequest(resume_ids=[resume_id], job_posting_ids=job_ids)
+    batch_service.create_batch(request)
+    TailorJobQueue().run_pending()
+
+    monkeypatch.setattr(app_service, "get_rewrite_service", OtherModel)
+    switched = batch_service.create_batch(request)
+    assert batch_service.get_batch(switched.id)[1]["cached"] == 0
+    assert TailorJobQueue().run_pending() == 2
+
+    repeat = batch_service.create_batch(request)
+    _, stats, items = batch_service.get_batch(repeat.id)
+    assert stats["cached"] == 2
+    with session_scope() as connection:
+        versions = [crud.get_resume_version(connection, item.resume_version_id) for item in items]
+    assert {(version.model_name, version.mock) for version in versions} == {("gpt-test", False)}
@@ -0,0 +1,31 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from backend.services.cron import CronError, parse_cron
+
+
+def _at(*args: int) -> datetime:
+    return datetime(*args, tzinfo=timezone.utc)
+
+
+@pytest.mark.parametrize(
+    ("expression", "after", "expected"),
+    [
+        ("*/15 * * * *", _at(2026, 3, 1, 10, 7), _at(2026, 3, 1, 10, 15)),
+        ("0 9 * * MON-FRI", _at(2026, 3, 6, 9, 0), _at(2026, 3, 9, 9, 0)),
+        ("30 18 1 */3 *", _at(2026, 2, 10), _at(2026, 4, 1, 18, 30)),
+        ("0 0 29 FEB *", _at(2026, 1, 1), _at(2028, 2, 29)),
+        ("0 12 13 * FRI", _at(2026, 3, 1), _at(2026, 3, 6, 12, 0)),
+        ("5 4 * * 7", _at(2026, 12, 31, 23, 59), _at(2027, 1, 3, 4, 5)),
+        ("@hourly", _at(2026, 3, 1, 10, 0, 30), _at(2026, 3, 1, 11, 0)),
+    ],
+)
+def test_next_after(expression, after, expected):
+    assert parse_cron(expression).next_after(after) == expected
+
+
+@pytest.mark.parametrize("expression", ["* * * *", "60 * * * *", "0 0 * * FUNDAY", "0 0 10-5 * *", "*/0 * * * *", "0 0 30 2 *"])
+def test_invalid_expressions(expression):
+    with pytest.raises(CronError):
+        parse_cron(expression)
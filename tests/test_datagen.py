@@ -0,0 +1,56 @@
+import csv
+import io
+import json
+from pathlib import Path
+
+from backend import crud
+from backend.db import session_scope
+from backend.services import app_service
+from backend.utils.docx_utils import extract_docx_text
+from benchmarks import datagen
+
+
+def test_feeds_are_identical_across_worker_counts():
+    companies = datagen.generate_companies(30, seed=7)
+    options = {"seed": 7, "companies": companies, "duplicate_rate": 0.2, "chunk_size": 100}
+    inline = "".join(datagen.iter_job_feed(450, fmt="jsonl", workers=1, **options))
+    parallel = "".join(datagen.iter_job_feed(450, fmt="jsonl", workers=3, **options))
+    assert inline == parallel
+
+    rows = [json.loads(line) for line in inline.splitlines()]
+    urls = {row["url"] for row in rows}
+    assert len(rows) == 450
+    # About a fifth of the rows repost an earlier posting; external ids stay unique.
+    assert 0.7 < len(urls) / len(rows) < 0.9
+    assert len({row["external_id"] for row in rows}) == 450
+    assert all(2 <= len(company.aliases) <= 4 for company in companies)
+    assert len({company.name for company in datagen.generate_companies(500)}) == 500
+
+
+def test_resume_text_matches_extraction_including_tables(tmp_path):
+    resume = datagen.generate_resume(3, seed=1, roles=6, bullets=4, table_rows=5)
+    path = tmp_path / resume.filename
+    path.write_bytes(resume.content)
+
+    assert extract_docx_text(path) == resume.text
+    assert "Skill\nYears\nLevel" in resume.text
+    assert datagen.generate_resume(3, seed=1, roles=6, bullets=4, table_rows=5).content == resume.content
+
+
+def test_csv_import_skips_reposted_rows(isolated_db):
+    content = datagen.jobs_csv(300, companies=datagen.generate_companies(10), duplicate_rate=0.25)
+    unique = len({row["url"] for row in csv.DictReader(io.StringIO(content))})
+
+    created = app_service.import_jobs_from_csv(content)
+    assert len(created) == unique < 300
+    assert app_service.import_jobs_from_csv(content) == []
+
+
+def test_synthetic_db_fixture_populates_tables(synthetic_db):
+    with session_scope() as connection:
+        counts = crud.get_counts(connection)
+        resumes = crud.list_resumes(connection)
+    assert synthetic_db["companies"] == 20
+    assert counts["job_postings"] == synthetic_db["job_postings"] < 500
+    assert counts["resumes"] == 5
+    assert extract_docx_text(Path(resumes[0].file_path)) == resumes[0].text
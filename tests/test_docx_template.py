@@ -0,0 +1,98 @@
+import os
+from io import BytesIO
+from zipfile import ZipFile
+
+import pytest
+
+from backend.utils import docx_template
+from backend.utils.docx_template import TemplateError, clear_template_cache, compile_template, load_template
+from backend.utils.docx_utils import _write_docx, extract_docx_text
+
+_W = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+
+
+def _template_with_split_runs(path, body):
+    document = (
+        f"<?xml version='1.0' encoding='UTF-8'?>\n<w:document xmlns:w='{_W}'><w:body>{body}</w:body></w:document>"
+    )
+    with ZipFile(path, "w") as archive:
+        archive.writestr("[Content_Types].xml", "<Types/>")
+        archive.writestr("word/document.xml", document)
+
+
+def _text(data: bytes) -> str:
+    with ZipFile(BytesIO(data)) as archive:
+        assert archive.testzip() is None
+    return extract_docx_text(BytesIO(data))
+
+
+def test_template_renders_split_placeholders_and_repeated_blocks(tmp_path):
+    template_path = tmp_path / "custom.docx"
+    _template_with_split_runs(
+        template_path,
+        "<w:p><w:r><w:rPr><w:b/></w:rPr><w:t>Profile: {{ sum</w:t></w:r><w:r><w:t>mary }}</w:t></w:r></w:p>"
+        "<w:p><w:r><w:t>* {{ skills }}</w:t></w:r></w:p>"
+        "<w:p><w:r><w:t>{%p for job in experience %}</w:t></w:r></w:p>"
+        "<w:p><w:r><w:t>{{ job.role }} at {{ job.employer }}</w:t></w:r></w:p>"
+        "<w:p><w:r><w:t>{%p for bullet in job.bullets %}</w:t></w:r></w:p>"
+        "<w:p><w:r><w:t>- {{ bullet }}</w:t></w:r></w:p>"
+        "<w:p><w:r><w:t>{%p endfor %}</w:t></w:r></w:p>"
+        "<w:p><w:r><w:t>{%p endfor %}</w:t></w:r></w:p>"
+        "<w:p><w:r><w:t>{{ certifications }}</w:t></w:r></w:p>",
+    )
+    context = {
+        "summary": "Builds <reliable> systems & teams",
+        "skills": ["Python", "SQL"],
+        "experience": [
+            {"role": "Engineer", "employer": "Acme", "bullets": ["Shipped", "Scaled"]},
+            {"role": "Lead", "employer": "Globex", "bullets": []},
+        ],
+        "certifications": [],
+    }
+
+    rendered = load_template(template_path).render(context)
+
+    assert _text(rendered).splitlines() == [
+        "Profile: Builds <reliable> systems & teams",
+        "* Python",
+        "* SQL",
+        "Engineer at Acme",
+        "- Shipped",
+        "- Scaled",
+        "Lead at Globex",
+    ]
+    with ZipFile(BytesIO(rendered)) as archive:
+        assert "<w:b/>" in archive.read("word/document.xml").decode("utf-8")
+    assert load_template(template_path).render(context) == rendered
+
+    broken_path = tmp_path / "broken.docx"
+    _template_with_split_runs(broken_path, "<w:p><w:r><w:t>{%p for skill in skills %}</w:t></w:r></w:p>")
+    with pytest.raises(TemplateError):
+        compile_template(broken_path.read_bytes())
+
+
+def test_compiled_templates_are_cached_until_the_file_changes(tmp_path):
+    clear_template_cache()
+    template_path = tmp_path / "resume_template.docx"
+    _write_docx(template_path, ["{{ summary }}"])
+
+    first = load_template(template_path)
+    assert load_template(template_path) is first
+
+    _write_docx(template_path, ["Summary: {{ summary }}"])
+    stat = template_path.stat()
+    os.utime(template_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    second = load_template(template_path)
+    assert second is not first
+    assert "Summary: Hello" in _text(second.render({"summary": "Hello"}))
+
+
+def test_path_cache_is_bounded(tmp_path):
+    clear_template_cache()
+    for index in range(docx_template._CACHE_LIMIT + 5):
+        path = tmp_path / f"template_{index}.docx"
+        _write_docx(path, ["{{ summary }}"])
+        load_template(path)
+    assert len(docx_template._by_path) == docx_template._CACHE_LIMIT
+    # Identical bytes share one compiled template.
+    assert docx_template.template_cache_size() == 1
@@ -0,0 +1,27 @@
+from zipfile import ZipFile
+
+from backend.utils.docx_utils import RenderContext, build_docx, extract_docx_text, render_resume_docx
+
+
+def test_rendered_docx_is_deterministic_and_readable(tmp_path):
+    context = RenderContext(
+        summary="Builder of <reliable> systems & teams",
+        skills=["Python", "SQL"],
+        experience=["Acme — Engineer (2020 - 2024)\n• Shipped things"],
+        education=["BSc"],
+        certifications=[],
+    )
+    first, second = tmp_path / "a.docx", tmp_path / "b.docx"
+    render_resume_docx(first, context)
+    render_resume_docx(second, context)
+    assert first.read_bytes() == second.read_bytes()
+
+    for compress in (False, True):
+        path = tmp_path / f"compressed_{compress}.docx"
+        path.write_bytes(build_docx(context.iter_paragraphs(), compress=compress))
+        with ZipFile(path) as archive:
+            assert archive.testzip() is None
+            assert archive.namelist()[-1] == "word/document.xml"
+        text = extract_docx_text(path)
+        assert "Builder of <reliable> systems & teams" in text
+        assert "- SQL" in text
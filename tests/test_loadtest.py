@@ -0,0 +1,79 @@
+import json
+import threading
+import time
+import urllib.error
+import urllib.request
+
+import pytest
+
+from benchmarks.fake_openai import Distribution, FakeModelConfig, FakeOpenAIServer
+from benchmarks.loadtest import LoadPlan, parse_mix, percentile, run_load, summarize
+
+
+def _post(url, body):
+    request = urllib.request.Request(
+        url, data=json.dumps(body).encode(), headers={"Content-Type": "application/json"}, method="POST"
+    )
+    return urllib.request.urlopen(request, timeout=10)
+
+
+def test_fake_server_answers_in_the_responses_shape():
+    config = FakeModelConfig(
+        latency=Distribution.parse("fixed:0"), output_tokens=Distribution.parse("fixed:120"), tokens_per_second=0
+    )
+    with FakeOpenAIServer(config) as server:
+        body = {"model": "gpt-4o-mini", "input": [{"role": "user", "content": "x" * 400}]}
+        with _post(server.base_url + "/responses", {**body, "response_format": {"type": "json_object"}}) as response:
+            payload = json.load(response)
+        plan = json.loads(payload["output"][0]["content"][0]["text"])
+        assert set(plan) == {"summary", "skills", "experience", "education", "certifications"}
+        assert payload["usage"]["output_tokens"] == 120 and payload["usage"]["input_tokens"] > 100
+
+        with _post(server.base_url + "/responses", {**body, "stream": True}) as response:
+            assert response.headers["Content-Type"] == "text/event-stream"
+            events = [json.loads(line[6:]) for line in response.read().decode().splitlines() if line.startswith("data: ")]
+        deltas = "".join(event["delta"] for event in events if event["type"] == "response.output_text.delta")
+        assert events[0]["type"] == "response.created" and events[-1]["type"] == "response.completed"
+        assert deltas == events[-1]["response"]["output"][0]["content"][0]["text"]
+        assert server.model.snapshot() == {"requests": 2, "streamed": 1, "errors": 0, "output_tokens": 240}
+
+
+def test_fake_server_injects_errors():
+    config = FakeModelConfig(latency=Distribution.parse("fixed:0"), error_rate=1.0, error_statuses=(429,))
+    with FakeOpenAIServer(config) as server:
+        with pytest.raises(urllib.error.HTTPError) as raised:
+            _post(server.base_url + "/responses", {"model": "m", "input": "hi"})
+    assert raised.value.code == 429
+    assert json.load(raised.value)["error"]["code"] == "rate_limit_exceeded"
+    with pytest.raises(ValueError):
+        Distribution.parse("gamma:1,2")
+
+
+class _SlowTransport:
+    def __init__(self):
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def request(self, method, path, *, json_body=None, upload=None):
+        with self.lock:
+            self.calls.append((method, path))
+        time.sleep(0.01)
+        return (503, None) if path == "/api/job_postings" else (200, {})
+
+
+def test_load_driver_keeps_the_schedule_and_reports_percentiles():
+    transport = _SlowTransport()
+    plan = LoadPlan(
+        rps=100, duration=0.5, mix=parse_mix("tailor=3,list=1,upload=0"), upload_rows=5, resume_ids=[1], job_ids=[1, 2]
+    )
+    samples, elapsed = run_load(transport, plan)
+    report = summarize(samples, elapsed)
+
+    assert report["all"]["requests"] == len(transport.calls) == 50
+    assert report["tailor"]["requests"] > report["list"]["requests"] == report["list"]["errors"] > 0
+    assert "upload" not in report
+    assert report["all"]["throughput_rps"] > 50
+    assert 10 <= report["all"]["p50_ms"] <= report["all"]["p99_ms"] <= report["all"]["max_ms"]
+    assert percentile([5, 1, 3, 2, 4], 0.5) == 3 and percentile([], 0.9) == 0
+    with pytest.raises(ValueError):
+        parse_mix("tailor=1,unknown=2")
@@ -0,0 +1,106 @@
+import dataclasses
+import io
+import json
+import logging
+
+import pytest
+import structlog
+
+from backend.config import get_settings
+from backend.logging_config import EventSampler, configure_logging, shutdown_logging
+from backend.utils.metrics import REGISTRY
+
+
+@pytest.fixture
+def log_stream():
+    root = logging.getLogger()
+    handlers, level = list(root.handlers), root.level
+    config = structlog.get_config()
+    stream = io.StringIO()
+    yield stream
+    shutdown_logging()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    for handler in handlers:
+        root.addHandler(handler)
+    root.setLevel(level)
+    structlog.configure(**config)
+
+
+def _configure(stream, **overrides):
+    configure_logging(dataclasses.replace(get_settings(), **overrides), stream=stream)
+
+
+def _lines(stream):
+    shutdown_logging()
+    return [json.loads(line) for line in stream.getvalue().splitlines()]
+
+
+def test_events_are_rendered_as_json_by_the_listener(log_stream):
+    _configure(log_stream, log_async=True, log_sample_rates={})
+    logger = structlog.get_logger("fitresume.test").bind(run_id=7)
+    logger.info("run_started", postings=3)
+    try:
+        raise RuntimeError("boom")
+    except RuntimeError:
+        logger.exception("run_failed")
+    logging.getLogger("fitresume.plain").warning("plain %s", "record")
+
+    started, failed, plain = _lines(log_stream)
+    assert started["event"] == "run_started"
+    assert started["level"] == "info"
+    assert started["run_id"] == 7 and started["postings"] == 3
+    assert "timestamp" in started
+    assert failed["level"] == "error"
+    assert "RuntimeError: boom" in failed["exception"]
+    assert plain == {**plain, "event": "plain record", "level": "warning", "logger": "fitresume.plain"}
+
+
+def test_disabled_levels_skip_the_processor_chain(log_stream):
+    _configure(log_stream, log_async=False, log_level="INFO", log_sample_rates={})
+    calls = []
+    processors = structlog.get_config()["processors"]
+    structlog.configure(processors=[lambda logger, name, event_dict: calls.append(name) or event_dict, *processors])
+
+    logger = structlog.get_logger("fitresume.test")
+    logger.debug("too_verbose", payload=object())
+    logger.info("kept")
+
+    assert calls == ["info"]
+    assert [line["event"] for line in _lines(log_stream)] == ["kept"]
+
+
+def test_sampler_keeps_every_nth_info_event_but_all_warnings(log_stream):
+    _configure(log_stream, log_async=False, log_sample_rates={"noisy": 0.25})
+    dropped = REGISTRY.value("fitresume_log_events_dropped_total", reason="sampled")
+    logger = structlog.get_logger("fitresume.test")
+    for _ in range(8):
+        logger.info("noisy")
+    logger.warning("noisy")
+    logger.info("quiet")
+
+    lines = _lines(log_stream)
+    assert [(line["event"], line["level"]) for line in lines] == [
+        ("noisy", "info"),
+        ("noisy", "info"),
+        ("noisy", "warning"),
+        ("quiet", "info"),
+    ]
+    assert lines[0]["sample_rate"] == 0.25 and "sample_rate" not in lines[2]
+    assert REGISTRY.value("fitresume_log_events_dropped_total", reason="sampled") == dropped + 6
+    with pytest.raises(ValueError):
+        EventSampler({"noisy": 0})
+
+
+def test_full_queue_drops_instead_of_blocking(log_stream):
+    _configure(log_stream, log_async=True, log_queue_size=1, log_sample_rates={})
+    dropped = REGISTRY.value("fitresume_log_events_dropped_total", reason="queue_full")
+    # Stop the listener so the queue cannot drain while we log.
+    handler = logging.getLogger().handlers[0]
+    shutdown_logging()
+    logger = structlog.get_logger("fitresume.test")
+    for index in range(5):
+        logger.info("burst", index=index)
+
+    assert handler.queue.qsize() == 1
+    assert REGISTRY.value("fitresume_log_events_dropped_total", reason="queue_full") == dropped + 4
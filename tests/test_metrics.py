@@ -0,0 +1,77 @@
+import io
+import threading
+
+import pytest
+
+from backend.utils.metrics import Registry
+
+
+def test_counters_from_many_threads_sum_without_locks():
+    registry = Registry()
+    calls = registry.counter("test_calls_total", "Calls.", ("stage",))
+
+    def work():
+        for _ in range(1000):
+            calls.inc(stage="plan")
+        calls.inc(2.5, stage="render")
+
+    threads = [threading.Thread(target=work) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert registry.value("test_calls_total", stage="plan") == 8000
+    # Finished threads are folded into the retired shard and still counted.
+    assert all(thread.is_alive() for thread, _ in registry._shards)
+    assert registry.value("test_calls_total", stage="render") == 20
+    calls.inc(stage="plan")
+    assert registry.value("test_calls_total", stage="plan") == 8001
+
+
+def test_exposition_format():
+    registry = Registry()
+    latency = registry.histogram("test_latency_seconds", "Latency.", ("handler",), buckets=(0.1, 1.0))
+    registry.gauge("test_queue_depth", "Depth.", ("status",), callback=lambda: {("queued",): 3})
+    broken = registry.gauge("test_broken", "Raises.", callback=lambda: 1 / 0)
+    for value in (0.05, 0.1, 0.5, 7.0):
+        latency.observe(value, handler='say "hi"')
+
+    text = registry.collect()
+    assert "# TYPE test_latency_seconds histogram" in text
+    assert 'test_latency_seconds_bucket{handler="say \\"hi\\"",le="0.1"} 2' in text
+    assert 'test_latency_seconds_bucket{handler="say \\"hi\\"",le="1"} 3' in text
+    assert 'test_latency_seconds_bucket{handler="say \\"hi\\"",le="+Inf"} 4' in text
+    assert 'test_latency_seconds_sum{handler="say \\"hi\\""} 7.65' in text
+    assert 'test_latency_seconds_count{handler="say \\"hi\\""} 4' in text
+    assert 'test_queue_depth{status="queued"} 3' in text
+    assert "# TYPE test_broken gauge" in text and broken.current({}, ()) == 0.0
+
+    with pytest.raises(ValueError):
+        latency.observe(1.0)
+    with pytest.raises(ValueError):
+        registry.counter("test_latency_seconds", "Clash.")
+
+
+def test_metrics_endpoint_reports_route_and_db_activity(isolated_db):
+    from fastapi.testclient import TestClient
+
+    from backend.main import app
+
+    client = TestClient(app)
+    assert client.get("/api/runs").status_code == 200
+    assert client.get("/api/stage_timings", params={"per": "nope"}).status_code == 400
+    csv = "title,company\nData Engineer,Acme\n,Missing Title\n"
+    client.post("/api/job_postings/upload_csv", files={"file": ("jobs.csv", io.BytesIO(csv.encode()), "text/csv")})
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    text = response.text
+    assert 'fitresume_http_request_duration_seconds_count{handler="list_runs",status="200"}' in text
+    assert 'fitresume_http_request_duration_seconds_count{handler="stage_timings",status="400"}' in text
+    assert 'fitresume_db_session_duration_seconds_count{outcome="commit"}' in text
+    assert 'fitresume_import_rows_total{outcome="created"}' in text
+    assert 'fitresume_import_rows_total{outcome="skipped"}' in text
+    assert "fitresume_tailor_queue_workers" in text
+
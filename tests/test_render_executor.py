@@ -0,0 +1,32 @@
+import hashlib
+
+from backend.services.render_executor import RenderExecutor, RenderTask
+from backend.utils.docx_utils import RenderContext, create_placeholder_template, extract_docx_text
+
+
+def test_process_pool_renders_batches_like_inline(tmp_path):
+    template_path = tmp_path / "resume_template.docx"
+    create_placeholder_template(template_path)
+    contexts = [
+        RenderContext(summary=f"Candidate {index}", skills=["Python"], experience=[], education=[], certifications=[])
+        for index in range(12)
+    ]
+
+    in_memory = [RenderTask(context=context, key=index) for index, context in enumerate(contexts)]
+    to_disk = [
+        RenderTask(context=context, destination=tmp_path / "out" / f"{index}.docx", key=index)
+        for index, context in enumerate(contexts)
+    ]
+
+    with RenderExecutor(template_path, workers=0) as executor:
+        inline = {outcome.key: outcome for outcome in executor.render_many(in_memory)}
+    with RenderExecutor(template_path, workers=2, chunk_size=3, max_in_flight=2) as executor:
+        pooled = list(executor.render_many(to_disk))
+
+    assert sorted(outcome.key for outcome in pooled) == list(range(12))
+    for outcome in pooled:
+        assert outcome.error is None and outcome.content is None
+        data = outcome.path.read_bytes()
+        assert hashlib.sha256(data).hexdigest() == outcome.sha256 == inline[outcome.key].sha256
+        assert data == inline[outcome.key].content
+    assert "Candidate 7" in extract_docx_text(tmp_path / "out" / "7.docx")
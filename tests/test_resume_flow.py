@@ -1,4 +1,7 @@
+import io
+import json
 import os
+import time
 from pathlib import Path
 from zipfile import ZipFile
 
@@ -115,3 +118,652 @@ def test_resume_tailoring_flow(client, tmp_path):
     assert artifact_path.exists()
     meta_path = artifact_path.parent / "meta.json"
     assert meta_path.exists()
+
+
+def test_job_csv_upload_skips_postings_that_already_exist(client):
+    content = (
+        "title,company,url,description\n"
+        "Importer,CSV Co,https://jobs.example.com/csv-1,First.\n"
+        "Importer (repost),CSV Co,https://jobs.example.com/csv-1,First again.\n"
+        "Exporter,CSV Co,,Second.\n"
+    ).encode()
+
+    def upload() -> list[int]:
+        response = client.post("/api/job_postings/upload_csv", files={"file": ("jobs.csv", io.BytesIO(content), "text/csv")})
+        assert response.status_code == 200
+        return response.json()["created_ids"]
+
+    created = upload()
+    assert len(created) == 2
+    # Re-importing the same feed creates nothing instead of failing the upload.
+    assert upload() == []
+
+
+def test_tailor_stream_emits_progress_events(client, tmp_path):
+    resume_path = tmp_path / "stream.docx"
+    create_sample_docx(resume_path)
+    with resume_path.open("rb") as file_obj:
+        resume_data = client.post(
+            "/api/resumes",
+            files={"file": ("stream.docx", file_obj, "application/octet-stream")},
+        ).json()
+    job_data = client.post(
+        "/api/job_postings",
+        json={"title": "ML Engineer", "company_name": "Stream Co", "raw_text": "Streaming tailoring."},
+    ).json()
+
+    response = client.post(
+        "/api/tailor/stream",
+        json={"resume_id": resume_data["id"], "job_posting_id": job_data["id"]},
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "text/event-stream"
+    events = [
+        json.loads(line[len("data: ") :])
+        for line in response.text.splitlines()
+        if line.startswith("data: ")
+    ]
+    names = [event["event"] for event in events]
+    assert names[0] == "queued"
+    assert names.index("plan_started") < names.index("plan_token") < names.index("artifact_written")
+    assert names[-1] == "version"
+    assert Path(events[-1]["artifact_path"]).exists()
+
+    missing = client.post("/api/tailor/stream", json={"resume_id": 999999, "job_posting_id": job_data["id"]})
+    assert missing.status_code == 404
+
+
+def test_async_tailor_job_is_idempotent(client, tmp_path):
+    resume_path = tmp_path / "queued.docx"
+    create_sample_docx(resume_path)
+    with resume_path.open("rb") as file_obj:
+        resume_data = client.post(
+            "/api/resumes",
+            files={"file": ("queued.docx", file_obj, "application/octet-stream")},
+        ).json()
+    job_data = client.post(
+        "/api/job_postings",
+        json={"title": "Data Engineer", "company_name": "Queue Co", "raw_text": "Pipelines."},
+    ).json()
+    payload = {
+        "resume_id": resume_data["id"],
+        "job_posting_id": job_data["id"],
+        "async": True,
+        "idempotency_key": "queue-test-1",
+    }
+
+    first = client.post("/api/tailor", json=payload).json()
+    retry = client.post("/api/tailor", json=payload).json()
+    assert first["job_id"] == retry["job_id"]
+
+    deadline = time.monotonic() + 10
+    status = client.get(f"/api/tailor/jobs/{first['job_id']}").json()
+    while status["status"] not in ("succeeded", "failed") and time.monotonic() < deadline:
+        time.sleep(0.05)
+        status = client.get(f"/api/tailor/jobs/{first['job_id']}").json()
+    assert status["status"] == "succeeded"
+    assert Path(status["artifact_path"]).exists()
+
+    sync_retry = client.post("/api/tailor", json={**payload, "async": False}).json()
+    assert sync_retry["resume_version_id"] == status["resume_version_id"]
+    assert client.get("/api/tailor/jobs/999999").status_code == 404
+
+    other_job = client.post(
+        "/api/job_postings",
+        json={"title": "Other Engineer", "company_name": "Queue Co", "raw_text": "Different role."},
+    ).json()
+    conflict = client.post("/api/tailor", json={**payload, "job_posting_id": other_job["id"]})
+    assert conflict.status_code == 409
+
+
+def test_sync_tailor_returns_202_when_the_wait_runs_out(client, tmp_path, monkeypatch):
+    from backend.services.job_queue import job_queue
+
+    resume_path = tmp_path / "slow.docx"
+    create_sample_docx(resume_path)
+    with resume_path.open("rb") as file_obj:
+        resume_id = client.post(
+            "/api/resumes", files={"file": ("slow.docx", file_obj, "application/octet-stream")}
+        ).json()["id"]
+    job_id = client.post(
+        "/api/job_postings", json={"title": "Slow Role", "company_name": "Wait Co", "raw_text": "Takes a while."}
+    ).json()["id"]
+    original = job_queue.run_sync
+    # Another worker holds the job, so the inline claim fails and the wait expires.
+    monkeypatch.setattr(job_queue, "_claim", lambda worker_id, job_id=None: None)
+    monkeypatch.setattr(job_queue, "run_sync", lambda request: original(request, timeout=0.2))
+
+    response = client.post(
+        "/api/tailor", json={"resume_id": resume_id, "job_posting_id": job_id, "idempotency_key": "slow-1"}
+    )
+    assert response.status_code == 202
+    body = json.loads(response.content)
+    assert body["status"] == "queued" and "resume_version_id" not in body
+    assert response.headers["Location"] == f"/api/tailor/jobs/{body['job_id']}"
+
+
+def test_batch_tailoring_dedupes_and_reuses_versions(client, tmp_path):
+    resume_path = tmp_path / "batch.docx"
+    create_sample_docx(resume_path)
+    with resume_path.open("rb") as file_obj:
+        resume_id = client.post(
+            "/api/resumes",
+            files={"file": ("batch.docx", file_obj, "application/octet-stream")},
+        ).json()["id"]
+    job_ids = [
+        client.post(
+            "/api/job_postings",
+            json={"title": f"Analyst {index}", "company_name": "Batch Co", "raw_text": f"Batch role {index}."},
+        ).json()["id"]
+        for index in range(3)
+    ]
+
+    batch = client.post(
+        "/api/tailor/batch",
+        json={"resume_ids": [resume_id, resume_id], "job_posting_ids": job_ids + [job_ids[0]]},
+    ).json()
+    assert batch["total"] == 3
+
+    response = client.get(f"/api/tailor/batch/{batch['id']}/events")
+    events = [
+        json.loads(line[len("data: ") :])
+        for line in response.text.splitlines()
+        if line.startswith("data: ")
+    ]
+    assert [event["event"] for event in events].count("item") == 3
+    summary = events[-1]
+    assert summary["event"] == "batch"
+    assert summary["stats"]["succeeded"] == 3
+
+    repeat = client.post(
+        "/api/tailor/batch",
+        json={"resume_ids": [resume_id], "job_filter": {"company": "Batch Co"}},
+    ).json()
+    assert repeat["total"] == 3
+    assert repeat["stats"]["cached"] == 3
+    assert repeat["status"] == "completed"
+
+
+def test_speculative_plan_makes_tailoring_use_cache(client, tmp_path, monkeypatch):
+    import backend.config as config
+    from backend.db import session_scope
+
+    resume_path = tmp_path / "primary.docx"
+    create_sample_docx(resume_path)
+    with resume_path.open("rb") as file_obj:
+        resume_id = client.post(
+            "/api/resumes",
+            files={"file": ("primary.docx", file_obj, "application/octet-stream")},
+        ).json()["id"]
+
+    monkeypatch.setenv("SPECULATIVE_TAILORING", "1")
+    monkeypatch.setenv("PRIMARY_RESUME_IDS", str(resume_id))
+    config.get_settings.cache_clear()
+    try:
+        job_id = client.post(
+            "/api/job_postings",
+            json={"title": "Speculative Role", "company_name": "Eager Co", "raw_text": "Pre-tailored."},
+        ).json()["id"]
+
+        deadline = time.monotonic() + 10
+        while time.monotonic() < deadline:
+            with session_scope() as connection:
+                row = connection.execute(
+                    "SELECT status FROM tailor_jobs WHERE kind = 'speculative' AND job_posting_id = ?",
+                    (job_id,),
+                ).fetchone()
+            if row and row["status"] == "succeeded":
+                break
+            time.sleep(0.05)
+        assert row["status"] == "succeeded"
+
+        response = client.post("/api/tailor/stream", json={"resume_id": resume_id, "job_posting_id": job_id})
+        assert "event: plan_cached" in response.text
+        assert "event: plan_started" not in response.text
+
+        assert client.delete(f"/api/job_postings/{job_id}").json() == {"status": "deleted"}
+        assert client.delete(f"/api/job_postings/{job_id}").status_code == 404
+    finally:
+        monkeypatch.undo()
+        config.get_settings.cache_clear()
+
+
+def test_concurrent_identical_tailoring_is_coalesced(client, tmp_path, monkeypatch):
+    from concurrent.futures import ThreadPoolExecutor
+
+    from backend.schemas import TailorRequest
+    from backend.services import app_service
+    from backend.services.rewrite_service import MockRewriteService
+
+    calls = []
+
+    class SlowMock(MockRewriteService):
+        def rewrite(self, resume_text, job_text):
+            calls.append(job_text)
+            time.sleep(0.3)
+            return super().rewrite(resume_text, job_text)
+
+    monkeypatch.setattr(app_service, "get_rewrite_service", SlowMock)
+
+    resume_path = tmp_path / "coalesce.docx"
+    create_sample_docx(resume_path)
+    with resume_path.open("rb") as file_obj:
+        resume_id = client.post(
+            "/api/resumes",
+            files={"file": ("coalesce.docx", file_obj, "application/octet-stream")},
+        ).json()["id"]
+    job_id = client.post(
+        "/api/job_postings",
+        json={"title": "Popular Role", "company_name": "Herd Co", "raw_text": "Everyone applies."},
+    ).json()["id"]
+
+    request = TailorRequest(resume_id=resume_id, job_posting_id=job_id)
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        outcomes = list(pool.map(lambda _: app_service.tailor_resume(request), range(4)))
+
+    assert len(calls) == 1
+    assert len({version.id for version, _, _ in outcomes}) == 1
+
+
+def test_user_and_scheduler_share_one_tailoring_run(client, tmp_path, monkeypatch):
+    from concurrent.futures import ThreadPoolExecutor
+
+    from backend import crud
+    from backend.db import session_scope
+    from backend.schemas import TailorRequest
+    from backend.services import app_service
+    from backend.services.rewrite_service import MockRewriteService
+    from backend.services.scheduler_service import SchedulerService
+
+    calls = []
+
+    class SlowMock(MockRewriteService):
+        def rewrite(self, resume_text, job_text):
+            calls.append(job_text)
+            time.sleep(0.3)
+            return super().rewrite(resume_text, job_text)
+
+    monkeypatch.setattr(app_service, "get_rewrite_service", SlowMock)
+
+    resume_path = tmp_path / "crosspath.docx"
+    create_sample_docx(resume_path)
+    with resume_path.open("rb") as file_obj:
+        resume_id = client.post(
+            "/api/resumes",
+            files={"file": ("crosspath.docx", file_obj, "application/octet-stream")},
+        ).json()["id"]
+    job_id = client.post(
+        "/api/job_postings",
+        json={"title": "Shared Role", "company_name": "Both Paths Co", "raw_text": "Tailored twice at once."},
+    ).json()["id"]
+    with session_scope() as connection:
+        resume = crud.get_resume(connection, resume_id)
+        job = crud.get_job_posting(connection, job_id)
+
+    scheduler = SchedulerService()
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        user = pool.submit(app_service.tailor_resume, TailorRequest(resume_id=resume_id, job_posting_id=job_id))
+        scheduled = pool.submit(scheduler._tailor_pair, resume, job)
+        _, artifact_path, _ = user.result()
+        assert scheduled.result() == artifact_path
+
+    assert len(calls) == 1
+    # Once the version exists, the scheduler reuses it without tailoring again.
+    assert scheduler._tailor_pair(resume, job) == artifact_path
+    assert len(calls) == 1
+
+
+def test_preview_streams_docx_without_persisting(client, tmp_path):
+    from io import BytesIO
+
+    resume_path = tmp_path / "preview.docx"
+    create_sample_docx(resume_path)
+    with resume_path.open("rb") as file_obj:
+        resume_id = client.post(
+            "/api/resumes",
+            files={"file": ("preview.docx", file_obj, "application/octet-stream")},
+        ).json()["id"]
+    job_id = client.post(
+        "/api/job_postings",
+        json={"title": "Preview Role", "company_name": "Preview Co", "raw_text": "Just looking."},
+    ).json()["id"]
+    artifacts_root = Path(os.environ["ARTIFACTS_ROOT"])
+
+    response = client.post("/api/tailor/preview", json={"resume_id": resume_id, "job_posting_id": job_id})
+    assert response.status_code == 200
+    assert int(response.headers["Content-Length"]) == len(response.content)
+    with ZipFile(BytesIO(response.content)) as archive:
+        assert b"[MOCK OUTPUT]" in archive.read("word/document.xml")
+    assert not list(artifacts_root.glob("Preview_Co__*"))
+
+
+def test_artifact_catalog_lists_and_searches_tailored_resumes(client, tmp_path):
+    resume_path = tmp_path / "catalog.docx"
+    create_sample_docx(resume_path)
+    with resume_path.open("rb") as file_obj:
+        resume_id = client.post(
+            "/api/resumes",
+            files={"file": ("catalog.docx", file_obj, "application/octet-stream")},
+        ).json()["id"]
+    job_id = client.post(
+        "/api/job_postings",
+        json={"title": "Catalog Engineer", "company_name": "Catalog Labs", "raw_text": "Indexes."},
+    ).json()["id"]
+    tailored = client.post("/api/tailor", json={"resume_id": resume_id, "job_posting_id": job_id}).json()
+
+    page = client.get("/api/artifacts", params={"q": "catalog labs", "limit": 10}).json()
+    assert page["total"] == 1
+    artifact = page["items"][0]
+    assert artifact["path"] == tailored["artifact_path"]
+    assert artifact["resume_id"] == resume_id
+    assert artifact["job_posting_id"] == job_id
+    assert artifact["size"] == Path(artifact["path"]).stat().st_size
+
+    assert client.get("/api/artifacts", params={"q": "no such company"}).json()["total"] == 0
+    # LIKE wildcards in the query are matched literally.
+    for literal in ("%", "c_talog", "c%labs"):
+        assert client.get("/api/artifacts", params={"q": literal}).json()["total"] == 0
+    # Queries too short for the trigram index fall back to a scan.
+    short = client.get("/api/artifacts", params={"q": "ab", "limit": 100}).json()
+    assert artifact["id"] in [item["id"] for item in short["items"]]
+    by_job = client.get("/api/artifacts", params={"job_posting_id": job_id}).json()
+    assert [item["id"] for item in by_job["items"]] == [artifact["id"]]
+    assert client.post("/api/artifacts/reindex").json() == {"added": 0}
+
+
+def test_search_index_is_built_for_catalogs_that_predate_it(tmp_path):
+    import sqlite3
+
+    from backend import db
+
+    connection = sqlite3.connect(tmp_path / "old.db")
+    db.initialize_schema(connection)
+    connection.executescript(
+        """
+        DROP TRIGGER artifacts_search_insert;
+        DROP TRIGGER artifacts_search_delete;
+        DROP TRIGGER artifacts_search_update;
+        DROP TABLE artifacts_search;
+        INSERT INTO artifacts (path, folder, file_name, size, sha256, search_text)
+        VALUES ('/a/resume.docx', 'a', 'resume.docx', 1, 'x', 'legacy labs a resume.docx');
+        """
+    )
+    db.initialize_schema(connection)
+    rows = connection.execute("SELECT rowid FROM artifacts_search WHERE artifacts_search MATCH ?", ('"acy lab"',)).fetchall()
+    assert rows == [(1,)]
+    connection.close()
+
+
+def test_rerender_rebuilds_outdated_versions_from_stored_plans(client, tmp_path, monkeypatch):
+    from backend import crud
+    from backend.db import session_scope
+    from backend.services import app_service, rerender_service
+    from backend.services.artifact_service import ArtifactService
+
+    resume_path = tmp_path / "rerender.docx"
+    create_sample_docx(resume_path)
+    with resume_path.open("rb") as file_obj:
+        resume_id = client.post(
+            "/api/resumes",
+            files={"file": ("rerender.docx", file_obj, "application/octet-stream")},
+        ).json()["id"]
+    job_id = client.post(
+        "/api/job_postings",
+        json={"title": "Rerender Role", "company_name": "Template Co", "raw_text": "Fresh templates."},
+    ).json()["id"]
+    tailored = client.post("/api/tailor", json={"resume_id": resume_id, "job_posting_id": job_id}).json()
+    version_id = tailored["resume_version_id"]
+    with session_scope() as connection:
+        connection.execute("UPDATE resume_versions SET template_version = '0.9' WHERE id = ?", (version_id,))
+
+    def no_model_calls():
+        raise AssertionError("re-rendering must not call the model")
+
+    monkeypatch.setattr(app_service, "get_rewrite_service", no_model_calls)
+    assert client.get("/api/resume_versions/rerender").json()["outdated"] >= 1
+    report = rerender_service.rerender_outdated(workers=0)
+
+    assert report.rendered >= 1 and report.failed == 0 and report.remaining == 0
+    with session_scope() as connection:
+        version = crud.get_resume_version(connection, version_id)
+        artifact = crud.get_artifact_by_path(connection, version.file_path)
+    assert version.template_version == ArtifactService.TEMPLATE_VERSION
+    assert version.file_path != tailored["artifact_path"] and Path(version.file_path).exists()
+    assert version.plan and artifact.resume_id == resume_id
+    # The superseded file and its catalog row are retired, and meta.json describes the new file.
+    assert not Path(tailored["artifact_path"]).exists()
+    with session_scope() as connection:
+        assert crud.get_artifact_by_path(connection, tailored["artifact_path"]) is None
+    meta = json.loads((Path(version.file_path).parent / "meta.json").read_text(encoding="utf-8"))
+    assert meta["artifact"] == Path(version.file_path).name and meta["template_version"] == "1.0"
+    assert rerender_service.rerender_outdated(workers=0).rendered == 0
+
+
+def test_artifact_export_streams_matching_files_as_zip(client, tmp_path):
+    from io import BytesIO
+
+    resume_path = tmp_path / "export.docx"
+    create_sample_docx(resume_path)
+    with resume_path.open("rb") as file_obj:
+        resume_id = client.post(
+            "/api/resumes",
+            files={"file": ("export.docx", file_obj, "application/octet-stream")},
+        ).json()["id"]
+    paths = []
+    for title in ("Export One", "Export Two"):
+        job_id = client.post(
+            "/api/job_postings",
+            json={"title": title, "company_name": "Export Inc", "raw_text": f"Zip {title}."},
+        ).json()["id"]
+        tailored = client.post("/api/tailor", json={"resume_id": resume_id, "job_posting_id": job_id}).json()
+        paths.append(tailored["artifact_path"])
+
+    response = client.get("/api/artifacts/export", params={"company": "export inc"})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/zip"
+    with ZipFile(BytesIO(response.content)) as archive:
+        assert archive.testzip() is None
+        names = archive.namelist()
+        assert len(names) == 2
+        for path in paths:
+            member = f"{Path(path).parent.name}/{Path(path).name}"
+            assert archive.read(member) == Path(path).read_bytes()
+    assert client.get("/api/artifacts/export", params={"created_after": "not-a-date"}).status_code == 400
+
+
+def test_artifact_download_supports_etags_and_ranges(client, tmp_path):
+    resume_path = tmp_path / "download.docx"
+    create_sample_docx(resume_path)
+    with resume_path.open("rb") as file_obj:
+        resume_id = client.post(
+            "/api/resumes",
+            files={"file": ("download.docx", file_obj, "application/octet-stream")},
+        ).json()["id"]
+    job_id = client.post(
+        "/api/job_postings",
+        json={"title": "Download Role", "company_name": "Cache Co", "raw_text": "Conditional requests."},
+    ).json()["id"]
+    path = client.post("/api/tailor", json={"resume_id": resume_id, "job_posting_id": job_id}).json()["artifact_path"]
+    data = Path(path).read_bytes()
+
+    full = client.get("/api/artifacts/download", params={"path": path})
+    assert full.status_code == 200 and full.content == data
+    etag = full.headers["ETag"]
+    assert "immutable" in full.headers["Cache-Control"]
+
+    cached = client.get("/api/artifacts/download", params={"path": path}, headers={"If-None-Match": etag})
+    assert cached.status_code == 304 and cached.content == b""
+
+    partial = client.get("/api/artifacts/download", params={"path": path}, headers={"Range": "bytes=10-19"})
+    assert partial.status_code == 206 and partial.content == data[10:20]
+    assert partial.headers["Content-Range"] == f"bytes 10-19/{len(data)}"
+    suffix = client.get("/api/artifacts/download", params={"path": path}, headers={"Range": "bytes=-5"})
+    assert suffix.content == data[-5:]
+    stale = client.get(
+        "/api/artifacts/download", params={"path": path}, headers={"Range": "bytes=0-9", "If-Range": '"old"'}
+    )
+    assert stale.status_code == 200 and stale.content == data
+    beyond = client.get("/api/artifacts/download", params={"path": path}, headers={"Range": f"bytes={len(data)}-"})
+    assert beyond.status_code == 416
+
+    assert client.get("/api/artifacts/download", params={"path": "/etc/passwd"}).status_code == 404
+
+
+def test_scheduler_heap_reloads_only_changed_schedules(client):
+    from datetime import timedelta
+
+    from backend.services.scheduler_service import SchedulerService
+
+    assert client.post("/api/schedules", json={"cron_expr": "0 9 * * FUNDAY"}).status_code == 400
+    hourly = client.post("/api/schedules", json={"cron_expr": "0 * * * *"}).json()
+    daily = client.post("/api/schedules", json={"cron_expr": "30 6 * * MON-FRI"}).json()
+
+    scheduler = SchedulerService()
+    assert scheduler.sync_schedules() >= 2
+    assert scheduler.sync_schedules() == 0
+    first = scheduler.next_fire_time(hourly["id"])
+    assert first.minute == 0 and first.second == 0
+    listed = {item["id"]: item for item in client.get("/api/schedules").json()}
+    assert listed[hourly["id"]]["next_fire_at"] == first.isoformat()
+    assert listed[hourly["id"]]["coalesce"] is True and listed[hourly["id"]]["max_instances"] == 1
+
+    updated = client.patch(f"/api/schedules/{daily['id']}", json={"is_enabled": False}).json()
+    assert updated["revision"] == daily["revision"] + 1
+    assert scheduler.sync_schedules() == 1
+    assert scheduler.next_fire_time(daily["id"]) is None
+
+    # Due times carry up to SCHEDULER_JITTER (30s) of spread past the nominal fire time.
+    due = scheduler._pop_due(first + timedelta(seconds=30))
+    assert (hourly["id"], first) in [(schedule_id, fire_at) for schedule_id, fire_at, _ in due]
+    assert scheduler.next_fire_time(hourly["id"]) == first + timedelta(hours=1)
+    assert daily["id"] not in [schedule_id for schedule_id, _, _ in scheduler._pop_due(first + timedelta(days=7))]
+
+
+def test_scheduled_run_commits_in_short_transactions(client, monkeypatch):
+    from backend import crud
+    from backend.db import session_scope
+    from backend.services.rewrite_service import get_rewrite_service
+    from backend.services.scheduler_service import SchedulerService
+
+    schedule = client.post(
+        "/api/schedules", json={"cron_expr": "0 0 1 1 *", "criteria_json": {"title": "Short Transaction"}}
+    ).json()
+    client.post(
+        "/api/job_postings",
+        json={"title": "Short Transaction Role", "company_name": "Lock Co", "raw_text": "Short transactions."},
+    )
+    scheduler = SchedulerService()
+    seen = {}
+    service = get_rewrite_service()
+    original = service.rewrite
+
+    def rewrite_while_others_write(resume_text, job_text):
+        # Another writer gets the lock mid-run and already sees the run as running.
+        with session_scope() as connection:
+            crud.get_or_create_company(connection, "Concurrent Writer Co")
+            seen["status"] = [run.status for run in crud.list_runs(connection) if run.schedule_id == schedule["id"]]
+        return original(resume_text, job_text)
+
+    monkeypatch.setattr(service, "rewrite", rewrite_while_others_write)
+    scheduler.run_now(schedule["id"])
+    assert seen["status"] == ["running"]
+    runs = [run for run in client.get("/api/runs").json() if run.get("schedule_id") == schedule["id"]]
+    assert [run["status"] for run in runs] == ["success"]
+    assert {"db_read", "plan", "render", "docx_render", "commit"} <= set(runs[0]["stage_timings"])
+    per_run = {row["stage"] for row in client.get("/api/stage_timings", params={"per": "run"}).json()}
+    assert {"db_read", "commit"} <= per_run
+    assert client.get("/api/stage_timings", params={"per": "pair"}).status_code == 400
+
+    with session_scope() as connection:
+        crashed = crud.create_run(
+            connection, triggered_by="scheduler", run_type="scheduled", schedule_id=schedule["id"], heartbeat_at=0.0
+        )
+    assert scheduler.recover_stale_runs() == [crashed.id]
+    with session_scope() as connection:
+        recovered = next(run for run in crud.list_runs(connection) if run.id == crashed.id)
+    assert recovered.status == "failed" and "heartbeat" in recovered.error
+
+
+def test_schedule_criteria_fan_out_from_high_water_mark(client, tmp_path, monkeypatch):
+    from backend import crud
+    from backend.db import session_scope
+    from backend.services.rewrite_service import get_rewrite_service
+    from backend.services.scheduler_service import SchedulerService
+
+    resume_path = tmp_path / "fanout.docx"
+    create_sample_docx(resume_path)
+    with resume_path.open("rb") as file_obj:
+        resume_id = client.post(
+            "/api/resumes", files={"file": ("fanout.docx", file_obj, "application/octet-stream")}
+        ).json()["id"]
+
+    def post_job(title, location):
+        return client.post(
+            "/api/job_postings",
+            json={"title": title, "company_name": "Fan Co", "location": location, "raw_text": f"{title} {location}"},
+        ).json()["id"]
+
+    # Postings that predate the schedule are behind its high-water mark.
+    backlog = post_job("Fanout Engineer", "Remote (backlog)")
+
+    assert client.post(
+        "/api/schedules", json={"cron_expr": "@daily", "criteria_json": {"title": 3}}
+    ).status_code == 400
+    schedule = client.post(
+        "/api/schedules",
+        json={"cron_expr": "@daily", "criteria_json": {"title": "fanout", "location": ["remote"], "resume_ids": [resume_id]}},
+    ).json()
+    assert schedule["last_job_posting_id"] == backlog
+
+    remote = [post_job("Fanout Engineer", "Remote"), post_job("Senior Fanout Engineer", "Remote (EU)")]
+    post_job("Fanout Engineer", "Berlin")
+    post_job("Office Manager", "Remote")
+    scheduler = SchedulerService()
+
+    def latest_run():
+        runs = [run for run in client.get("/api/runs").json() if run.get("schedule_id") == schedule["id"]]
+        return max(runs, key=lambda run: run["id"])
+
+    def tailored_jobs():
+        with session_scope() as connection:
+            return sorted(artifact.job_posting_id for artifact in crud.list_artifacts(connection, company="Fan Co"))
+
+    scheduler.run_now(schedule["id"])
+    assert latest_run()["status"] == "success"
+    assert tailored_jobs() == remote
+    scheduler.run_now(schedule["id"])
+    assert latest_run()["status"] == "skipped"
+
+    flaky = post_job("Fanout Lead", "Remote")
+    later = post_job("Fanout Staff Engineer", "Remote")
+    service = get_rewrite_service()
+    original = service.rewrite
+    calls = []
+
+    def fail_for_lead(resume_text, job_text):
+        calls.append(job_text)
+        if "Fanout Lead" in job_text:
+            raise RuntimeError("model unavailable")
+        return original(resume_text, job_text)
+
+    monkeypatch.setattr(service, "rewrite", fail_for_lead)
+    scheduler.run_now(schedule["id"])
+    assert latest_run()["status"] == "completed_with_errors"
+    assert tailored_jobs() == [*remote, later]
+    with session_scope() as connection:
+        assert crud.get_schedule(connection, schedule["id"]).last_job_posting_id == flaky - 1
+
+    # The retry tailors the failed posting only; the one after it is reused.
+    def count_calls(resume_text, job_text):
+        calls.append(job_text)
+        return original(resume_text, job_text)
+
+    calls.clear()
+    monkeypatch.setattr(service, "rewrite", count_calls)
+    scheduler.run_now(schedule["id"])
+    assert latest_run()["status"] == "success"
+    assert len(calls) == 1 and "Fanout Lead" in calls[0]
+    assert tailored_jobs() == [*remote, flaky, later]
+    with session_scope() as connection:
+        assert crud.get_schedule(connection, schedule["id"]).last_job_posting_id >= flaky
@@ -0,0 +1,105 @@
+import dataclasses
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from backend import crud
+from backend.db import session_scope
+from backend.services import retention_service
+from backend.services.artifact_service import ArtifactService
+from backend.services.rewrite_service import RewriteResult
+
+
+def _artifact(service, job_key, age_days, now):
+    result = RewriteResult(plan={"summary": job_key}, rendered_text="", model_name="mock", prompt_hash="h")
+    path = service.create_artifact(company_name="Keep Co", job_key=job_key, rewrite_result=result)
+    with session_scope() as connection:
+        connection.execute(
+            "UPDATE artifacts SET created_at = ? WHERE path = ?",
+            ((now - timedelta(days=age_days)).strftime("%Y-%m-%d %H:%M:%S"), str(path)),
+        )
+        return crud.get_artifact_by_path(connection, str(path))
+
+
+def test_sweep_applies_policies_and_reads_through_bundles(isolated_db, tmp_path):
+    now = datetime(2026, 6, 15, tzinfo=timezone.utc)
+    service = ArtifactService(template_path=tmp_path / "template.docx")
+    stale = _artifact(service, "1_Old", 400, now)
+    excess = _artifact(service, "2_Role", 100, now)
+    cold = _artifact(service, "2_Role", 50, now)
+    fresh = _artifact(service, "2_Role", 1, now)
+    cold_bytes = Path(cold.path).read_bytes()
+
+    settings = dataclasses.replace(
+        isolated_db, artifact_max_age_days=365, artifact_keep_per_job=2, artifact_archive_after_days=30
+    )
+    report = retention_service.sweep(settings, now=now)
+
+    assert (report.deleted, report.archived) == (2, 1)
+    assert report.bytes_reclaimed > 0
+    assert not Path(stale.path).exists() and not Path(excess.path).exists() and not Path(cold.path).exists()
+    assert not Path(stale.path).parent.exists()
+    with session_scope() as connection:
+        assert crud.get_artifact_by_path(connection, stale.path) is None
+        archived = crud.get_artifact_by_path(connection, cold.path)
+    assert Path(archived.archive_path).name == "2026-04.zip"
+    with retention_service.open_artifact(archived) as handle:
+        assert handle.read() == cold_bytes
+
+    report = retention_service.sweep(dataclasses.replace(isolated_db, artifact_max_total_bytes=1), now=now)
+    assert report.deleted == 2 and report.bundles_removed == 1
+    assert not Path(fresh.path).exists() and not Path(archived.archive_path).exists()
+
+
+def test_versions_whose_artifact_was_deleted_are_not_reused(isolated_db, tmp_path):
+    from backend.schemas import TailorRequest
+    from backend.services import app_service
+
+    with session_scope() as connection:
+        resume = crud.create_resume(
+            connection, file_path="resume.docx", file_format="docx", text="Python analyst.", text_hash="r1"
+        )
+        job = crud.create_job_posting(
+            connection, title="Analyst", company=None, location=None, url=None, raw_text="Role.", external_id=None
+        )
+    version, artifact_path, _ = app_service.tailor_resume(TailorRequest(resume_id=resume.id, job_posting_id=job.id))
+    now = datetime.now(timezone.utc)
+    with session_scope() as connection:
+        connection.execute(
+            "UPDATE artifacts SET created_at = ? WHERE path = ?",
+            ((now - timedelta(days=60)).strftime("%Y-%m-%d %H:%M:%S"), str(artifact_path)),
+        )
+
+    def reusable():
+        with session_scope() as connection:
+            return app_service.find_reusable_version(connection, resume, job)
+
+    retention_service.sweep(dataclasses.replace(isolated_db, artifact_archive_after_days=30), now=now)
+    assert not artifact_path.exists() and reusable().id == version.id
+
+    retention_service.sweep(dataclasses.replace(isolated_db, artifact_max_total_bytes=1), now=now)
+    assert reusable() is None
+
+
+def test_archive_copies_each_bundle_once_per_sweep(isolated_db, tmp_path, monkeypatch):
+    import shutil
+
+    now = datetime(2026, 6, 15, tzinfo=timezone.utc)
+    service = ArtifactService(template_path=tmp_path / "template.docx")
+    settings = dataclasses.replace(isolated_db, artifact_archive_after_days=30)
+    _artifact(service, "1_First", 50, now)
+    retention_service.sweep(settings, now=now)
+
+    later = [_artifact(service, f"{index}_Role", 50, now) for index in range(2, 6)]
+    copies = []
+    copyfile = shutil.copyfile
+    monkeypatch.setattr(retention_service, "BATCH_SIZE", 1)
+    monkeypatch.setattr(shutil, "copyfile", lambda *args: copies.append(args) or copyfile(*args))
+    report = retention_service.sweep(settings, now=now)
+
+    assert report.archived == 4 and len(copies) == 1
+    with session_scope() as connection:
+        archived = [crud.get_artifact_by_path(connection, artifact.path) for artifact in later]
+    assert {Path(artifact.archive_path).name for artifact in archived} == {"2026-04.zip"}
+    with retention_service.open_artifact(archived[-1]) as handle:
+        assert handle.read()
+    assert not list(service.artifacts_root.glob("_archive/*.tmp"))
@@ -0,0 +1,95 @@
+import multiprocessing
+import os
+import time
+from datetime import datetime, timedelta, timezone
+
+from backend import crud
+from backend.db import session_scope
+from backend.services import lease_service
+
+
+def _node(database_url, artifacts_root, schedule_id, fire_times, barrier, results):
+    os.environ["DATABASE_URL"] = database_url
+    os.environ["ARTIFACTS_ROOT"] = artifacts_root
+    from backend.services.scheduler_service import SchedulerService
+
+    scheduler = SchedulerService()
+    executed = []
+    barrier.wait()
+    for fire_at in fire_times:
+        if scheduler.claim_occurrence(schedule_id, fire_at):
+            executed.append((fire_at, scheduler.execute_occurrence(schedule_id, fire_at)))
+    results.put((scheduler.node_id, executed))
+
+
+def test_each_occurrence_runs_on_exactly_one_node(isolated_db):
+    with session_scope() as connection:
+        schedule = crud.create_schedule(
+            connection, cron_expr="* * * * *", is_enabled=True, criteria_json=None, max_instances=4
+        )
+    start = datetime(2026, 5, 1, 9, 0, tzinfo=timezone.utc)
+    fire_times = [start + timedelta(minutes=minute) for minute in range(24)]
+
+    context = multiprocessing.get_context("spawn")
+    barrier = context.Barrier(4)
+    results = context.Queue()
+    nodes = [
+        context.Process(
+            target=_node,
+            args=(isolated_db.database_url, str(isolated_db.artifacts_root), schedule.id, fire_times, barrier, results),
+        )
+        for _ in range(4)
+    ]
+    for node in nodes:
+        node.start()
+    outcomes = [results.get(timeout=60) for _ in nodes]
+    for node in nodes:
+        node.join(timeout=10)
+
+    executed = [fire_at for _, items in outcomes for fire_at, _ in items]
+    assert sorted(executed) == fire_times
+    assert sum(1 for _, items in outcomes if items) > 1
+    with session_scope() as connection:
+        runs = [run for run in crud.list_runs(connection) if run.schedule_id == schedule.id]
+    assert len(runs) == len(fire_times)
+    assert {run_id for _, items in outcomes for _, run_id in items} == {run.id for run in runs}
+
+
+def test_expired_occurrence_lease_is_taken_over(isolated_db):
+    from backend.services.scheduler_service import SchedulerService, occurrence_lease_name
+
+    with session_scope() as connection:
+        schedule = crud.create_schedule(connection, cron_expr="@hourly", is_enabled=True, criteria_json=None)
+    scheduler = SchedulerService()
+    scheduler.sync_schedules()
+    fire_at = datetime(2026, 5, 1, 10, 0, tzinfo=timezone.utc)
+    name = occurrence_lease_name(schedule.id, fire_at)
+
+    assert lease_service.acquire(name, "other-node", 0.5)
+    assert not scheduler.claim_occurrence(schedule.id, fire_at)
+    assert scheduler._pop_deferred(time.time()) == []
+    time.sleep(0.6)
+    assert [item[:2] for item in scheduler._pop_deferred(time.time())] == [(schedule.id, fire_at)]
+    assert scheduler.claim_occurrence(schedule.id, fire_at)
+    scheduler.execute_occurrence(schedule.id, fire_at)
+    assert lease_service.get(name).result["node"] == scheduler.node_id
+
+    # A finished occurrence is neither re-run nor queued for takeover.
+    other = SchedulerService()
+    assert not other.claim_occurrence(schedule.id, fire_at)
+    assert other._deferred == []
+
+
+def test_expired_occurrence_and_tailor_leases_are_purged(isolated_db):
+    from backend.services.scheduler_service import SchedulerService
+
+    assert lease_service.acquire("schedule:1:2026-05-01T10:00", "node", 0.01)
+    assert lease_service.acquire("tailor:1:2:hash:mock:1.0", "worker", 0.01)
+    assert lease_service.acquire("tailor:1:3:hash:mock:1.0", "worker", 60)
+    assert lease_service.acquire("other:1", "worker", 0.01)
+    time.sleep(0.05)
+
+    assert SchedulerService().purge_expired_leases() == 2
+    assert lease_service.get("tailor:1:2:hash:mock:1.0") is None
+    assert lease_service.get("tailor:1:3:hash:mock:1.0") is not None
+    assert lease_service.get("other:1") is not None
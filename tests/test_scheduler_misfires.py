@@ -0,0 +1,192 @@
+import sqlite3
+import time
+from datetime import datetime, timedelta, timezone
+
+from backend import crud
+from backend.db import session_scope
+from backend.services import lease_service
+from backend.services.cron import parse_cron
+
+
+def _create_schedule(**policy):
+    with session_scope() as connection:
+        return crud.create_schedule(connection, cron_expr="@hourly", is_enabled=True, criteria_json=None, **policy)
+
+
+def _schedule(schedule_id):
+    with session_scope() as connection:
+        return crud.get_schedule(connection, schedule_id)
+
+
+def test_missed_occurrences_respect_grace_and_coalesce(isolated_db):
+    from backend.services.scheduler_service import _Entry, _missed_occurrences
+
+    cron = parse_cron("0 * * * *")
+    last = datetime(2026, 5, 1, 0, 0, tzinfo=timezone.utc)
+    now = datetime(2026, 5, 1, 5, 30, tzinfo=timezone.utc)
+
+    separate = _Entry(revision=1, cron=cron, grace=7200, jitter=0, coalesce=False)
+    catch_up, dropped = _missed_occurrences(cron, last, now, separate)
+    assert [moment.hour for moment in dropped] == [1, 2, 3]
+    assert [moment.hour for moment in catch_up] == [4, 5]
+
+    coalesced = _Entry(revision=1, cron=cron, grace=7200, jitter=0, coalesce=True)
+    catch_up, dropped = _missed_occurrences(cron, last, now, coalesced)
+    assert [moment.hour for moment in dropped] == [1, 2, 3, 4]
+    assert [moment.hour for moment in catch_up] == [5]
+
+
+def test_startup_catch_up_counts_misfires_once_across_nodes(isolated_db):
+    from backend.services.scheduler_service import SchedulerService
+
+    schedule = _create_schedule(misfire_grace_seconds=3 * 3600, jitter_seconds=0)
+    last = datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0) - timedelta(hours=5)
+    with session_scope() as connection:
+        crud.record_schedule_fire(connection, schedule.id, last)
+
+    first, second = SchedulerService(), SchedulerService()
+    first.sync_schedules()
+    second.sync_schedules()
+    assert len(first._deferred) == len(second._deferred) == 1
+    assert _schedule(schedule.id).misfire_count == 4
+
+    # Schedules this process already tracks are not caught up again.
+    first.sync_schedules()
+    assert len(first._deferred) == 1
+
+
+def test_max_instances_skips_occurrence(isolated_db):
+    from backend.services.scheduler_service import SchedulerService, occurrence_lease_name
+
+    schedule = _create_schedule(max_instances=1)
+    with session_scope() as connection:
+        crud.create_run(
+            connection, triggered_by="scheduler", run_type="scheduled", schedule_id=schedule.id, heartbeat_at=time.time()
+        )
+    scheduler = SchedulerService()
+    fire_at = datetime(2026, 5, 1, 10, 0, tzinfo=timezone.utc)
+
+    assert scheduler.claim_occurrence(schedule.id, fire_at)
+    assert scheduler.execute_occurrence(schedule.id, fire_at) is None
+    assert lease_service.get(occurrence_lease_name(schedule.id, fire_at)).result["skipped"] is True
+    assert _schedule(schedule.id).misfire_count == 1
+    with session_scope() as connection:
+        assert len([run for run in crud.list_runs(connection) if run.schedule_id == schedule.id]) == 1
+
+
+def test_manual_trigger_runs_in_background_and_honours_max_instances(isolated_db):
+    import pytest
+
+    from backend.services.scheduler_service import SchedulerService
+
+    schedule = _create_schedule(max_instances=1)
+    scheduler = SchedulerService()
+    with pytest.raises(LookupError):
+        scheduler.trigger(schedule.id + 1)
+
+    run_id = scheduler.trigger(schedule.id)
+    deadline = time.monotonic() + 5
+    while time.monotonic() < deadline:
+        with session_scope() as connection:
+            run = next(run for run in crud.list_runs(connection) if run.id == run_id)
+        if run.status != "running":
+            break
+        time.sleep(0.01)
+    assert run.status == "skipped" and run.triggered_by == "user"
+
+    with session_scope() as connection:
+        crud.create_run(
+            connection, triggered_by="scheduler", run_type="scheduled", schedule_id=schedule.id, heartbeat_at=time.time()
+        )
+    assert scheduler.trigger(schedule.id) is None
+    assert scheduler.run_now(schedule.id) is None
+    scheduler.shutdown()
+
+
+def test_late_occurrence_is_dropped_and_lag_is_recorded(isolated_db):
+    from backend.services.scheduler_service import SchedulerService
+
+    schedule = _create_schedule(misfire_grace_seconds=60, jitter_seconds=0)
+    scheduler = SchedulerService()
+    scheduler.sync_schedules()
+    now = datetime.now(timezone.utc)
+
+    late = now - timedelta(minutes=5)
+    scheduler._enqueue([(schedule.id, late, late)])
+    scheduler._dispatch_ready()
+    assert not scheduler._ready
+    assert _schedule(schedule.id).misfire_count == 1
+
+    fire_at = now.replace(microsecond=0) - timedelta(seconds=5)
+    assert scheduler.claim_occurrence(schedule.id, fire_at)
+    run_id = scheduler.execute_occurrence(schedule.id, fire_at)
+    with session_scope() as connection:
+        run = next(run for run in crud.list_runs(connection) if run.id == run_id)
+        stats = crud.schedule_lag_stats(connection)[schedule.id]
+    assert run.scheduled_for == fire_at.replace(tzinfo=None)
+    assert run.lag_seconds >= 5
+    assert stats["runs"] == 1 and stats["last_lag_seconds"] == run.lag_seconds
+    assert _schedule(schedule.id).last_fire_at == fire_at.replace(tzinfo=None)
+
+
+def test_lag_excludes_the_occurrence_jitter(isolated_db):
+    from backend.services.scheduler_service import SchedulerService, _jitter
+
+    schedule = _create_schedule(jitter_seconds=600)
+    scheduler = SchedulerService()
+    fire_at = datetime.now(timezone.utc).replace(microsecond=0) - timedelta(minutes=20)
+    offset = _jitter(schedule.id, fire_at, 600)
+
+    assert scheduler.claim_occurrence(schedule.id, fire_at)
+    run_id = scheduler.execute_occurrence(schedule.id, fire_at)
+    with session_scope() as connection:
+        run = next(run for run in crud.list_runs(connection) if run.id == run_id)
+    elapsed = (datetime.now(timezone.utc) - fire_at - offset).total_seconds()
+    assert 0 < run.lag_seconds <= elapsed
+    assert run.lag_seconds > elapsed - 5
+
+
+def test_coalescing_collapses_queued_occurrences(isolated_db):
+    from backend.services.scheduler_service import SchedulerService
+
+    coalesced = _create_schedule(jitter_seconds=0)
+    separate = _create_schedule(jitter_seconds=0, coalesce=False)
+    scheduler = SchedulerService()
+    scheduler.sync_schedules()
+    base = datetime.now(timezone.utc).replace(second=0, microsecond=0)
+    occurrences = [base - timedelta(minutes=2), base - timedelta(minutes=1)]
+
+    for fire_at in occurrences:
+        scheduler._enqueue([(coalesced.id, fire_at, fire_at), (separate.id, fire_at, fire_at)])
+    assert [item[1] for item in scheduler._ready if item[0] == coalesced.id] == occurrences[1:]
+    assert [item[1] for item in scheduler._ready if item[0] == separate.id] == occurrences
+    assert _schedule(coalesced.id).misfire_count == 1
+
+
+def test_jitter_is_stable_and_bounded():
+    from backend.services.scheduler_service import _jitter
+
+    fire_at = datetime(2026, 5, 1, 8, 0, tzinfo=timezone.utc)
+    offsets = [_jitter(schedule_id, fire_at, 30) for schedule_id in range(1, 51)]
+    assert offsets == [_jitter(schedule_id, fire_at, 30) for schedule_id in range(1, 51)]
+    assert all(timedelta(0) <= offset < timedelta(seconds=30) for offset in offsets)
+    assert len(set(offsets)) > 40
+    assert _jitter(1, fire_at, 0) == timedelta(0)
+
+
+def test_watermark_migration_starts_existing_schedules_at_newest_posting(tmp_path):
+    from backend import db
+
+    connection = sqlite3.connect(tmp_path / "old.db")
+    connection.executescript(
+        """
+        CREATE TABLE job_postings (id INTEGER PRIMARY KEY AUTOINCREMENT, title TEXT);
+        CREATE TABLE schedules (id INTEGER PRIMARY KEY AUTOINCREMENT, cron_expr TEXT NOT NULL,
+            is_enabled INTEGER DEFAULT 1, criteria_json TEXT);
+        INSERT INTO job_postings (title) VALUES ('a'), ('b'), ('c');
+        INSERT INTO schedules (cron_expr) VALUES ('@daily');
+        """
+    )
+    db._apply_column_migrations(connection)
+    assert connection.execute("SELECT last_job_posting_id FROM schedules").fetchone()[0] == 3
+    connection.close()
@@ -0,0 +1,72 @@
+import threading
+from contextvars import copy_context
+
+from backend import crud
+from backend.db import session_scope
+from backend.schemas import TailorRequest
+from backend.utils import spans
+
+
+def test_recording_nests_and_collects_across_threads():
+    with spans.span("ignored"):
+        pass  # no recorder: a no-op
+
+    with spans.recording() as outer:
+        with spans.span("db_read"):
+            pass
+        with spans.recording() as inner:
+            with spans.span("plan"):
+                pass
+        worker = threading.Thread(target=copy_context().run, args=(_record_render,))
+        worker.start()
+        worker.join()
+        with spans.span("db_read"):
+            pass
+
+    assert list(inner.totals()) == ["plan"]
+    totals = outer.totals()
+    assert list(totals) == ["db_read", "plan", "render"]
+    assert totals["db_read"][1] == 2 and totals["render"] == (0.25, 1)
+    assert spans.current() is None
+
+
+def _record_render():
+    spans.current().add("render", 0.25)
+
+
+def test_stage_percentiles_use_nearest_rank(isolated_db):
+    with session_scope() as connection:
+        run_ids = []
+        for ms in range(1, 21):
+            run = crud.create_run(connection, triggered_by="test", run_type="scheduled")
+            crud.record_stage_timings(connection, {"plan": (ms / 1000, 1)}, run_id=run.id)
+            run_ids.append(run.id)
+        crud.record_stage_timings(connection, {"db_read": (0.5, 3)}, run_id=run_ids[0])
+
+        per_run = {row["stage"]: row for row in crud.stage_timing_percentiles(connection, per="run")}
+        assert per_run["plan"] == {"stage": "plan", "samples": 20, "p50_ms": 10.0, "p95_ms": 19.0, "max_ms": 20.0}
+        assert per_run["db_read"]["samples"] == 1
+        assert crud.stage_timing_percentiles(connection) == []
+        assert crud.get_run_stage_timings(connection, run_ids[:2]) == {
+            run_ids[0]: {"plan": 1.0, "db_read": 500.0},
+            run_ids[1]: {"plan": 2.0},
+        }
+
+
+def test_tailoring_records_stage_timings_on_version(isolated_db):
+    from backend.services import app_service
+
+    with session_scope() as connection:
+        resume = crud.create_resume(
+            connection, file_path="resume.txt", file_format="txt", text="Python developer", text_hash="h"
+        )
+        job = crud.create_job_posting(
+            connection, title="Engineer", company=None, location=None, url=None, raw_text="Build APIs", external_id=None
+        )
+
+    version, _, _ = app_service.tailor_resume(TailorRequest(resume_id=resume.id, job_posting_id=job.id))
+
+    with session_scope() as connection:
+        timings = crud.get_version_stage_timings(connection, version.id)
+    assert {"db_read", "plan_cache", "plan", "render", "docx_render", "docx_write", "commit"} <= set(timings)
+    assert all(ms >= 0 for ms in timings.values())
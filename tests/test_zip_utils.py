@@ -0,0 +1,58 @@
+import struct
+import zlib
+from io import BytesIO
+from zipfile import ZipFile
+
+from backend.utils import zip_utils
+
+
+def _local_headers(archive: bytes):
+    """Walk the local headers the way a streaming reader does, without the central directory."""
+
+    position = 0
+    while archive[position : position + 4] == b"PK\x03\x04":
+        flags, crc, compressed, size, name_length, extra_length = struct.unpack_from(
+            "<2xH6x3L2H", archive, position + 4
+        )
+        extra = archive[position + 30 + name_length : position + 30 + name_length + extra_length]
+        if compressed == 0xFFFFFFFF:
+            size = compressed = struct.unpack_from("<2Q", extra, 4)[0]
+        yield flags, crc, size
+        position += 30 + name_length + extra_length + compressed
+
+
+def test_stream_files_writes_crc_and_size_in_local_headers(tmp_path):
+    sources = {"a.txt": b"alpha" * 100, "nested/b.txt": b"", "c.bin": bytes(range(256)) * 40}
+    for name, data in sources.items():
+        path = tmp_path / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(data)
+    members = [(name, tmp_path / name) for name in sources] + [("gone.txt", tmp_path / "missing.txt")]
+
+    archive = b"".join(zip_utils.stream_files(members, chunk_size=1000))
+
+    assert [(crc, size) for _, crc, size in _local_headers(archive)] == [
+        (zlib.crc32(data), len(data)) for data in sources.values()
+    ]
+    assert all(not flags & 0x08 for flags, _, _ in _local_headers(archive))
+    with ZipFile(BytesIO(archive)) as bundle:
+        assert {name: bundle.read(name) for name in bundle.namelist()} == sources
+
+
+def test_stream_files_switches_to_zip64_past_the_classic_limits(tmp_path, monkeypatch):
+    monkeypatch.setattr(zip_utils, "_ZIP32_LIMIT", 1500)
+    monkeypatch.setattr(zip_utils, "_MAX_ENTRIES", 3)
+    monkeypatch.setattr(zip_utils, "_BUFFER_LIMIT", 100)
+    sources = {f"file{index}.txt": bytes([65 + index]) * (400 * index + 10) for index in range(6)}
+    for name, data in sources.items():
+        (tmp_path / name).write_bytes(data)
+
+    archive = b"".join(zip_utils.stream_files([(name, tmp_path / name) for name in sources], chunk_size=64))
+
+    assert b"PK\x06\x06" in archive and b"PK\x06\x07" in archive
+    assert [(crc, size) for _, crc, size in _local_headers(archive)] == [
+        (zlib.crc32(data), len(data)) for data in sources.values()
+    ]
+    with ZipFile(BytesIO(archive)) as bundle:
+        assert bundle.testzip() is None
+        assert {name: bundle.read(name) for name in bundle.namelist()} == sources
@@ -1,7 +1,6 @@
 from __future__ import annotations
 
-import json
-from typing import List
+from typing import Iterator, List
 
 from backend import crud
 from backend.db import session_scope
@@ -10,24 +9,22 @@ from backend.services.app_service import create_job_posting as service_create_jo
 from backend.services.app_service import (
     create_schedule as service_create_schedule,
     import_jobs_from_csv as service_import_jobs_from_csv,
+    load_tailor_inputs,
     save_resume_file,
+    stream_tailor_resume as service_stream_tailor_resume,
     tailor_resume as service_tailor_resume,
 )
-from backend.services.artifact_service import ArtifactService
 from backend.services.scheduler_service import scheduler_service
 
 
 def get_counts() -> dict[str, int]:
     with session_scope() as session:
-        resumes = len(crud.list_resumes(session))
-        jobs = len(crud.list_job_postings(session))
-        schedules = len(crud.list_schedules(session))
-    artifacts = sum(1 for _ in ArtifactService().artifacts_root.glob("*/*.docx"))
+        counts = crud.get_counts(session)
     return {
-        "Resumes": resumes,
-        "Job Postings": jobs,
-        "Artifacts": artifacts,
-        "Schedules": schedules,
+        "Resumes": counts["resumes"],
+        "Job Postings": counts["job_postings"],
+        "Artifacts": counts["artifacts"],
+        "Schedules": counts["schedules"],
     }
 
 
@@ -55,6 +52,11 @@ def list_runs():
         return crud.list_runs(session)
 
 
+def stage_timing_percentiles(per: str = "version") -> list[dict]:
+    with session_scope() as session:
+        return crud.stage_timing_percentiles(session, per=per)
+
+
 def list_schedules():
     with session_scope() as session:
         return crud.list_schedules(session)
@@ -69,6 +71,12 @@ def tailor_resume(resume_id: int, job_id: int):
     return service_tailor_resume(request)
 
 
+def stream_tailor_resume(resume_id: int, job_id: int) -> Iterator[dict]:
+    request = TailorRequest(resume_id=resume_id, job_posting_id=job_id)
+    resume, job = load_tailor_inputs(request)
+    return service_stream_tailor_resume(resume, job)
+
+
 def create_job_posting(payload: JobPostingCreate | dict):
     if not isinstance(payload, JobPostingCreate):
         payload = JobPostingCreate(**payload)
@@ -91,32 +99,31 @@ def import_jobs_from_csv(file) -> List[int]:
     return service_import_jobs_from_csv(raw)
 
 
-def list_artifacts() -> List[dict]:
-    root = ArtifactService().artifacts_root
-    artifacts = []
-    for directory in sorted(root.glob("*")):
-        if directory.is_dir():
-            for docx_path in directory.glob("*.docx"):
-                meta = directory / "meta.json"
-                meta_data = {}
-                if meta.exists():
-                    try:
-                        meta_data = json.loads(meta.read_text(encoding="utf-8"))
-                    except Exception:
-                        meta_data = {}
-                artifacts.append(
-                    {
-                        "folder": directory.name,
-                        "file": docx_path.name,
-                        "path": str(docx_path),
-                        "meta": meta_data,
-                    }
-                )
-    return artifacts
+def list_artifacts(query: str = "", limit: int = 50, offset: int = 0) -> tuple[List[dict], int]:
+    """Return one page of catalogued artifacts matching ``query`` and the total match count."""
+
+    with session_scope() as session:
+        artifacts = crud.list_artifacts(session, query=query or None, limit=limit, offset=offset)
+        total = crud.count_artifacts(session, query=query or None)
+    return (
+        [
+            {
+                "id": artifact.id,
+                "folder": artifact.folder,
+                "file": artifact.file_name,
+                "path": artifact.path,
+                "size": artifact.size,
+                "meta": artifact.meta or {},
+            }
+            for artifact in artifacts
+        ],
+        total,
+    )
 
 
 def trigger_schedule(schedule_id: int) -> None:
-    scheduler_service.run_now(schedule_id)
+    if scheduler_service.trigger(schedule_id) is None:
+        raise RuntimeError("schedule is already running its maximum number of instances")
 
 
 def sync_scheduler() -> None:
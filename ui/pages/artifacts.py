@@ -8,6 +8,8 @@ from nicegui import ui
 from ..backend_bridge import list_artifacts
 from .shared import page_container, top_navigation
 
+PAGE_SIZE = 25
+
 
 @ui.page("/artifacts")
 def artifacts_page() -> None:
@@ -18,22 +20,18 @@ def artifacts_page() -> None:
 
         search = ui.input("Search", placeholder="Company, job, or filename").classes("w-full")
         container = ui.column().classes("w-full gap-4")
+        pager = ui.row().classes("items-center gap-4")
+        state = {"offset": 0}
 
         def render() -> None:
-            artifacts = list_artifacts()
-            query = (search.value or "").lower()
+            artifacts, total = list_artifacts(search.value or "", limit=PAGE_SIZE, offset=state["offset"])
             container.clear()
-            matches = []
-            for artifact in artifacts:
-                text_blob = json.dumps(artifact.get("meta", {})).lower()
-                if query and query not in artifact["folder"].lower() and query not in artifact["file"].lower() and query not in text_blob:
-                    continue
-                matches.append(artifact)
-            if not matches:
+            pager.clear()
+            if not artifacts:
                 with container:
                     ui.label("No artifacts match your search yet.").classes("text-gray-500")
                 return
-            for artifact in matches:
+            for artifact in artifacts:
                 download_url = f"/api/artifacts/download?path={quote(artifact['path'])}"
                 meta = artifact.get("meta", {})
                 with container:
@@ -43,9 +41,24 @@ def artifacts_page() -> None:
                         if isinstance(meta, dict) and meta:
                             ui.label(json.dumps(meta, indent=2)).classes("font-mono text-sm bg-gray-100 p-2 rounded")
                         ui.button("Download", on_click=lambda url=download_url: ui.open(url)).props("color=primary")
+            with pager:
+                export_url = f"/api/artifacts/export?q={quote(search.value or '')}"
+                ui.button("Download all as ZIP", on_click=lambda: ui.open(export_url)).props("outline")
+                first = state["offset"] + 1
+                last = state["offset"] + len(artifacts)
+                ui.label(f"{first}–{last} of {total}").classes("text-gray-500")
+                if state["offset"] > 0:
+                    ui.button("Previous", on_click=lambda: turn_page(-PAGE_SIZE)).props("flat")
+                if last < total:
+                    ui.button("Next", on_click=lambda: turn_page(PAGE_SIZE)).props("flat")
+
+        def turn_page(step: int) -> None:
+            state["offset"] = max(state["offset"] + step, 0)
+            render()
 
         @search.on("input")
         def _(_: str) -> None:
+            state["offset"] = 0
             render()
 
         render()
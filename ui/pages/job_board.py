@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import asyncio
+
 from nicegui import ui
 
 from ..backend_bridge import (
@@ -7,7 +9,7 @@ from ..backend_bridge import (
     import_jobs_from_csv,
     list_job_postings,
     list_resumes,
-    tailor_resume,
+    stream_tailor_resume,
 )
 from .shared import page_container, top_navigation
 
@@ -116,18 +118,39 @@ def job_board_page() -> None:
                                 on_click=lambda j=job: run_tailoring(j.id, j.title, j.company.name if j.company else "Company"),
                             ).props("color=primary")
 
-        def run_tailoring(job_id: int, title: str, company: str) -> None:
+        progress_labels = {
+            "queued": "Queued",
+            "plan_cached": "Using pre-computed plan",
+            "plan_started": "Planning edits",
+            "plan_token": "Planning edits",
+            "render_started": "Rendering resume text",
+            "render_token": "Rendering resume text",
+            "artifact_rendering": "Writing DOCX",
+            "artifact_written": "Saving version",
+        }
+
+        async def run_tailoring(job_id: int, title: str, company: str) -> None:
             if not selected_resume.value:
                 status.set_text("Select a resume before tailoring")
                 status.classes("text-red-600")
                 return
             try:
-                version, artifact_path, mock = tailor_resume(selected_resume.value, job_id)
-                label = "MOCK" if mock else "AI"
-                status.set_text(
-                    f"[{label}] Generated resume version #{version.id} for {company} — {title}. Saved to {artifact_path}."
-                )
-                status.classes("text-green-600")
+                events = stream_tailor_resume(selected_resume.value, job_id)
+                received = 0
+                while (event := await asyncio.to_thread(next, events, None)) is not None:
+                    received += len(event.get("delta", ""))
+                    if event["event"] == "error":
+                        raise RuntimeError(event.get("detail"))
+                    if event["event"] == "version":
+                        label = "MOCK" if event["mock"] else "AI"
+                        status.set_text(
+                            f"[{label}] Generated resume version #{event['resume_version_id']} for {company} — {title}. "
+                            f"Saved to {event['artifact_path']}."
+                        )
+                        status.classes("text-green-600")
+                        return
+                    status.set_text(f"{progress_labels.get(event['event'], event['event'])}… ({received} chars received)")
+                    status.classes("text-gray-600")
             except Exception as exc:  # pragma: no cover - UI feedback
                 status.set_text(f"Tailoring failed: {exc}")
                 status.classes("text-red-600")
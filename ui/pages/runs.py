@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from nicegui import ui
 
-from ..backend_bridge import list_runs
+from ..backend_bridge import list_runs, stage_timing_percentiles
 from .shared import page_container, top_navigation
 
 
@@ -20,6 +20,25 @@ def runs_page() -> None:
             )
             return
 
+        percentiles = stage_timing_percentiles()
+        if percentiles:
+            with ui.card().classes("w-full"):
+                ui.label("Stage latency per tailored resume").classes("text-xl font-semibold")
+                ui.table(
+                    columns=[
+                        {"name": "stage", "label": "Stage", "field": "stage"},
+                        {"name": "samples", "label": "Samples", "field": "samples"},
+                        {"name": "p50_ms", "label": "p50 (ms)", "field": "p50_ms"},
+                        {"name": "p95_ms", "label": "p95 (ms)", "field": "p95_ms"},
+                        {"name": "max_ms", "label": "Max (ms)", "field": "max_ms"},
+                    ],
+                    rows=[
+                        {**row, **{key: round(row[key], 1) for key in ("p50_ms", "p95_ms", "max_ms")}}
+                        for row in percentiles
+                    ],
+                    row_key="stage",
+                ).classes("w-full")
+
         with ui.timeline().classes("w-full"):
             for run in runs:
                 with ui.timeline_item(icon="play_arrow"):
@@ -33,3 +52,6 @@ def runs_page() -> None:
                         )
                         if run.error:
                             ui.label(f"Error: {run.error}").classes("text-red-600")
+                        if run.stage_timings:
+                            breakdown = ", ".join(f"{stage} {ms:.0f} ms" for stage, ms in run.stage_timings.items())
+                            ui.label(f"Stages: {breakdown}").classes("text-gray-600 text-sm")
@@ -29,6 +29,8 @@ def scheduler_page() -> None:
                     "cron": schedule.cron_expr,
                     "enabled": "Yes" if schedule.is_enabled else "No",
                     "criteria": schedule.criteria_json or {},
+                    "last_fire": schedule.last_fire_at.isoformat(timespec="minutes") if schedule.last_fire_at else "",
+                    "misfires": schedule.misfire_count,
                 }
                 for schedule in schedules
             ]
@@ -52,7 +54,12 @@ def scheduler_page() -> None:
                 status.set_text("Cron expression required")
                 status.classes("text-red-600")
                 return
-            schedule = create_schedule({"cron_expr": cron, "is_enabled": enable_toggle.value, "criteria_json": None})
+            try:
+                schedule = create_schedule({"cron_expr": cron, "is_enabled": enable_toggle.value, "criteria_json": None})
+            except ValueError as exc:
+                status.set_text(f"Invalid cron expression: {exc}")
+                status.classes("text-red-600")
+                return
             status.set_text(f"Created schedule #{schedule.id} ({schedule.cron_expr})")
             status.classes("text-green-600")
             cron_input.set_value("")
@@ -65,6 +72,8 @@ def scheduler_page() -> None:
                 {"name": "cron", "label": "Cron", "field": "cron"},
                 {"name": "enabled", "label": "Enabled", "field": "enabled"},
                 {"name": "criteria", "label": "Criteria", "field": "criteria"},
+                {"name": "last_fire", "label": "Last Fire", "field": "last_fire"},
+                {"name": "misfires", "label": "Misfires", "field": "misfires"},
             ],
             rows=[],
             row_key="id",
@@ -77,7 +86,7 @@ def scheduler_page() -> None:
                 return
             try:
                 trigger_schedule(row["id"])
-                status.set_text(f"Triggered schedule #{row['id']} immediately")
+                status.set_text(f"Started schedule #{row['id']} in the background")
                 status.classes("text-green-600")
             except Exception as exc:  # pragma: no cover - UI feedback
                 status.set_text(f"Trigger failed: {exc}")